@@ -0,0 +1,174 @@
+"""
+Set-based finalization of AI Course Builder drafts.
+
+A draft is turned into course package records (see
+instructor_portal/course_package.py) and inserted with CourseImporter, which
+builds every Module/Lesson/Assessment/Question/Answer row in memory and
+writes each level with ``bulk_create``. ``bulk_create`` sends no per-row
+save signals, so the ordering, duration and analytics handlers that a
+row-by-row ``create`` would trigger are skipped; durations and assessment
+flags are recomputed once at the end instead.
+
+Classes:
+- DraftFinalizer: Create a published course from a draft
+
+Functions:
+- iter_draft_records: Convert a draft's JSON documents into package records
+"""
+
+import logging
+
+from django.db import transaction
+
+from courses.models import Course
+from instructor_portal.course_package import (
+    PACKAGE_FORMAT,
+    PACKAGE_VERSION,
+    CourseImporter,
+)
+from instructor_portal.models import CourseInstructor
+
+logger = logging.getLogger(__name__)
+
+# Lesson types the generator emits that are named differently on Lesson
+LESSON_TYPE_ALIASES = {
+    'lab': 'lab_exercise',
+    'text': 'reading',
+    'article': 'reading',
+}
+
+DEFAULT_PASSING_SCORE = 70
+
+
+def _lesson_type(value):
+    value = (value or 'reading').lower()
+    return LESSON_TYPE_ALIASES.get(value, value)
+
+
+def iter_draft_records(draft):
+    """
+    Yield package records for a draft.
+
+    Each module quiz is attached to the module's last lesson, since a lesson
+    holds at most one assessment. Lessons without generated content fall back
+    to their outline description so they still satisfy Lesson validation.
+    """
+    modules = (draft.outline or {}).get('modules') or []
+    lesson_content = (draft.content or {}).get('lessons') or {}
+    quizzes = {}
+    if draft.has_assessments:
+        for quiz in (draft.assessments or {}).get('quizzes') or []:
+            quizzes.setdefault(quiz.get('moduleIndex'), quiz)
+
+    yield {'kind': 'header', 'format': PACKAGE_FORMAT, 'version': PACKAGE_VERSION}
+
+    for i, module_data in enumerate(modules):
+        module_ref = f"m{i}"
+        yield {
+            'kind': 'module',
+            'ref': module_ref,
+            'title': module_data.get('title') or f"Module {i+1}",
+            'description': module_data.get('description') or '',
+            'order': i + 1,
+        }
+
+        lessons = module_data.get('lessons') or []
+        for j, lesson_info in enumerate(lessons):
+            title = lesson_info.get('title') or f"Lesson {j+1}"
+            generated = lesson_content.get(f"{i}-{j}") or {}
+            yield {
+                'kind': 'lesson',
+                'ref': f"l{i}-{j}",
+                'parent': module_ref,
+                'title': title,
+                'content': (generated.get('content') or lesson_info.get('description')
+                            or f"<h2>{title}</h2><p>Lesson content to be added.</p>"),
+                'type': _lesson_type(lesson_info.get('type')),
+                'order': j + 1,
+                'duration_minutes': generated.get('duration_minutes') or 0,
+            }
+
+        quiz = quizzes.get(i)
+        if not quiz:
+            continue
+        if not lessons:
+            logger.warning(f"Draft {draft.id}: skipping quiz for module {i} without lessons")
+            continue
+
+        lesson_ref = f"l{i}-{len(lessons) - 1}"
+        assessment_ref = f"a{i}"
+        yield {
+            'kind': 'assessment',
+            'ref': assessment_ref,
+            'parent': lesson_ref,
+            'title': quiz.get('title') or f"Quiz for {module_data.get('title') or f'Module {i+1}'}",
+            'description': quiz.get('description') or '',
+            'passing_score': DEFAULT_PASSING_SCORE,
+        }
+
+        for q, question in enumerate(quiz.get('questions') or []):
+            question_ref = f"q{i}-{q}"
+            yield {
+                'kind': 'question',
+                'ref': question_ref,
+                'parent': assessment_ref,
+                'question_text': question.get('question') or f"Question {q+1}",
+                'question_type': 'multiple_choice',
+                'order': q + 1,
+            }
+            for o, option in enumerate(question.get('options') or []):
+                yield {
+                    'kind': 'answer',
+                    'ref': f"o{i}-{q}-{o}",
+                    'parent': question_ref,
+                    'answer_text': option.get('text') or f"Option {o+1}",
+                    'is_correct': bool(option.get('is_correct')),
+                    'order': o + 1,
+                }
+
+    yield {'kind': 'footer'}
+
+
+class DraftFinalizer:
+    """
+    Create a published course from a draft in a single transaction.
+
+    The number of queries depends on the number of rows divided by
+    ``batch_size``, not on the number of modules, lessons and questions.
+    """
+
+    def __init__(self, draft, batch_size=500):
+        self.draft = draft
+        self.batch_size = batch_size
+        self.counts = {}
+
+    def run(self):
+        """
+        Create the course, its instructor link and its content.
+
+        Raises:
+            CoursePackageError: If the draft content fails validation
+        """
+        draft = self.draft
+        with transaction.atomic():
+            course = Course.objects.create(
+                title=draft.title,
+                description=draft.description,
+                price=draft.price or 0.00,
+                duration_minutes=draft.duration_minutes or 0,
+                level=draft.difficulty_level or "all_levels",
+                is_published=True,
+            )
+            CourseInstructor.objects.create(
+                course=course, instructor=draft.instructor, is_lead=True
+            )
+
+            importer = CourseImporter(course, batch_size=self.batch_size)
+            self.counts = importer.run(iter_draft_records(draft))['counts']
+
+            draft.status = "PUBLISHED"
+            draft.save(update_fields=['status', 'updated_at'])
+
+        course.refresh_from_db(fields=['duration_minutes', 'updated_date'])
+        logger.info(f"Finalized draft {draft.id} into course {course.id}: {self.counts}")
+        return course
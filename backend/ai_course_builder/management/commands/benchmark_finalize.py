@@ -0,0 +1,97 @@
+# python manage.py benchmark_finalize --modules 50 --lessons 6
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from ai_course_builder.finalization import DraftFinalizer
+from ai_course_builder.models import AICourseBuilderDraft
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Benchmark AI draft finalization on a synthetic draft (rolled back by default)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--modules", type=int, default=50, help="Modules in the draft (default: 50)")
+        parser.add_argument("--lessons", type=int, default=6, help="Lessons per module (default: 6)")
+        parser.add_argument("--questions", type=int, default=5, help="Questions per module quiz (default: 5)")
+        parser.add_argument("--instructor", type=str, help="Username of the draft owner (default: first user)")
+        parser.add_argument("--keep", action="store_true", help="Keep the created course instead of rolling back")
+
+    def build_draft(self, instructor, modules, lessons, questions):
+        outline = {"modules": []}
+        content = {"lessons": {}}
+        quizzes = []
+        for i in range(modules):
+            outline["modules"].append({
+                "title": f"Module {i + 1}: Benchmark topic",
+                "description": f"Synthetic module {i + 1}",
+                "lessons": [{"title": f"Lesson {j + 1}", "type": "reading"} for j in range(lessons)],
+            })
+            for j in range(lessons):
+                content["lessons"][f"{i}-{j}"] = {
+                    "content": f"<p>Synthetic lesson body {i}-{j} for benchmarking.</p>",
+                    "duration_minutes": 15,
+                }
+            quizzes.append({
+                "title": f"Assessment: Module {i + 1}",
+                "moduleIndex": i,
+                "questions": [
+                    {
+                        "question": f"Question {q + 1}?",
+                        "options": [{"text": f"Option {o}", "is_correct": o == 0} for o in range(4)],
+                    }
+                    for q in range(questions)
+                ],
+            })
+
+        return AICourseBuilderDraft.objects.create(
+            instructor=instructor,
+            title="Finalization benchmark",
+            description="Synthetic draft used to benchmark finalization",
+            outline=outline,
+            content=content,
+            assessments={"quizzes": quizzes},
+            has_outline=True,
+            has_modules=True,
+            has_lessons=True,
+            has_assessments=True,
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        users = User.objects.order_by("id")
+        if options["instructor"]:
+            users = users.filter(username=options["instructor"])
+        instructor = users.first()
+        if instructor is None:
+            raise CommandError("No user available to own the benchmark draft")
+
+        try:
+            with transaction.atomic():
+                draft = self.build_draft(
+                    instructor, options["modules"], options["lessons"], options["questions"]
+                )
+                finalizer = DraftFinalizer(draft)
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    course = finalizer.run()
+                    elapsed = time.perf_counter() - started
+
+                self.stdout.write(f"Course {course.id}: {finalizer.counts}")
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Finalized {options['modules']} modules in {elapsed * 1000:.1f} ms "
+                        f"with {len(queries)} queries"
+                    )
+                )
+                if not options["keep"]:
+                    raise _Rollback
+        except _Rollback:
+            self.stdout.write("Benchmark data rolled back")
@@ -0,0 +1,34 @@
+# Generated by Django 5.2 on 2026-10-18 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_course_builder', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AIGeneratedUnit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unit_type', models.CharField(choices=[('OUTLINE', 'Outline'), ('MODULE', 'Module'), ('LESSON', 'Lesson'), ('ASSESSMENT', 'Assessment')], max_length=20)),
+                ('unit_key', models.CharField(blank=True, default='', max_length=32)),
+                ('prompt_hash', models.CharField(db_index=True, max_length=64)),
+                ('provider', models.CharField(blank=True, default='', max_length=50)),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('draft', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='generated_units', to='ai_course_builder.aicoursebuilderdraft')),
+            ],
+            options={
+                'verbose_name': 'AI Generated Unit',
+                'verbose_name_plural': 'AI Generated Units',
+                'ordering': ['draft', 'unit_type', 'unit_key'],
+                'constraints': [models.UniqueConstraint(fields=('draft', 'unit_type', 'unit_key'), name='unique_draft_unit')],
+            },
+        ),
+    ]
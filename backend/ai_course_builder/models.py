@@ -6,6 +6,8 @@ before they are published as regular courses.
 
 Classes:
 - AICourseBuilderDraft: Stores draft data for AI-generated courses
+- AIGeneratedUnit: Stores one generated unit (outline, module, lesson or
+  assessment) of a draft in its own row
 """
 
 from django.db import models
@@ -109,3 +111,53 @@ class AICourseBuilderDraft(models.Model):
         verbose_name = "AI Course Builder Draft"
         verbose_name_plural = "AI Course Builder Drafts"
         ordering = ["-updated_at"]
+
+
+class AIGeneratedUnit(models.Model):
+    """
+    A single generated unit of an AI course draft.
+
+    Parallel generation tasks write their output here, one row per unit,
+    instead of rewriting the draft's JSON documents. The orchestrator merges
+    finished units back into the draft once the fan-out completes.
+
+    Fields:
+        draft: The draft this unit belongs to
+        unit_type: OUTLINE/MODULE/LESSON/ASSESSMENT
+        unit_key: Position of the unit in the outline ("0" for module 0,
+            "0-2" for lesson 2 of module 0, "" for the outline)
+        prompt_hash: SHA-256 of the prompt payload, used for memoization
+        provider: Name of the provider that produced the unit
+        data: The generated content
+    """
+
+    UNIT_TYPE_CHOICES = (
+        ("OUTLINE", "Outline"),
+        ("MODULE", "Module"),
+        ("LESSON", "Lesson"),
+        ("ASSESSMENT", "Assessment"),
+    )
+
+    draft = models.ForeignKey(
+        AICourseBuilderDraft, on_delete=models.CASCADE, related_name="generated_units"
+    )
+    unit_type = models.CharField(max_length=20, choices=UNIT_TYPE_CHOICES)
+    unit_key = models.CharField(max_length=32, blank=True, default="")
+    prompt_hash = models.CharField(max_length=64, db_index=True)
+    provider = models.CharField(max_length=50, blank=True, default="")
+    data = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.get_unit_type_display()} {self.unit_key} of draft {self.draft_id}"
+
+    class Meta:
+        verbose_name = "AI Generated Unit"
+        verbose_name_plural = "AI Generated Units"
+        ordering = ["draft", "unit_type", "unit_key"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["draft", "unit_type", "unit_key"], name="unique_draft_unit"
+            ),
+        ]
@@ -0,0 +1,249 @@
+"""
+Generation orchestration for AI Course Builder.
+
+Course generation is a small DAG: the outline comes first, every module and
+lesson can then be generated independently, and assessments need the
+finished modules. This module holds the pieces the Celery tasks share:
+
+- Prompt payloads and their content hashes, used to memoize provider calls
+- Per-unit storage in AIGeneratedUnit, so parallel tasks never rewrite the
+  draft's JSON documents
+- Row-locked JSON path updates for the single-unit endpoints
+- Assembly of finished units back into the draft in one write
+- Splitting the fan-out into a bounded number of batches
+
+Functions:
+- prompt_hash: Stable hash of a prompt payload
+- build_prompt: Build the prompt payload for a unit from a draft snapshot
+- generate_unit: Produce (or reuse) a unit and store it in its own row
+- merge_unit_into_draft: Apply one unit to the draft under a row lock
+- assemble_draft: Merge every stored unit into the draft in a single save
+- plan_unit_batches: Split module/lesson units into bounded batches
+"""
+
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import AICourseBuilderDraft, AIGeneratedUnit
+from .providers import get_provider
+
+logger = logging.getLogger(__name__)
+
+PROMPT_CACHE_PREFIX = 'ai_builder_prompt'
+
+DEFAULT_CONCURRENCY = 4
+
+# Draft columns needed to build prompts; avoids loading content/assessments
+SNAPSHOT_FIELDS = ('id', 'title', 'description', 'difficulty_level',
+                   'course_objectives', 'target_audience', 'outline')
+
+
+def prompt_cache_timeout():
+    return getattr(settings, 'AI_PROMPT_CACHE_TIMEOUT', 7 * 24 * 3600)
+
+
+def generation_concurrency():
+    return max(1, int(getattr(settings, 'AI_GENERATION_CONCURRENCY', DEFAULT_CONCURRENCY)))
+
+
+def prompt_hash(unit_type, prompt, provider=None):
+    """
+    Return a SHA-256 over the unit type, provider, model and prompt payload.
+
+    Identical prompts sent to the same model produce the same hash, so their
+    output can be reused across drafts and retries.
+    """
+    provider = provider or get_provider()
+    body = json.dumps(
+        {'unit': unit_type, 'provider': provider.name, 'model': provider.model, 'prompt': prompt},
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+
+def load_snapshot(draft_id):
+    """Load only the draft fields needed to build prompts"""
+    return AICourseBuilderDraft.objects.only(*SNAPSHOT_FIELDS).get(id=draft_id)
+
+
+def _course_context(draft):
+    return {
+        'title': draft.title,
+        'description': draft.description,
+        'difficulty_level': draft.difficulty_level,
+        'objectives': draft.course_objectives,
+        'target_audience': draft.target_audience,
+    }
+
+
+def build_prompt(draft, unit_type, unit_key='', course_info=None):
+    """
+    Build the prompt payload for a unit.
+
+    Raises:
+        KeyError/IndexError/ValueError: If the unit key does not exist in the outline
+    """
+    course = course_info or _course_context(draft)
+    if unit_type == 'OUTLINE':
+        return course
+
+    modules = (draft.outline or {}).get('modules') or []
+    if unit_type == 'LESSON':
+        module_index, lesson_index = (int(part) for part in unit_key.split('-'))
+        module = modules[module_index]
+        return {
+            'course': course,
+            'module': {'title': module.get('title'), 'description': module.get('description')},
+            'lesson': module['lessons'][lesson_index],
+            'module_index': module_index,
+            'lesson_index': lesson_index,
+        }
+
+    module_index = int(unit_key)
+    return {'course': course, 'module': modules[module_index], 'module_index': module_index}
+
+
+GENERATORS = {
+    'OUTLINE': 'generate_outline',
+    'MODULE': 'generate_module',
+    'LESSON': 'generate_lesson',
+    'ASSESSMENT': 'generate_assessment',
+}
+
+
+def generate_unit(draft_id, unit_type, unit_key, prompt):
+    """
+    Generate a unit, reusing memoized output for an identical prompt.
+
+    The result is stored in its own AIGeneratedUnit row. Returns a tuple of
+    (data, cached) where ``cached`` tells whether the provider was skipped.
+    """
+    provider = get_provider()
+    digest = prompt_hash(unit_type, prompt, provider)
+    cache_key = f"{PROMPT_CACHE_PREFIX}:{digest}"
+
+    data = cache.get(cache_key)
+    cached = data is not None
+    if not cached:
+        previous = (
+            AIGeneratedUnit.objects.filter(prompt_hash=digest)
+            .values_list('data', flat=True)
+            .first()
+        )
+        if previous is not None:
+            data, cached = previous, True
+        else:
+            data = getattr(provider, GENERATORS[unit_type])(prompt)
+        cache.set(cache_key, data, prompt_cache_timeout())
+
+    AIGeneratedUnit.objects.update_or_create(
+        draft_id=draft_id,
+        unit_type=unit_type,
+        unit_key=unit_key,
+        defaults={'prompt_hash': digest, 'provider': provider.name, 'data': data},
+    )
+    return data, cached
+
+
+def _apply_unit(draft, unit_type, unit_key, data):
+    """Apply a unit to in-memory draft documents; returns the changed fields"""
+    if unit_type == 'OUTLINE':
+        draft.outline = data
+        draft.has_outline = True
+        return ['outline', 'has_outline']
+
+    if unit_type == 'ASSESSMENT':
+        assessments = draft.assessments or {}
+        quizzes = [q for q in assessments.get('quizzes', []) if q.get('moduleIndex') != data.get('moduleIndex')]
+        quizzes.append(data)
+        quizzes.sort(key=lambda q: q.get('moduleIndex', 0))
+        assessments['quizzes'] = quizzes
+        draft.assessments = assessments
+        draft.has_assessments = True
+        return ['assessments', 'has_assessments']
+
+    content = draft.content or {}
+    if unit_type == 'MODULE':
+        content.setdefault('content', {})[unit_key] = data
+        draft.content = content
+        draft.has_modules = True
+        return ['content', 'has_modules']
+
+    content.setdefault('lessons', {})[unit_key] = data
+    draft.content = content
+    draft.has_lessons = True
+    return ['content', 'has_lessons']
+
+
+def merge_unit_into_draft(draft_id, unit_type, unit_key, data):
+    """
+    Write one unit into the draft's JSON under a row lock.
+
+    Only the affected document is loaded and saved, and the lock serialises
+    concurrent single-unit tasks so none of them loses another's update.
+    """
+    document = {'OUTLINE': 'outline', 'ASSESSMENT': 'assessments'}.get(unit_type, 'content')
+    with transaction.atomic():
+        draft = (
+            AICourseBuilderDraft.objects.select_for_update()
+            .only('id', document)
+            .get(id=draft_id)
+        )
+        fields = _apply_unit(draft, unit_type, unit_key, data)
+        draft.save(update_fields=fields + ['updated_at'])
+
+
+def assemble_draft(draft_id, unit_types=('MODULE', 'LESSON', 'ASSESSMENT')):
+    """
+    Merge stored units into the draft with a single save.
+
+    Returns the number of units merged.
+    """
+    units = list(
+        AIGeneratedUnit.objects.filter(draft_id=draft_id, unit_type__in=unit_types)
+        .order_by('unit_type', 'unit_key')
+        .values_list('unit_type', 'unit_key', 'data')
+    )
+    if not units:
+        return 0
+
+    with transaction.atomic():
+        draft = (
+            AICourseBuilderDraft.objects.select_for_update()
+            .only('id', 'content', 'assessments', 'generation_metadata')
+            .get(id=draft_id)
+        )
+        fields = set()
+        for unit_type, unit_key, data in units:
+            fields.update(_apply_unit(draft, unit_type, unit_key, data))
+        draft.save(update_fields=sorted(fields) + ['updated_at'])
+    return len(units)
+
+
+def plan_unit_batches(outline, concurrency=None):
+    """
+    Split every module and lesson unit of an outline into at most
+    ``concurrency`` batches of similar size.
+
+    Each batch becomes one Celery task, which bounds how many provider calls
+    a single draft can have in flight at once.
+    """
+    units = []
+    for i, module in enumerate((outline or {}).get('modules') or []):
+        units.append(('MODULE', str(i)))
+        for j, _ in enumerate(module.get('lessons') or []):
+            units.append(('LESSON', f"{i}-{j}"))
+
+    if not units:
+        return []
+
+    concurrency = min(concurrency or generation_concurrency(), len(units))
+    batches = [[] for _ in range(concurrency)]
+    for position, unit in enumerate(units):
+        batches[position % concurrency].append(list(unit))
+    return batches
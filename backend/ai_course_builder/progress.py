@@ -0,0 +1,195 @@
+"""
+Progress channel for AI Course Builder tasks.
+
+Generation tasks publish progress events into a per-draft channel and the
+frontend either keeps one Server-Sent Events connection open or long-polls
+with an ETag, instead of polling the Celery result backend every second.
+
+Each draft channel keeps a monotonically increasing version and the latest
+event of every task, so a client that (re)connects gets a full snapshot and
+then only the changes after the version it has seen.
+
+Classes:
+- ProgressBroker: Interface shared by the broker backends
+- InMemoryProgressBroker: Single-process broker used in tests and eager mode
+- RedisProgressBroker: Redis pub/sub broker used across web and worker processes
+
+Functions:
+- get_broker: Return the configured broker
+- publish_task_event: Publish a task event for a draft
+"""
+
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATES = {'SUCCESS', 'FAILURE', 'REVOKED'}
+
+CHANNEL_TTL = 24 * 3600  # seconds a draft channel survives without events
+
+
+def channel_name(draft_id):
+    return f"ai_builder:progress:{draft_id}"
+
+
+class ProgressBroker:
+    """
+    Interface for progress brokers.
+
+    ``snapshot`` returns ``(version, {task_id: event})`` and ``wait`` blocks
+    until the channel version exceeds ``since`` or the timeout elapses.
+    """
+
+    def publish(self, draft_id, task_id, event):
+        raise NotImplementedError
+
+    def snapshot(self, draft_id):
+        raise NotImplementedError
+
+    def wait(self, draft_id, since, timeout):
+        raise NotImplementedError
+
+
+class InMemoryProgressBroker(ProgressBroker):
+    """Broker that keeps channels in process memory"""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._channels = {}
+
+    def publish(self, draft_id, task_id, event):
+        with self._condition:
+            version, tasks = self._channels.get(draft_id, (0, {}))
+            version += 1
+            tasks = {**tasks, task_id: {**event, 'version': version}}
+            self._channels[draft_id] = (version, tasks)
+            self._condition.notify_all()
+        return version
+
+    def snapshot(self, draft_id):
+        with self._condition:
+            version, tasks = self._channels.get(draft_id, (0, {}))
+            return version, dict(tasks)
+
+    def wait(self, draft_id, since, timeout):
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._channels.get(draft_id, (0, {}))[0] <= since:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+        return self.snapshot(draft_id)
+
+    def clear(self):
+        with self._condition:
+            self._channels.clear()
+
+
+class RedisProgressBroker(ProgressBroker):
+    """
+    Broker backed by Redis.
+
+    Events are stored in a hash per draft (latest event per task) next to a
+    version counter, and a pub/sub message carrying the new version wakes
+    any waiting subscribers.
+    """
+
+    def __init__(self, url=None):
+        import redis
+
+        self.url = url or getattr(settings, 'AI_PROGRESS_REDIS_URL', settings.CELERY_BROKER_URL)
+        self.client = redis.Redis.from_url(self.url)
+
+    def _keys(self, draft_id):
+        channel = channel_name(draft_id)
+        return channel, f"{channel}:version", f"{channel}:tasks"
+
+    def publish(self, draft_id, task_id, event):
+        channel, version_key, tasks_key = self._keys(draft_id)
+        version = self.client.incr(version_key)
+        pipe = self.client.pipeline()
+        pipe.hset(tasks_key, task_id, json.dumps({**event, 'version': version}, default=str))
+        pipe.expire(tasks_key, CHANNEL_TTL)
+        pipe.expire(version_key, CHANNEL_TTL)
+        pipe.publish(channel, version)
+        pipe.execute()
+        return version
+
+    def snapshot(self, draft_id):
+        _, version_key, tasks_key = self._keys(draft_id)
+        pipe = self.client.pipeline()
+        pipe.get(version_key)
+        pipe.hgetall(tasks_key)
+        version, tasks = pipe.execute()
+        return int(version or 0), {
+            key.decode(): json.loads(value) for key, value in (tasks or {}).items()
+        }
+
+    def wait(self, draft_id, since, timeout):
+        version, tasks = self.snapshot(draft_id)
+        if version > since:
+            return version, tasks
+
+        channel, _, _ = self._keys(draft_id)
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(channel)
+            # Re-check after subscribing so an event published in between is not missed
+            version, tasks = self.snapshot(draft_id)
+            deadline = time.monotonic() + timeout
+            while version <= since:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                message = pubsub.get_message(timeout=remaining)
+                if message and int(message['data']) > since:
+                    version, tasks = self.snapshot(draft_id)
+        finally:
+            pubsub.close()
+        return version, tasks
+
+
+_brokers = {}
+_brokers_lock = threading.Lock()
+
+BROKER_CLASSES = {
+    'memory': InMemoryProgressBroker,
+    'redis': RedisProgressBroker,
+}
+
+
+def get_broker():
+    """Return the broker selected by AI_PROGRESS_BROKER ('redis' or 'memory')"""
+    name = getattr(settings, 'AI_PROGRESS_BROKER', 'redis')
+    with _brokers_lock:
+        if name not in _brokers:
+            _brokers[name] = BROKER_CLASSES[name]()
+        return _brokers[name]
+
+
+def publish_task_event(draft_id, task_id, state, percent=None, message="", result=None):
+    """
+    Publish a task event for a draft, never raising into the caller.
+
+    Returns the new channel version, or None if publishing failed.
+    """
+    event = {
+        'taskId': task_id,
+        'state': state,
+        'progress': {'percent': percent, 'message': message},
+        'timestamp': time.time(),
+    }
+    if result is not None:
+        event['result'] = result
+
+    try:
+        return get_broker().publish(draft_id, task_id, event)
+    except Exception as e:
+        logger.warning(f"Failed to publish progress for task {task_id}: {e}")
+        return None
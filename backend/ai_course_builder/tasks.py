@@ -10,21 +10,55 @@ Functions:
 - generate_module_content_task: Creates detailed content for a course module
 - generate_lesson_content_task: Creates content for a specific lesson
 - generate_assessments_task: Creates quiz questions for a course
+- run_generation_pipeline_task: Generates a whole draft as a DAG, fanning
+  module and lesson generation out as a chord of bounded batches
+- generate_unit_batch_task: Generates one batch of module/lesson units
+- assemble_generation_task: Chord callback merging units and adding assessments
+
+Generated units are stored in their own AIGeneratedUnit rows and provider
+calls are memoized by prompt hash (see orchestrator.py). Progress and
+completion events are published to the draft's progress channel (see
+progress.py) so clients do not need to poll the result backend.
 """
 
-from celery import shared_task
+from celery import chord, shared_task
 from celery.exceptions import SoftTimeLimitExceeded, Retry
 from celery.signals import task_failure, task_success, task_revoked
 import logging
 import time
 import traceback
 import json
+import uuid
 from django.conf import settings
 from django.db import transaction
 from .models import AICourseBuilderDraft
+from .orchestrator import (
+    assemble_draft,
+    build_prompt,
+    generate_unit,
+    load_snapshot,
+    merge_unit_into_draft,
+    plan_unit_batches,
+)
+from .progress import publish_task_event
 
 logger = logging.getLogger(__name__)
 
+def _draft_id_from_args(args, kwargs):
+    """Return the draft ID a task was called with, or None"""
+    if kwargs and isinstance(kwargs.get('draft_id'), int):
+        return kwargs['draft_id']
+    # draft_id is the first integer argument (chord callbacks get results first)
+    return next((arg for arg in args or () if isinstance(arg, int)), None)
+
+
+def _publish_for_request(request, state, **fields):
+    """Publish a task event for the draft a task request belongs to"""
+    draft_id = _draft_id_from_args(getattr(request, 'args', None), getattr(request, 'kwargs', None))
+    if draft_id is not None and getattr(request, 'id', None):
+        publish_task_event(draft_id, request.id, state, **fields)
+
+
 # Task status tracking
 class TaskStatus:
     """Helper class for updating task progress during execution."""
@@ -34,6 +68,9 @@ class TaskStatus:
         """
         Update the current task's progress.
 
+        The progress is stored in the result backend and published to the
+        draft's progress channel.
+
         Args:
             task: The Celery task instance
             percent (int): Current progress percentage (0-100)
@@ -49,6 +86,7 @@ class TaskStatus:
                     }
                 }
             )
+            _publish_for_request(task.request, 'PROGRESS', percent=percent, message=message)
             logger.info(f"Task {task.request.id}: {percent}% - {message}")
 
 # Error handling for tasks
@@ -60,9 +98,10 @@ def log_failed_task(sender=None, task_id=None, exception=None, **kwargs):
     # Try to update the draft with error information
     try:
         # Extract draft_id from task args if possible
-        args = kwargs.get('args', [])
-        if args and isinstance(args[0], int):
-            draft_id = args[0]
+        draft_id = _draft_id_from_args(kwargs.get('args', []), kwargs.get('kwargs'))
+        if draft_id is not None:
+            if getattr(sender, 'name', '').startswith('ai_course_builder.'):
+                publish_task_event(draft_id, task_id, 'FAILURE', message=str(exception))
             draft = AICourseBuilderDraft.objects.filter(id=draft_id).first()
 
             if draft and draft.generation_metadata:
@@ -79,6 +118,22 @@ def log_failed_task(sender=None, task_id=None, exception=None, **kwargs):
         logger.error(f"Error logging task failure metadata: {e}")
 
 
+@task_success.connect
+def publish_task_success(sender=None, result=None, **kwargs):
+    """Publish completion of AI Course Builder tasks to the progress channel."""
+    if sender is None or not sender.name.startswith('ai_course_builder.'):
+        return
+    _publish_for_request(sender.request, 'SUCCESS', percent=100, message="Completed", result=result)
+
+
+@task_revoked.connect
+def publish_task_revoked(sender=None, request=None, **kwargs):
+    """Publish revocation of AI Course Builder tasks to the progress channel."""
+    if sender is None or not getattr(sender, 'name', '').startswith('ai_course_builder.'):
+        return
+    _publish_for_request(request, 'REVOKED', message="Task was cancelled")
+
+
 @shared_task(
     bind=True,
     name='ai_course_builder.generate_course_outline',
@@ -106,60 +161,31 @@ def generate_course_outline_task(self, draft_id, course_info=None):
     """
     try:
         # Get the draft object
-        draft = AICourseBuilderDraft.objects.get(id=draft_id)
+        draft = load_snapshot(draft_id)
 
         # Update progress
         TaskStatus.update_progress(self, 10, "Preparing course information")
+        prompt = build_prompt(draft, 'OUTLINE', course_info=course_info or None)
 
-        # In a production implementation, this would call an AI service
-        # For demonstration, we'll simulate an AI response with a delay
-        TaskStatus.update_progress(self, 30, "Connecting to AI service")
-        time.sleep(1)  # Simulate connection
-
-        TaskStatus.update_progress(self, 50, "Generating course structure")
-        time.sleep(1)  # Simulate processing
-
-        TaskStatus.update_progress(self, 70, "Creating modules and lessons")
-        time.sleep(1)  # Simulate more processing
-
-        # Generate a placeholder outline (replace with actual AI integration)
-        outline_data = {
-            "modules": [
-                {
-                    "title": f"Module 1: Introduction to {draft.title}",
-                    "description": "This module introduces the fundamental concepts of the course.",
-                    "lessons": [
-                        {"title": "Getting Started", "type": "video"},
-                        {"title": "Core Concepts", "type": "reading"},
-                        {"title": "Practical Application", "type": "interactive"}
-                    ]
-                },
-                {
-                    "title": "Module 2: Intermediate Topics",
-                    "description": "Building on the fundamentals, this module explores more advanced topics.",
-                    "lessons": [
-                        {"title": "Advanced Techniques", "type": "video"},
-                        {"title": "Case Studies", "type": "reading"},
-                        {"title": "Hands-on Exercise", "type": "lab"}
-                    ]
-                }
-            ]
-        }        # Final progress update
+        TaskStatus.update_progress(self, 30, "Generating course structure")
+        outline_data, cached = generate_unit(draft_id, 'OUTLINE', '', prompt)
+
+        # Final progress update
         TaskStatus.update_progress(self, 90, "Finalizing course outline")
 
         # Use transaction to ensure atomicity
         with transaction.atomic():
-            # Update the draft with the outline data
-            draft.outline = outline_data
-            draft.has_outline = True
-            draft.save()
+            merge_unit_into_draft(draft_id, 'OUTLINE', '', outline_data)
 
             # Update metadata with successful completion
+            draft = AICourseBuilderDraft.objects.select_for_update().only(
+                'id', 'generation_metadata').get(id=draft_id)
             if not draft.generation_metadata:
                 draft.generation_metadata = {}
 
             draft.generation_metadata['outline_completed'] = True
             draft.generation_metadata['outline_completed_at'] = time.time()
+            draft.generation_metadata['outline_cached'] = cached
             draft.save(update_fields=['generation_metadata'])
 
         TaskStatus.update_progress(self, 100, "Course outline completed")
@@ -220,41 +246,23 @@ def generate_module_content_task(self, draft_id, module_index):
     """
     try:
         # Get the draft object
-        draft = AICourseBuilderDraft.objects.get(id=draft_id)
+        draft = load_snapshot(draft_id)
 
         # Ensure the module exists in the outline
-        if not draft.has_outline or not draft.outline.get('modules') or \
+        if not draft.outline or not draft.outline.get('modules') or \
            module_index >= len(draft.outline['modules']):
             return {
                 "status": "error",
                 "message": "Invalid module index or outline not generated"
             }
 
-        # In a production implementation, this would call an AI service
-        # For demonstration, simulate an AI response with a delay
-        time.sleep(2)  # Simulate AI processing time
-
-        # Generate placeholder content for the module
-        module_data = draft.outline['modules'][module_index]
-        module_data['content'] = f"Detailed content for module: {module_data['title']}"
-
-        # Add additional information
-        module_data['learning_outcomes'] = [
-            "Understand the core concepts presented in this module",
-            "Apply the techniques in practical scenarios",
-            "Analyze and evaluate different approaches"
-        ]
-
-        # Update the content in the draft
-        if 'content' not in draft.content:
-            draft.content['content'] = {}
-        draft.content['content'][str(module_index)] = module_data
+        unit_key = str(module_index)
+        module_data, _ = generate_unit(
+            draft_id, 'MODULE', unit_key, build_prompt(draft, 'MODULE', unit_key)
+        )
 
-        # Update the has_modules flag if this is the first module
-        if not draft.has_modules:
-            draft.has_modules = True
-
-        draft.save()
+        # Write only this module's entry into the draft content
+        merge_unit_into_draft(draft_id, 'MODULE', unit_key, module_data)
 
         return {
             "status": "success",
@@ -301,43 +309,22 @@ def generate_lesson_content_task(self, draft_id, module_index, lesson_index):
     """
     try:
         # Get the draft object
-        draft = AICourseBuilderDraft.objects.get(id=draft_id)
+        draft = load_snapshot(draft_id)
 
         # Validate the indices
+        lesson_key = f"{module_index}-{lesson_index}"
         try:
-            module = draft.outline['modules'][module_index]
-            lesson_info = module['lessons'][lesson_index]
-        except (KeyError, IndexError):
+            prompt = build_prompt(draft, 'LESSON', lesson_key)
+        except (KeyError, IndexError, TypeError):
             return {
                 "status": "error",
                 "message": "Invalid module or lesson index"
             }
 
-        # In a production implementation, this would call an AI service
-        # For demonstration, simulate an AI response with a delay
-        time.sleep(1.5)  # Simulate AI processing time        # Generate placeholder content for the lesson
-        lesson_data = {
-            **lesson_info,
-            'content': f"<h2>Welcome to {lesson_info['title']}</h2><p>This comprehensive lesson covers all essential aspects of the topic, providing detailed explanations and examples to enhance understanding.</p><h3>Key Concepts</h3><p>The main ideas you will learn in this lesson include fundamental principles, practical applications, and advanced techniques.</p><h4>Practical Application</h4><p>Through hands-on exercises, you will apply these concepts in real-world scenarios.</p>",
-            'duration_minutes': 15,
-            'learning_objectives': [
-                "Understand the core principles discussed in this lesson",
-                "Apply the knowledge in practical situations"
-            ]
-        }
-
-        # Update the content in the draft
-        if 'lessons' not in draft.content:
-            draft.content['lessons'] = {}
-
-        lesson_key = f"{module_index}-{lesson_index}"
-        draft.content['lessons'][lesson_key] = lesson_data
-
-        # Update the has_lessons flag if this is the first lesson
-        if not draft.has_lessons:
-            draft.has_lessons = True
+        lesson_data, _ = generate_unit(draft_id, 'LESSON', lesson_key, prompt)
 
-        draft.save()
+        # Write only this lesson's entry into the draft content
+        merge_unit_into_draft(draft_id, 'LESSON', lesson_key, lesson_data)
 
         return {
             "status": "success",
@@ -382,44 +369,7 @@ def generate_assessments_task(self, draft_id):
         dict: The generated assessment data
     """
     try:
-        # Get the draft object
-        draft = AICourseBuilderDraft.objects.get(id=draft_id)
-
-        # In a production implementation, this would call an AI service
-        # For demonstration, simulate an AI response with a delay
-        time.sleep(2.5)  # Simulate AI processing time
-
-        # Generate placeholder assessments based on the course modules
-        assessments_data = {"quizzes": []}
-
-        # Create a quiz for each module
-        for i, module in enumerate(draft.outline.get('modules', [])):
-            quiz = {
-                'title': f"Assessment: {module.get('title', f'Module {i+1}')}",
-                'moduleIndex': i,
-                'description': f"Test your knowledge of {module.get('title', f'Module {i+1}')}",
-                'questions': []
-            }
-
-            # Add 3-5 questions per module
-            num_questions = min(len(module.get('lessons', [])) + 2, 5)
-            for j in range(num_questions):
-                quiz['questions'].append({
-                    'question': f"Question {j+1} about {module.get('title', 'this module')}?",
-                    'options': [
-                        {'text': 'Option A', 'is_correct': j % 4 == 0},
-                        {'text': 'Option B', 'is_correct': j % 4 == 1},
-                        {'text': 'Option C', 'is_correct': j % 4 == 2},
-                        {'text': 'Option D', 'is_correct': j % 4 == 3}
-                    ]
-                })
-
-            assessments_data['quizzes'].append(quiz)
-
-        # Update the draft with the assessments data
-        draft.assessments = assessments_data
-        draft.has_assessments = True
-        draft.save()
+        assessments_data = _generate_assessments(draft_id)
 
         return {
             "status": "success",
@@ -442,3 +392,189 @@ def generate_assessments_task(self, draft_id):
             "status": "error",
             "message": str(e)
         }
+
+
+def _generate_assessments(draft_id):
+    """Generate one quiz per outline module and store them in a single write."""
+    draft = load_snapshot(draft_id)
+    modules = (draft.outline or {}).get('modules') or []
+
+    for i in range(len(modules)):
+        generate_unit(draft_id, 'ASSESSMENT', str(i), build_prompt(draft, 'ASSESSMENT', str(i)))
+
+    assemble_draft(draft_id, unit_types=('ASSESSMENT',))
+    return AICourseBuilderDraft.objects.only('id', 'assessments').get(id=draft_id).assessments
+
+
+@shared_task(
+    bind=True,
+    name='ai_course_builder.generate_unit_batch',
+    soft_time_limit=600,  # 10 minutes
+    time_limit=660,       # 11 minutes
+    max_retries=2,
+    acks_late=True
+)
+def generate_unit_batch_task(self, draft_id, units):
+    """
+    Generate a batch of module/lesson units for a draft.
+
+    Units are processed sequentially, so the number of batches scheduled by
+    the pipeline bounds how many provider calls are in flight for a draft.
+    Each unit is written to its own row; the draft itself is not touched.
+
+    Args:
+        draft_id (int): ID of the AICourseBuilderDraft
+        units (list): [unit_type, unit_key] pairs, e.g. [["LESSON", "0-1"]]
+
+    Returns:
+        dict: Counts of generated and memoized units
+    """
+    try:
+        draft = load_snapshot(draft_id)
+        generated = cached = 0
+        for unit_type, unit_key in units:
+            _, was_cached = generate_unit(
+                draft_id, unit_type, unit_key, build_prompt(draft, unit_type, unit_key)
+            )
+            generated += 1
+            cached += int(was_cached)
+
+        return {"status": "success", "draft_id": draft_id, "generated": generated, "cached": cached}
+
+    except SoftTimeLimitExceeded:
+        logger.error(f"Time limit exceeded generating unit batch for draft {draft_id}")
+        self.retry(countdown=30)
+    except Exception as e:
+        logger.error(f"Error generating unit batch for draft {draft_id}: {str(e)}")
+        return {"status": "error", "draft_id": draft_id, "message": str(e)}
+
+
+@shared_task(
+    bind=True,
+    name='ai_course_builder.assemble_generation',
+    soft_time_limit=300,  # 5 minutes
+    time_limit=360,       # 6 minutes
+    max_retries=2
+)
+def assemble_generation_task(self, batch_results, draft_id):
+    """
+    Chord callback: merge generated units into the draft and add assessments.
+
+    Args:
+        batch_results (list): Results of the generate_unit_batch_task header
+        draft_id (int): ID of the AICourseBuilderDraft
+
+    Returns:
+        dict: Summary of the pipeline run
+    """
+    try:
+        failed = [r for r in batch_results or [] if not r or r.get('status') != 'success']
+        merged = assemble_draft(draft_id, unit_types=('MODULE', 'LESSON'))
+        assessments = _generate_assessments(draft_id)
+
+        with transaction.atomic():
+            draft = AICourseBuilderDraft.objects.select_for_update().only(
+                'id', 'generation_metadata').get(id=draft_id)
+            metadata = draft.generation_metadata or {}
+            metadata['pipeline'] = {
+                **metadata.get('pipeline', {}),
+                'completed_at': time.time(),
+                'units_merged': merged,
+                'failed_batches': len(failed),
+                'cached_units': sum(r.get('cached', 0) for r in batch_results or [] if r),
+            }
+            draft.generation_metadata = metadata
+            draft.save(update_fields=['generation_metadata'])
+
+        return {
+            "status": "success" if not failed else "partial",
+            "draft_id": draft_id,
+            "units_merged": merged,
+            "quizzes": len(assessments.get('quizzes', [])),
+        }
+
+    except Exception as e:
+        logger.error(f"Error assembling generated content for draft {draft_id}: {str(e)}")
+        return {"status": "error", "draft_id": draft_id, "message": str(e)}
+
+
+@shared_task(
+    bind=True,
+    name='ai_course_builder.run_generation_pipeline',
+    soft_time_limit=300,  # 5 minutes
+    time_limit=360,       # 6 minutes
+    max_retries=2,
+    acks_late=True
+)
+def run_generation_pipeline_task(self, draft_id, course_info=None, concurrency=None):
+    """
+    Generate a complete draft: outline, then modules and lessons in parallel,
+    then assessments.
+
+    The module/lesson fan-out is scheduled as a chord of at most
+    ``concurrency`` batch tasks (AI_GENERATION_CONCURRENCY by default) whose
+    callback assembles the draft once.
+
+    Args:
+        draft_id (int): ID of the AICourseBuilderDraft
+        course_info (dict, optional): Course information for the outline
+        concurrency (int, optional): Maximum parallel batches
+
+    Returns:
+        dict: The chord id and the number of scheduled batches
+    """
+    try:
+        TaskStatus.update_progress(self, 10, "Preparing course outline")
+        draft = load_snapshot(draft_id)
+
+        if not (draft.outline or {}).get('modules'):
+            outline, _ = generate_unit(
+                draft_id, 'OUTLINE', '', build_prompt(draft, 'OUTLINE', course_info=course_info or None)
+            )
+            merge_unit_into_draft(draft_id, 'OUTLINE', '', outline)
+            draft = load_snapshot(draft_id)
+
+        batches = plan_unit_batches(draft.outline, concurrency)
+        TaskStatus.update_progress(self, 30, f"Scheduling {len(batches)} generation batches")
+
+        # Record the run before scheduling so a fast callback cannot be overwritten
+        chord_id = str(uuid.uuid4())
+        with transaction.atomic():
+            locked = AICourseBuilderDraft.objects.select_for_update().only(
+                'id', 'generation_metadata').get(id=draft_id)
+            metadata = locked.generation_metadata or {}
+            metadata['pipeline'] = {
+                'started_at': time.time(),
+                'batches': len(batches),
+                'units': sum(len(batch) for batch in batches),
+                'chord_id': chord_id,
+            }
+            locked.generation_metadata = metadata
+            locked.save(update_fields=['generation_metadata'])
+
+        # Announce the callback so progress clients know the run is not done yet
+        publish_task_event(draft_id, chord_id, 'PENDING',
+                           message=f"Waiting for {len(batches)} generation batches")
+
+        chord(
+            generate_unit_batch_task.s(draft_id, batch) for batch in batches
+        )(assemble_generation_task.s(draft_id).set(task_id=chord_id))
+
+        TaskStatus.update_progress(self, 100, "Generation scheduled")
+        return {
+            "status": "success",
+            "draft_id": draft_id,
+            "chord_id": chord_id,
+            "batches": len(batches),
+        }
+
+    except AICourseBuilderDraft.DoesNotExist:
+        error_msg = f"Draft with ID {draft_id} not found"
+        logger.error(error_msg)
+        return {"status": "error", "message": error_msg}
+    except SoftTimeLimitExceeded:
+        logger.error(f"Time limit exceeded scheduling generation for draft {draft_id}")
+        self.retry(countdown=60)
+    except Exception as e:
+        logger.error(f"Error scheduling generation pipeline for draft {draft_id}: {str(e)}")
+        return {"status": "error", "message": str(e)}
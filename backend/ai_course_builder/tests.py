@@ -0,0 +1,313 @@
+import re
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from courses.models import Answer, Lesson, Module, Question
+from instructor_portal.models import CourseInstructor
+
+from . import orchestrator, views
+from .finalization import DraftFinalizer
+from .models import AICourseBuilderDraft, AIGeneratedUnit
+from .progress import InMemoryProgressBroker, get_broker, publish_task_event
+from .providers import LocalStubProvider
+from .tasks import generate_course_outline_task
+
+# Course creation with its statistics signal, the instructor link, one INSERT
+# per content level and the duration recomputation; independent of the
+# number of modules and lessons
+FINALIZE_QUERIES = 31
+
+
+# Generation orchestrator tests
+@override_settings(AI_BUILDER_PROVIDER="ai_course_builder.providers.LocalStubProvider")
+class OrchestratorTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.instructor = get_user_model().objects.create_user(
+                username="builderinstructor", email="builderinstructor@example.com", password="pass12345"
+            )
+        self.draft = AICourseBuilderDraft.objects.create(
+            instructor=self.instructor, title="Builder Course", description="Builder course",
+        )
+        self.draft.outline = LocalStubProvider().generate_outline({"title": self.draft.title})
+        self.draft.save(update_fields=["outline"])
+
+    def _generate(self, draft, unit_type, unit_key):
+        prompt = orchestrator.build_prompt(orchestrator.load_snapshot(draft.id), unit_type, unit_key)
+        return orchestrator.generate_unit(draft.id, unit_type, unit_key, prompt)
+
+    def test_prompt_hash_is_stable_and_keyed_by_unit(self):
+        prompt = orchestrator.build_prompt(self.draft, "MODULE", "0")
+        self.assertEqual(
+            orchestrator.prompt_hash("MODULE", prompt),
+            orchestrator.prompt_hash("MODULE", dict(reversed(list(prompt.items())))),
+        )
+        self.assertNotEqual(orchestrator.prompt_hash("MODULE", prompt), orchestrator.prompt_hash("ASSESSMENT", prompt))
+
+    def test_build_prompt_rejects_units_missing_from_the_outline(self):
+        with self.assertRaises(IndexError):
+            orchestrator.build_prompt(self.draft, "MODULE", "5")
+        with self.assertRaises(IndexError):
+            orchestrator.build_prompt(self.draft, "LESSON", "0-9")
+
+    def test_identical_prompts_skip_the_provider(self):
+        data, cached = self._generate(self.draft, "LESSON", "0-1")
+        self.assertFalse(cached)
+        self.assertEqual(data["title"], "Core Concepts")
+
+        with mock.patch.object(LocalStubProvider, "generate_lesson") as generate:
+            self.assertEqual(self._generate(self.draft, "LESSON", "0-1"), (data, True))
+            cache.clear()
+            # A second draft with the same prompt reuses the stored unit
+            other = AICourseBuilderDraft.objects.create(
+                instructor=self.instructor, title=self.draft.title,
+                description=self.draft.description, outline=self.draft.outline,
+            )
+            self.assertEqual(self._generate(other, "LESSON", "0-1"), (data, True))
+        generate.assert_not_called()
+        self.assertEqual(AIGeneratedUnit.objects.filter(unit_type="LESSON", unit_key="0-1").count(), 2)
+
+    def test_assemble_merges_every_unit_in_one_save(self):
+        for unit_type, unit_key in (("MODULE", "0"), ("LESSON", "0-0"), ("LESSON", "1-2"), ("ASSESSMENT", "1")):
+            self._generate(self.draft, unit_type, unit_key)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(orchestrator.assemble_draft(self.draft.id), 4)
+        updates = [q["sql"] for q in queries.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+
+        self.draft.refresh_from_db()
+        self.assertEqual(set(self.draft.content["content"]), {"0"})
+        self.assertEqual(set(self.draft.content["lessons"]), {"0-0", "1-2"})
+        self.assertEqual([q["moduleIndex"] for q in self.draft.assessments["quizzes"]], [1])
+        self.assertTrue(self.draft.has_modules and self.draft.has_lessons and self.draft.has_assessments)
+
+    def test_merge_unit_keeps_other_units(self):
+        orchestrator.merge_unit_into_draft(self.draft.id, "LESSON", "0-0", {"title": "first"})
+        orchestrator.merge_unit_into_draft(self.draft.id, "LESSON", "0-1", {"title": "second"})
+        orchestrator.merge_unit_into_draft(self.draft.id, "ASSESSMENT", "", {"moduleIndex": 0, "title": "old"})
+        orchestrator.merge_unit_into_draft(self.draft.id, "ASSESSMENT", "", {"moduleIndex": 0, "title": "new"})
+
+        self.draft.refresh_from_db()
+        self.assertEqual(set(self.draft.content["lessons"]), {"0-0", "0-1"})
+        self.assertEqual([q["title"] for q in self.draft.assessments["quizzes"]], ["new"])
+
+    def test_unit_batches_are_bounded_and_cover_every_unit(self):
+        batches = orchestrator.plan_unit_batches(self.draft.outline, concurrency=3)
+        self.assertEqual(len(batches), 3)
+        units = sorted(tuple(unit) for batch in batches for unit in batch)
+        self.assertEqual(len(units), 8)  # two modules of three lessons each
+        self.assertEqual(len(set(units)), 8)
+        self.assertLessEqual(max(map(len, batches)) - min(map(len, batches)), 1)
+
+        self.assertEqual(len(orchestrator.plan_unit_batches(self.draft.outline, concurrency=50)), 8)
+        self.assertEqual(orchestrator.plan_unit_batches({}), [])
+
+
+# Progress channel tests
+class InMemoryProgressBrokerTests(SimpleTestCase):
+    def setUp(self):
+        self.broker = InMemoryProgressBroker()
+
+    def test_snapshot_keeps_the_latest_event_per_task(self):
+        self.assertEqual(self.broker.snapshot(1), (0, {}))
+        self.broker.publish(1, "a", {"state": "PROGRESS"})
+        self.broker.publish(1, "b", {"state": "PROGRESS"})
+        self.assertEqual(self.broker.publish(1, "a", {"state": "SUCCESS"}), 3)
+
+        version, tasks = self.broker.snapshot(1)
+        self.assertEqual(version, 3)
+        self.assertEqual({k: (v["state"], v["version"]) for k, v in tasks.items()},
+                         {"a": ("SUCCESS", 3), "b": ("PROGRESS", 2)})
+        self.assertEqual(self.broker.snapshot(2), (0, {}))
+
+    def test_wait_returns_at_once_when_the_channel_is_ahead(self):
+        self.broker.publish(1, "a", {"state": "PROGRESS"})
+        started = time.monotonic()
+        self.assertEqual(self.broker.wait(1, 0, 5)[0], 1)
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_wait_times_out_without_events(self):
+        self.assertEqual(self.broker.wait(1, 0, 0.05), (0, {}))
+
+    def test_wait_wakes_on_publish(self):
+        timer = threading.Timer(0.05, self.broker.publish, (1, "a", {"state": "SUCCESS"}))
+        timer.start()
+        self.addCleanup(timer.cancel)
+        started = time.monotonic()
+        version, tasks = self.broker.wait(1, 0, 5)
+        self.assertEqual((version, tasks["a"]["state"]), (1, "SUCCESS"))
+        self.assertLess(time.monotonic() - started, 1)
+
+
+@override_settings(
+    AI_PROGRESS_BROKER="memory",
+    AI_PROGRESS_STREAM_MAX_SECONDS=0.2,
+    AI_PROGRESS_STREAM_MAX_CONNECTIONS=2,
+    AI_BUILDER_PROVIDER="ai_course_builder.providers.LocalStubProvider",
+)
+class ProgressEndpointTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.broker = get_broker()
+        self.broker.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.instructor = get_user_model().objects.create_user(
+                username="progressinstructor", email="progressinstructor@example.com", password="pass12345"
+            )
+            self.other = get_user_model().objects.create_user(
+                username="progressother", email="progressother@example.com", password="pass12345"
+            )
+        self.draft = AICourseBuilderDraft.objects.create(
+            instructor=self.instructor, title="Progress Course", description="Progress course",
+        )
+        self.url = f"/api/instructor/ai-course-builder/{self.draft.id}/progress/"
+        self.client = APIClient()
+        self.client.force_authenticate(self.instructor)
+
+    def _hold_slots(self, count):
+        for _ in range(count):
+            release = views._acquire_stream_slot()
+            self.assertIsNotNone(release)
+            self.addCleanup(release)
+
+    def test_first_poll_returns_a_snapshot_with_its_etag(self):
+        publish_task_event(self.draft.id, "outline", "PROGRESS", percent=10)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["ETag"], '"v1"')
+        self.assertEqual(response.json()["tasks"]["outline"]["progress"]["percent"], 10)
+        self.assertFalse(response.json()["done"])
+
+    def test_unchanged_etag_is_not_modified(self):
+        publish_task_event(self.draft.id, "outline", "SUCCESS", percent=100)
+
+        response = self.client.get(self.url, {"wait": 0}, HTTP_IF_NONE_MATCH='W/"v1"')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], '"v1"')
+
+        response = self.client.get(self.url, {"since": 0}, HTTP_IF_NONE_MATCH='"v0"')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["done"])
+
+    def test_long_poll_returns_when_an_event_arrives(self):
+        timer = threading.Timer(0.05, publish_task_event, (self.draft.id, "outline", "PROGRESS"))
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+        response = self.client.get(self.url, {"wait": 5}, HTTP_IF_NONE_MATCH='"v0"')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["version"], 1)
+        self.assertEqual(views._open_streams, 0)
+
+    def test_saturated_long_poll_answers_without_waiting(self):
+        self._hold_slots(2)
+        with mock.patch.object(InMemoryProgressBroker, "wait") as wait:
+            response = self.client.get(self.url, {"wait": 25}, HTTP_IF_NONE_MATCH='"v0"')
+        wait.assert_not_called()
+        self.assertEqual(response.status_code, 304)
+
+    def test_other_instructors_draft_is_not_found(self):
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.assertEqual(self.client.get(f"{self.url}stream/").status_code, 404)
+
+    def test_stream_sends_events_after_last_event_id_and_frees_its_slot(self):
+        for state in ("PENDING", "PROGRESS", "SUCCESS"):
+            publish_task_event(self.draft.id, f"task-{state}", state)
+
+        response = self.client.get(f"{self.url}stream/", HTTP_LAST_EVENT_ID="1")
+        self.assertEqual(views._open_streams, 1)
+        body = b"".join(response.streaming_content).decode()
+        response.close()
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertTrue(body.startswith("retry: 3000"))
+        self.assertEqual(re.findall(r"^id: (\d+)$", body, re.M), ["2", "3"])
+        self.assertEqual(views._open_streams, 0)
+
+    def test_stream_cap_answers_503_with_fallback(self):
+        self._hold_slots(2)
+        response = self.client.get(f"{self.url}stream/", HTTP_ACCEPT="application/json")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "5")
+        self.assertEqual(response.json()["fallback"], "progress")
+
+    def test_tasks_publish_progress_and_completion(self):
+        result = generate_course_outline_task.delay(self.draft.id)
+
+        version, tasks = self.broker.snapshot(self.draft.id)
+        event = tasks[result.id]
+        self.assertEqual(event["state"], "SUCCESS")
+        self.assertEqual(event["result"]["status"], "success")
+        # Four progress updates, then the success event
+        self.assertEqual(version, 5)
+
+
+# Draft finalization tests
+class DraftFinalizerTests(TestCase):
+    def setUp(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.instructor = get_user_model().objects.create_user(
+                username="finalizeinstructor", email="finalizeinstructor@example.com", password="pass12345"
+            )
+
+    def _draft(self, modules):
+        provider = LocalStubProvider()
+        outline = {"modules": provider.generate_outline({"title": "Final"})["modules"] * (modules // 2)}
+        lessons, quizzes = {}, []
+        for i, module in enumerate(outline["modules"]):
+            quizzes.append(provider.generate_assessment({"module": module, "module_index": i}))
+            for j, lesson in enumerate(module["lessons"]):
+                lessons[f"{i}-{j}"] = provider.generate_lesson({"lesson": lesson})
+        return AICourseBuilderDraft.objects.create(
+            instructor=self.instructor, title=f"Finalized Course {modules}", description="Finalized course",
+            outline=outline, content={"lessons": lessons}, assessments={"quizzes": quizzes},
+            has_outline=True, has_lessons=True, has_assessments=True,
+        )
+
+    def _finalize(self, draft):
+        with self.captureOnCommitCallbacks(execute=True):
+            return DraftFinalizer(draft).run()
+
+    def test_finalize_creates_the_course_tree(self):
+        draft = self._draft(modules=2)
+        course = self._finalize(draft)
+
+        self.assertTrue(course.is_published)
+        self.assertTrue(CourseInstructor.objects.filter(course=course, instructor=self.instructor, is_lead=True).exists())
+        modules = list(Module.objects.filter(course=course).order_by("order"))
+        self.assertEqual([m.duration_minutes for m in modules], [45, 45])
+        self.assertEqual(course.duration_minutes, 90)
+        lessons = Lesson.objects.filter(module__course=course)
+        self.assertEqual(lessons.count(), 6)
+        self.assertEqual(
+            set(lessons.filter(has_assessment=True).values_list("title", flat=True)),
+            {"Practical Application", "Hands-on Exercise"},
+        )
+        self.assertEqual(lessons.get(title="Hands-on Exercise").type, "lab_exercise")
+        self.assertEqual(Question.objects.filter(assessment__lesson__module__course=course).count(), 10)
+        answers = Answer.objects.filter(question__assessment__lesson__module__course=course)
+        self.assertEqual((answers.count(), answers.filter(is_correct=True).count()), (40, 10))
+        draft.refresh_from_db()
+        self.assertEqual(draft.status, "PUBLISHED")
+
+    def test_query_count_does_not_grow_with_the_draft(self):
+        # The first course created in a process loads content types and the like
+        self._finalize(self._draft(modules=2))
+        for modules in (2, 4):
+            draft = self._draft(modules=modules)
+            with self.subTest(modules=modules), self.assertNumQueries(FINALIZE_QUERIES):
+                self._finalize(draft)
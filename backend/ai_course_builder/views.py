@@ -7,32 +7,42 @@ AI-assisted course generation operations.
 
 Classes:
 - AICourseBuilderHealthView: Simple health check endpoint
+- EventStreamRenderer: Lets DRF negotiate text/event-stream responses
 - AICourseBuilderDraftViewSet: Main viewset for draft management
 """
 
+import json
+import threading
+import time
+
 from celery.result import AsyncResult
-from courses.models import Assessment, Course, Lesson, Module, Question
 from courses.serializers import CourseSerializer
 from courses.serializers.utils import HealthCheckSerializer
+from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import connection
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
-from instructor_portal.models import CourseInstructor
+from instructor_portal.course_package import CoursePackageError
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.renderers import BaseRenderer, JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .finalization import DraftFinalizer
 from .models import AICourseBuilderDraft
+from .progress import TERMINAL_STATES, get_broker
 from .serializers import AICourseBuilderDraftSerializer
 from .tasks import (
     generate_assessments_task,
     generate_course_outline_task,
     generate_lesson_content_task,
     generate_module_content_task,
+    run_generation_pipeline_task,
 )
 
 
@@ -57,6 +67,78 @@ class AICourseBuilderHealthView(APIView):
         )
 
 
+class EventStreamRenderer(BaseRenderer):
+    """
+    Renderer for Server-Sent Events.
+
+    The stream itself is written by a StreamingHttpResponse; this renderer only
+    lets content negotiation accept ``text/event-stream`` and renders error
+    responses as JSON.
+    """
+
+    media_type = "text/event-stream"
+    format = "event-stream"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data).encode(self.charset)
+
+
+def _sse_event(version, event):
+    """Format one progress event as an SSE message"""
+    return f"id: {version}\nevent: progress\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+_open_streams = 0
+_streams_lock = threading.Lock()
+
+
+def _acquire_stream_slot():
+    """
+    Take one of this process's AI_PROGRESS_STREAM_MAX_CONNECTIONS slots for
+    a held request (an SSE stream or a waiting long-poll); returns a release
+    function, or None when all are taken.
+    """
+    global _open_streams
+    with _streams_lock:
+        if _open_streams >= getattr(settings, "AI_PROGRESS_STREAM_MAX_CONNECTIONS", 20):
+            return None
+        _open_streams += 1
+
+    released = threading.Event()
+
+    def release():
+        global _open_streams
+        with _streams_lock:
+            if not released.is_set():
+                released.set()
+                _open_streams -= 1
+
+    return release
+
+
+class _SlotStream:
+    """Stream iterator that gives its slot back when the response is closed"""
+
+    def __init__(self, events, release):
+        self.events = events
+        self.release = release
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.events)
+
+    def close(self):
+        # Called by the server when the client disconnects or the stream ends,
+        # also for a stream that was never iterated
+        try:
+            self.events.close()
+        finally:
+            self.release()
+
+
 class AICourseBuilderDraftViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing AI Course Builder drafts.
@@ -72,7 +154,10 @@ class AICourseBuilderDraftViewSet(viewsets.ModelViewSet):
     - module: Generate content for a specific module (async)
     - lesson: Generate content for a specific lesson (async)
     - assessments: Generate assessments for the course (async)
+    - generate: Generate the whole course as a parallel pipeline (async)
     - task_status: Check the status of an async task
+    - progress: Long-poll the draft's task progress (ETag aware)
+    - progress_stream: Server-Sent Events stream of task progress
     """
 
     serializer_class = AICourseBuilderDraftSerializer
@@ -193,6 +278,7 @@ class AICourseBuilderDraftViewSet(viewsets.ModelViewSet):
                 "message": "Course outline generation started",
                 "taskId": task.id,
                 "pollUrl": f"/api/instructor/ai-course-builder/{draft.id}/task-status/{task.id}/",
+                "streamUrl": f"/api/instructor/ai-course-builder/{draft.id}/progress/stream/",
             },
             status=status.HTTP_202_ACCEPTED,
         )
@@ -267,6 +353,7 @@ class AICourseBuilderDraftViewSet(viewsets.ModelViewSet):
                 "taskId": task.id,
                 "moduleIndex": module_index,
                 "pollUrl": f"/api/instructor/ai-course-builder/{draft.id}/task-status/{task.id}/",
+                "streamUrl": f"/api/instructor/ai-course-builder/{draft.id}/progress/stream/",
             },
             status=status.HTTP_202_ACCEPTED,
         )
@@ -346,6 +433,7 @@ class AICourseBuilderDraftViewSet(viewsets.ModelViewSet):
                 "moduleIndex": module_index,
                 "lessonIndex": lesson_index,
                 "pollUrl": f"/api/instructor/ai-course-builder/{draft.id}/task-status/{task.id}/",
+                "streamUrl": f"/api/instructor/ai-course-builder/{draft.id}/progress/stream/",
             },
             status=status.HTTP_202_ACCEPTED,
         )
@@ -388,6 +476,55 @@ class AICourseBuilderDraftViewSet(viewsets.ModelViewSet):
                 "message": "Assessment generation started",
                 "taskId": task.id,
                 "pollUrl": f"/api/instructor/ai-course-builder/{draft.id}/task-status/{task.id}/",
+                "streamUrl": f"/api/instructor/ai-course-builder/{draft.id}/progress/stream/",
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+    @action(detail=True, methods=["post"])
+    def generate(self, request, id=None):
+        """
+        Generate the complete course (outline, modules, lessons, assessments).
+
+        Module and lesson generation fan out as a Celery chord of bounded
+        batches; the callback assembles the draft once all batches finish.
+
+        Request Parameters:
+            courseInfo (dict, optional): Course information for the outline
+            concurrency (int, optional): Maximum parallel generation batches
+
+        Returns:
+            Response with the task ID for the pipeline
+        """
+        draft = self.get_object()
+
+        concurrency = request.data.get("concurrency")
+        if concurrency is not None:
+            try:
+                concurrency = max(1, int(concurrency))
+            except (TypeError, ValueError):
+                return Response(
+                    {"status": "error", "message": "Concurrency must be an integer"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        task = run_generation_pipeline_task.delay(
+            draft.id, request.data.get("courseInfo") or None, concurrency
+        )
+
+        if not draft.generation_metadata:
+            draft.generation_metadata = {}
+
+        draft.generation_metadata["pipeline_task_id"] = task.id
+        draft.save(update_fields=["generation_metadata"])
+
+        return Response(
+            {
+                "status": "pending",
+                "message": "Course generation pipeline started",
+                "taskId": task.id,
+                "pollUrl": f"/api/instructor/ai-course-builder/{draft.id}/task-status/{task.id}/",
+                "streamUrl": f"/api/instructor/ai-course-builder/{draft.id}/progress/stream/",
             },
             status=status.HTTP_202_ACCEPTED,
         )
@@ -424,6 +561,8 @@ class AICourseBuilderDraftViewSet(viewsets.ModelViewSet):
         task_locations = [
             draft.generation_metadata.get("outline_task_id"),
             draft.generation_metadata.get("assessments_task_id"),
+            draft.generation_metadata.get("pipeline_task_id"),
+            draft.generation_metadata.get("pipeline", {}).get("chord_id"),
         ]
 
         # Check module tasks
@@ -484,6 +623,158 @@ class AICourseBuilderDraftViewSet(viewsets.ModelViewSet):
                 {"status": "pending", "state": task_result.state, "progress": progress}
             )
 
+    def _get_owned_draft_id(self, id):
+        """Return the draft ID if it belongs to the user, without loading its documents"""
+        return get_object_or_404(self.get_queryset().only("id"), id=id).id
+
+    @staticmethod
+    def _parse_version(value):
+        try:
+            return max(0, int(str(value).strip().removeprefix("W/").strip("\"").lstrip("v")))
+        except (TypeError, ValueError):
+            return None
+
+    @action(detail=True, methods=["get"])
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("id", OpenApiTypes.INT, location=OpenApiParameter.PATH),
+            OpenApiParameter("since", OpenApiTypes.INT, location=OpenApiParameter.QUERY),
+            OpenApiParameter("wait", OpenApiTypes.INT, location=OpenApiParameter.QUERY),
+        ],
+        responses={200: OpenApiTypes.OBJECT, 304: None},
+    )
+    def progress(self, request, id=None):
+        """
+        Long-poll the progress of every task of this draft.
+
+        Returns immediately when the channel has changed since the version in
+        ``since`` (or in If-None-Match), otherwise waits up to ``wait``
+        seconds for the next event. Responds 304 if nothing changed.
+
+        A waiting request holds a worker like an open stream and takes a slot
+        from the same AI_PROGRESS_STREAM_MAX_CONNECTIONS pool. When every
+        slot is taken it answers at once and the client polls again.
+        """
+        draft_id = self._get_owned_draft_id(id)
+
+        since = self._parse_version(request.query_params.get("since"))
+        etag_version = self._parse_version(request.headers.get("If-None-Match"))
+        if since is None:
+            since = etag_version
+
+        max_wait = getattr(settings, "AI_PROGRESS_LONG_POLL_TIMEOUT", 25)
+        try:
+            wait = min(max(0, int(request.query_params.get("wait", max_wait))), max_wait)
+        except (TypeError, ValueError):
+            wait = max_wait
+
+        broker = get_broker()
+        release = _acquire_stream_slot() if since is not None and wait else None
+        if release is None:
+            version, tasks = broker.snapshot(draft_id)
+        else:
+            try:
+                version, tasks = broker.wait(draft_id, since, wait)
+            finally:
+                release()
+
+        etag = f'"v{version}"'
+        if etag_version is not None and etag_version == version:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(
+                {
+                    "draftId": draft_id,
+                    "version": version,
+                    "tasks": tasks,
+                    "done": bool(tasks)
+                    and all(t.get("state") in TERMINAL_STATES for t in tasks.values()),
+                }
+            )
+        response["ETag"] = etag
+        response["Cache-Control"] = "no-cache"
+        return response
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="progress/stream",
+        renderer_classes=[EventStreamRenderer, JSONRenderer],
+    )
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("id", OpenApiTypes.INT, location=OpenApiParameter.PATH),
+        ],
+        responses={(200, "text/event-stream"): OpenApiTypes.STR},
+    )
+    def progress_stream(self, request, id=None):
+        """
+        Stream task progress for this draft as Server-Sent Events.
+
+        The stream starts with every event newer than Last-Event-ID (all
+        events on first connect), then pushes each new event as it is
+        published. Connections close after AI_PROGRESS_STREAM_MAX_SECONDS;
+        EventSource reconnects and resumes from the last event ID.
+
+        Every open stream holds a worker thread (or greenlet) for its whole
+        lifetime. Serve this endpoint from async-capable workers (gunicorn
+        with gevent, or ASGI); under sync or gthread workers, keep
+        AI_PROGRESS_STREAM_MAX_CONNECTIONS below the threads per process.
+        Past that cap the endpoint answers 503 with Retry-After, and clients
+        fall back to the progress long-poll.
+        """
+        draft_id = self._get_owned_draft_id(id)
+        since = self._parse_version(
+            request.headers.get("Last-Event-ID") or request.query_params.get("lastEventId")
+        ) or 0
+
+        # The stream never touches the database; don't hold a connection open
+        if not connection.in_atomic_block:
+            connection.close()
+
+        broker = get_broker()
+        max_seconds = getattr(settings, "AI_PROGRESS_STREAM_MAX_SECONDS", 300)
+        heartbeat = 15
+
+        release = _acquire_stream_slot()
+        if release is None:
+            response = Response(
+                {
+                    "error": "Too many open progress streams",
+                    "fallback": "progress",
+                },
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+            response["Retry-After"] = "5"
+            return response
+
+        def stream():
+            deadline = time.monotonic() + max_seconds
+            last_version = since
+            yield "retry: 3000\n\n"
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                version, tasks = broker.wait(draft_id, last_version, min(heartbeat, remaining))
+                if version <= last_version:
+                    yield ": keepalive\n\n"
+                    continue
+                events = sorted(
+                    (e for e in tasks.values() if e.get("version", 0) > last_version),
+                    key=lambda e: e["version"],
+                )
+                for event in events:
+                    yield _sse_event(event["version"], event)
+                last_version = version
+
+        response = StreamingHttpResponse(
+            _SlotStream(stream(), release), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
     @action(detail=True, methods=["post"])
     def finalize(self, request, id=None):
         """
@@ -523,90 +814,22 @@ class AICourseBuilderDraftViewSet(viewsets.ModelViewSet):
             )
 
         try:
-            # Use a transaction to ensure all-or-nothing creation
-            with transaction.atomic():
-                # Create the course
-                course = Course.objects.create(
-                    title=draft.title,
-                    description=draft.description,
-                    price=draft.price or 0.00,
-                    duration_minutes=draft.duration_minutes or 0,
-                    level=draft.difficulty_level or "all_levels",
-                    is_published=True,
-                )
-
-                # Add the instructor
-                CourseInstructor.objects.create(
-                    course=course, instructor=draft.instructor, is_lead=True
-                )
+            # Modules, lessons and quizzes are inserted set-wise in one transaction
+            course = DraftFinalizer(draft).run()
 
-                # Create modules and lessons
-                for i, module_data in enumerate(draft.outline.get("modules", [])):
-                    module = Module.objects.create(
-                        course=course,
-                        title=module_data.get("title", f"Module {i+1}"),
-                        description=module_data.get("description", ""),
-                        order=i + 1,
-                    )
-
-                    # Create lessons for this module
-                    for j, lesson_info in enumerate(module_data.get("lessons", [])):
-                        # Get detailed lesson content if available
-                        lesson_key = f"{i}-{j}"
-                        lesson_content = draft.content.get("lessons", {}).get(
-                            lesson_key, {"content": ""}
-                        )
-
-                        lesson = Lesson.objects.create(
-                            module=module,
-                            title=lesson_info.get("title", f"Lesson {j+1}"),
-                            content=lesson_content.get("content", ""),
-                            type=lesson_info.get("type", "reading"),
-                            order=j + 1,
-                        )
-
-                        # Create assessment if this module has one in the draft
-                        if draft.has_assessments and draft.assessments.get("quizzes"):
-                            for quiz in draft.assessments["quizzes"]:
-                                if quiz.get("moduleIndex") == i:
-                                    assessment = Assessment.objects.create(
-                                        lesson=lesson,
-                                        title=quiz.get(
-                                            "title", f"Quiz for {lesson.title}"
-                                        ),
-                                        passing_score=70,
-                                    )
-
-                                    # Create questions for this assessment
-                                    for q_idx, q_data in enumerate(
-                                        quiz.get("questions", [])
-                                    ):
-                                        Question.objects.create(
-                                            assessment=assessment,
-                                            question_text=q_data.get(
-                                                "question", f"Question {q_idx+1}"
-                                            ),
-                                            question_type="multiple_choice",
-                                            order=q_idx + 1,
-                                        )
-
-                # Update the draft status
-                draft.status = "PUBLISHED"
-                draft.save()
-
-                # Return the new course details
-                course_data = CourseSerializer(course).data
+            # Return the new course details
+            course_data = CourseSerializer(course).data
 
-                return Response(
-                    {
-                        "status": "success",
-                        "message": "Course published successfully",
-                        "courseId": course.id,
-                        "course": course_data,
-                    }
-                )
+            return Response(
+                {
+                    "status": "success",
+                    "message": "Course published successfully",
+                    "courseId": course.id,
+                    "course": course_data,
+                }
+            )
 
-        except ValidationError as e:
+        except (ValidationError, CoursePackageError) as e:
             return Response(
                 {
                     "status": "error",
@@ -17,9 +17,10 @@ router = DefaultRouter()
 router.register(r'testimonials', views.TestimonialViewSet)
 
 urlpatterns = [
-    path('', include(router.urls)),
+    # Before the router, or testimonials/<pk>/ captures "featured"
     path('testimonials/featured/', views.FeaturedTestimonialsView.as_view(),
          name='featured-testimonials'),
+    path('', include(router.urls)),
     path('statistics/platform/', views.platform_statistics,
          name='platform-statistics'),
     path('statistics/user/learning/', views.user_learning_statistics,
@@ -21,6 +21,8 @@ from django.utils.html import escape, format_html
 from django.utils.safestring import mark_safe
 from instructor_portal.models import CourseInstructor
 
+from educore import audit
+
 from .constants import AccessLevel, CourseLevel, EnrollmentStatus, LessonType
 from .models import (
     Answer,
@@ -68,27 +70,18 @@ def audit_admin_action(
 ):
     """
     Comprehensive audit logging for admin actions
-    ADDED: Security audit trail for admin operations
+    ENHANCED: One buffered audit event per object, so bulk actions are
+    queryable by object and cost no I/O on the request thread
     """
-    try:
-        log_entry = {
-            "timestamp": timezone.now().isoformat(),
-            "user_id": request.user.id if request.user.is_authenticated else None,
-            "username": (
-                request.user.username if request.user.is_authenticated else "anonymous"
-            ),
-            "action": action,
-            "model": model_name,
-            "object_ids": object_ids or [],
-            "ip_address": request.META.get("REMOTE_ADDR"),
-            "user_agent": request.META.get("HTTP_USER_AGENT", "")[:200],
-            "metadata": metadata or {},
-        }
-
-        logger.info(f"ADMIN_AUDIT: {action} on {model_name} by {request.user.username}")
-
-    except Exception as e:
-        logger.error(f"Failed to create admin audit log: {e}")
+    audit.record_many(
+        action,
+        object_ids,
+        source="admin",
+        actor=request.user,
+        object_type=model_name,
+        request=request,
+        metadata=metadata,
+    )
 
 
 def validate_admin_permission(
@@ -9,7 +9,7 @@
 # Last Modified By: sujibeautysalon
 # Last Modified: 2025-06-18 15:52:17 UTC
 # User: sujibeautysalon
-# Version: 2.0.1
+# Version: 2.1.0
 #
 # Production-Ready Django App Configuration for Course Management System
 #
@@ -17,6 +17,11 @@
 # three code reviews including security enhancements, signal handling, error
 # handling, monitoring setup, production-ready initialization, and Windows compatibility.
 #
+# Version 2.1.0 Changes:
+# - CHANGED: Database, migration, cache and monitoring checks moved out of
+#   ready() into deferred, time-budgeted probes (courses/startup_checks.py)
+# - ADDED: COURSES_STARTUP_CHECKS_MODE ("deferred", "eager", "off")
+#
 # Version 2.0.1 Changes:
 # - FIXED: Windows compatibility for resource module import
 # - ENHANCED: Cross-platform memory monitoring with fallback implementations
@@ -32,7 +37,6 @@ from django.apps import AppConfig
 from django.conf import settings
 from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
-from django.db import connection
 from django.utils import timezone
 
 # Platform-specific imports with fallback handling
@@ -56,7 +60,7 @@ logger = logging.getLogger(__name__)
 # App constants
 APP_NAME = "courses"
 APP_VERBOSE_NAME = "Course Management System"
-APP_VERSION = "2.0.1"
+APP_VERSION = "2.1.0"
 
 # Platform detection
 IS_WINDOWS = platform.system().lower() == "windows"
@@ -125,24 +129,19 @@ class CoursesConfig(AppConfig):
             # Setup signal handlers
             self._setup_signal_handlers()
 
-            # Initialize monitoring
-            self._initialize_monitoring()
-
-            # Validate database connections
-            self._validate_database_connections()
-
-            # Setup caching
-            self._setup_caching()
-
             # Register custom checks
             self._register_system_checks()
 
-            # Initialize performance monitoring with cross-platform support
-            self._initialize_performance_monitoring()
+            # Connection budget check and transaction-pooling audit
+            self._configure_database_connections()
 
             # Validate permissions and security
             self._validate_security_configuration()
 
+            # Database, cache and monitoring probes touch external services and
+            # run once per deployment (see startup_checks.py), not in every process
+            self._schedule_startup_checks()
+
             # Mark as ready
             self.health_status = "ready"
 
@@ -273,6 +272,27 @@ class CoursesConfig(AppConfig):
             logger.error(f"Error setting up signal handlers: {e}")
             # Don't raise - signal handlers are not critical for basic functionality
 
+    def _schedule_startup_checks(self):
+        """
+        Run startup probes now only in eager mode; otherwise they run on first use
+        ADDED: Deferred startup checks
+        """
+        from . import startup_checks
+
+        mode = startup_checks.get_mode()
+        if mode == startup_checks.MODE_EAGER:
+            report = startup_checks.run_startup_checks()
+            if report["status"] == "unhealthy":
+                self.initialization_errors.append("startup checks failed")
+        logger.debug(f"Startup checks mode: {mode}")
+
+    def initialize_monitoring(self):
+        """
+        Initialize monitoring counters in the cache (run by the "monitoring" startup probe)
+        """
+        self._initialize_monitoring()
+        self._initialize_performance_monitoring()
+
     def _initialize_monitoring(self):
         """
         Initialize comprehensive monitoring and health checks with cross-platform support
@@ -422,90 +442,6 @@ class CoursesConfig(AppConfig):
         else:
             return "unavailable"
 
-    def _validate_database_connections(self):
-        """
-        Validate database connections and migration status
-        ADDED: Database connection validation
-        """
-        try:
-            # Test database connection
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
-                result = cursor.fetchone()
-                if result[0] != 1:
-                    raise Exception("Database connection test failed")
-
-            # Check if migrations are up to date
-            from django.db.migrations.executor import MigrationExecutor
-
-            executor = MigrationExecutor(connection)
-
-            # Get pending migrations
-            pending_migrations = executor.migration_plan(
-                executor.loader.graph.leaf_nodes()
-            )
-
-            if pending_migrations:
-                migration_names = [
-                    f"{migration[0]}.{migration[1]}" for migration in pending_migrations
-                ]
-                logger.warning(f"Pending migrations detected: {migration_names}")
-            else:
-                logger.debug("All migrations are up to date")
-
-            # Update health status
-            health_status = cache.get(f"{APP_NAME}_health_status", {})
-            health_status["database_status"] = "connected"
-            cache.set(f"{APP_NAME}_health_status", health_status, timeout=300)
-
-            logger.debug("Database connection validation completed")
-
-        except Exception as e:
-            logger.error(f"Database validation failed: {e}")
-
-            # Update health status with error
-            health_status = cache.get(f"{APP_NAME}_health_status", {})
-            health_status["database_status"] = f"error: {str(e)}"
-            cache.set(f"{APP_NAME}_health_status", health_status, timeout=300)
-
-            raise
-
-    def _setup_caching(self):
-        """
-        Setup and validate caching configuration
-        ADDED: Caching setup and validation
-        """
-        try:
-            # Test cache connection
-            test_key = f"{APP_NAME}_cache_test"
-            test_value = "cache_test_value"
-
-            cache.set(test_key, test_value, timeout=60)
-            retrieved_value = cache.get(test_key)
-
-            if retrieved_value != test_value:
-                raise Exception("Cache test failed - values don't match")
-
-            # Clean up test key
-            cache.delete(test_key)
-
-            # Update health status
-            health_status = cache.get(f"{APP_NAME}_health_status", {})
-            health_status["cache_status"] = "connected"
-            cache.set(f"{APP_NAME}_health_status", health_status, timeout=300)
-
-            logger.debug("Cache setup and validation completed")
-
-        except Exception as e:
-            logger.error(f"Cache setup failed: {e}")
-
-            # Update health status with error
-            health_status = cache.get(f"{APP_NAME}_health_status", {})
-            health_status["cache_status"] = f"error: {str(e)}"
-            cache.set(f"{APP_NAME}_health_status", health_status, timeout=300)
-
-            # Cache failure is not critical - continue without caching
-
     def _register_system_checks(self):
         """
         Register custom Django system checks
@@ -533,6 +469,18 @@ class CoursesConfig(AppConfig):
         except Exception as e:
             logger.error(f"System checks registration failed: {e}")
 
+    def _configure_database_connections(self):
+        """
+        Register the connection budget check and, with DB_POOL_AUDIT on,
+        the transaction-pooling audit (educore/db_pool.py)
+        """
+        try:
+            from educore import db_pool
+
+            db_pool.install()
+        except Exception as e:
+            logger.error(f"Database connection management setup failed: {e}")
+
     def _initialize_performance_monitoring(self):
         """
         Initialize advanced performance monitoring with cross-platform support
@@ -627,8 +575,23 @@ class CoursesConfig(AppConfig):
         ENHANCED: Platform-aware health status reporting
         """
         try:
+            from .startup_checks import get_startup_report
+
             health_status = cache.get(f"{APP_NAME}_health_status", {})
 
+            # Probe results are shared per deployment; started on first use
+            report = get_startup_report()
+            if report:
+                checks = report["checks"]
+                for component in ("database", "cache"):
+                    if component in checks:
+                        health_status[f"{component}_status"] = (
+                            "connected"
+                            if checks[component]["status"] == "ok"
+                            else f"{checks[component]['status']}: {checks[component]['detail']}"
+                        )
+                health_status["startup_checks"] = report
+
             # Add current timestamp and platform information
             health_status.update(
                 {
@@ -0,0 +1,32 @@
+#
+# File Path: backend/courses/benchmarks/__init__.py
+# Folder Path: backend/courses/benchmarks/
+# Date Created: 2026-10-18 00:00:00
+# Version: 1.0.0
+#
+# Benchmark harness: seeded dataset generator, scenario runner, result
+# comparison and the query-count regression check. Driven by the
+# seed_benchmark_data, run_benchmarks, compare_benchmarks and
+# check_query_counts management commands.
+
+from .datasets import SCALES, DatasetGenerator, Scale, purge_dataset
+from .query_counts import QueryCountHarness, check_budgets, discover_cases
+from .results import build_result, compare_results, load_result, write_result
+from .scenarios import SCENARIOS, Scenario, ScenarioRunner
+
+__all__ = [
+    "SCALES",
+    "Scale",
+    "DatasetGenerator",
+    "purge_dataset",
+    "SCENARIOS",
+    "Scenario",
+    "ScenarioRunner",
+    "build_result",
+    "compare_results",
+    "load_result",
+    "write_result",
+    "QueryCountHarness",
+    "check_budgets",
+    "discover_cases",
+]
@@ -0,0 +1,396 @@
+#
+# File Path: backend/courses/benchmarks/datasets.py
+# Folder Path: backend/courses/benchmarks/
+# Date Created: 2026-10-18 00:00:00
+# Version: 1.0.0
+#
+# Deterministic, production-shaped benchmark datasets
+#
+# DatasetGenerator writes users, instructors, administrators, categories,
+# courses, modules, lessons, assessments, enrollments, progress, assessment
+# attempts and reviews with bulk_create. Every value comes from
+# random.Random(seed), so the same scale and seed always produce the same
+# rows (auto timestamps excepted), and every row is tagged with a
+# "bench-<seed>" prefix so a dataset can be purged without touching real
+# data.
+#
+# bulk_create sends no post_save signals: enrollments get no automatic
+# Progress rows, analytics handlers do not run, and denormalized course
+# counters are recomputed once at the end with set-based UPDATEs. Category
+# closure links are inserted explicitly for the same reason.
+
+import logging
+import random
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from typing import Dict, List, Union
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Avg, Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from courses.models import (
+    Assessment,
+    AssessmentAttempt,
+    Category,
+    CategoryClosure,
+    Course,
+    Enrollment,
+    Lesson,
+    Module,
+    Progress,
+    Review,
+)
+from instructor_portal.models import CourseInstructor, InstructorProfile
+from users.models import Profile, Subscription
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_PASSWORD = "benchmark-password"
+BASE_TIME = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+
+LEVELS = ["beginner", "intermediate", "advanced", "all_levels"]
+LESSON_TYPES = ["video", "reading", "interactive", "quiz", "lab_exercise"]
+ACCESS_LEVELS = ["guest", "registered", "registered", "premium"]
+ENROLLMENT_STATUSES = ["active"] * 6 + ["completed"] * 3 + ["dropped"]
+
+
+@dataclass(frozen=True)
+class Scale:
+    """Row counts for a benchmark dataset"""
+
+    students: int
+    instructors: int
+    categories: int
+    courses: int
+    modules_per_course: int
+    lessons_per_module: int
+    enrollments_per_student: int
+    progress_ratio: float  # share of a course's lessons with a Progress row
+    attempt_ratio: float  # share of enrollments with an assessment attempt
+    review_ratio: float  # share of enrollments with a review
+    published_ratio: float = 0.9  # share of courses that are published
+    featured_ratio: float = 0.05  # share of courses that are featured
+    admins: int = 0  # platform administrators
+
+
+SCALES: Dict[str, Scale] = {
+    "tiny": Scale(50, 5, 4, 20, 3, 4, 3, 0.5, 0.3, 0.2),
+    "small": Scale(1_000, 50, 12, 500, 4, 5, 4, 0.5, 0.3, 0.2),
+    "medium": Scale(5_000, 200, 20, 2_000, 5, 6, 5, 0.4, 0.3, 0.15),
+    # ~10k courses, ~100k enrollments, ~1M progress rows
+    "large": Scale(20_000, 500, 30, 10_000, 5, 6, 5, 0.33, 0.3, 0.1),
+}
+
+
+def dataset_prefix(seed: int) -> str:
+    return f"bench-{seed}"
+
+
+class DatasetGenerator:
+    """
+    Generate a benchmark dataset for ``scale`` (a preset name or a Scale) with ``seed``.
+
+    ``run`` inserts everything in one transaction and returns row counts.
+    Generating the same seed twice fails on unique slugs; purge first.
+    """
+
+    def __init__(self, scale: Union[str, Scale] = "small", seed: int = 42, batch_size: int = 2000):
+        if isinstance(scale, Scale):
+            self.scale_name, self.scale = "custom", scale
+        elif scale in SCALES:
+            self.scale_name, self.scale = scale, SCALES[scale]
+        else:
+            raise ValueError(f"Unknown scale '{scale}', expected one of {sorted(SCALES)}")
+        self.seed = seed
+        self.batch_size = batch_size
+        self.prefix = dataset_prefix(seed)
+        self.rng = random.Random(seed)
+        self.counts: Dict[str, int] = {}
+
+    def _insert(self, model, objs: List, key: str = None):
+        created = model.objects.bulk_create(objs, batch_size=self.batch_size)
+        key = key or model._meta.model_name
+        self.counts[key] = self.counts.get(key, 0) + len(created)
+        return created
+
+    def _time(self, max_days: int = 365) -> datetime:
+        return BASE_TIME + timedelta(seconds=self.rng.randrange(max_days * 86400))
+
+    # ====================================
+    # PEOPLE
+    # ====================================
+
+    def _create_users(self, role: str, count: int):
+        User = get_user_model()
+        password = make_password(BENCHMARK_PASSWORD)
+        users = self._insert(User, [
+            User(
+                username=f"{self.prefix}-{role}-{i}",
+                email=f"{self.prefix}-{role}-{i}@benchmark.invalid",
+                password=password,
+                first_name=role.title(),
+                last_name=str(i),
+                role=role,
+                is_active=True,
+                is_email_verified=True,
+            )
+            for i in range(count)
+        ], key=f"{role}s")
+        self._insert(Profile, [Profile(user=user) for user in users])
+        tiers = ["registered"] * 4 + ["premium"]
+        self._insert(Subscription, [
+            Subscription(user=user, tier=self.rng.choice(tiers), status="active")
+            for user in users
+        ])
+        return users
+
+    def _create_instructor_profiles(self, users):
+        return self._insert(InstructorProfile, [
+            InstructorProfile(
+                user=user,
+                display_name=f"Instructor {i}",
+                status=InstructorProfile.Status.ACTIVE,
+                tier=self.rng.choice(InstructorProfile.Tier.values),
+                is_verified=True,
+            )
+            for i, user in enumerate(users)
+        ])
+
+    # ====================================
+    # CATALOG
+    # ====================================
+
+    def _create_catalog(self, instructors):
+        scale = self.scale
+        categories = self._insert(Category, [
+            Category(
+                name=f"{self.prefix} Category {i}",
+                slug=f"{self.prefix}-category-{i}",
+                description=f"Benchmark category {i}",
+                sort_order=i,
+            )
+            for i in range(scale.categories)
+        ])
+        CategoryClosure.objects.insert_nodes(categories)
+
+        courses = self._insert(Course, [
+            Course(
+                title=f"Benchmark Course {i}",
+                slug=f"{self.prefix}-course-{i}",
+                subtitle=f"Subtitle for course {i}",
+                description=f"Description for benchmark course {i}. " * 5,
+                category=self.rng.choice(categories),
+                price=Decimal(self.rng.choice([0, 0, 19, 49, 99])),
+                level=self.rng.choice(LEVELS),
+                is_published=self.rng.random() < scale.published_ratio,
+                published_date=self._time(),
+                has_certificate=self.rng.random() < 0.5,
+                is_featured=self.rng.random() < scale.featured_ratio,
+                completion_status="published",
+                sort_order=i,
+            )
+            for i in range(scale.courses)
+        ])
+
+        self._insert(CourseInstructor, [
+            CourseInstructor(course=course, instructor=self.rng.choice(instructors), is_lead=True)
+            for course in courses
+        ])
+
+        modules = self._insert(Module, [
+            Module(
+                course=course,
+                title=f"Module {m + 1}",
+                description=f"Module {m + 1} of {course.title}",
+                order=m + 1,
+                is_published=course.is_published,
+            )
+            for course in courses
+            for m in range(scale.modules_per_course)
+        ])
+
+        lessons = self._insert(Lesson, [
+            Lesson(
+                module=module,
+                title=f"Lesson {l + 1}",
+                content=f"<p>Benchmark lesson {l + 1} content.</p>" * 10,
+                type=self.rng.choice(LESSON_TYPES),
+                access_level=self.rng.choice(ACCESS_LEVELS),
+                duration_minutes=self.rng.randint(3, 30),
+                order=l + 1,
+                has_assessment=l == scale.lessons_per_module - 1,
+                is_free_preview=l == 0,
+            )
+            for module in modules
+            for l in range(scale.lessons_per_module)
+        ])
+
+        # One quiz per module, on the module's last lesson
+        assessments = self._insert(Assessment, [
+            Assessment(lesson=lesson, title=f"Quiz for {lesson.module.title}", passing_score=70)
+            for lesson in lessons
+            if lesson.has_assessment
+        ])
+
+        lessons_by_course: Dict[int, List[Lesson]] = {}
+        for lesson in lessons:
+            lessons_by_course.setdefault(lesson.module.course_id, []).append(lesson)
+        assessments_by_course: Dict[int, List[Assessment]] = {}
+        for assessment in assessments:
+            assessments_by_course.setdefault(assessment.lesson.module.course_id, []).append(assessment)
+        return courses, lessons_by_course, assessments_by_course
+
+    # ====================================
+    # LEARNING ACTIVITY
+    # ====================================
+
+    def _create_activity(self, students, courses, lessons_by_course, assessments_by_course):
+        scale = self.scale
+        per_student = min(scale.enrollments_per_student, len(courses))
+
+        enrollments = []
+        for student in students:
+            for course in self.rng.sample(courses, per_student):
+                status = self.rng.choice(ENROLLMENT_STATUSES)
+                enrolled = self._time()
+                enrollments.append(Enrollment(
+                    user=student,
+                    course=course,
+                    status=status,
+                    enrolled_date=enrolled,
+                    last_accessed=enrolled + timedelta(days=self.rng.randint(0, 60)),
+                    completion_date=enrolled + timedelta(days=30) if status == "completed" else None,
+                    progress_percentage=100 if status == "completed" else self.rng.randint(0, 90),
+                    total_time_spent=self.rng.randint(0, 20000),
+                ))
+        enrollments = self._insert(Enrollment, enrollments)
+
+        progress, attempts, reviews = [], [], []
+        for enrollment in enrollments:
+            lessons = lessons_by_course[enrollment.course_id]
+            touched = max(1, int(len(lessons) * scale.progress_ratio))
+            done = touched if enrollment.status == "completed" else self.rng.randint(0, touched)
+            for position, lesson in enumerate(lessons[:touched]):
+                completed = position < done
+                progress.append(Progress(
+                    enrollment=enrollment,
+                    lesson=lesson,
+                    is_completed=completed,
+                    completed_date=enrollment.enrolled_date + timedelta(days=position) if completed else None,
+                    progress_percentage=100 if completed else self.rng.randint(0, 90),
+                    time_spent=self.rng.randint(60, 3600),
+                ))
+            if len(progress) >= self.batch_size:
+                self._insert(Progress, progress)
+                progress = []
+
+            if self.rng.random() < scale.attempt_ratio:
+                assessment = self.rng.choice(assessments_by_course[enrollment.course_id])
+                score = self.rng.randint(30, 100)
+                started = enrollment.enrolled_date + timedelta(days=self.rng.randint(1, 30))
+                attempts.append(AssessmentAttempt(
+                    user_id=enrollment.user_id,
+                    assessment=assessment,
+                    start_time=started,
+                    end_time=started + timedelta(minutes=self.rng.randint(5, 40)),
+                    score=score,
+                    max_score=100,
+                    is_completed=True,
+                    passed=score >= 70,
+                    is_passed=score >= 70,
+                    attempt_number=1,
+                ))
+
+            if self.rng.random() < scale.review_ratio:
+                reviews.append(Review(
+                    user_id=enrollment.user_id,
+                    course_id=enrollment.course_id,
+                    rating=self.rng.choices([1, 2, 3, 4, 5], weights=[1, 1, 3, 6, 8])[0],
+                    title="Benchmark review",
+                    content="Generated review text for benchmarking purposes.",
+                    is_verified_purchase=True,
+                    is_approved=True,
+                ))
+
+        if progress:
+            self._insert(Progress, progress)
+        self._insert(AssessmentAttempt, attempts)
+        self._insert(Review, reviews)
+
+    def _refresh_course_counters(self):
+        courses = Course.objects.filter(slug__startswith=f"{self.prefix}-")
+        enrolled = (
+            Enrollment.objects.filter(course=OuterRef("pk"))
+            .values("course").annotate(n=Count("id")).values("n")
+        )
+        reviewed = (
+            Review.objects.filter(course=OuterRef("pk"))
+            .values("course").annotate(n=Count("id")).values("n")
+        )
+        rating = (
+            Review.objects.filter(course=OuterRef("pk"))
+            .values("course").annotate(avg=Avg("rating")).values("avg")
+        )
+        courses.update(
+            enrolled_students_count=Coalesce(Subquery(enrolled, output_field=IntegerField()), 0),
+            total_reviews=Coalesce(Subquery(reviewed, output_field=IntegerField()), 0),
+            avg_rating=Coalesce(Subquery(rating), Decimal("0")),
+        )
+
+    def run(self) -> Dict[str, int]:
+        scale = self.scale
+        logger.info(f"Generating '{self.scale_name}' benchmark dataset with seed {self.seed}")
+        with transaction.atomic():
+            instructors = self._create_users("instructor", scale.instructors)
+            self._create_instructor_profiles(instructors)
+            students = self._create_users("student", scale.students)
+            if scale.admins:
+                self._create_users("admin", scale.admins)
+            courses, lessons_by_course, assessments_by_course = self._create_catalog(instructors)
+            self._create_activity(students, courses, lessons_by_course, assessments_by_course)
+            self._refresh_course_counters()
+        return dict(self.counts)
+
+    def describe(self) -> Dict:
+        return {"scale": self.scale_name, "seed": self.seed, **asdict(self.scale)}
+
+
+def purge_dataset(seed: int) -> Dict[str, int]:
+    """
+    Delete every row generated for ``seed``.
+
+    Generated activity and content rows are removed with plain DELETEs:
+    going through the collector would fire the per-row delete signals that
+    recompute ratings, durations and analytics for every review and lesson.
+    Courses, categories and users then go through the ORM so rows other code
+    attached to them during benchmark runs are cleaned up too.
+    """
+    prefix = f"{dataset_prefix(seed)}-"
+    in_dataset = {"course__slug__startswith": prefix}
+    deleted = {}
+    with transaction.atomic():
+        for model, lookup in (
+            (Progress, {"enrollment__course__slug__startswith": prefix}),
+            (AssessmentAttempt, {"assessment__lesson__module__course__slug__startswith": prefix}),
+            (Review, in_dataset),
+            (Enrollment, in_dataset),
+            (CourseInstructor, in_dataset),
+            (Assessment, {"lesson__module__course__slug__startswith": prefix}),
+            (Lesson, {"module__course__slug__startswith": prefix}),
+            (Module, in_dataset),
+        ):
+            queryset = model.objects.filter(**lookup)
+            deleted[model._meta.model_name] = queryset._raw_delete(queryset.db)
+
+        for model, lookup in (
+            (Course, {"slug__startswith": prefix}),
+            (Category, {"slug__startswith": prefix}),
+            (get_user_model(), {"username__startswith": prefix}),
+        ):
+            deleted[model._meta.model_name] = model.objects.filter(**lookup).delete()[0]
+    return deleted
@@ -0,0 +1,310 @@
+#
+# File Path: backend/courses/benchmarks/query_counts.py
+# Folder Path: backend/courses/benchmarks/
+# Date Created: 2026-10-18 00:00:00
+# Version: 1.0.0
+#
+# Query-count regression harness for every GET API endpoint
+#
+# The URL conf is walked with educore/utils/endpoint_extractor.py. Every GET
+# API endpoint is requested against two generated datasets in which every
+# relation (courses, modules per course, lessons per module, enrollments,
+# progress, reviews) is larger in the second one. An endpoint whose query
+# count differs between the two datasets issues O(n) queries.
+#
+# Results are checked against a budget file (query_budgets.json next to
+# this module) holding, per endpoint, the query counts and the response
+# status at both sizes:
+#
+# - an endpoint whose queries grow with rows fails
+# - an endpoint issuing more queries than its budget at either size fails
+# - an endpoint answering with another status than recorded fails, so a
+#   budget measured on an error response cannot pass silently
+# - an endpoint missing from the file fails until the file is regenerated
+#
+# Endpoints whose URL parameters cannot be filled from the fixtures are
+# reported as skipped. Endpoints listed in QUERY_PARAMS get the query string
+# they require, those in ADMIN_PATTERNS are requested as a platform admin.
+# Leaderboards are read from the in-memory backend, rebuilt from each
+# dataset. Each dataset is created inside a transaction that is rolled back,
+# so the harness can run against a test database or, with care, a
+# development one.
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from courses import leaderboards
+from courses.models import Category, Enrollment, Lesson, Module, Progress, Review
+
+from .datasets import DatasetGenerator, Scale, dataset_prefix
+from .scenarios import _QueryCounter
+
+BUDGET_FILE = os.path.join(os.path.dirname(__file__), "query_budgets.json")
+BUDGET_VERSION = 1
+
+# Rows per relation in the two datasets
+SMALL_SIZE = 2
+LARGE_SIZE = 4
+FIXTURE_SEED = 9_000_001
+
+# Endpoints that cannot be measured with a plain GET
+SKIP_PATTERNS = [
+    (re.compile(r"/progress/stream$"), "server-sent event stream"),
+    (re.compile(r"/social/"), "redirects to an external OAuth provider"),
+    (re.compile(r"/health(/|$)"), "health checks run probes, not queries on rows"),
+    (re.compile(r"^/api/debug/"), "debug endpoint"),
+    (re.compile(r"^/api/system/"), "system endpoint"),
+]
+
+# Query strings for endpoints that reject a bare GET
+QUERY_PARAMS = {
+    "/api/search/": "q=Benchmark",
+}
+
+# Endpoints restricted to platform administrators
+ADMIN_PATTERNS = [
+    re.compile(r"^/api/user/metrics/$"),
+]
+
+# URL segment before a parameter -> fixture providing its value
+RESOURCE_SEGMENTS = {
+    "categories": "category",
+    "courses": "course",
+    "enrollments": "enrollment",
+    "lessons": "lesson",
+    "modules": "module",
+    "progress": "progress",
+    "reviews": "review",
+    "subscription": "subscription",
+}
+
+PLACEHOLDER_RE = re.compile(r"<(\w+)>")
+
+
+def fixture_scale(size: int) -> Scale:
+    """Dataset in which every relation has ``size`` rows per parent"""
+    return Scale(
+        students=size,
+        instructors=1,
+        categories=size,
+        courses=size,
+        modules_per_course=size,
+        lessons_per_module=size,
+        enrollments_per_student=size,
+        progress_ratio=1.0,
+        attempt_ratio=1.0,
+        review_ratio=1.0,
+        published_ratio=1.0,
+        featured_ratio=1.0,
+        admins=1,
+    )
+
+
+@dataclass
+class EndpointCase:
+    key: str  # "GET /api/courses/<slug>/"
+    url: str  # canonical URL pattern from the extractor
+    view: str
+    actor: str
+    skip_reason: str = ""
+    counts: Dict[str, int] = field(default_factory=dict)
+    statuses: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def scales(self) -> bool:
+        return len(set(self.counts.values())) > 1
+
+
+def discover_cases() -> List[EndpointCase]:
+    """List every GET API endpoint of the URL conf"""
+    from educore.utils.endpoint_extractor import EndpointExtractor
+
+    cases = {}
+    for endpoint in EndpointExtractor().get_all_endpoints(skip_admin=True):
+        if not endpoint["is_api"] or "GET" not in endpoint["methods"]:
+            continue
+        url = endpoint["url"].rstrip("/") + "/"
+        key = f"GET {url}"
+        if key in cases:
+            continue
+        if any(pattern.search(url) for pattern in ADMIN_PATTERNS):
+            actor = "admin"
+        elif url.startswith("/api/instructor/") or "/instructor" in url:
+            actor = "instructor"
+        else:
+            actor = "student"
+        case = EndpointCase(key=key, url=url, view=endpoint["view"], actor=actor)
+        for pattern, reason in SKIP_PATTERNS:
+            if pattern.search(url.rstrip("/")):
+                case.skip_reason = reason
+                break
+        cases[key] = case
+    return sorted(cases.values(), key=lambda case: case.key)
+
+
+class FixtureSet:
+    """Objects of one generated dataset used to fill URL parameters"""
+
+    def __init__(self, seed: int):
+        prefix = f"{dataset_prefix(seed)}-"
+        User = get_user_model()
+        self.actors = {
+            "student": User.objects.filter(username__startswith=f"{prefix}student-").order_by("pk").first(),
+            "instructor": User.objects.filter(username__startswith=f"{prefix}instructor-").order_by("pk").first(),
+            "admin": User.objects.filter(username__startswith=f"{prefix}admin-").order_by("pk").first(),
+        }
+        student = self.actors["student"]
+        enrollment = Enrollment.objects.filter(user=student).order_by("pk").first()
+        self.objects = {
+            "category": Category.objects.filter(slug__startswith=prefix).order_by("pk").first(),
+            "course": enrollment.course,
+            "module": Module.objects.filter(course=enrollment.course).order_by("order").first(),
+            "lesson": Lesson.objects.filter(module__course=enrollment.course).order_by("pk").first(),
+            "enrollment": enrollment,
+            "progress": Progress.objects.filter(enrollment=enrollment).order_by("pk").first(),
+            "review": Review.objects.filter(user=student).order_by("pk").first(),
+            "subscription": getattr(student, "subscription", None),
+        }
+
+    def fill(self, url: str) -> Tuple[Optional[str], str]:
+        """Return (concrete URL, "") or (None, reason)"""
+        segments = url.strip("/").split("/")
+        for i, segment in enumerate(segments):
+            match = PLACEHOLDER_RE.fullmatch(segment)
+            if not match:
+                continue
+            resource = RESOURCE_SEGMENTS.get(segments[i - 1]) if i else None
+            obj = self.objects.get(resource) if resource else None
+            if obj is None:
+                return None, f"no fixture for parameter {segment} after '{segments[i - 1] if i else ''}'"
+            use_slug = match.group(1) in ("slug", "str") and hasattr(obj, "slug")
+            segments[i] = str(obj.slug if use_slug else obj.pk)
+        query = QUERY_PARAMS.get(url)
+        path = "/" + "/".join(segments) + "/"
+        return (f"{path}?{query}" if query else path), ""
+
+
+class _Rollback(Exception):
+    pass
+
+
+class QueryCountHarness:
+    """Measure every endpoint at both dataset sizes and check the budgets"""
+
+    def __init__(self, cases: Optional[List[EndpointCase]] = None, sizes=(SMALL_SIZE, LARGE_SIZE)):
+        self.cases = cases if cases is not None else discover_cases()
+        self.sizes = sizes
+        self.host = next(
+            (h for h in settings.ALLOWED_HOSTS if h and h != "*" and not h.startswith(".")),
+            "localhost",
+        )
+
+    def _measure(self, case: EndpointCase, fixtures: FixtureSet, label: str):
+        url, reason = fixtures.fill(case.url)
+        if url is None:
+            case.skip_reason = reason
+            return
+
+        client = APIClient(HTTP_HOST=self.host)
+        actor = fixtures.actors[case.actor]
+        client.force_login(actor)
+        client.force_authenticate(actor)
+
+        cache.clear()
+        counter = _QueryCounter()
+        try:
+            with transaction.atomic(), connection.execute_wrapper(counter):
+                response = client.get(url)
+                status = response.status_code
+                raise _Rollback
+        except _Rollback:
+            pass
+        except Exception as e:
+            status = f"error: {type(e).__name__}"
+        case.counts[label] = counter.count
+        case.statuses[label] = status
+
+    @override_settings(LEADERBOARD_BACKEND="memory")
+    def run(self) -> List[EndpointCase]:
+        for size in self.sizes:
+            label = f"n{size}"
+            try:
+                with transaction.atomic():
+                    DatasetGenerator(fixture_scale(size), seed=FIXTURE_SEED + size).run()
+                    fixtures = FixtureSet(FIXTURE_SEED + size)
+                    # Boards filled from the dataset, so leaderboard pages have entries
+                    leaderboards.get_backend().clear()
+                    leaderboards.reconcile()
+                    for case in self.cases:
+                        if not case.skip_reason:
+                            self._measure(case, fixtures, label)
+                    raise _Rollback
+            except _Rollback:
+                pass
+        leaderboards.get_backend().clear()
+        return self.cases
+
+
+# ====================================
+# BUDGETS
+# ====================================
+
+def build_budgets(cases: List[EndpointCase]) -> Dict:
+    endpoints = {}
+    for case in cases:
+        if case.skip_reason or not case.counts:
+            continue
+        endpoints[case.key] = {
+            "view": case.view,
+            "queries": dict(sorted(case.counts.items())),
+            "status": dict(sorted((k, str(v)) for k, v in case.statuses.items())),
+        }
+    return {"version": BUDGET_VERSION, "sizes": [f"n{s}" for s in (SMALL_SIZE, LARGE_SIZE)],
+            "endpoints": endpoints}
+
+
+def load_budgets(path: str = BUDGET_FILE) -> Dict:
+    if not os.path.exists(path):
+        return {"version": BUDGET_VERSION, "endpoints": {}}
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def write_budgets(budgets: Dict, path: str = BUDGET_FILE):
+    with open(path, "w") as handle:
+        json.dump(budgets, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def check_budgets(cases: List[EndpointCase], budgets: Dict) -> List[str]:
+    """Return one message per violated budget"""
+    failures = []
+    known = budgets.get("endpoints", {})
+    for case in cases:
+        if case.skip_reason or not case.counts:
+            continue
+        budget = known.get(case.key)
+        if budget is None:
+            failures.append(f"{case.key}: no budget recorded ({case.counts}); regenerate the budget file")
+            continue
+        if case.scales:
+            failures.append(f"{case.key}: query count grows with rows {case.counts}")
+        for label, count in case.counts.items():
+            allowed = budget["queries"].get(label)
+            if allowed is not None and count > allowed:
+                failures.append(f"{case.key}: {count} queries at {label}, budget {allowed}")
+            expected = budget.get("status", {}).get(label)
+            status = str(case.statuses.get(label))
+            if expected is not None and status != expected:
+                failures.append(f"{case.key}: status {status} at {label}, expected {expected}")
+    return failures
@@ -0,0 +1,144 @@
+#
+# File Path: backend/courses/benchmarks/results.py
+# Folder Path: backend/courses/benchmarks/
+# Date Created: 2026-10-18 00:00:00
+# Version: 1.0.0
+#
+# Benchmark result files and run comparison
+#
+# A result file is JSON:
+#
+#   {
+#     "format": "educore-benchmark", "version": 1,
+#     "created_at": "...", "git_commit": "...",
+#     "environment": {"python": ..., "django": ..., "database": ...},
+#     "dataset": {"scale": "small", "seed": 42, ...},
+#     "settings": {"iterations": 20, "warmup": 2, "cold_cache": true},
+#     "scenarios": {"course_list": {"latency_ms": {...}, "queries": {...}, ...}}
+#   }
+#
+# compare_results flags a scenario as a regression when its p95 latency grows
+# by more than the relative tolerance (and by at least min_latency_ms, to
+# ignore noise on fast endpoints), when its maximum query count grows, or
+# when its status codes change: a run that starts answering 500 or 404 is
+# fast and cheap, not improved. Latency and queries are only compared when
+# both runs returned the same status codes; error responses going away is
+# an improvement.
+
+import json
+import platform
+import subprocess
+from typing import Dict, List, Set
+
+import django
+from django.db import connection
+from django.utils import timezone
+
+RESULT_FORMAT = "educore-benchmark"
+RESULT_VERSION = 1
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5, check=True,
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def build_result(dataset: Dict, settings: Dict, scenarios: Dict) -> Dict:
+    return {
+        "format": RESULT_FORMAT,
+        "version": RESULT_VERSION,
+        "created_at": timezone.now().isoformat(),
+        "git_commit": _git_commit(),
+        "environment": {
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+        },
+        "dataset": dataset,
+        "settings": settings,
+        "scenarios": scenarios,
+    }
+
+
+def write_result(result: Dict, path: str):
+    with open(path, "w") as handle:
+        json.dump(result, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def load_result(path: str) -> Dict:
+    with open(path) as handle:
+        result = json.load(handle)
+    if result.get("format") != RESULT_FORMAT:
+        raise ValueError(f"{path} is not a benchmark result file")
+    if result.get("version") != RESULT_VERSION:
+        raise ValueError(f"{path} has unsupported result version {result.get('version')}")
+    return result
+
+
+def _error_codes(status_codes: Dict[str, int]) -> Set[str]:
+    return {code for code in status_codes if not 200 <= int(code) < 300}
+
+
+def compare_results(baseline: Dict, current: Dict, latency_tolerance: float = 0.2,
+                    min_latency_ms: float = 5.0, query_tolerance: int = 0) -> List[Dict]:
+    """
+    Compare two result files scenario by scenario.
+
+    Returns one row per scenario with ``status`` set to "regression",
+    "improvement", "ok", "missing" (dropped from ``current``) or "new".
+    """
+    rows = []
+    base_scenarios = baseline.get("scenarios", {})
+    current_scenarios = current.get("scenarios", {})
+
+    for name in sorted(set(base_scenarios) | set(current_scenarios)):
+        base, new = base_scenarios.get(name), current_scenarios.get(name)
+        if base is None or new is None:
+            rows.append({"scenario": name, "status": "new" if base is None else "missing", "reasons": []})
+            continue
+
+        base_p95, new_p95 = base["latency_ms"]["p95"], new["latency_ms"]["p95"]
+        base_queries, new_queries = base["queries"]["max"], new["queries"]["max"]
+        base_codes, new_codes = base.get("status_codes", {}), new.get("status_codes", {})
+        latency_change = (new_p95 - base_p95) / base_p95 if base_p95 else 0.0
+
+        reasons = []
+        if set(base_codes) == set(new_codes):
+            if latency_change > latency_tolerance and new_p95 - base_p95 >= min_latency_ms:
+                reasons.append(f"p95 {base_p95}ms -> {new_p95}ms ({latency_change:+.0%})")
+            if new_queries > base_queries + query_tolerance:
+                reasons.append(f"queries {base_queries} -> {new_queries}")
+            improved = latency_change < -latency_tolerance or new_queries < base_queries
+        else:
+            # One run timed a different (error) path, so only the status codes compare
+            improved = (
+                _error_codes(base_codes)
+                and not _error_codes(new_codes)
+                and set(new_codes) <= set(base_codes)
+            )
+            if not improved:
+                reasons.append(f"status {sorted(base_codes)} -> {sorted(new_codes)}")
+
+        if reasons:
+            status = "regression"
+        elif improved:
+            status = "improvement"
+        else:
+            status = "ok"
+
+        rows.append({
+            "scenario": name,
+            "status": status,
+            "reasons": reasons,
+            "p95_ms": (base_p95, new_p95),
+            "queries": (base_queries, new_queries),
+            "status_codes": (sorted(base_codes), sorted(new_codes)),
+            "latency_change": round(latency_change, 3),
+        })
+    return rows
@@ -0,0 +1,164 @@
+#
+# File Path: backend/courses/benchmarks/scenarios.py
+# Folder Path: backend/courses/benchmarks/
+# Date Created: 2026-10-18 00:00:00
+# Version: 1.0.0
+#
+# Benchmark scenarios and runner
+#
+# A scenario is one request against a key endpoint, made as a given kind of
+# user picked from a generated dataset (the busiest student and the most
+# enrolled course, so the numbers reflect the heavy end of the distribution).
+# ScenarioRunner repeats each scenario through the DRF test client and
+# records latency percentiles, query counts and status codes. Responses
+# outside 2xx are counted as errors: their timings measure an error path,
+# not the endpoint, so compare_results treats them as regressions.
+
+import math
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+from rest_framework.test import APIClient
+
+from courses.models import Course
+
+from .datasets import dataset_prefix
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    rank = max(math.ceil(pct * len(ordered) / 100) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def error_count(status_codes: Dict[str, int]) -> int:
+    """Responses outside 2xx in a ``{"200": n, ...}`` mapping"""
+    return sum(n for code, n in status_codes.items() if not 200 <= int(code) < 300)
+
+
+class _QueryCounter:
+    """Execute wrapper counting queries (connection.queries is reset per request)"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    path: str  # may reference {course_slug}
+    actor: str = "anonymous"  # anonymous or student
+    description: str = ""
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    s.name: s
+    for s in [
+        Scenario("course_list", "/api/courses/", description="CourseViewSet.list, anonymous"),
+        Scenario("course_list_student", "/api/courses/", "student",
+                 description="CourseViewSet.list, enrolled student"),
+        Scenario("course_detail", "/api/courses/{course_slug}/", "student",
+                 description="CourseViewSet.retrieve of the most enrolled course"),
+        Scenario("user_progress_stats", "/api/user/progress/stats/", "student",
+                 description="UserProgressStatsView for the busiest student"),
+    ]
+}
+
+
+class ScenarioRunner:
+    """
+    Run scenarios against the dataset generated with ``seed``.
+
+    With ``cold_cache`` (default) the cache is cleared before every
+    iteration so cached endpoints are measured on their slow path.
+    """
+
+    def __init__(self, seed: int = 42, iterations: int = 20, warmup: int = 2, cold_cache: bool = True):
+        self.seed = seed
+        self.iterations = iterations
+        self.warmup = warmup
+        self.cold_cache = cold_cache
+        self.host = next(
+            (h for h in settings.ALLOWED_HOSTS if h and h != "*" and not h.startswith(".")),
+            "localhost",
+        )
+        self.context = self._resolve_context()
+
+    def _resolve_context(self) -> Dict:
+        prefix = f"{dataset_prefix(self.seed)}-"
+        User = get_user_model()
+        student = (
+            User.objects.filter(username__startswith=f"{prefix}student-")
+            .annotate(n=Count("student_enrollments")).order_by("-n", "pk").first()
+        )
+        course = (
+            Course.objects.filter(slug__startswith=prefix, is_published=True)
+            .order_by("-enrolled_students_count", "pk").first()
+        )
+        if not (student and course):
+            raise LookupError(
+                f"No benchmark dataset for seed {self.seed}; run seed_benchmark_data first"
+            )
+        return {"student": student, "course_slug": course.slug}
+
+    def _request(self, scenario: Scenario):
+        actor = self.context.get(scenario.actor)
+        client = APIClient(HTTP_HOST=self.host)
+        if actor is not None:
+            # Session login too, for views wrapped in plain Django decorators
+            client.force_login(actor)
+            client.force_authenticate(actor)
+        return client.get(scenario.path.format(**self.context))
+
+    def run_scenario(self, scenario: Scenario) -> Dict:
+        latencies, queries, statuses = [], [], {}
+        for i in range(self.warmup + self.iterations):
+            if self.cold_cache:
+                cache.clear()
+            counter = _QueryCounter()
+            with connection.execute_wrapper(counter):
+                started = time.perf_counter()
+                response = self._request(scenario)
+                elapsed = (time.perf_counter() - started) * 1000
+            if i < self.warmup:
+                continue
+            latencies.append(elapsed)
+            queries.append(counter.count)
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+        return {
+            "description": scenario.description,
+            "iterations": self.iterations,
+            "status_codes": statuses,
+            "errors": error_count(statuses),
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50), 2),
+                "p95": round(percentile(latencies, 95), 2),
+                "mean": round(statistics.fmean(latencies), 2),
+                "min": round(min(latencies), 2),
+                "max": round(max(latencies), 2),
+            },
+            "queries": {
+                "p50": percentile(queries, 50),
+                "max": max(queries),
+            },
+        }
+
+    def run(self, names: Optional[List[str]] = None) -> Dict[str, Dict]:
+        names = names or list(SCENARIOS)
+        unknown = sorted(set(names) - set(SCENARIOS))
+        if unknown:
+            raise ValueError(f"Unknown scenarios: {', '.join(unknown)}")
+        return {name: self.run_scenario(SCENARIOS[name]) for name in names}
@@ -0,0 +1,579 @@
+#
+# File Path: backend/courses/leaderboards.py
+# Folder Path: backend/courses/
+# Date Created: 2026-10-18 00:00:00
+# Version: 1.0.0
+#
+# Sorted-set leaderboards and study streak store
+#
+# Rankings are kept in sorted sets rather than recomputed from Progress rows,
+# so top-K and rank-of-user queries cost O(log n + K) however many learners
+# there are:
+# - points: LEADERBOARD_LESSON_POINTS per completed lesson, globally and per
+#   course, each all-time, for the current day and for the current ISO week
+#   (daily and weekly boards expire on their own once their window is over);
+# - streaks: each user's current run of consecutive study days (local dates),
+#   next to a set holding the last study day. A run that misses a day is
+#   pruned from the board on the first read of the next day.
+#
+# Progress.save records a newly completed lesson once the transaction commits.
+# Board updates are increments, so rows deleted or un-completed later, and
+# updates lost while the backend was down, drift until the next run of
+# reconcile. Reconcile is scheduled by CELERY_BEAT_SCHEDULE. It rebuilds the
+# current boards from Progress rows, the source of truth, and swaps each
+# board in atomically.
+#
+# Backends:
+# - "redis": sorted sets shared by every process (default); the streak update
+#   is a Lua script so concurrent completions cannot double count a day
+# - "memory": per-process sorted lists, for tests and single-process setups
+# A backend failure is logged; updates are dropped (reconcile restores them)
+# and reads return empty boards.
+#
+# Settings:
+# - LEADERBOARD_BACKEND: "redis" or "memory" (default: "redis")
+# - LEADERBOARD_REDIS_URL: Redis URL for the redis backend (default: CELERY_BROKER_URL)
+# - LEADERBOARD_NAMESPACE: key prefix in Redis (default: "educore")
+# - LEADERBOARD_LESSON_POINTS: points per completed lesson (default: 10)
+# - LEADERBOARD_RECONCILE_INTERVAL: seconds between reconcile runs (default: 3600)
+
+import fnmatch
+import logging
+import threading
+import time
+import uuid
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+POINTS = "points"
+STREAKS = "streaks"
+BOARDS = (POINTS, STREAKS)
+
+WINDOW_ALL = "all"
+WINDOW_DAILY = "daily"
+WINDOW_WEEKLY = "weekly"
+WINDOWS = (WINDOW_ALL, WINDOW_DAILY, WINDOW_WEEKLY)
+
+# Seconds a windowed board outlives its window, so the previous day or
+# week can still be read for a while
+WINDOW_TTL = {WINDOW_ALL: None, WINDOW_DAILY: 2 * 86400, WINDOW_WEEKLY: 14 * 86400}
+
+STREAK_LENGTH_KEY = "streaks:length"
+STREAK_LAST_DAY_KEY = "streaks:last"
+
+REPLACE_CHUNK = 1000
+
+
+def get_lesson_points() -> int:
+    return getattr(settings, "LEADERBOARD_LESSON_POINTS", 10)
+
+
+# =====================================
+# KEYS
+# =====================================
+
+
+def window_suffix(window: str, day) -> str:
+    if window == WINDOW_DAILY:
+        return f"{WINDOW_DAILY}:{day:%Y%m%d}"
+    if window == WINDOW_WEEKLY:
+        year, week, _ = day.isocalendar()
+        return f"{WINDOW_WEEKLY}:{year}W{week:02d}"
+    return WINDOW_ALL
+
+
+def points_key(course_id: Optional[int], window: str, day) -> str:
+    scope = "global" if course_id is None else f"course:{course_id}"
+    return f"{POINTS}:{scope}:{window_suffix(window, day)}"
+
+
+def window_start(window: str, day) -> Optional[datetime]:
+    """Aware start of the window containing a local date; None for all-time"""
+    if window == WINDOW_DAILY:
+        start = day
+    elif window == WINDOW_WEEKLY:
+        start = day - timedelta(days=day.weekday())
+    else:
+        return None
+    return timezone.make_aware(datetime.combine(start, datetime.min.time()))
+
+
+# =====================================
+# MEMORY BACKEND
+# =====================================
+
+
+class _SortedSet:
+    """Scores plus a list kept sorted by (-score, member)"""
+
+    __slots__ = ("scores", "order")
+
+    def __init__(self):
+        self.scores = {}
+        self.order = []
+
+    def add(self, member, score):
+        old = self.scores.get(member)
+        if old is not None:
+            del self.order[bisect_left(self.order, (-old, member))]
+        self.scores[member] = score
+        insort(self.order, (-score, member))
+
+    def remove(self, member):
+        old = self.scores.pop(member, None)
+        if old is not None:
+            del self.order[bisect_left(self.order, (-old, member))]
+
+    def rank(self, member):
+        score = self.scores.get(member)
+        if score is None:
+            return None
+        return bisect_left(self.order, (-score, member)), score
+
+
+class InMemoryLeaderboardBackend:
+    """Per-process sorted sets; inserts shift a list, so this is for tests"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sets = {}
+        self._expires = {}
+
+    def _get(self, key, create=False):
+        expires = self._expires.get(key)
+        if expires is not None and expires <= time.time():
+            self._sets.pop(key, None)
+            self._expires.pop(key, None)
+        zset = self._sets.get(key)
+        if zset is None and create:
+            zset = self._sets[key] = _SortedSet()
+        return zset
+
+    def increment(self, member, increments):
+        with self._lock:
+            for key, amount, ttl in increments:
+                zset = self._get(key, create=True)
+                zset.add(member, zset.scores.get(member, 0) + amount)
+                if ttl:
+                    self._expires[key] = time.time() + ttl
+
+    def top(self, key, offset, limit):
+        with self._lock:
+            zset = self._get(key)
+            if zset is None:
+                return []
+            return [(member, -score) for score, member in zset.order[offset:offset + limit]]
+
+    def rank(self, key, member):
+        with self._lock:
+            zset = self._get(key)
+            return zset.rank(member) if zset is not None else None
+
+    def count(self, key):
+        with self._lock:
+            zset = self._get(key)
+            return len(zset.scores) if zset is not None else 0
+
+    def replace(self, key, scores, ttl=None):
+        zset = _SortedSet()
+        for member, score in scores.items():
+            zset.add(member, score)
+        with self._lock:
+            if scores:
+                self._sets[key] = zset
+                self._expires.pop(key, None)
+                if ttl:
+                    self._expires[key] = time.time() + ttl
+            else:
+                self._sets.pop(key, None)
+                self._expires.pop(key, None)
+
+    def record_study(self, member, day):
+        with self._lock:
+            lengths = self._get(STREAK_LENGTH_KEY, create=True)
+            last_days = self._get(STREAK_LAST_DAY_KEY, create=True)
+            last = last_days.scores.get(member)
+            length = lengths.scores.get(member, 0)
+            if last is not None and day <= last:
+                return length
+            length = length + 1 if last == day - 1 else 1
+            lengths.add(member, length)
+            last_days.add(member, day)
+            return length
+
+    def prune_streaks(self, before_day):
+        with self._lock:
+            lengths = self._get(STREAK_LENGTH_KEY, create=True)
+            last_days = self._get(STREAK_LAST_DAY_KEY, create=True)
+            stale = [m for m, day in last_days.scores.items() if day < before_day]
+            for member in stale:
+                lengths.remove(member)
+                last_days.remove(member)
+            return len(stale)
+
+    def replace_streaks(self, streaks):
+        lengths, last_days = _SortedSet(), _SortedSet()
+        for member, (length, day) in streaks.items():
+            lengths.add(member, length)
+            last_days.add(member, day)
+        with self._lock:
+            self._sets[STREAK_LENGTH_KEY] = lengths
+            self._sets[STREAK_LAST_DAY_KEY] = last_days
+
+    def keys(self, pattern):
+        with self._lock:
+            return [key for key in list(self._sets) if fnmatch.fnmatchcase(key, pattern)
+                    and self._get(key) is not None]
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._sets.pop(key, None)
+                self._expires.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._sets.clear()
+            self._expires.clear()
+
+
+# =====================================
+# REDIS BACKEND
+# =====================================
+
+
+# KEYS[1]: streak lengths, KEYS[2]: last study day (date ordinal)
+# ARGV: member, day
+# Returns: the member's streak length after the update
+RECORD_STUDY_LUA = """
+local day = tonumber(ARGV[2])
+local last = tonumber(redis.call('ZSCORE', KEYS[2], ARGV[1]))
+local length = tonumber(redis.call('ZSCORE', KEYS[1], ARGV[1])) or 0
+if last and day <= last then
+    return length
+end
+if last and day == last + 1 then
+    length = length + 1
+else
+    length = 1
+end
+redis.call('ZADD', KEYS[1], length, ARGV[1])
+redis.call('ZADD', KEYS[2], day, ARGV[1])
+return length
+"""
+
+
+class RedisLeaderboardBackend:
+    """Sorted sets shared by all processes, one per board"""
+
+    def __init__(self, url=None, namespace=None):
+        import redis
+
+        self.url = url or getattr(settings, "LEADERBOARD_REDIS_URL", settings.CELERY_BROKER_URL)
+        self.prefix = f"{namespace or getattr(settings, 'LEADERBOARD_NAMESPACE', 'educore')}:leaderboard"
+        self.client = redis.Redis.from_url(self.url)
+        self.record_script = self.client.register_script(RECORD_STUDY_LUA)
+
+    def _key(self, key):
+        return f"{self.prefix}:{key}"
+
+    def increment(self, member, increments):
+        pipe = self.client.pipeline(transaction=False)
+        for key, amount, ttl in increments:
+            pipe.zincrby(self._key(key), amount, member)
+            if ttl:
+                pipe.expire(self._key(key), ttl)
+        pipe.execute()
+
+    def top(self, key, offset, limit):
+        rows = self.client.zrevrange(self._key(key), offset, offset + limit - 1, withscores=True)
+        return [(member.decode(), score) for member, score in rows]
+
+    def rank(self, key, member):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.zrevrank(self._key(key), member)
+        pipe.zscore(self._key(key), member)
+        rank, score = pipe.execute()
+        return None if rank is None else (rank, score)
+
+    def count(self, key):
+        return self.client.zcard(self._key(key))
+
+    def _stage(self, scores):
+        """Write scores to a temporary set in chunks and return its key"""
+        staging = self._key(f"staging:{uuid.uuid4().hex}")
+        items = list(scores.items())
+        pipe = self.client.pipeline(transaction=False)
+        for start in range(0, len(items), REPLACE_CHUNK):
+            pipe.zadd(staging, dict(items[start:start + REPLACE_CHUNK]))
+        pipe.expire(staging, 3600)
+        pipe.execute()
+        return staging
+
+    def replace(self, key, scores, ttl=None):
+        if not scores:
+            self.client.delete(self._key(key))
+            return
+        staging = self._stage(scores)
+        pipe = self.client.pipeline(transaction=True)
+        pipe.rename(staging, self._key(key))
+        if ttl:
+            pipe.expire(self._key(key), ttl)
+        else:
+            pipe.persist(self._key(key))
+        pipe.execute()
+
+    def record_study(self, member, day):
+        return int(self.record_script(
+            keys=[self._key(STREAK_LENGTH_KEY), self._key(STREAK_LAST_DAY_KEY)],
+            args=[member, day],
+        ))
+
+    def prune_streaks(self, before_day):
+        removed = 0
+        while True:
+            stale = self.client.zrangebyscore(
+                self._key(STREAK_LAST_DAY_KEY), "-inf", f"({before_day}", start=0, num=REPLACE_CHUNK
+            )
+            if not stale:
+                return removed
+            pipe = self.client.pipeline(transaction=True)
+            pipe.zrem(self._key(STREAK_LENGTH_KEY), *stale)
+            pipe.zrem(self._key(STREAK_LAST_DAY_KEY), *stale)
+            pipe.execute()
+            removed += len(stale)
+
+    def replace_streaks(self, streaks):
+        lengths = {member: length for member, (length, _) in streaks.items()}
+        last_days = {member: day for member, (_, day) in streaks.items()}
+        pipe = self.client.pipeline(transaction=True)
+        if streaks:
+            pipe.rename(self._stage(lengths), self._key(STREAK_LENGTH_KEY))
+            pipe.rename(self._stage(last_days), self._key(STREAK_LAST_DAY_KEY))
+        else:
+            pipe.delete(self._key(STREAK_LENGTH_KEY), self._key(STREAK_LAST_DAY_KEY))
+        pipe.execute()
+
+    def keys(self, pattern):
+        start = len(self.prefix) + 1
+        return [key.decode()[start:] for key in self.client.scan_iter(self._key(pattern))]
+
+    def delete(self, *keys):
+        if keys:
+            self.client.delete(*(self._key(key) for key in keys))
+
+    def clear(self):
+        for key in self.client.scan_iter(f"{self.prefix}:*"):
+            self.client.delete(key)
+
+
+BACKEND_CLASSES = {
+    "memory": InMemoryLeaderboardBackend,
+    "redis": RedisLeaderboardBackend,
+}
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend():
+    """Return the backend selected by LEADERBOARD_BACKEND"""
+    name = getattr(settings, "LEADERBOARD_BACKEND", "redis")
+    with _backends_lock:
+        if name not in _backends:
+            _backends[name] = BACKEND_CLASSES[name]()
+        return _backends[name]
+
+
+# =====================================
+# RECORDING
+# =====================================
+
+
+def record_lesson_completion(user_id: int, course_id: int, completed_at=None):
+    """Add a completed lesson to the points boards and the user's study streak"""
+    day = timezone.localdate(completed_at or timezone.now())
+    points = get_lesson_points()
+    increments = [
+        (points_key(scope, window, day), points, WINDOW_TTL[window])
+        for scope in (None, course_id)
+        for window in WINDOWS
+    ]
+    try:
+        backend = get_backend()
+        backend.increment(str(user_id), increments)
+        backend.record_study(str(user_id), day.toordinal())
+    except Exception as exc:
+        logger.warning(f"Leaderboard update for user {user_id} dropped: {exc}")
+
+
+# =====================================
+# QUERIES
+# =====================================
+
+_pruned = {"day": None}
+
+
+def _board_key(board: str, course_id: Optional[int], window: str) -> str:
+    if board not in BOARDS:
+        raise ValueError(f"Unknown leaderboard '{board}'")
+    if window not in WINDOWS:
+        raise ValueError(f"Unknown leaderboard window '{window}'")
+    if board == STREAKS:
+        if course_id is not None or window != WINDOW_ALL:
+            raise ValueError("Streaks are ranked globally and all-time only")
+        return STREAK_LENGTH_KEY
+    return points_key(course_id, window, timezone.localdate())
+
+
+def _prune_broken_streaks():
+    """Drop runs that missed yesterday; needed once per process per day"""
+    today = timezone.localdate().toordinal()
+    if _pruned["day"] == today:
+        return
+    get_backend().prune_streaks(today - 1)
+    _pruned["day"] = today
+
+
+def top(board: str = POINTS, course_id: Optional[int] = None, window: str = WINDOW_ALL,
+        limit: int = 10, offset: int = 0) -> List[Dict]:
+    """Ranked entries of a board, best first; ranks start at 1"""
+    key = _board_key(board, course_id, window)
+    try:
+        if board == STREAKS:
+            _prune_broken_streaks()
+        rows = get_backend().top(key, offset, limit)
+    except Exception as exc:
+        logger.warning(f"Leaderboard {key} unavailable: {exc}")
+        return []
+    return [
+        {"rank": offset + position + 1, "user_id": int(member), "score": int(score)}
+        for position, (member, score) in enumerate(rows)
+    ]
+
+
+def rank_of(user_id: int, board: str = POINTS, course_id: Optional[int] = None,
+            window: str = WINDOW_ALL) -> Optional[Dict]:
+    """A user's rank and score on a board, or None if they are not on it"""
+    key = _board_key(board, course_id, window)
+    try:
+        if board == STREAKS:
+            _prune_broken_streaks()
+        backend = get_backend()
+        found = backend.rank(key, str(user_id))
+        total = backend.count(key) if found is not None else 0
+    except Exception as exc:
+        logger.warning(f"Leaderboard {key} unavailable: {exc}")
+        return None
+    if found is None:
+        return None
+    rank, score = found
+    return {"rank": rank + 1, "score": int(score), "total": total}
+
+
+# =====================================
+# RECONCILIATION
+# =====================================
+
+
+def _iter_points(window: str, day, batch_size: int) -> Iterator[Tuple[int, int, int]]:
+    """(course id, user id, completed lessons) in the window, ordered by course"""
+    from django.db.models import Count
+
+    from .models import Progress
+
+    completions = Progress.objects.filter(is_completed=True)
+    start = window_start(window, day)
+    if start is not None:
+        completions = completions.filter(completed_date__gte=start)
+    return (
+        completions.values_list("enrollment__course_id", "enrollment__user_id")
+        .annotate(lessons=Count("id"))
+        .order_by("enrollment__course_id")
+        .iterator(chunk_size=batch_size)
+    )
+
+
+def _iter_study_days(batch_size: int) -> Iterator[Tuple[int, object]]:
+    """(user id, local study date) per user, latest first"""
+    from django.db.models.functions import TruncDate
+
+    from .models import Progress
+
+    return (
+        Progress.objects.filter(is_completed=True, completed_date__isnull=False)
+        .annotate(day=TruncDate("completed_date"))
+        .values_list("enrollment__user_id", "day")
+        .distinct()
+        .order_by("enrollment__user_id", "-day")
+        .iterator(chunk_size=batch_size)
+    )
+
+
+def current_streaks(today, batch_size: int = 2000) -> Dict[str, Tuple[int, int]]:
+    """{user id: (streak length, last study day ordinal)} for unbroken runs"""
+    streaks = {}
+    current, expected = None, None
+    for user_id, day in _iter_study_days(batch_size):
+        ordinal = day.toordinal()
+        if user_id != current:
+            current, expected = user_id, None
+            if ordinal >= today.toordinal() - 1:
+                streaks[str(user_id)] = (1, ordinal)
+                expected = ordinal - 1
+        elif expected is not None and ordinal == expected:
+            length, last = streaks[str(user_id)]
+            streaks[str(user_id)] = (length + 1, last)
+            expected -= 1
+        else:
+            expected = None
+    return streaks
+
+
+def reconcile(batch_size: int = 2000) -> Dict[str, int]:
+    """
+    Rebuild the current boards from Progress rows and swap them in.
+
+    Completions recorded between the queries and the swap are overwritten;
+    the next run counts them.
+    """
+    backend = get_backend()
+    today = timezone.localdate()
+    points = get_lesson_points()
+    counts = {}
+
+    for window in WINDOWS:
+        ttl = WINDOW_TTL[window]
+        totals: Dict[str, int] = defaultdict(int)
+        rebuilt = set()
+        course_id, scores = None, {}
+        for row_course, user_id, lessons in _iter_points(window, today, batch_size):
+            if row_course != course_id:
+                if scores:
+                    backend.replace(points_key(course_id, window, today), scores, ttl)
+                    rebuilt.add(points_key(course_id, window, today))
+                course_id, scores = row_course, {}
+            scores[str(user_id)] = lessons * points
+            totals[str(user_id)] += lessons * points
+        if scores:
+            backend.replace(points_key(course_id, window, today), scores, ttl)
+            rebuilt.add(points_key(course_id, window, today))
+        backend.replace(points_key(None, window, today), dict(totals), ttl)
+
+        # Course boards with no completions left in the window
+        pattern = f"{POINTS}:course:*:{window_suffix(window, today)}"
+        backend.delete(*(key for key in backend.keys(pattern) if key not in rebuilt))
+        counts[window] = len(totals)
+
+    backend.replace_streaks(current_streaks(today, batch_size))
+    _pruned["day"] = today.toordinal()
+    counts[STREAKS] = backend.count(STREAK_LENGTH_KEY)
+    logger.info(f"Leaderboards reconciled: {counts}")
+    return counts
@@ -7,6 +7,8 @@ from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
 from django.db import connection
 
+from educore.schema_snapshot import diff_models, get_snapshot, sample_models
+
 # python manage.py check_db --all-apps --export-md report.md
 
 
@@ -17,6 +19,7 @@ class Command(BaseCommand):
         super().__init__(*args, **kwargs)
         self.md_output = []
         self.export_to_md = False
+        self.snapshot = None
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -69,12 +72,36 @@ class Command(BaseCommand):
         parser.add_argument(
             "--batch-check",
             action="store_true",
-            help="Use batch queries for better performance (recommended for large schemas)",
+            help="Read the schema from a cached snapshot taken in a few catalog queries (recommended for large schemas)",
+        )
+        parser.add_argument(
+            "--refresh-snapshot",
+            action="store_true",
+            help="Take a new schema snapshot instead of reusing the cached one",
+        )
+        parser.add_argument(
+            "--schema-diff",
+            action="store_true",
+            help="Compare models with the database schema (use with --model, --app or alone for all apps)",
+        )
+        parser.add_argument(
+            "--sample",
+            action="store_true",
+            help="Load a few rows of every model in scope, in parallel",
+        )
+        parser.add_argument(
+            "--sample-size", type=int, default=5, help="Rows loaded per model with --sample"
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Concurrent sampling checks with --sample (default: SCHEMA_SAMPLE_WORKERS)",
         )
 
     def handle(self, *args, **options):
         self.verbose = options["verbose"]
         self.batch_check = options["batch_check"]
+        self.refresh_snapshot = options["refresh_snapshot"]
         self.export_to_md = bool(options.get("export_md"))
         self.md_file_path = options.get("export_md")
 
@@ -95,7 +122,13 @@ class Command(BaseCommand):
         config = self.load_config_file(options.get("config_file"))
 
         # Execute based on options
-        if options["table"] and options["column"]:
+        if options["schema_diff"] or options["sample"]:
+            models = self.get_models_in_scope(options)
+            if options["schema_diff"]:
+                self.check_schema_diff(models)
+            if options["sample"]:
+                self.check_model_samples(models, options["sample_size"], options["workers"])
+        elif options["table"] and options["column"]:
             self.check_specific_column(options["table"], options["column"])
         elif options["model"]:
             self.check_specific_model(options["model"])
@@ -227,10 +260,17 @@ class Command(BaseCommand):
             self.write_md_section(f"Model: {model_path}", 3)
             self.write_output(f"\nChecking model: {model_path} (table: {table_name})")
 
-            if self.check_table_exists_safe(table_name):
-                self.write_output(f"✅ Table {table_name} exists", "SUCCESS")
+            if self.batch_check:
+                table_exists = self.get_snapshot().has_table(table_name)
+            else:
+                table_exists = self.check_table_exists_safe(table_name)
+
+            if table_exists:
+                self.write_output(
+                    f"✅ Table {table_name} exists{self.describe_rows(table_name)}", "SUCCESS"
+                )
 
-                # Get all columns for this table in one query if using batch mode
+                # Get all columns for this table from the snapshot if using batch mode
                 if self.batch_check:
                     existing_columns = self.get_table_columns_batch(table_name)
 
@@ -261,7 +301,7 @@ class Command(BaseCommand):
     def check_app_tables(self, app_name, skip_system=False):
         """Check all tables for a specific app"""
         try:
-            app_models = apps.get_app_config(app_name).get_models()
+            app_models = list(apps.get_app_config(app_name).get_models())
             self.write_md_section(f"App: {app_name}")
             self.write_output(f"Checking tables for app: {app_name}")
 
@@ -287,7 +327,10 @@ class Command(BaseCommand):
                     existing_columns = None
 
                 if table_exists:
-                    self.write_output(f"✅ Table {table_name} exists", "SUCCESS")
+                    self.write_output(
+                        f"✅ Table {table_name} exists{self.describe_rows(table_name)}",
+                        "SUCCESS",
+                    )
 
                     # Check each field
                     for field in model._meta.concrete_fields:
@@ -336,6 +379,79 @@ class Command(BaseCommand):
                 self.write_output(f'\n{"="*50}')
                 self.check_app_tables(app_name, skip_system)
 
+    def get_models_in_scope(self, options):
+        """Models selected by --model, --app or all apps"""
+        if options["model"]:
+            try:
+                return [apps.get_model(options["model"])]
+            except (LookupError, ValueError):
+                self.write_output(f'❌ Model "{options["model"]}" not found', "ERROR")
+                return []
+
+        if options["app"]:
+            try:
+                return list(apps.get_app_config(options["app"]).get_models())
+            except LookupError:
+                self.write_output(f'❌ App "{options["app"]}" not found', "ERROR")
+                return []
+
+        system_apps = self.get_system_apps()
+        models = []
+        for app_config in apps.get_app_configs():
+            app_name = app_config.name.split(".")[-1]
+            if options["skip_system_apps"] and (
+                app_name in system_apps or app_config.name.startswith("django.")
+            ):
+                continue
+            models.extend(app_config.get_models())
+        return models
+
+    def check_schema_diff(self, models):
+        """Compare model state with the schema snapshot"""
+        self.write_md_section("Schema Diff")
+        self.write_output(f"Comparing {len(models)} models with the database schema")
+
+        self.batch_check = True
+        issues = diff_models(self.get_snapshot(), models)
+
+        for issue in issues:
+            style = "ERROR" if issue.severity == "error" else "WARNING"
+            icon = "❌" if issue.severity == "error" else "⚠️"
+            self.write_output(f"{icon} {issue}", style)
+
+        errors = sum(1 for issue in issues if issue.severity == "error")
+        if errors:
+            self.write_output(
+                f"\n{errors} errors, {len(issues) - errors} warnings", "ERROR"
+            )
+        elif issues:
+            self.write_output(f"\n✅ No errors, {len(issues)} warnings", "WARNING")
+        else:
+            self.write_output("✅ Schema matches all models", "SUCCESS")
+
+    def check_model_samples(self, models, size=5, workers=None):
+        """Load a few rows of every model in parallel"""
+        self.write_md_section("Model Sampling")
+        self.write_output(f"Sampling {size} rows from {len(models)} models")
+
+        results = sample_models(models, size=size, max_workers=workers)
+
+        failed = 0
+        for result in results:
+            if result["ok"]:
+                if self.verbose:
+                    self.write_output(
+                        f"  ✅ {result['model']}: {result['rows']} rows in {result['duration'] * 1000:.1f}ms"
+                    )
+            else:
+                failed += 1
+                self.write_output(f"  ❌ {result['model']}: {result['error']}", "ERROR")
+
+        if failed:
+            self.write_output(f"\n{failed} of {len(results)} models failed", "ERROR")
+        else:
+            self.write_output(f"✅ All {len(results)} models loaded", "SUCCESS")
+
     def get_system_apps(self):
         """Get comprehensive list of Django system apps"""
         return {
@@ -464,75 +580,45 @@ class Command(BaseCommand):
         except Exception:
             return False
 
+    def get_snapshot(self):
+        """Schema snapshot shared by every batch check of this run"""
+        if self.snapshot is None:
+            self.snapshot = get_snapshot(refresh=self.refresh_snapshot)
+            if self.snapshot.cached:
+                source = "cache"
+            else:
+                source = f"{self.snapshot.queries} catalog queries in {self.snapshot.duration * 1000:.0f}ms"
+            self.write_output(
+                f"Schema snapshot: {len(self.snapshot.tables)} tables ({source})"
+            )
+        return self.snapshot
+
+    def describe_rows(self, table_name):
+        """Approximate row count suffix for verbose batch output"""
+        if not (self.batch_check and self.verbose):
+            return ""
+        rows = self.get_snapshot().approx_rows(table_name)
+        return f" (~{rows} rows)" if rows is not None else ""
+
     def get_table_columns_batch(self, table_name):
-        """Get all columns for a table in one query"""
+        """Get all columns for a table from the schema snapshot"""
         try:
-            with connection.cursor() as cursor:
-                if connection.vendor == "postgresql":
-                    cursor.execute(
-                        """
-                        SELECT column_name FROM information_schema.columns
-                        WHERE table_name = %s AND table_schema = 'public'
-                    """,
-                        [table_name],
-                    )
-                elif connection.vendor == "mysql":
-                    cursor.execute(
-                        """
-                        SELECT column_name FROM information_schema.columns
-                        WHERE table_name = %s AND table_schema = DATABASE()
-                    """,
-                        [table_name],
-                    )
-                elif connection.vendor == "sqlite":
-                    cursor.execute("PRAGMA table_info(%s)", [table_name])
-                    return {col[1] for col in cursor.fetchall()}
-
-                return {row[0] for row in cursor.fetchall()}
+            return set(self.get_snapshot().columns(table_name))
         except Exception:
             return set()
 
     def get_multiple_tables_columns_batch(self, table_names):
-        """Get columns for multiple tables in one query"""
+        """Get columns for multiple tables from the schema snapshot"""
         if not table_names:
             return {}
 
         try:
-            with connection.cursor() as cursor:
-                if connection.vendor == "postgresql":
-                    placeholders = ",".join(["%s"] * len(table_names))
-                    cursor.execute(
-                        f"""
-                        SELECT table_name, column_name
-                        FROM information_schema.columns
-                        WHERE table_name IN ({placeholders}) AND table_schema = 'public'
-                    """,
-                        table_names,
-                    )
-                elif connection.vendor == "mysql":
-                    placeholders = ",".join(["%s"] * len(table_names))
-                    cursor.execute(
-                        f"""
-                        SELECT table_name, column_name
-                        FROM information_schema.columns
-                        WHERE table_name IN ({placeholders}) AND table_schema = DATABASE()
-                    """,
-                        table_names,
-                    )
-                elif connection.vendor == "sqlite":
-                    # SQLite doesn't have information_schema, fall back to individual queries
-                    result = {}
-                    for table_name in table_names:
-                        result[table_name] = self.get_table_columns_batch(table_name)
-                    return result
-
-                result = {}
-                for table_name, column_name in cursor.fetchall():
-                    if table_name not in result:
-                        result[table_name] = set()
-                    result[table_name].add(column_name)
-
-                return result
+            snapshot = self.get_snapshot()
+            return {
+                table_name: set(snapshot.columns(table_name))
+                for table_name in table_names
+                if snapshot.has_table(table_name)
+            }
         except Exception:
             return {}
 
@@ -713,6 +799,10 @@ class Command(BaseCommand):
         self.write_output(
             "  python manage.py check_db --all-apps --export-md report.md"
         )
+        self.write_output("\nCompare models with the database schema:")
+        self.write_output("  python manage.py check_db --schema-diff --skip-system-apps")
+        self.write_output("\nLoad a few rows of every model in an app, 8 at a time:")
+        self.write_output("  python manage.py check_db --app myapp --sample --workers 8")
         self.write_output("\nVerbose output with batch checking:")
         self.write_output(
             "  python manage.py check_db --all-apps --verbose --batch-check --export-md detailed_report.md"
@@ -736,8 +826,9 @@ class Command(BaseCommand):
 
         self.write_md_section("Performance Tips")
         self.write_output("=== PERFORMANCE TIPS ===", "SUCCESS")
-        self.write_output("• Use --batch-check for large schemas (faster)")
+        self.write_output("• Use --batch-check for large schemas (a few catalog queries, cached)")
+        self.write_output("• Use --refresh-snapshot after changing the schema outside migrations")
         self.write_output("• Use --skip-system-apps to focus on your code")
         self.write_output("• Use config files for CI/CD pipelines")
         self.write_output("• Use --export-md for documentation and reporting")
-        self.write_output("• PostgreSQL users: batch mode is highly recommended")
+        self.write_output("• --schema-diff also reports missing indexes, unique and check constraints")
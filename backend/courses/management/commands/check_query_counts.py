@@ -0,0 +1,66 @@
+# python manage.py check_query_counts [--update-budgets] [--endpoint /api/courses/]
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from courses.benchmarks.query_counts import (
+    BUDGET_FILE,
+    QueryCountHarness,
+    build_budgets,
+    check_budgets,
+    discover_cases,
+    load_budgets,
+    write_budgets,
+)
+
+
+class Command(BaseCommand):
+    help = "Check that GET API endpoints issue a constant number of queries as rows grow"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--update-budgets", action="store_true",
+                            help="Rewrite the budget file from this run instead of checking it")
+        parser.add_argument("--budget-file", default=BUDGET_FILE,
+                            help="Budget file (default: courses/benchmarks/query_budgets.json)")
+        parser.add_argument("--endpoint", action="append",
+                            help="Only check endpoints whose URL starts with this prefix (repeatable)")
+        parser.add_argument("--use-current-db", action="store_true",
+                            help="Run against the configured database (changes are rolled back) "
+                                 "instead of a throwaway test database")
+
+    def handle(self, *args, **options):
+        cases = discover_cases()
+        if options["endpoint"]:
+            cases = [c for c in cases if any(c.url.startswith(p) for p in options["endpoint"])]
+            if not cases:
+                raise CommandError("No endpoint matches the given prefixes")
+            if options["update_budgets"]:
+                raise CommandError("--update-budgets regenerates the whole file; drop --endpoint")
+
+        if options["use_current_db"]:
+            QueryCountHarness(cases).run()
+        else:
+            old_name = connection.settings_dict["NAME"]
+            connection.creation.create_test_db(verbosity=0, autoclobber=True)
+            try:
+                QueryCountHarness(cases).run()
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.stdout.write(f"{'endpoint':<60} {'queries':>12}  status")
+        for case in cases:
+            if case.skip_reason:
+                self.stdout.write(f"{case.key:<60} {'skipped':>12}  {case.skip_reason}")
+                continue
+            counts = " / ".join(str(case.counts[k]) for k in sorted(case.counts))
+            line = f"{case.key:<60} {counts:>12}  {', '.join(str(v) for v in case.statuses.values())}"
+            self.stdout.write(self.style.WARNING(line) if case.scales else line)
+
+        if options["update_budgets"]:
+            write_budgets(build_budgets(cases), options["budget_file"])
+            self.stdout.write(self.style.SUCCESS(f"Budgets written to {options['budget_file']}"))
+            return
+
+        failures = check_budgets(cases, load_budgets(options["budget_file"]))
+        if failures:
+            raise CommandError(f"{len(failures)} query budget(s) exceeded:\n" + "\n".join(failures))
+        self.stdout.write(self.style.SUCCESS("All query budgets met"))
@@ -0,0 +1,56 @@
+# python manage.py compare_benchmarks baseline.json current.json [--fail-on-regression]
+from django.core.management.base import BaseCommand, CommandError
+
+from courses.benchmarks import compare_results, load_result
+
+
+class Command(BaseCommand):
+    help = "Compare two benchmark result files and flag regressions"
+
+    def add_arguments(self, parser):
+        parser.add_argument("baseline", help="Result file of the reference run")
+        parser.add_argument("current", help="Result file of the run to check")
+        parser.add_argument("--latency-tolerance", type=float, default=0.2,
+                            help="Allowed relative p95 increase (default: 0.2 = 20%%)")
+        parser.add_argument("--min-latency-ms", type=float, default=5.0,
+                            help="Ignore p95 increases smaller than this (default: 5ms)")
+        parser.add_argument("--query-tolerance", type=int, default=0,
+                            help="Allowed increase in max query count (default: 0)")
+        parser.add_argument("--fail-on-regression", action="store_true",
+                            help="Exit with an error if any scenario regressed")
+
+    def handle(self, *args, **options):
+        try:
+            baseline = load_result(options["baseline"])
+            current = load_result(options["current"])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        if baseline.get("dataset") != current.get("dataset"):
+            self.stdout.write(self.style.WARNING(
+                f"Datasets differ: {baseline.get('dataset')} vs {current.get('dataset')}"
+            ))
+
+        rows = compare_results(
+            baseline, current,
+            latency_tolerance=options["latency_tolerance"],
+            min_latency_ms=options["min_latency_ms"],
+            query_tolerance=options["query_tolerance"],
+        )
+
+        styles = {"regression": self.style.ERROR, "improvement": self.style.SUCCESS}
+        for row in rows:
+            detail = ""
+            if "p95_ms" in row:
+                detail = (f"p95 {row['p95_ms'][0]} -> {row['p95_ms'][1]} ms, "
+                          f"queries {row['queries'][0]} -> {row['queries'][1]}, "
+                          f"status {'/'.join(row['status_codes'][1]) or '-'}")
+            line = f"{row['scenario']:<24} {row['status']:<12} {detail}"
+            self.stdout.write(styles.get(row["status"], str)(line))
+
+        regressions = [row for row in rows if row["status"] == "regression"]
+        if regressions and options["fail_on_regression"]:
+            raise CommandError(
+                f"{len(regressions)} scenario(s) regressed: "
+                + "; ".join(f"{r['scenario']}: {', '.join(r['reasons'])}" for r in regressions)
+            )
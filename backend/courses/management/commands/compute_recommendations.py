@@ -0,0 +1,25 @@
+# python manage.py compute_recommendations [--batch-size N] [--top N] [--skip-users]
+from django.core.management.base import BaseCommand
+
+from courses.recommendations import compute_recommendations
+
+
+class Command(BaseCommand):
+    help = "Rebuild precomputed related-course and personal recommendation lists"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None,
+                            help="Rows written per transaction (default: RECOMMENDATION_BATCH_SIZE)")
+        parser.add_argument("--top", type=int, default=None,
+                            help="Courses kept per list (default: RECOMMENDATION_TOP_N)")
+        parser.add_argument("--skip-users", action="store_true",
+                            help="Only rebuild related and popular lists; keep personal lists")
+
+    def handle(self, *args, **options):
+        counts = compute_recommendations(
+            batch_size=options["batch_size"],
+            top_n=options["top"],
+            include_users=not options["skip_users"],
+        )
+        summary = ", ".join(f"{kind}: {count}" for kind, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Recommendations rebuilt ({summary})"))
@@ -0,0 +1,36 @@
+# python manage.py rebuild_category_closure [--check]
+from django.core.management.base import BaseCommand, CommandError
+
+from courses.models import CategoryClosure
+
+
+class Command(BaseCommand):
+    help = "Rebuild or check the category closure table against category parent pointers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true",
+                            help="Only report inconsistencies; exit with an error if any are found")
+        parser.add_argument("--limit", type=int, default=20,
+                            help="Maximum number of links listed per problem type (default: 20)")
+
+    def handle(self, *args, **options):
+        problems = CategoryClosure.objects.check_consistency()
+        for name, items in problems.items():
+            if not items:
+                continue
+            self.stdout.write(self.style.WARNING(f"{name}: {len(items)}"))
+            for item in items[:options["limit"]]:
+                self.stdout.write(f"  {item}")
+
+        if options["check"]:
+            if any(problems.values()):
+                raise CommandError("Category closure table is inconsistent; run rebuild_category_closure")
+            self.stdout.write(self.style.SUCCESS("Category closure table is consistent"))
+            return
+
+        links, cycles = CategoryClosure.objects.rebuild()
+        if cycles:
+            self.stdout.write(self.style.WARNING(
+                f"Categories with looping parent chains kept as isolated nodes: {sorted(cycles)}"
+            ))
+        self.stdout.write(self.style.SUCCESS(f"Category closure rebuilt: {links} links"))
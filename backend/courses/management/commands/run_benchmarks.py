@@ -0,0 +1,60 @@
+# python manage.py run_benchmarks --seed 42 --iterations 20 --output results.json
+from django.core.management.base import BaseCommand, CommandError
+
+from courses.benchmarks import SCALES, SCENARIOS, ScenarioRunner, build_result, write_result
+
+
+class Command(BaseCommand):
+    help = "Run benchmark scenarios against a generated dataset and record p50/p95 and query counts"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=42, help="Seed of the generated dataset (default: 42)")
+        parser.add_argument("--scale", choices=sorted(SCALES), default="",
+                            help="Scale the dataset was generated with (recorded in the result)")
+        parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                            help="Scenario to run (repeatable, default: all)")
+        parser.add_argument("--iterations", type=int, default=20, help="Measured requests per scenario")
+        parser.add_argument("--warmup", type=int, default=2, help="Unmeasured requests per scenario")
+        parser.add_argument("--warm-cache", action="store_true",
+                            help="Keep the cache between iterations instead of clearing it")
+        parser.add_argument("--output", help="Write the JSON result to this file")
+
+    def handle(self, *args, **options):
+        try:
+            runner = ScenarioRunner(
+                seed=options["seed"],
+                iterations=options["iterations"],
+                warmup=options["warmup"],
+                cold_cache=not options["warm_cache"],
+            )
+        except LookupError as e:
+            raise CommandError(str(e))
+
+        scenarios = runner.run(options["scenario"])
+        result = build_result(
+            dataset={"seed": options["seed"], "scale": options["scale"]},
+            settings={
+                "iterations": options["iterations"],
+                "warmup": options["warmup"],
+                "cold_cache": not options["warm_cache"],
+            },
+            scenarios=scenarios,
+        )
+
+        self.stdout.write(f"{'scenario':<24} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8}  status")
+        for name, data in scenarios.items():
+            line = (
+                f"{name:<24} {data['latency_ms']['p50']:>9} {data['latency_ms']['p95']:>9} "
+                f"{data['queries']['max']:>8}  {data['status_codes']}"
+            )
+            self.stdout.write(self.style.ERROR(line) if data["errors"] else line)
+
+        failed = [name for name, data in scenarios.items() if data["errors"]]
+        if failed:
+            self.stdout.write(self.style.WARNING(
+                f"Non-2xx responses in {', '.join(failed)}; their timings measure an error path"
+            ))
+
+        if options["output"]:
+            write_result(result, options["output"])
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
@@ -0,0 +1,29 @@
+# python manage.py run_startup_checks [--force]
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from courses.startup_checks import run_startup_checks
+
+
+class Command(BaseCommand):
+    help = "Run the courses startup probes for this deployment and share the report"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Run the probes even if a report exists for the current migrations",
+        )
+        parser.add_argument(
+            "--fail-on-unhealthy",
+            action="store_true",
+            help="Exit with an error if a critical probe failed",
+        )
+
+    def handle(self, *args, **options):
+        report = run_startup_checks(force=options["force"])
+        self.stdout.write(json.dumps(report, indent=2, default=str))
+
+        if options["fail_on_unhealthy"] and report["status"] == "unhealthy":
+            raise CommandError("Startup checks failed")
@@ -0,0 +1,44 @@
+# python manage.py seed_benchmark_data --scale small --seed 42 [--purge]
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from courses.benchmarks import SCALES, DatasetGenerator, purge_dataset
+
+
+class Command(BaseCommand):
+    help = "Generate a deterministic, production-shaped dataset for benchmarks"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=sorted(SCALES), default="small",
+                            help="Dataset size preset (default: small)")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+        parser.add_argument("--batch-size", type=int, default=2000, help="Rows per INSERT (default: 2000)")
+        parser.add_argument("--purge", action="store_true",
+                            help="Delete the dataset for this seed before generating")
+        parser.add_argument("--purge-only", action="store_true",
+                            help="Delete the dataset for this seed and exit")
+
+    def handle(self, *args, **options):
+        seed = options["seed"]
+        if options["purge"] or options["purge_only"]:
+            deleted = purge_dataset(seed)
+            self.stdout.write(f"Purged dataset for seed {seed}: {json.dumps(deleted)}")
+            if options["purge_only"]:
+                return
+
+        generator = DatasetGenerator(options["scale"], seed, options["batch_size"])
+        started = time.monotonic()
+        try:
+            counts = generator.run()
+        except Exception as e:
+            raise CommandError(
+                f"Could not generate dataset (use --purge if seed {seed} already exists): {e}"
+            )
+
+        self.stdout.write(json.dumps(counts, indent=2))
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated '{options['scale']}' dataset with seed {seed} "
+            f"in {time.monotonic() - started:.1f}s"
+        ))
@@ -0,0 +1,51 @@
+# Generated by Django 5.2 on 2026-10-18 22:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_closure(apps, schema_editor):
+    """Backfill links for existing categories from their parent pointers"""
+    Category = apps.get_model("courses", "Category")
+    CategoryClosure = apps.get_model("courses", "CategoryClosure")
+
+    parents = dict(Category.objects.values_list("id", "parent_id"))
+    links = []
+    for category_id in parents:
+        chain, node = [], category_id
+        while node is not None and node not in chain:
+            chain.append(node)
+            node = parents.get(node)
+        if node is not None:
+            chain = [category_id]  # parent chain loops; left for the consistency check
+        links.extend(
+            CategoryClosure(ancestor_id=ancestor, descendant_id=category_id, depth=depth)
+            for depth, ancestor in enumerate(chain)
+        )
+    CategoryClosure.objects.bulk_create(links, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_alter_course_completion_status_alter_course_level_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField(help_text='Number of levels between ancestor and descendant')),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='courses.category')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='courses.category')),
+            ],
+            options={
+                'verbose_name': 'Category Closure',
+                'verbose_name_plural': 'Category Closure',
+                'indexes': [models.Index(fields=['descendant', 'depth'], name='category_closure_desc_idx')],
+                'constraints': [models.UniqueConstraint(fields=('ancestor', 'descendant'), name='unique_category_closure_link')],
+            },
+        ),
+        migrations.RunPython(populate_closure, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-18 23:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_category_closure'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('related', 'Related courses'), ('user', 'Personal suggestions'), ('popular', 'Popular courses')], max_length=10)),
+                ('items', models.JSONField(default=list, help_text='Ranked course summaries with their scores')),
+                ('computed_at', models.DateTimeField(db_index=True)),
+                ('course', models.ForeignKey(blank=True, help_text='Course the related list belongs to', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='recommendation_rows', to='courses.course')),
+                ('user', models.ForeignKey(blank=True, help_text='User the personal suggestions belong to', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='course_recommendations', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Course Recommendation',
+                'verbose_name_plural': 'Course Recommendations',
+                'constraints': [models.UniqueConstraint(condition=models.Q(('kind', 'related')), fields=('course',), name='unique_related_recommendation'), models.UniqueConstraint(condition=models.Q(('kind', 'user')), fields=('user',), name='unique_user_recommendation'), models.UniqueConstraint(condition=models.Q(('kind', 'popular')), fields=('kind',), name='unique_popular_recommendation')],
+            },
+        ),
+    ]
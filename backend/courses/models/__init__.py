@@ -19,6 +19,7 @@ from .core import get_default_category, AnalyticsCourseMixin
 # Import and re-export from core.py
 from .core import (
     Category,
+    CategoryClosure,
     Course,
     Module,
     Lesson,
@@ -40,6 +41,7 @@ from .analytics import (
     UserActivity,
     CourseStats,
     UserStats,
+    CourseRecommendation,
     Notification,
     Assessment,
     Question,
@@ -80,6 +82,7 @@ __all__ = [
 
     # Core models
     'Category',
+    'CategoryClosure',
     'Course',
     'Module',
     'Lesson',
@@ -97,6 +100,7 @@ __all__ = [
     'UserActivity',
     'CourseStats',
     'UserStats',
+    'CourseRecommendation',
     'Notification',
     'Assessment',
     'Question',
@@ -1164,6 +1164,74 @@ class UserStats(TimeStampedMixin):
         return f"Stats for {self.user.username}"
 
 
+class CourseRecommendation(models.Model):
+    """
+    Precomputed course suggestions, rebuilt in batches by
+    courses.recommendations.compute_recommendations.
+
+    One row per course (related courses), per user (personal suggestions)
+    and one popular row used as the fallback. Items are denormalized so a
+    suggestion list is served from a single indexed lookup.
+    """
+
+    KIND_RELATED = "related"
+    KIND_USER = "user"
+    KIND_POPULAR = "popular"
+    KIND_CHOICES = [
+        (KIND_RELATED, _("Related courses")),
+        (KIND_USER, _("Personal suggestions")),
+        (KIND_POPULAR, _("Popular courses")),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    course = models.ForeignKey(
+        "Course",
+        on_delete=models.CASCADE,
+        related_name="recommendation_rows",
+        null=True,
+        blank=True,
+        help_text="Course the related list belongs to",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="course_recommendations",
+        null=True,
+        blank=True,
+        help_text="User the personal suggestions belong to",
+    )
+    items = models.JSONField(
+        default=list, help_text="Ranked course summaries with their scores"
+    )
+    computed_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        app_label = "courses"
+        verbose_name = "Course Recommendation"
+        verbose_name_plural = "Course Recommendations"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["course"],
+                condition=models.Q(kind="related"),
+                name="unique_related_recommendation",
+            ),
+            models.UniqueConstraint(
+                fields=["user"],
+                condition=models.Q(kind="user"),
+                name="unique_user_recommendation",
+            ),
+            models.UniqueConstraint(
+                fields=["kind"],
+                condition=models.Q(kind="popular"),
+                name="unique_popular_recommendation",
+            ),
+        ]
+
+    def __str__(self):
+        owner = self.course_id or self.user_id or "all"
+        return f"{self.kind} recommendations for {owner}"
+
+
 class Notification(TimeStampedMixin):
     """Course-related notifications for users"""
 
@@ -220,7 +220,10 @@ class Category(TimeStampedMixin, SlugMixin, StateMixin):
         return normalized.strip()
 
     def save(self, *args, **kwargs):
-        """Enhanced save with atomic slug generation and name normalization"""
+        """
+        Enhanced save with atomic slug generation and name normalization.
+        Keeps CategoryClosure in step with inserts and parent changes.
+        """
         if self.name:
             self.name = self.normalize_name(self.name)
 
@@ -230,44 +233,82 @@ class Category(TimeStampedMixin, SlugMixin, StateMixin):
 
         # Use transaction for atomicity
         with transaction.atomic():
+            is_new = self._state.adding
+            old_parent_id = None
+            if not is_new:
+                old_parent_id = (
+                    Category.objects.filter(pk=self.pk)
+                    .values_list("parent_id", flat=True)
+                    .first()
+                )
+                if self.parent_id != old_parent_id and self.parent_id is not None:
+                    if CategoryClosure.objects.filter(
+                        ancestor_id=self.pk, descendant_id=self.parent_id
+                    ).exists():
+                        raise ValidationError(
+                            "A category cannot be moved under itself or one of its subcategories"
+                        )
+
             super().save(*args, **kwargs)
 
+            if is_new:
+                CategoryClosure.objects.insert_nodes([self])
+            elif self.parent_id != old_parent_id:
+                CategoryClosure.objects.move_subtree(self)
+
     def get_course_count(self) -> int:
         """Get count of active courses in this category"""
         return self.courses.select_related("category").filter(is_published=True).count()
 
     def get_all_courses(self):
         """Get all courses in this category and its subcategories"""
-        from django.db.models import Q
-
-        descendant_ids = self._get_descendant_ids()
-
         return (
             Course.objects.select_related("category", "parent_version")
             .prefetch_related(
-                "instructor_portal_relationships__instructor", "modules__lessons"
+                "courseinstructor_set__instructor", "modules__lessons"
             )
             .filter(
-                Q(category_id__in=descendant_ids) | Q(category=self), is_published=True
+                category_id__in=self._descendant_links().values("descendant_id"),
+                is_published=True,
             )
-            .distinct()
         )
 
-    def _get_descendant_ids(self):
-        """Get all descendant category IDs recursively"""
-        descendant_ids = [self.id]
-        children = list(
-            self.category_children.filter(is_active=True).values_list("id", flat=True)
+    def get_subtree_course_count(self) -> int:
+        """Count published courses in this category and its subcategories"""
+        return Course.objects.filter(
+            category_id__in=self._descendant_links().values("descendant_id"),
+            is_published=True,
+        ).count()
+
+    def get_descendants(self, include_self=False):
+        """All subcategories at any depth, nearest first (one query)"""
+        links = CategoryClosure.objects.filter(ancestor=self)
+        if not include_self:
+            links = links.filter(depth__gt=0)
+        return Category.objects.filter(
+            ancestor_links__in=links
+        ).order_by("ancestor_links__depth", "sort_order", "name")
+
+    def get_ancestors(self, include_self=False):
+        """Parent chain from the root down (one query)"""
+        links = CategoryClosure.objects.filter(descendant=self)
+        if not include_self:
+            links = links.filter(depth__gt=0)
+        return Category.objects.filter(descendant_links__in=links).order_by(
+            "-descendant_links__depth"
         )
 
-        for child_id in children:
-            try:
-                child = Category.objects.get(id=child_id)
-                descendant_ids.extend(child._get_descendant_ids())
-            except Category.DoesNotExist:
-                continue
+    def get_breadcrumbs(self):
+        """Root-to-self path as ``[{"id", "name", "slug"}, ...]``"""
+        return list(self.get_ancestors(include_self=True).values("id", "name", "slug"))
+
+    def _descendant_links(self):
+        """Closure rows of the visible subtree: inactive subcategories hide their branch"""
+        return CategoryClosure.objects.visible().filter(ancestor=self)
 
-        return descendant_ids
+    def _get_descendant_ids(self):
+        """Get all visible descendant category IDs, including this one"""
+        return list(self._descendant_links().values_list("descendant_id", flat=True))
 
     def __str__(self) -> str:
         return self.name
@@ -294,6 +335,173 @@ class Category(TimeStampedMixin, SlugMixin, StateMixin):
         ]
 
 
+class CategoryClosureManager(models.Manager):
+    """
+    Maintenance of the category closure table.
+
+    Category.save calls insert_nodes and move_subtree, and a pre_delete
+    receiver in courses/signals.py calls detach_subtree. Writes that bypass
+    those hooks (bulk_create, queryset.update(parent=...)) must call them
+    directly, or run ``python manage.py rebuild_category_closure``.
+    """
+
+    def visible(self):
+        """Links whose path below the ancestor crosses no inactive category"""
+        hidden = self.filter(
+            descendant=models.OuterRef("descendant"),
+            ancestor__is_active=False,
+            depth__lt=models.OuterRef("depth"),
+        )
+        return self.filter(~models.Exists(hidden))
+
+    def subtree_course_count(self, outer_ref="pk"):
+        """Expression counting published courses in the visible subtree of ``OuterRef(outer_ref)``"""
+        from django.db.models.functions import Coalesce
+
+        counts = (
+            self.visible()
+            .filter(
+                ancestor=models.OuterRef(outer_ref),
+                descendant__courses__is_published=True,
+            )
+            .order_by()
+            .values("ancestor")
+            .annotate(n=models.Count("descendant__courses"))
+            .values("n")
+        )
+        return Coalesce(models.Subquery(counts, output_field=models.IntegerField()), 0)
+
+    def insert_nodes(self, categories):
+        """Add links for new categories; parents must come before their children"""
+        parent_ids = {c.parent_id for c in categories if c.parent_id}
+        chains = {}
+        for ancestor_id, descendant_id, depth in self.filter(
+            descendant_id__in=parent_ids
+        ).values_list("ancestor_id", "descendant_id", "depth"):
+            chains.setdefault(descendant_id, []).append((ancestor_id, depth))
+
+        links = []
+        for category in categories:
+            chain = [(category.pk, 0)] + [
+                (ancestor_id, depth + 1)
+                for ancestor_id, depth in chains.get(category.parent_id, [])
+            ]
+            chains[category.pk] = chain
+            links.extend(
+                self.model(ancestor_id=ancestor_id, descendant_id=category.pk, depth=depth)
+                for ancestor_id, depth in chain
+            )
+        self.bulk_create(links)
+
+    def detach_subtree(self, category):
+        """Cut the links between a subtree and the ancestors of its root"""
+        subtree = self.filter(ancestor_id=category.pk).values("descendant_id")
+        self.filter(descendant_id__in=subtree).exclude(ancestor_id__in=subtree).delete()
+
+    def move_subtree(self, category):
+        """Re-link a subtree under the category's current parent"""
+        self.detach_subtree(category)
+        if category.parent_id is None:
+            return
+        subtree = list(
+            self.filter(ancestor_id=category.pk).values_list("descendant_id", "depth")
+        )
+        ancestors = list(
+            self.filter(descendant_id=category.parent_id).values_list("ancestor_id", "depth")
+        )
+        self.bulk_create(
+            self.model(
+                ancestor_id=ancestor_id,
+                descendant_id=descendant_id,
+                depth=ancestor_depth + descendant_depth + 1,
+            )
+            for ancestor_id, ancestor_depth in ancestors
+            for descendant_id, descendant_depth in subtree
+        )
+
+    def expected_links(self):
+        """
+        Compute the closure from parent pointers.
+
+        Returns ``(links, cycles)``: the set of ``(ancestor, descendant,
+        depth)`` triples and the ids of categories whose parent chain loops.
+        Categories on a cycle only get their self link.
+        """
+        parents = dict(Category.objects.values_list("id", "parent_id"))
+        links, cycles = set(), set()
+        for category_id in parents:
+            chain, node = [], category_id
+            while node is not None and node not in chain:
+                chain.append(node)
+                node = parents.get(node)
+            if node is not None:
+                cycles.add(category_id)
+                chain = [category_id]
+            links.update((ancestor, category_id, depth) for depth, ancestor in enumerate(chain))
+        return links, cycles
+
+    def rebuild(self):
+        """Replace every link with the closure computed from parent pointers"""
+        links, cycles = self.expected_links()
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(
+                (self.model(ancestor_id=a, descendant_id=d, depth=depth) for a, d, depth in links),
+                batch_size=1000,
+            )
+        return len(links), cycles
+
+    def check_consistency(self):
+        """
+        Compare stored links with parent pointers.
+
+        Returns ``{"missing": [...], "unexpected": [...], "cycles": [...]}``;
+        every list is empty when the table is consistent.
+        """
+        expected, cycles = self.expected_links()
+        actual = set(self.values_list("ancestor_id", "descendant_id", "depth"))
+        return {
+            "missing": sorted(expected - actual),
+            "unexpected": sorted(actual - expected),
+            "cycles": sorted(cycles),
+        }
+
+
+class CategoryClosure(models.Model):
+    """
+    Closure table for the category tree: one row per (ancestor, descendant)
+    pair, including each category paired with itself at depth 0, so ancestor
+    and descendant lookups are single indexed queries at any depth.
+    """
+
+    ancestor = models.ForeignKey(
+        Category, on_delete=models.CASCADE, related_name="descendant_links"
+    )
+    descendant = models.ForeignKey(
+        Category, on_delete=models.CASCADE, related_name="ancestor_links"
+    )
+    depth = models.PositiveIntegerField(
+        help_text="Number of levels between ancestor and descendant"
+    )
+
+    objects = CategoryClosureManager()
+
+    def __str__(self) -> str:
+        return f"{self.ancestor_id} -> {self.descendant_id} ({self.depth})"
+
+    class Meta:
+        verbose_name = "Category Closure"
+        verbose_name_plural = "Category Closure"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ancestor", "descendant"], name="unique_category_closure_link"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["descendant", "depth"], name="category_closure_desc_idx"),
+        ]
+
+
 # =====================================
 # COURSE MODEL AND RELATED
 # =====================================
@@ -593,9 +801,7 @@ class Course(
                 cloned_course = self
                 original_course = (
                     Course.objects.select_related("category")
-                    .prefetch_related(
-                        "instructor_portal_relationships__instructor"  # UPDATED: Use instructor_portal relationship
-                    )
+                    .prefetch_related("courseinstructor_set__instructor")
                     .get(pk=original_id)
                 )
 
@@ -605,9 +811,7 @@ class Course(
                 instructor_relations = []
                 for (
                     instructor_rel
-                ) in original_course.instructor_portal_relationships.select_related(
-                    "instructor"
-                ).all():
+                ) in original_course.courseinstructor_set.all():
                     instructor_relations.append(
                         CourseInstructor(
                             course=cloned_course,
@@ -626,6 +830,20 @@ class Course(
                     instructor_relations, ignore_conflicts=True
                 )
 
+                # bulk_create sends no signals: recompile the copied
+                # instructors' permission matrices
+                from courses import permission_matrix
+
+                instructor_ids = {rel.instructor_id for rel in instructor_relations}
+                for instructor_id in instructor_ids:
+                    permission_matrix.forget_local(instructor_id)
+
+                def invalidate_instructors():
+                    for instructor_id in instructor_ids:
+                        permission_matrix.invalidate_permissions(instructor_id)
+
+                transaction.on_commit(invalidate_instructors)
+
                 # Ensure creator is an instructor
                 CourseInstructor.objects.get_or_create(
                     course=cloned_course,
@@ -643,6 +861,14 @@ class Course(
                 if clone_options["copy_modules"]:
                     self._copy_modules(original_course, cloned_course, clone_options)
 
+                # Instructors, modules and lessons were bulk-created without
+                # signals; retire anything cached under the new course id
+                from courses import response_cache
+
+                transaction.on_commit(
+                    lambda: response_cache.bump_course(cloned_course.pk)
+                )
+
                 logger.info(
                     f"Course cloned: {original_title} -> {cloned_course.title} by {creator.username}"
                 )
@@ -210,6 +210,27 @@ class Enrollment(TimeStampedMixin):
                     completion_date=self.completion_date,
                 )
 
+                # update() sends no signals: retire the user's cached course
+                # detail, and the public one when a completion changes counts
+                from courses import response_cache
+
+                course_id, user_id = self.course_id, self.user_id
+                status_changed = previous_status != self.status
+                transaction.on_commit(
+                    lambda: response_cache.bump_course_user(course_id, user_id)
+                )
+                if status_changed:
+                    # The permission matrix records the enrollment status
+                    from courses import permission_matrix
+
+                    permission_matrix.forget_local(user_id)
+                    transaction.on_commit(
+                        lambda: permission_matrix.invalidate_permissions(user_id)
+                    )
+                    transaction.on_commit(
+                        lambda: response_cache.bump_course(course_id)
+                    )
+
                 # Update course analytics if necessary (only on completion)
                 if previous_status != self.status and self.status == "completed":
                     try:
@@ -379,6 +400,16 @@ class Progress(TimeStampedMixin):
 
                 # FIXED: Only trigger progress update on completion status change
                 if is_new_completion:
+                    from courses import leaderboards
+
+                    transaction.on_commit(
+                        lambda: leaderboards.record_lesson_completion(
+                            self.enrollment.user_id,
+                            self.enrollment.course_id,
+                            self.completed_date,
+                        )
+                    )
+
                     # FIXED: Defer expensive aggregation to Celery task to prevent N×DB hits in loops
                     try:
                         from django.conf import settings
@@ -0,0 +1,323 @@
+#
+# File Path: backend/courses/permission_matrix.py
+# Folder Path: backend/courses/
+# Date Created: 2026-10-18 00:00:00
+# Version: 1.0.0
+#
+# Compiled per-user permission matrix for course access checks
+#
+# Everything the course permission checks ask about a user is loaded in one
+# pass: enrollments and their status, CourseInstructor rows with their permission
+# flags, staff/role status and the subscription access level. That is three
+# queries, compiled into a plain dict. The dict is cached, and is memoized
+# on the user object for the rest of the request. A course detail with 50
+# lessons then answers every is_enrolled / is_instructor / access-level check
+# from memory, instead of making one cache round trip per check.
+#
+# Invalidation is versioned: each user has a version token, and the cached
+# matrix records the token it was compiled under. The token and the matrix
+# are fetched together in one get_many. Signals in courses/signals.py
+# replace the token when the user's enrollments, instructor roles,
+# subscription or account flags change. Writes that send no signals
+# (bulk_create, QuerySet.update) must call invalidate_permissions themselves;
+# clone_version and Enrollment progress updates do.
+#
+# Throttles and pagination only need the access level: get_access_level reads
+# it from a memoized or cached matrix and otherwise resolves it alone, so a
+# request that checks no course permission never compiles a matrix.
+#
+# Settings:
+# - COURSE_PERMISSION_MATRIX_TIMEOUT: seconds a compiled matrix is kept (default: 900)
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+MATRIX_PREFIX = "permission_matrix"
+VERSION_PREFIX = "permission_matrix_version"
+VERSION_TIMEOUT = 7 * 86400
+
+INSTRUCTOR_PERMISSION_FIELDS = (
+    "can_edit_content",
+    "can_manage_students",
+    "can_view_analytics",
+)
+
+# Bumped on every invalidation in this process, so memoized contexts are
+# recompiled. A change made by a request must be visible to it before the
+# transaction commits and the token changes: users changed in the open
+# transaction of a thread are compiled from the database, bypassing the cache.
+_local_epoch = 0
+_epoch_lock = threading.Lock()
+_pending = threading.local()
+
+
+def get_timeout() -> int:
+    return getattr(settings, "COURSE_PERMISSION_MATRIX_TIMEOUT", 900)
+
+
+def _matrix_key(user_id: int) -> str:
+    return f"{MATRIX_PREFIX}:{user_id}"
+
+
+def _version_key(user_id: int) -> str:
+    return f"{VERSION_PREFIX}:{user_id}"
+
+
+# =====================================
+# PERMISSION CONTEXT
+# =====================================
+
+
+class PermissionContext:
+    """Read-only view of one user's compiled permission matrix"""
+
+    def __init__(self, matrix: Dict[str, Any]):
+        self.matrix = matrix
+        self.user_id = matrix.get("user_id")
+        self.access_level = matrix["access_level"]
+        self.is_admin = matrix["is_admin"]
+        self.has_instructor_role = matrix["has_instructor_role"]
+        self.enrollments = matrix["enrollments"]
+        self.enrolled = frozenset(
+            course_id for course_id, status in self.enrollments.items() if status == "active"
+        )
+        self.instructor = matrix["instructor"]
+
+    def is_enrolled(self, course_id: Optional[int]) -> bool:
+        """Active enrollment in a course"""
+        return course_id in self.enrolled
+
+    def has_enrollment(self, course_id: Optional[int]) -> bool:
+        """Enrollment in a course with any status, e.g. completed or dropped"""
+        return course_id in self.enrollments
+
+    def is_instructor(self, course_id: Optional[int] = None) -> bool:
+        """
+        Staff, superusers and users with an instructor role count as
+        instructors of every course, as in is_user_instructor_cached
+        """
+        if self.is_admin or self.has_instructor_role:
+            return True
+        if course_id is None:
+            return bool(self.instructor)
+        return course_id in self.instructor
+
+    def instructor_role(self, course_id: int) -> Optional[Dict[str, Any]]:
+        """The user's CourseInstructor role and flags for a course, if any"""
+        return self.instructor.get(course_id)
+
+    def has_instructor_permission(self, course_id: int, permission: str) -> bool:
+        """can_edit_content / can_manage_students / can_view_analytics for a course"""
+        if self.is_admin:
+            return True
+        role = self.instructor.get(course_id)
+        return bool(role and role.get(permission))
+
+    def can_access(self, required_level: str) -> bool:
+        from .validation import can_user_access_content
+
+        return can_user_access_content(self.access_level, required_level)
+
+
+def _guest_matrix() -> Dict[str, Any]:
+    from .validation import ACCESS_LEVELS
+
+    return {
+        "user_id": None,
+        "version": None,
+        "access_level": ACCESS_LEVELS["GUEST"],
+        "is_admin": False,
+        "has_instructor_role": False,
+        "enrollments": {},
+        "instructor": {},
+    }
+
+
+_guest_context: Optional[PermissionContext] = None
+
+
+def guest_context() -> PermissionContext:
+    global _guest_context
+    if _guest_context is None:
+        _guest_context = PermissionContext(_guest_matrix())
+    return _guest_context
+
+
+# =====================================
+# COMPILATION
+# =====================================
+
+
+def compile_matrix(user, version: Optional[str] = None) -> Dict[str, Any]:
+    """Load everything the permission checks need for a user in one pass"""
+    from instructor_portal.models import CourseInstructor
+
+    from .models import Enrollment
+    from .validation import resolve_user_access_level
+
+    enrollments = dict(
+        Enrollment.objects.filter(user_id=user.pk).values_list("course_id", "status")
+    )
+
+    instructor = {
+        row["course_id"]: row
+        for row in CourseInstructor.objects.filter(
+            instructor_id=user.pk, is_active=True
+        ).values("course_id", "role", "is_lead", *INSTRUCTOR_PERMISSION_FIELDS)
+    }
+
+    allowed_instructor_roles = getattr(
+        settings, "ALLOWED_INSTRUCTOR_ROLES", ["instructor", "administrator"]
+    )
+
+    return {
+        "user_id": user.pk,
+        "version": version,
+        "access_level": resolve_user_access_level(user),
+        "is_admin": bool(user.is_staff or user.is_superuser),
+        "has_instructor_role": getattr(user, "role", None) in allowed_instructor_roles,
+        "enrollments": enrollments,
+        "instructor": instructor,
+    }
+
+
+def _pending_users() -> set:
+    users = getattr(_pending, "users", None)
+    if users is None:
+        users = _pending.users = set()
+    return users
+
+
+def _is_pending(user) -> bool:
+    """Whether the user was changed in this thread's open transaction"""
+    pending = _pending_users()
+    if pending and not connection.in_atomic_block:
+        # Committed or rolled back
+        pending.clear()
+    return user.pk in pending
+
+
+def _cached_matrix(user):
+    """
+    ``(version, matrix)`` from the cache in one round trip; ``matrix`` is
+    None when missing or compiled under an older version token
+    """
+    found = cache.get_many([_version_key(user.pk), _matrix_key(user.pk)])
+    version = found.get(_version_key(user.pk))
+    matrix = found.get(_matrix_key(user.pk))
+    if version is None or matrix is None or matrix.get("version") != version:
+        return version, None
+    return version, matrix
+
+
+def _load_matrix(user) -> Dict[str, Any]:
+    if _is_pending(user):
+        return compile_matrix(user)
+
+    try:
+        version, matrix = _cached_matrix(user)
+    except Exception as e:
+        logger.warning(f"Permission matrix cache unavailable for user {user.pk}: {e}")
+        return compile_matrix(user)
+    if matrix is not None:
+        return matrix
+
+    if version is None:
+        # Never set or evicted: a fresh token keeps older matrices from coming back
+        version_key = _version_key(user.pk)
+        version = repr(time.time())
+        cache.add(version_key, version, VERSION_TIMEOUT)
+        version = cache.get(version_key) or version
+
+    matrix = compile_matrix(user, version)
+    try:
+        cache.set(_matrix_key(user.pk), matrix, get_timeout())
+    except Exception as e:
+        logger.warning(f"Could not cache permission matrix for user {user.pk}: {e}")
+    return matrix
+
+
+def get_permission_context(user) -> PermissionContext:
+    """
+    Permission context for a user, compiled at most once per user object.
+
+    The user object is request.user for the duration of a request, so every
+    permission class, view and serializer handling the request shares it.
+    """
+    if user is None or not getattr(user, "is_authenticated", False):
+        return guest_context()
+
+    epoch = _local_epoch
+    memo = getattr(user, "_permission_context", None)
+    if memo is not None and memo[0] == epoch:
+        return memo[1]
+
+    return _memoize(user, epoch, PermissionContext(_load_matrix(user)))
+
+
+def _memoize(user, epoch: int, context: PermissionContext) -> PermissionContext:
+    try:
+        user._permission_context = (epoch, context)
+    except AttributeError:
+        pass
+    return context
+
+
+def get_access_level(user) -> str:
+    """
+    Access level of a user, without compiling the matrix when it is neither
+    memoized nor cached. Throttles and pagination ask for it on every
+    request, most of which never check an enrollment or instructor role.
+    """
+    from .validation import resolve_user_access_level
+
+    epoch = _local_epoch
+    memo = getattr(user, "_permission_context", None)
+    if memo is not None and memo[0] == epoch:
+        return memo[1].access_level
+
+    if not _is_pending(user):
+        try:
+            _, matrix = _cached_matrix(user)
+        except Exception as e:
+            logger.warning(f"Permission matrix cache unavailable for user {user.pk}: {e}")
+            matrix = None
+        if matrix is not None:
+            return _memoize(user, epoch, PermissionContext(matrix)).access_level
+
+    return resolve_user_access_level(user)
+
+
+# =====================================
+# INVALIDATION
+# =====================================
+
+
+def forget_local(user_id: int):
+    """
+    Drop contexts memoized in this process, and compile the user's matrix
+    from the database until the current transaction ends
+    """
+    global _local_epoch
+    with _epoch_lock:
+        _local_epoch += 1
+    if connection.in_atomic_block:
+        _pending_users().add(user_id)
+
+
+def invalidate_permissions(user_id: int):
+    """Replace the user's version token so every cached matrix is recompiled"""
+    forget_local(user_id)
+    _pending_users().discard(user_id)
+    try:
+        cache.set(_version_key(user_id), repr(time.time()), VERSION_TIMEOUT)
+    except Exception as e:
+        logger.error(f"Error invalidating permission matrix for user {user_id}: {e}")
@@ -20,12 +20,12 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.db.models import Exists, OuterRef
-from instructor_portal.models import CourseInstructor
 from rest_framework import permissions
 from rest_framework.request import Request
 from rest_framework.views import APIView
 
-from .models import Course, Enrollment
+from .models import Course
+from .permission_matrix import get_permission_context, invalidate_permissions
 
 
 def get_course_from_object(obj):
@@ -42,8 +42,6 @@ logger = logging.getLogger(__name__)
 User = get_user_model()
 
 # Cache timeouts for performance optimization
-ENROLLMENT_CACHE_TIMEOUT = 300  # 5 minutes
-INSTRUCTOR_CACHE_TIMEOUT = 600  # 10 minutes
 COURSE_CACHE_TIMEOUT = 300  # 5 minutes - NEW: Added course caching
 
 
@@ -54,31 +52,14 @@ COURSE_CACHE_TIMEOUT = 300  # 5 minutes - NEW: Added course caching
 
 def is_user_enrolled_cached(user, course) -> bool:
     """
-    Check enrollment status with caching for performance
-    FIXED: Enhanced with select_related optimization
+    Check enrollment status against the user's compiled permission matrix
+    The matrix is loaded once per request, so repeated checks cost nothing
     """
     if not user or not user.is_authenticated or not course:
         return False
 
-    cache_key = f"enrollment:{user.id}:{course.id}"
-
-    # Try cache first
-    result = cache.get(cache_key)
-    if result is not None:
-        return result
-
-    # Database query with optimization
     try:
-        # FIXED: Added select_related to prevent additional queries
-        is_enrolled = (
-            Enrollment.objects.select_related("user", "course")
-            .filter(user=user, course=course, status="active")
-            .exists()
-        )
-
-        # Cache the result
-        cache.set(cache_key, is_enrolled, ENROLLMENT_CACHE_TIMEOUT)
-        return is_enrolled
+        return get_permission_context(user).is_enrolled(course.id)
 
     except Exception as e:
         logger.error(
@@ -89,8 +70,8 @@ def is_user_enrolled_cached(user, course) -> bool:
 
 def is_user_instructor_cached(user, course=None) -> bool:
     """
-    Check instructor status with caching for performance
-    FIXED: Added configurable instructor roles from settings
+    Check instructor status against the user's compiled permission matrix
+    Staff, superusers and ALLOWED_INSTRUCTOR_ROLES count as instructors of any course
     """
     if not user or not user.is_authenticated:
         return False
@@ -99,102 +80,26 @@ def is_user_instructor_cached(user, course=None) -> bool:
     if user.is_staff or user.is_superuser:
         return True
 
-    # FIXED: Use configurable instructor roles from settings
-    allowed_instructor_roles = getattr(
-        settings, "ALLOWED_INSTRUCTOR_ROLES", ["instructor", "administrator"]
-    )
-
-    # Check user role if available
-    if hasattr(user, "role") and user.role in allowed_instructor_roles:
-        return True
-
-    # Course-specific instructor check with caching
-    if course:
-        cache_key = f"instructor:{user.id}:{course.id}"
-        result = cache.get(cache_key)
-        if result is not None:
-            return result
-
-        try:
-            # FIXED: Added select_related to prevent additional queries
-            is_instructor = (
-                CourseInstructor.objects.select_related("course", "instructor")
-                .filter(course=course, instructor=user, is_active=True)
-                .exists()
-            )
-
-            cache.set(cache_key, is_instructor, INSTRUCTOR_CACHE_TIMEOUT)
-            return is_instructor
-
-        except Exception as e:
-            logger.error(
-                f"Error checking instructor status for user {user.id} in course {course.id}: {e}"
-            )
-            return False
-
-    # General instructor check with caching
-    cache_key = f"instructor_any:{user.id}"
-    result = cache.get(cache_key)
-    if result is not None:
-        return result
-
     try:
-        # FIXED: Added select_related to prevent additional queries
-        is_instructor = (
-            CourseInstructor.objects.select_related("instructor")
-            .filter(instructor=user, is_active=True)
-            .exists()
+        return get_permission_context(user).is_instructor(
+            course.id if course else None
         )
 
-        cache.set(cache_key, is_instructor, INSTRUCTOR_CACHE_TIMEOUT)
-        return is_instructor
-
     except Exception as e:
-        logger.error(
-            f"Error checking general instructor status for user {user.id}: {e}"
-        )
+        logger.error(f"Error checking instructor status for user {user.id}: {e}")
         return False
 
 
 def get_user_access_level_safe(user) -> str:
     """
     Safe access level determination with proper fallbacks
-    FIXED: Enhanced error handling and caching
+    Read from the user's compiled permission matrix
     """
     if not user or not user.is_authenticated:
         return "guest"
 
-    # FIXED: Add caching for access level determination
-    cache_key = f"access_level:{user.id}"
-    cached_level = cache.get(cache_key)
-    if cached_level:
-        return cached_level
-
     try:
-        # Import here to avoid circular imports - consolidated access logic
-        from .validation import get_unified_user_access_level
-
-        access_level = get_unified_user_access_level(user)
-        # Cache for 5 minutes
-        cache.set(cache_key, access_level, 300)
-        return access_level
-    except ImportError:
-        logger.warning("Could not import get_unified_user_access_level, using fallback")
-        # Fallback logic
-        if user.is_staff or user.is_superuser:
-            access_level = "premium"
-        elif hasattr(user, "subscription") and getattr(
-            user.subscription, "is_active", False
-        ):
-            access_level = "premium"
-        elif user.is_authenticated:
-            access_level = "registered"
-        else:
-            access_level = "guest"
-
-        # Cache fallback result too
-        cache.set(cache_key, access_level, 300)
-        return access_level
+        return get_permission_context(user).access_level
     except Exception as e:
         logger.error(f"Error determining user access level for user {user.id}: {e}")
         return "registered" if user.is_authenticated else "guest"
@@ -724,6 +629,7 @@ def clear_permission_cache(user_id: int, course_id: int = None):
             )
 
         cache.delete_many(cache_keys)
+        invalidate_permissions(user_id)
         logger.debug(f"Cleared permission cache for user {user_id}")
 
     except Exception as e:
@@ -733,22 +639,14 @@ def clear_permission_cache(user_id: int, course_id: int = None):
 def bulk_check_enrollments(user, course_ids: list) -> dict:
     """
     Efficiently check enrollment status for multiple courses
-    FIXED: Enhanced with select_related optimization
+    Answered from the user's compiled permission matrix
     """
     try:
         if not user or not user.is_authenticated:
             return {course_id: False for course_id in course_ids}
 
-        # FIXED: Get all enrollments in one optimized query
-        enrollments = (
-            Enrollment.objects.select_related("user", "course")
-            .filter(user=user, course_id__in=course_ids, status="active")
-            .values_list("course_id", flat=True)
-        )
-
-        enrolled_course_ids = set(enrollments)
-
-        return {course_id: course_id in enrolled_course_ids for course_id in course_ids}
+        context = get_permission_context(user)
+        return {course_id: context.is_enrolled(course_id) for course_id in course_ids}
 
     except Exception as e:
         logger.error(f"Error in bulk enrollment check: {e}")
@@ -772,5 +670,6 @@ __all__ = [
     "is_user_instructor_cached",
     "clear_permission_cache",
     "bulk_check_enrollments",
+    "get_permission_context",
     "IsCourseInstructor",
 ]
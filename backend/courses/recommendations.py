@@ -0,0 +1,529 @@
+#
+# File Path: backend/courses/recommendations.py
+# Folder Path: backend/courses/
+# Date Created: 2026-10-18 00:00:00
+# Version: 1.0.0
+#
+# Precomputed related-course and personal recommendation engine
+#
+# Suggestions are computed offline, by the courses.compute_recommendations
+# Celery task or the compute_recommendations management command, and stored
+# as CourseRecommendation rows. Each row holds a ranked list of compact course
+# summaries, so serving a list costs one indexed lookup on the course
+# slug or user id. After the first request, that lookup is a cache hit.
+#
+# Related courses are scored from three signals:
+# - co-enrollment: cosine similarity between the courses' enrollment sets. Each
+#   enrollment is weighted by the user's review rating: 1 star counts 0, an
+#   unreviewed course 1, 5 stars 2. Users enrolled in more than
+#   RECOMMENDATION_MAX_USER_COURSES courses are skipped, because they add pairs
+#   quadratically and say little about any one pair. Enrollments are indexed
+#   by user and by course, and similarities are computed one course at a
+#   time, so no map of every course pair is built.
+# - category: Jaccard similarity of the two courses' category ancestor sets,
+#   read from the category closure table.
+# - tags: Jaccard similarity of skills and meta keywords, plus a share for
+#   the same level.
+# Content candidates come from courses that share a category, a parent
+# category or a tag. Each bucket is capped at the most enrolled courses, so
+# no pass is quadratic in the catalog size.
+#
+# Personal suggestions add up a user's related lists, weighted by the same
+# rating weights, and leave out courses the user is already enrolled in.
+# Users without enrollments, and anonymous visitors, get the popular list.
+#
+# Each run replaces the rows batch by batch and deletes rows it did not
+# write, then replaces a generation token in the cache. Cached lists carry
+# the token they were read under, and both are fetched in one get_many.
+#
+# Settings:
+# - RECOMMENDATION_TOP_N: items kept per list (default: 20)
+# - RECOMMENDATION_BATCH_SIZE: rows written per transaction (default: 500)
+# - RECOMMENDATION_WEIGHTS: weight of each signal
+#   (default: co_enrollment 0.6, category 0.25, tags 0.15)
+# - RECOMMENDATION_MAX_USER_COURSES: enrollments above which a user is left out
+#   of co-enrollment counts (default: 200)
+# - RECOMMENDATION_CANDIDATE_LIMIT: courses kept per category/tag bucket (default: 500)
+# - RECOMMENDATION_CACHE_TIMEOUT: seconds a served list is cached (default: 3600)
+# - RECOMMENDATION_REFRESH_INTERVAL: seconds between scheduled runs (default: 21600)
+
+import heapq
+import logging
+import math
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "course_recommendations"
+GENERATION_KEY = "course_recommendations:generation"
+GENERATION_TIMEOUT = 7 * 86400
+
+# Enrollments that count as interest in a course
+INTEREST_STATUSES = ("active", "completed")
+
+DEFAULT_WEIGHTS = {"co_enrollment": 0.6, "category": 0.25, "tags": 0.15}
+LEVEL_SHARE = 0.2
+
+
+def _setting(name: str, default):
+    return getattr(settings, f"RECOMMENDATION_{name}", default)
+
+
+def get_top_n() -> int:
+    return _setting("TOP_N", 20)
+
+
+def get_weights() -> Dict[str, float]:
+    return {**DEFAULT_WEIGHTS, **_setting("WEIGHTS", {})}
+
+
+def rating_weight(rating: Optional[int]) -> float:
+    """Weight of an enrollment: 0 for 1 star, 1 when not reviewed, 2 for 5 stars"""
+    if rating is None:
+        return 1.0
+    return max(0.0, 1.0 + (rating - 3) / 2)
+
+
+def jaccard(a: Set, b: Set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+# =====================================
+# CATALOG
+# =====================================
+
+
+def _tags(skills, keywords: str) -> Set[str]:
+    tags = set()
+    if isinstance(skills, (list, tuple)):
+        tags.update(str(skill).strip().lower() for skill in skills if str(skill).strip())
+    tags.update(word.strip().lower() for word in (keywords or "").split(",") if word.strip())
+    return tags
+
+
+def _summary(row: Dict) -> Dict:
+    """Compact course summary stored in recommendation items"""
+    from .models import Course
+
+    thumbnail = row["thumbnail"]
+    return {
+        "id": row["id"],
+        "slug": row["slug"],
+        "title": row["title"],
+        "thumbnail": (
+            Course._meta.get_field("thumbnail").storage.url(thumbnail)
+            if thumbnail
+            else None
+        ),
+        "level": row["level"],
+        "price": float(row["price"] or 0),
+        "avg_rating": float(row["avg_rating"] or 0),
+        "enrolled_students": row["enrolled_students_count"] or 0,
+    }
+
+
+class Catalog:
+    """Published courses with the attributes the content signals compare"""
+
+    def __init__(self):
+        from .models import CategoryClosure, Course
+
+        rows = Course.objects.filter(is_published=True).values(
+            "id", "slug", "title", "thumbnail", "level", "price", "avg_rating",
+            "enrolled_students_count", "category_id", "skills", "meta_keywords",
+        )
+        self.summaries: Dict[int, Dict] = {}
+        self.level: Dict[int, str] = {}
+        self.category: Dict[int, Optional[int]] = {}
+        self.tags: Dict[int, Set[str]] = {}
+        for row in rows:
+            course_id = row["id"]
+            self.summaries[course_id] = _summary(row)
+            self.level[course_id] = row["level"]
+            self.category[course_id] = row["category_id"]
+            self.tags[course_id] = _tags(row["skills"], row["meta_keywords"])
+
+        self.ancestors: Dict[int, Set[int]] = defaultdict(set)
+        self.parent: Dict[int, int] = {}
+        for descendant, ancestor, depth in CategoryClosure.objects.values_list(
+            "descendant_id", "ancestor_id", "depth"
+        ):
+            self.ancestors[descendant].add(ancestor)
+            if depth == 1:
+                self.parent[descendant] = ancestor
+
+    def __contains__(self, course_id: int) -> bool:
+        return course_id in self.summaries
+
+    def popularity(self, course_id: int) -> Tuple[int, float]:
+        summary = self.summaries[course_id]
+        return summary["enrolled_students"], summary["avg_rating"]
+
+    def category_similarity(self, a: int, b: int) -> float:
+        return jaccard(
+            self.ancestors.get(self.category[a], set()),
+            self.ancestors.get(self.category[b], set()),
+        )
+
+    def tag_similarity(self, a: int, b: int) -> float:
+        same_level = 1.0 if self.level[a] == self.level[b] else 0.0
+        return (1 - LEVEL_SHARE) * jaccard(self.tags[a], self.tags[b]) + LEVEL_SHARE * same_level
+
+    def content_candidates(self) -> Dict[int, Set[int]]:
+        """Courses sharing a category, a parent category or a tag"""
+        buckets: Dict[Tuple[str, object], List[int]] = defaultdict(list)
+        for course_id in self.summaries:
+            category = self.category[course_id]
+            if category is not None:
+                buckets["category", category].append(course_id)
+                if category in self.parent:
+                    buckets["category", self.parent[category]].append(course_id)
+            for tag in self.tags[course_id]:
+                buckets["tag", tag].append(course_id)
+
+        limit = _setting("CANDIDATE_LIMIT", 500)
+        candidates: Dict[int, Set[int]] = defaultdict(set)
+        for members in buckets.values():
+            if len(members) > limit:
+                members = heapq.nlargest(limit, members, key=self.popularity)
+            for course_id in members:
+                candidates[course_id].update(members)
+        for course_id, others in candidates.items():
+            others.discard(course_id)
+        return candidates
+
+
+# =====================================
+# CO-ENROLLMENT
+# =====================================
+
+
+def iter_user_interests(batch_size: int) -> Iterator[Tuple[int, Dict[int, float]]]:
+    """
+    Stream (user id, {course id: rating weight}) for every user with
+    enrollments, in one ordered query read in chunks
+    """
+    from .models import Enrollment, Review
+
+    ratings = Review.objects.filter(
+        user_id=OuterRef("user_id"), course_id=OuterRef("course_id")
+    ).values("rating")[:1]
+    rows = (
+        Enrollment.objects.filter(status__in=INTEREST_STATUSES)
+        .annotate(rating=Subquery(ratings))
+        .order_by("user_id")
+        .values_list("user_id", "course_id", "rating")
+        .iterator(chunk_size=batch_size)
+    )
+
+    current, interests = None, {}
+    for user_id, course_id, rating in rows:
+        if user_id != current:
+            if interests:
+                yield current, interests
+            current, interests = user_id, {}
+        interests[course_id] = rating_weight(rating)
+    if interests:
+        yield current, interests
+
+
+class CoEnrollment:
+    """
+    Rating-weighted enrollment vectors, indexed by user and by course.
+
+    Cosine similarities are computed one course at a time by similarities(),
+    so memory stays linear in the number of enrollments instead of holding
+    every co-enrolled course pair.
+    """
+
+    def __init__(self, catalog: Catalog, batch_size: int):
+        max_courses = _setting("MAX_USER_COURSES", 200)
+        self.user_courses: Dict[int, List[Tuple[int, float]]] = {}
+        self.course_users: Dict[int, List[Tuple[int, float]]] = defaultdict(list)
+        self.norms: Dict[int, float] = defaultdict(float)
+        skipped = 0
+
+        for user_id, interests in iter_user_interests(batch_size):
+            weighted = [(c, w) for c, w in interests.items() if w > 0 and c in catalog]
+            if len(weighted) > max_courses:
+                skipped += 1
+                continue
+            for course_id, weight in weighted:
+                self.norms[course_id] += weight * weight
+            # A single course pairs with nothing; it only counts in the norm
+            if len(weighted) < 2:
+                continue
+            self.user_courses[user_id] = weighted
+            for course_id, weight in weighted:
+                self.course_users[course_id].append((user_id, weight))
+
+        if skipped:
+            logger.info(f"Co-enrollment skipped {skipped} users above {max_courses} courses")
+
+    def similarities(self, course_id: int) -> Dict[int, float]:
+        """Cosine similarity of ``course_id`` with every co-enrolled course"""
+        dots: Dict[int, float] = defaultdict(float)
+        for user_id, weight in self.course_users.get(course_id, ()):
+            for other, other_weight in self.user_courses[user_id]:
+                if other != course_id:
+                    dots[other] += weight * other_weight
+        norm = self.norms[course_id]
+        return {
+            other: dot / math.sqrt(norm * self.norms[other])
+            for other, dot in dots.items()
+        }
+
+
+# =====================================
+# SCORING
+# =====================================
+
+
+def related_scores(catalog: Catalog, batch_size: int, top_n: int) -> Dict[int, List[Tuple[int, float]]]:
+    """Top-N (course id, score) pairs for every published course"""
+    weights = get_weights()
+    cosine = CoEnrollment(catalog, batch_size)
+    content = catalog.content_candidates()
+
+    related = {}
+    for course_id in catalog.summaries:
+        co = cosine.similarities(course_id)
+        scored = []
+        for other in co.keys() | content.get(course_id, set()):
+            score = (
+                weights["co_enrollment"] * co.get(other, 0.0)
+                + weights["category"] * catalog.category_similarity(course_id, other)
+                + weights["tags"] * catalog.tag_similarity(course_id, other)
+            )
+            if score > 0:
+                scored.append((score, catalog.popularity(other), other))
+        related[course_id] = [
+            (other, round(score, 4)) for score, _, other in heapq.nlargest(top_n, scored)
+        ]
+    return related
+
+
+def personal_scores(
+    interests: Dict[int, float],
+    related: Dict[int, List[Tuple[int, float]]],
+    catalog: Catalog,
+    top_n: int,
+) -> List[Tuple[int, float]]:
+    """Related lists of a user's courses added up, without the courses they have"""
+    totals: Dict[int, float] = defaultdict(float)
+    for course_id, weight in interests.items():
+        for other, score in related.get(course_id, ()):
+            totals[other] += weight * score
+    ranked = heapq.nlargest(
+        top_n,
+        ((score, catalog.popularity(c), c) for c, score in totals.items() if c not in interests),
+    )
+    return [(course_id, round(score, 4)) for score, _, course_id in ranked]
+
+
+def popular_scores(catalog: Catalog, top_n: int) -> List[Tuple[int, float]]:
+    ranked = heapq.nlargest(top_n, catalog.summaries, key=catalog.popularity)
+    return [(course_id, float(catalog.popularity(course_id)[0])) for course_id in ranked]
+
+
+def _items(scored: Iterable[Tuple[int, float]], catalog: Catalog) -> List[Dict]:
+    return [{**catalog.summaries[course_id], "score": score} for course_id, score in scored]
+
+
+# =====================================
+# STORAGE
+# =====================================
+
+
+def _write_batch(kind: str, owner_field: str, rows: List[Tuple[int, List[Dict]]], computed_at):
+    from .models import CourseRecommendation
+
+    owners = [owner for owner, _ in rows]
+    with transaction.atomic():
+        CourseRecommendation.objects.filter(
+            kind=kind, **{f"{owner_field}__in": owners}
+        ).delete()
+        CourseRecommendation.objects.bulk_create(
+            [
+                CourseRecommendation(
+                    kind=kind, items=items, computed_at=computed_at,
+                    **{f"{owner_field}_id": owner},
+                )
+                for owner, items in rows
+            ]
+        )
+
+
+def _write_all(kind: str, owner_field: str, rows: Iterable[Tuple[int, List[Dict]]],
+               batch_size: int, computed_at) -> int:
+    written, batch = 0, []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            _write_batch(kind, owner_field, batch, computed_at)
+            written += len(batch)
+            batch = []
+    if batch:
+        _write_batch(kind, owner_field, batch, computed_at)
+        written += len(batch)
+    return written
+
+
+def compute_recommendations(batch_size: Optional[int] = None, top_n: Optional[int] = None,
+                            include_users: bool = True) -> Dict[str, int]:
+    """Rebuild every recommendation list and return the number of rows written per kind"""
+    from .models import CourseRecommendation
+
+    batch_size = batch_size or _setting("BATCH_SIZE", 500)
+    top_n = top_n or get_top_n()
+    computed_at = timezone.now()
+    started = time.monotonic()
+
+    catalog = Catalog()
+    related = related_scores(catalog, batch_size, top_n)
+
+    counts = {
+        CourseRecommendation.KIND_RELATED: _write_all(
+            CourseRecommendation.KIND_RELATED,
+            "course",
+            ((course_id, _items(scored, catalog)) for course_id, scored in related.items()),
+            batch_size,
+            computed_at,
+        )
+    }
+
+    if include_users:
+        personal = (
+            (user_id, _items(scored, catalog))
+            for user_id, interests in iter_user_interests(batch_size)
+            for scored in [personal_scores(interests, related, catalog, top_n)]
+            if scored
+        )
+        counts[CourseRecommendation.KIND_USER] = _write_all(
+            CourseRecommendation.KIND_USER, "user", personal, batch_size, computed_at
+        )
+
+    with transaction.atomic():
+        CourseRecommendation.objects.filter(kind=CourseRecommendation.KIND_POPULAR).delete()
+        CourseRecommendation.objects.create(
+            kind=CourseRecommendation.KIND_POPULAR,
+            items=_items(popular_scores(catalog, top_n), catalog),
+            computed_at=computed_at,
+        )
+    counts[CourseRecommendation.KIND_POPULAR] = 1
+
+    # Lists for unpublished courses and users who left every course
+    stale = CourseRecommendation.objects.filter(computed_at__lt=computed_at)
+    if not include_users:
+        stale = stale.exclude(kind=CourseRecommendation.KIND_USER)
+    stale.delete()
+
+    bump_generation()
+    logger.info(
+        f"Recommendations computed in {time.monotonic() - started:.1f}s: {counts}"
+    )
+    return counts
+
+
+# =====================================
+# SERVING
+# =====================================
+
+
+def bump_generation():
+    """Invalidate every cached recommendation list"""
+    cache.set(GENERATION_KEY, repr(time.time()), GENERATION_TIMEOUT)
+
+
+def _cached(scope: str, loader) -> Optional[List[Dict]]:
+    """
+    A stored list from the cache, or from its single-row lookup. A missing
+    row is cached too, as None, so unknown slugs do not reach the database
+    on every request.
+    """
+    entry_key = f"{CACHE_PREFIX}:{scope}"
+    try:
+        found = cache.get_many([GENERATION_KEY, entry_key])
+    except Exception as e:
+        logger.warning(f"Recommendation cache unavailable: {e}")
+        return loader()
+
+    generation = found.get(GENERATION_KEY)
+    if generation is None:
+        generation = repr(time.time())
+        cache.add(GENERATION_KEY, generation, GENERATION_TIMEOUT)
+        generation = cache.get(GENERATION_KEY) or generation
+
+    entry = found.get(entry_key)
+    if entry is not None and entry[0] == generation:
+        return entry[1]
+
+    items = loader()
+    try:
+        cache.set(entry_key, (generation, items), _setting("CACHE_TIMEOUT", 3600))
+    except Exception as e:
+        logger.warning(f"Could not cache recommendations for {scope}: {e}")
+    return items
+
+
+def related_courses(slug: str) -> Optional[List[Dict]]:
+    """
+    Related courses of a published course: an empty list if it was published
+    after the last run, None if there is no such published course.
+    """
+    from .models import Course, CourseRecommendation
+
+    def load():
+        items = CourseRecommendation.objects.filter(
+            kind=CourseRecommendation.KIND_RELATED,
+            course__slug=slug,
+            course__is_published=True,
+        ).values_list("items", flat=True).first()
+        if items is None and Course.objects.filter(slug=slug, is_published=True).exists():
+            return []
+        return items
+
+    return _cached(f"related:{slug}", load)
+
+
+def popular_courses() -> List[Dict]:
+    from .models import CourseRecommendation
+
+    return _cached(
+        "popular",
+        lambda: CourseRecommendation.objects.filter(
+            kind=CourseRecommendation.KIND_POPULAR
+        ).values_list("items", flat=True).first(),
+    ) or []
+
+
+def user_recommendations(user) -> List[Dict]:
+    """
+    Personal suggestions, falling back to popular courses. Courses the user
+    enrolled in since the last run are left out using the permission matrix.
+    """
+    from .models import CourseRecommendation
+    from .permission_matrix import get_permission_context
+
+    if user is None or not getattr(user, "is_authenticated", False):
+        return popular_courses()
+
+    items = _cached(
+        f"user:{user.pk}",
+        lambda: CourseRecommendation.objects.filter(
+            kind=CourseRecommendation.KIND_USER, user_id=user.pk
+        ).values_list("items", flat=True).first(),
+    ) or popular_courses()
+
+    context = get_permission_context(user)
+    return [item for item in items if not context.has_enrollment(item["id"])]
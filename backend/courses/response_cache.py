@@ -0,0 +1,172 @@
+#
+# File Path: backend/courses/response_cache.py
+# Folder Path: backend/courses/
+# Date Created: 2026-10-18 00:00:00
+# Version: 1.0.0
+#
+# Rendered-response cache with strong ETags and conditional GET
+#
+# Entries hold the final rendered bytes of a 200 response, its content type,
+# a strong ETag (hash of the bytes) and a Last-Modified time. A hit is
+# answered straight from the entry: 304 Not Modified when the client's
+# If-None-Match (or, without it, If-Modified-Since) still matches, else the
+# stored bytes. Serializers and renderers never run on a hit.
+#
+# Course entries are keyed by a generation token that signals in
+# courses/signals.py replace whenever the course or content shown with it
+# (modules, lessons, resources, assessments, reviews) changes, so stale
+# entries are never served and simply expire. Responses that embed one
+# user's enrollment use a second token replaced on that user's enrollment
+# and progress changes.
+#
+# Settings:
+# - COURSE_RESPONSE_CACHE_TIMEOUT: seconds an entry is kept (default: 300)
+
+import hashlib
+import time
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe
+
+ENTRY_PREFIX = "rendered_response"
+GENERATION_PREFIX = "response_generation"
+GENERATION_TIMEOUT = 7 * 86400
+
+
+class CachedResponseHit(Exception):
+    """Raised from APIView.initial to short-circuit the handler on a cache hit"""
+
+    def __init__(self, entry: Dict):
+        super().__init__("cached response available")
+        self.entry = entry
+
+
+def make_etag(content: bytes) -> str:
+    return '"%s"' % hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def get_timeout() -> int:
+    return getattr(settings, "COURSE_RESPONSE_CACHE_TIMEOUT", 300)
+
+
+# =====================================
+# GENERATIONS
+# =====================================
+
+
+def _generation_key(*parts) -> str:
+    return ":".join([GENERATION_PREFIX, *map(str, parts)])
+
+
+def bump(*parts):
+    """Invalidate every entry keyed with this generation"""
+    cache.set(_generation_key(*parts), repr(time.time()), GENERATION_TIMEOUT)
+
+
+def bump_course(course_id: int):
+    bump("course", course_id)
+
+
+def bump_course_user(course_id: int, user_id: int):
+    bump("course", course_id, "user", user_id)
+
+
+def generations(*scopes: Iterable) -> Dict[str, float]:
+    """
+    Current tokens for several scopes in one cache round trip.
+
+    A missing token (never set, or evicted) is created on the spot: entries
+    stored under an older token must not come back to life.
+    """
+    keys = [_generation_key(*scope) for scope in scopes]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            token = repr(time.time())
+            cache.add(key, token, GENERATION_TIMEOUT)
+            found[key] = cache.get(key) or token
+    return {key: float(found[key]) for key in keys}
+
+
+def course_scopes(course_id: int, user_id: Optional[int] = None):
+    scopes = [("course", course_id)]
+    if user_id is not None:
+        scopes.append(("course", course_id, "user", user_id))
+    return scopes
+
+
+# =====================================
+# ENTRIES
+# =====================================
+
+
+def entry_key(*parts) -> str:
+    digest = hashlib.blake2b(
+        "|".join(map(str, parts)).encode(), digest_size=16
+    ).hexdigest()
+    return f"{ENTRY_PREFIX}:{digest}"
+
+
+def request_fingerprint(request) -> str:
+    """Inputs that change the rendered bytes besides the data: query string and Accept"""
+    return "%s|%s" % (
+        request.META.get("QUERY_STRING", ""),
+        request.META.get("HTTP_ACCEPT", ""),
+    )
+
+
+def get(key: str) -> Optional[Dict]:
+    return cache.get(key)
+
+
+def store(key: str, response, last_modified: Optional[float] = None,
+          timeout: Optional[int] = None) -> Dict:
+    """Cache a rendered 200 response; returns the entry"""
+    content = bytes(response.content)
+    entry = {
+        "content": content,
+        "content_type": response.get("Content-Type", "application/json"),
+        "etag": make_etag(content),
+        "last_modified": int(last_modified) if last_modified else None,
+    }
+    cache.set(key, entry, timeout if timeout is not None else get_timeout())
+    return entry
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 prescribes for If-None-Match
+    candidates = [tag.strip() for tag in header.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def is_not_modified(request, entry: Dict) -> bool:
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_none_match:
+        return _etag_matches(if_none_match, entry["etag"])
+    if_modified_since = request.META.get("HTTP_IF_MODIFIED_SINCE")
+    if if_modified_since and entry["last_modified"]:
+        since = parse_http_date_safe(if_modified_since)
+        return since is not None and entry["last_modified"] <= since
+    return False
+
+
+def serve(request, entry: Dict, hit: bool, vary=("Accept", "Authorization", "Cookie")):
+    """Answer from an entry: 304 when the client copy is current, else the bytes"""
+    if is_not_modified(request, entry):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(entry["content"], content_type=entry["content_type"])
+    response["ETag"] = entry["etag"]
+    if entry["last_modified"]:
+        response["Last-Modified"] = http_date(entry["last_modified"])
+    # Clients keep the body but revalidate every time
+    response["Cache-Control"] = "private, no-cache"
+    response["X-Cache"] = "HIT" if hit else "MISS"
+    patch_vary_headers(response, vary)
+    return response
@@ -21,7 +21,7 @@ from .mixins import (
 
 # Core serializers
 from .core import (
-    CategorySerializer, ResourceSerializer, LessonSerializer,
+    CategorySerializer, CategoryTreeSerializer, CategoryDetailSerializer, ResourceSerializer, LessonSerializer,
     ModuleSerializer, ModuleDetailSerializer, CourseInstructorSerializer,
     CourseVersionSerializer, CourseSerializer, CourseDetailSerializer,
     CourseCloneSerializer
@@ -51,7 +51,8 @@ __all__ = [
     'ContextPropagationMixin', 'OptimizedQueryMixin', 'EnhancedValidationMixin',
 
     # Core
-    'CategorySerializer', 'ResourceSerializer', 'LessonSerializer',
+    'CategorySerializer', 'CategoryTreeSerializer', 'CategoryDetailSerializer',
+    'ResourceSerializer', 'LessonSerializer',
     'ModuleSerializer', 'ModuleDetailSerializer', 'CourseInstructorSerializer',
     'CourseVersionSerializer', 'CourseSerializer', 'CourseDetailSerializer',
     'CourseCloneSerializer',
@@ -31,7 +31,8 @@ from drf_spectacular.utils import extend_schema_field
 from instructor_portal.models import CourseInstructor
 from rest_framework import serializers
 
-from ..models import Category, Course, Lesson, Module, Resource
+from ..models import Category, CategoryClosure, Course, Lesson, Module, Resource
+from ..permission_matrix import get_permission_context
 from ..utils import format_duration, format_filesize
 from ..validation import (
     ACCESS_LEVELS,
@@ -47,6 +48,49 @@ from .mixins import (
 
 logger = logging.getLogger(__name__)
 
+
+def get_learner_progress(context, course_id):
+    """
+    (enrollment, {lesson_id: Progress}) of the request user in a course,
+    or (None, {}) when not enrolled.
+
+    The user's enrollments and progress rows are loaded with two queries the
+    first time an enrolled lesson or module is serialized and kept on the
+    request, so nested serializers do not query per lesson, module or course.
+    """
+    request = context.get("request")
+    if not request or not request.user.is_authenticated:
+        return None, {}
+    if not get_permission_context(request.user).has_enrollment(course_id):
+        return None, {}
+
+    loaded = getattr(request, "_learner_progress", None)
+    if loaded is None:
+        from ..models import Enrollment, Progress
+
+        progress = {}
+        for item in Progress.objects.filter(enrollment__user=request.user).only(
+            "enrollment_id", "lesson_id", "is_completed", "progress_percentage"
+        ):
+            progress.setdefault(item.enrollment_id, {})[item.lesson_id] = item
+        loaded = request._learner_progress = {
+            enrollment.course_id: (enrollment, progress.get(enrollment.pk, {}))
+            for enrollment in Enrollment.objects.filter(user=request.user)
+        }
+    return loaded.get(course_id, (None, {}))
+
+
+def prefetched_lesson_count(course):
+    """Lesson count of a course with prefetched modules and lessons, else None"""
+    modules = getattr(course, "_prefetched_objects_cache", {}).get("modules")
+    if modules is None or not all(
+        "lessons" in getattr(module, "_prefetched_objects_cache", {})
+        for module in modules
+    ):
+        return None
+    return sum(len(module.lessons.all()) for module in modules)
+
+
 # =====================================
 # OPTIMIZED CATEGORY SERIALIZERS
 # =====================================
@@ -81,13 +125,15 @@ class CategorySerializer(
 
     @classmethod
     def setup_eager_loading(cls, queryset):
-        """Optimize category queries"""
-        return queryset.prefetch_related(
-            Prefetch("courses", queryset=Course.objects.filter(is_published=True))
+        """Annotate the published course count in the list query"""
+        return queryset.annotate(
+            published_course_count=Count("courses", filter=Q(courses__is_published=True))
         )
 
     def get_course_count(self, obj):
         """Get number of active courses with caching"""
+        if hasattr(obj, "published_course_count"):
+            return obj.published_course_count
         if hasattr(obj, "_course_count"):
             return obj._course_count
 
@@ -98,6 +144,47 @@ class CategorySerializer(
             return 0
 
 
+class CategoryTreeSerializer(CategorySerializer):
+    """
+    Category listing with the course count of the whole subtree, read from
+    the closure table in the list query itself
+    """
+
+    subtree_course_count = serializers.SerializerMethodField()
+
+    class Meta(CategorySerializer.Meta):
+        fields = CategorySerializer.Meta.fields + ["subtree_course_count"]
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return super().setup_eager_loading(queryset).annotate(
+            subtree_courses=CategoryClosure.objects.subtree_course_count()
+        )
+
+    def get_subtree_course_count(self, obj):
+        """Published courses in this category and its active subcategories"""
+        if hasattr(obj, "subtree_courses"):
+            return obj.subtree_courses
+
+        try:
+            return obj.get_subtree_course_count()
+        except Exception as e:
+            logger.warning(f"Error getting subtree course count for category {obj.id}: {e}")
+            return 0
+
+
+class CategoryDetailSerializer(CategoryTreeSerializer):
+    """Category landing page: adds the root-to-category breadcrumb trail"""
+
+    breadcrumbs = serializers.SerializerMethodField()
+
+    class Meta(CategoryTreeSerializer.Meta):
+        fields = CategoryTreeSerializer.Meta.fields + ["breadcrumbs"]
+
+    def get_breadcrumbs(self, obj):
+        return obj.get_breadcrumbs()
+
+
 # =====================================
 # OPTIMIZED RESOURCE SERIALIZERS
 # =====================================
@@ -318,60 +405,28 @@ class LessonSerializer(
         # Also run streamlined model validation
         return self.validate_with_model_clean(data, self.instance)
 
+    def _get_lesson_progress(self, obj):
+        """The user's Progress row for the lesson, or None"""
+        # Set by ProgressSerializer, which serializes the row itself
+        if hasattr(obj, "_user_progress"):
+            return obj._user_progress
+        _, progress = get_learner_progress(self.context, obj.module.course_id)
+        return progress.get(obj.id)
+
     def get_is_completed(self, obj):
         """Enhanced completion status check with optimization"""
-        request = self.context.get("request")
-        if not request or not request.user.is_authenticated:
-            return False
-
-        # Use cached enrollment from context if available
-        enrollment = self.context.get("user_enrollment")
-        if not enrollment:
-            try:
-                from ..models import Enrollment
-
-                enrollment = Enrollment.objects.select_related("course").get(
-                    user=request.user, course=obj.module.course
-                )
-            except Enrollment.DoesNotExist:
-                return False
-
         try:
-            from ..models import Progress
-
-            return Progress.objects.filter(
-                enrollment=enrollment, lesson=obj, is_completed=True
-            ).exists()
+            lesson_progress = self._get_lesson_progress(obj)
+            return bool(lesson_progress and lesson_progress.is_completed)
         except Exception as e:
             logger.warning(f"Error checking lesson completion for lesson {obj.id}: {e}")
             return False
 
     def get_progress_percentage(self, obj):
         """Get user's progress percentage with optimization"""
-        request = self.context.get("request")
-        if not request or not request.user.is_authenticated:
-            return 0
-
-        # Use cached enrollment from context if available
-        enrollment = self.context.get("user_enrollment")
-        if not enrollment:
-            try:
-                from ..models import Enrollment
-
-                enrollment = Enrollment.objects.get(
-                    user=request.user, course=obj.module.course
-                )
-            except Enrollment.DoesNotExist:
-                return 0
-
         try:
-            from ..models import Progress
-
-            progress = Progress.objects.filter(
-                enrollment=enrollment, lesson=obj
-            ).first()
-
-            return progress.progress_percentage if progress else 0
+            lesson_progress = self._get_lesson_progress(obj)
+            return lesson_progress.progress_percentage if lesson_progress else 0
         except Exception as e:
             logger.warning(f"Error getting lesson progress for lesson {obj.id}: {e}")
             return 0
@@ -388,7 +443,10 @@ class LessonSerializer(
             return []
 
         try:
-            premium_resources = obj.resources.filter(premium=True).order_by("order")
+            # Filter the (prefetched) resources, already ordered by "order"
+            premium_resources = [
+                resource for resource in obj.resources.all() if resource.premium
+            ]
             context = self.get_serializer_context_for_nested()
             return ResourceSerializer(
                 premium_resources, many=True, context=context
@@ -400,7 +458,8 @@ class LessonSerializer(
     def get_resources(self, obj):
         """Get resources with proper context propagation"""
         try:
-            resources = obj.resources.all().order_by("order")
+            # Resource Meta ordering is (lesson, order): keeps the prefetch
+            resources = obj.resources.all()
             context = self.get_serializer_context_for_nested()
             return ResourceSerializer(resources, many=True, context=context).data
         except Exception as e:
@@ -544,7 +603,8 @@ class ModuleSerializer(
     def get_lessons(self, obj):
         """Get lessons with proper context propagation"""
         try:
-            lessons = obj.lessons.all().order_by("order")
+            # Lesson Meta ordering is (module, order): keeps the prefetch
+            lessons = obj.lessons.all()
 
             # Pass through enrollment context for optimization
             context = self.get_serializer_context_for_nested()
@@ -576,32 +636,21 @@ class ModuleDetailSerializer(ModuleSerializer):
 
     def get_completion_stats(self, obj):
         """Get module completion statistics for current user with optimization"""
-        request = self.context.get("request")
-        if not request or not request.user.is_authenticated:
-            return None
-
-        # Use cached enrollment from context if available
-        enrollment = self.context.get("user_enrollment")
-        if not enrollment:
-            try:
-                from ..models import Enrollment
-
-                enrollment = Enrollment.objects.get(
-                    user=request.user, course=obj.course
-                )
-            except Enrollment.DoesNotExist:
+        try:
+            enrollment, progress = get_learner_progress(self.context, obj.course_id)
+            if enrollment is None:
                 return None
 
-        try:
-            total_lessons = obj.lessons.count()
+            lessons = obj.lessons.all()
+            total_lessons = len(lessons)
             if total_lessons == 0:
                 return {"completed": 0, "total": 0, "percentage": 0}
 
-            from ..models import Progress
-
-            completed_lessons = Progress.objects.filter(
-                enrollment=enrollment, lesson__module=obj, is_completed=True
-            ).count()
+            completed_lessons = sum(
+                1
+                for lesson in lessons
+                if lesson.id in progress and progress[lesson.id].is_completed
+            )
 
             percentage = (
                 (completed_lessons / total_lessons) * 100 if total_lessons > 0 else 0
@@ -935,8 +984,8 @@ class CourseSerializer(
             if user_enrollment is not None:
                 return user_enrollment.course_id == obj.id
 
-            # Fallback to database query
-            return obj.enrollments.filter(user=request.user, status="active").exists()
+            # Fall back to the user's compiled permission matrix
+            return get_permission_context(request.user).is_enrolled(obj.id)
         except Exception as e:
             logger.warning(f"Error checking enrollment for course {obj.id}: {e}")
             return False
@@ -957,6 +1006,9 @@ class CourseSerializer(
             return obj._lesson_count
 
         try:
+            lesson_count = prefetched_lesson_count(obj)
+            if lesson_count is not None:
+                return lesson_count
             return Lesson.objects.filter(module__course=obj).count()
         except Exception:
             return 0
@@ -1106,6 +1158,8 @@ class CourseDetailSerializer(CourseSerializer):
                 try:
                     from ..models import Enrollment
 
+                    if not get_permission_context(request.user).has_enrollment(obj.id):
+                        raise Enrollment.DoesNotExist
                     enrollment = Enrollment.objects.get(user=request.user, course=obj)
                     context["user_enrollment"] = enrollment
                 except Enrollment.DoesNotExist:
@@ -1122,6 +1176,9 @@ class CourseDetailSerializer(CourseSerializer):
         if not request or not request.user.is_authenticated:
             return None
 
+        if not get_permission_context(request.user).has_enrollment(obj.id):
+            return None
+
         try:
             from ..models import Enrollment, Progress
 
@@ -1192,17 +1249,15 @@ class CourseDetailSerializer(CourseSerializer):
             return None
 
         try:
-            from ..models import Enrollment
-
-            enrollment = Enrollment.objects.get(user=request.user, course=obj)
+            enrollment, _ = get_learner_progress(self.context, obj.id)
+            if enrollment is None:
+                return None
             return {
                 "id": enrollment.id,
                 "status": enrollment.status,
                 "enrolled_date": enrollment.created_date,
                 "completion_date": enrollment.completion_date,
             }
-        except Enrollment.DoesNotExist:
-            return None
         except Exception as e:
             logger.warning(f"Error getting enrollment info for course {obj.id}: {e}")
             return None
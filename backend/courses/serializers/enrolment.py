@@ -23,10 +23,25 @@
 import logging
 
 from django.db.models import Prefetch
+from instructor_portal.models import CourseInstructor
 from rest_framework import serializers
 
-from ..models import Certificate, Course, Enrollment, Lesson, Progress
-from .core import CourseSerializer, LessonSerializer
+from ..models import (
+    Category,
+    Certificate,
+    Course,
+    Enrollment,
+    Lesson,
+    Module,
+    Progress,
+    Resource,
+)
+from .core import (
+    CategorySerializer,
+    CourseSerializer,
+    LessonSerializer,
+    prefetched_lesson_count,
+)
 from .mixins import ContextPropagationMixin, OptimizedQueryMixin
 
 logger = logging.getLogger(__name__)
@@ -91,15 +106,26 @@ class EnrollmentSerializer(
 
     @classmethod
     def setup_eager_loading(cls, queryset):
-        """Optimize enrollment queries"""
-        return queryset.select_related("course__category").prefetch_related(
-            "course__courseinstructor_set__instructor", "progress"
+        """Optimize enrollment queries: everything the nested course serializes"""
+        return queryset.select_related("course").prefetch_related(
+            Prefetch(
+                "course__category",
+                queryset=CategorySerializer.setup_eager_loading(Category.objects.all()),
+            ),
+            Prefetch(
+                "course__courseinstructor_set",
+                queryset=CourseInstructor.objects.select_related("instructor__profile"),
+            ),
+            Prefetch("course__modules", queryset=Module.objects.prefetch_related("lessons")),
+            "progress",
         )
 
     def get_progress_summary(self, obj):
         """Get enrollment progress summary with optimization"""
         try:
-            total_lessons = Lesson.objects.filter(module__course=obj.course).count()
+            total_lessons = prefetched_lesson_count(obj.course)
+            if total_lessons is None:
+                total_lessons = Lesson.objects.filter(module__course=obj.course).count()
 
             # Use prefetched progress if available
             if (
@@ -192,6 +218,19 @@ class ProgressSerializer(ContextPropagationMixin, serializers.ModelSerializer):
 
                 self.fields["lesson_id"].queryset = queryset
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Optimize progress queries with the nested lesson's related data"""
+        return queryset.select_related("lesson__module__course", "enrollment").prefetch_related(
+            Prefetch("lesson__resources", queryset=Resource.objects.order_by("order")),
+            Prefetch("lesson__assessment", queryset=LessonSerializer._get_assessment_queryset()),
+        )
+
+    def to_representation(self, instance):
+        """The nested lesson reports this row's completion and percentage"""
+        instance.lesson._user_progress = instance
+        return super().to_representation(instance)
+
     # FIXED: Removed dead method get_lesson() - DRF handles this automatically
 
 
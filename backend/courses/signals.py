@@ -34,15 +34,24 @@ from django.db.models.signals import post_delete, post_save, pre_delete, pre_sav
 from django.dispatch import receiver
 from django.utils import timezone
 
+from educore import audit, metrics
+from instructor_portal.models import CourseInstructor
+
+from . import permission_matrix, response_cache
 from .models import (
+    Answer,
+    Assessment,
     AssessmentAttempt,
     Category,
+    CategoryClosure,
     Certificate,
     Course,
     Enrollment,
     Lesson,
     Module,
     Progress,
+    Question,
+    Resource,
     Review,
 )
 
@@ -176,24 +185,15 @@ def audit_signal_action(
 ):
     """
     Audit logging for signal actions
-    ENHANCED: Better audit logging with structured data
-    """
-    try:
-        log_entry = {
-            "timestamp": timezone.now().isoformat(),
-            "action": action,
-            "model": model_name,
-            "instance_id": instance_id,
-            "metadata": metadata or {},
-            "thread_id": threading.current_thread().ident,
-        }
-
-        logger.info(
-            f"SIGNAL_AUDIT: {action} on {model_name}({instance_id})", extra=log_entry
-        )
-
-    except Exception as e:
-        logger.error(f"Failed to create signal audit log: {e}")
+    ENHANCED: Queued on the buffered audit pipeline instead of logged inline
+    """
+    audit.record(
+        action,
+        source="signal",
+        object_type=model_name,
+        object_id=instance_id,
+        metadata=metadata,
+    )
 
 
 def update_course_analytics_async(course_id: int):
@@ -262,6 +262,13 @@ def update_course_analytics_async(course_id: int):
         )
 
 
+@receiver(post_save, sender=Enrollment)
+def count_enrollment(sender, instance: Enrollment, created: bool, **kwargs):
+    """Count new enrollments in the metrics registry"""
+    if created:
+        metrics.on_commit(metrics.ENROLLMENTS.inc)
+
+
 @receiver(post_save, sender=Enrollment)
 @prevent_signal_loop("enrollment_post_save")
 def create_progress_records(sender, instance: Enrollment, created: bool, **kwargs):
@@ -477,6 +484,7 @@ def complete_course_enrollment(enrollment: Enrollment):
             enrollment.completion_date = timezone.now()
             enrollment.updated_date = timezone.now()
             enrollment.save(update_fields=["status", "completion_date", "updated_date"])
+            metrics.on_commit(metrics.COMPLETIONS.inc)
 
             # Generate certificate if applicable
             if enrollment.course.has_certificate:
@@ -821,6 +829,116 @@ def create_certificate_atomic(enrollment: Enrollment):
         raise
 
 
+@receiver(pre_delete, sender=Category)
+def detach_category_subtree(sender, instance: Category, **kwargs):
+    """
+    Keep the category closure table consistent on delete.
+
+    Children are re-rooted by the parent FK (SET_NULL), so their subtrees
+    lose every link to the deleted category's ancestors; links to the
+    deleted category itself are removed by the closure FK cascade.
+    """
+    CategoryClosure.objects.detach_subtree(instance)
+
+
+# =====================================
+# RENDERED RESPONSE CACHE
+# =====================================
+
+# Path from each model shown on the course detail page to its course id
+COURSE_ID_PATHS = {
+    Course: ("pk",),
+    Module: ("course_id",),
+    Lesson: ("module", "course_id"),
+    Resource: ("lesson", "module", "course_id"),
+    Assessment: ("lesson", "module", "course_id"),
+    Question: ("assessment", "lesson", "module", "course_id"),
+    Answer: ("question", "assessment", "lesson", "module", "course_id"),
+    Review: ("course_id",),
+    CourseInstructor: ("course_id",),
+}
+
+
+def _resolve_course_id(instance) -> Optional[int]:
+    value = instance
+    try:
+        for attr in COURSE_ID_PATHS[type(instance)]:
+            value = getattr(value, attr)
+    except Exception:
+        # Parent already gone in a cascade; the course's own delete bumps it
+        return None
+    return value
+
+
+@receiver([post_save, post_delete], sender=Course)
+@receiver([post_save, post_delete], sender=Module)
+@receiver([post_save, post_delete], sender=Lesson)
+@receiver([post_save, post_delete], sender=Resource)
+@receiver([post_save, post_delete], sender=Assessment)
+@receiver([post_save, post_delete], sender=Question)
+@receiver([post_save, post_delete], sender=Answer)
+@receiver([post_save, post_delete], sender=Review)
+@receiver([post_save, post_delete], sender=CourseInstructor)
+def invalidate_course_responses(sender, instance, **kwargs):
+    """Retire cached course detail responses once the change commits"""
+    course_id = _resolve_course_id(instance)
+    if course_id is not None:
+        transaction.on_commit(lambda: response_cache.bump_course(course_id))
+
+
+@receiver([post_save, post_delete], sender=Enrollment)
+@receiver([post_save, post_delete], sender=Progress)
+@receiver(post_save, sender=AssessmentAttempt)
+def invalidate_course_user_responses(sender, instance, **kwargs):
+    """
+    Retire the enrolled user's cached course detail; enrolling or leaving
+    also changes the public student count
+    """
+    try:
+        if sender is Enrollment:
+            course_id, user_id = instance.course_id, instance.user_id
+        elif sender is Progress:
+            course_id, user_id = instance.enrollment.course_id, instance.enrollment.user_id
+        else:
+            course_id = instance.assessment.lesson.module.course_id
+            user_id = instance.user_id
+    except Exception:
+        return
+
+    def bump():
+        response_cache.bump_course_user(course_id, user_id)
+        if sender is Enrollment and (kwargs.get("created") or "created" not in kwargs):
+            response_cache.bump_course(course_id)
+
+    transaction.on_commit(bump)
+
+
+@receiver([post_save, post_delete], sender=Enrollment)
+@receiver([post_save, post_delete], sender=CourseInstructor)
+@receiver([post_save, post_delete], sender="users.Subscription")
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_permissions(sender, instance, **kwargs):
+    """
+    Recompile the user's permission matrix after enrollments, instructor
+    roles, subscription or account flags change
+    """
+    update_fields = kwargs.get("update_fields")
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+
+    if sender is CourseInstructor:
+        user_id = instance.instructor_id
+    elif sender is Enrollment or hasattr(instance, "user_id"):
+        user_id = instance.user_id
+    else:
+        user_id = instance.pk
+
+    # Contexts memoized in this process are dropped right away so the
+    # writing request sees its own change; other processes after commit
+    permission_matrix.forget_local(user_id)
+    transaction.on_commit(lambda: permission_matrix.invalidate_permissions(user_id))
+
+
 # Signal connection validation
 @receiver(post_save, sender=Course)
 def validate_signal_connections(sender, **kwargs):
@@ -873,6 +991,9 @@ __all__ = [
     "update_course_duration",
     "update_course_completion_status",
     "update_lesson_progress_on_assessment",
+    "detach_category_subtree",
+    "invalidate_course_responses",
+    "invalidate_course_user_responses",
     "create_certificate_atomic",
     "update_course_analytics_async",  # FIXED: Now properly exported
     "clear_signal_flags",
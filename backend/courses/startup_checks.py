@@ -0,0 +1,301 @@
+#
+# File Path: backend/courses/startup_checks.py
+# Folder Path: backend/courses/
+# Date Created: 2026-10-18 00:00:00
+# Version: 1.0.0
+#
+# Deferred, time-budgeted startup checks for the courses app
+#
+# CoursesConfig.ready() used to test the database, build a migration plan,
+# round-trip the cache and write monitoring counters in every process that
+# imported Django. Those checks are now registered probes that run:
+#
+# - once per deployment: results are cached under a fingerprint of the
+#   migration files on disk, so every worker of a deployment shares them
+# - on first use: the first health-check hit starts them on a background
+#   thread if no result exists for the fingerprint, and health checks report
+#   "unknown" until that run finishes; the run_startup_checks management
+#   command runs them in the foreground
+# - at boot only when COURSES_STARTUP_CHECKS_MODE = "eager"
+#
+# Each probe runs in a daemon thread and is abandoned once it exceeds its
+# time budget, so a slow database or cache cannot stall the caller.
+#
+# Settings:
+# - COURSES_STARTUP_CHECKS_MODE: "deferred" (default), "eager" or "off"
+# - COURSES_STARTUP_CHECK_BUDGET: default per-probe budget in seconds
+# - COURSES_STARTUP_CHECKS_CACHE_TIMEOUT: how long a report is shared
+
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "courses_startup_checks"
+DEFAULT_BUDGET = 2.0  # seconds per probe
+DEFAULT_CACHE_TIMEOUT = 7 * 24 * 3600
+
+MODE_DEFERRED = "deferred"
+MODE_EAGER = "eager"
+MODE_OFF = "off"
+
+STATUS_OK = "ok"
+STATUS_WARNING = "warning"
+STATUS_ERROR = "error"
+STATUS_TIMEOUT = "timeout"
+STATUS_UNKNOWN = "unknown"
+
+
+class StartupProbe:
+    """A named check with a time budget; ``func`` returns (status, detail)"""
+
+    def __init__(self, name: str, func: Callable[[], Tuple[str, Any]],
+                 budget: Optional[float] = None, critical: bool = False):
+        self.name = name
+        self.func = func
+        self.budget = budget
+        self.critical = critical
+
+    def run(self) -> Dict[str, Any]:
+        budget = self.budget or get_budget()
+        outcome: Dict[str, Any] = {}
+
+        def target():
+            try:
+                outcome["status"], outcome["detail"] = self.func()
+            except Exception as e:
+                outcome["status"], outcome["detail"] = STATUS_ERROR, str(e)
+            finally:
+                # Connections are per thread; don't leak this thread's
+                connections.close_all()
+
+        started = time.monotonic()
+        worker = threading.Thread(target=target, name=f"startup-check-{self.name}", daemon=True)
+        worker.start()
+        worker.join(budget)
+        elapsed = time.monotonic() - started
+
+        if worker.is_alive():
+            logger.warning(f"Startup check '{self.name}' exceeded its {budget}s budget")
+            outcome = {"status": STATUS_TIMEOUT, "detail": f"exceeded {budget}s budget"}
+
+        return {
+            "status": outcome.get("status", STATUS_ERROR),
+            "detail": outcome.get("detail"),
+            "duration_ms": round(elapsed * 1000, 1),
+            "critical": self.critical,
+        }
+
+
+_probes: List[StartupProbe] = []
+_reports: Dict[str, Dict[str, Any]] = {}
+_run_lock = threading.Lock()
+_priming: Dict[str, threading.Thread] = {}
+_priming_lock = threading.Lock()
+_fingerprint: Optional[str] = None
+
+
+def register_probe(name: str, budget: Optional[float] = None, critical: bool = False):
+    """Decorator registering a startup probe"""
+
+    def decorator(func):
+        _probes[:] = [p for p in _probes if p.name != name]
+        _probes.append(StartupProbe(name, func, budget, critical))
+        return func
+
+    return decorator
+
+
+def get_mode() -> str:
+    return getattr(settings, "COURSES_STARTUP_CHECKS_MODE", MODE_DEFERRED)
+
+
+def get_budget() -> float:
+    return float(getattr(settings, "COURSES_STARTUP_CHECK_BUDGET", DEFAULT_BUDGET))
+
+
+def migration_fingerprint() -> str:
+    """
+    Hash of the migrations on disk, identifying a deployment's schema.
+
+    Only migration files are read; the database is not touched.
+    """
+    global _fingerprint
+    if _fingerprint is None:
+        from django.db.migrations.loader import MigrationLoader
+
+        loader = MigrationLoader(None, ignore_no_migrations=True)
+        names = sorted(f"{app}.{name}" for app, name in loader.disk_migrations)
+        _fingerprint = hashlib.sha256("\n".join(names).encode()).hexdigest()[:16]
+    return _fingerprint
+
+
+def _cache_key(fingerprint: str) -> str:
+    return f"{CACHE_KEY_PREFIX}:{fingerprint}"
+
+
+def _overall_status(checks: Dict[str, Dict[str, Any]]) -> str:
+    statuses = {c["status"] for c in checks.values()}
+    if any(c["critical"] and c["status"] != STATUS_OK for c in checks.values()):
+        return "unhealthy"
+    if statuses - {STATUS_OK}:
+        return "degraded"
+    return "healthy"
+
+
+def run_startup_checks(force: bool = False) -> Dict[str, Any]:
+    """
+    Run every probe once for the current migration fingerprint.
+
+    Returns the cached report unless ``force`` is set. Concurrent callers in
+    one process wait for a single run.
+    """
+    fingerprint = migration_fingerprint()
+    if not force:
+        report = get_startup_report(run_if_missing=False)
+        if report:
+            return report
+
+    with _run_lock:
+        if not force and fingerprint in _reports:
+            return _reports[fingerprint]
+
+        started = time.monotonic()
+        checks = {probe.name: probe.run() for probe in _probes}
+        report = {
+            "fingerprint": fingerprint,
+            "status": _overall_status(checks),
+            "checked_at": timezone.now().isoformat(),
+            "duration_ms": round((time.monotonic() - started) * 1000, 1),
+            "checks": checks,
+        }
+        _reports[fingerprint] = report
+
+    try:
+        timeout = getattr(settings, "COURSES_STARTUP_CHECKS_CACHE_TIMEOUT", DEFAULT_CACHE_TIMEOUT)
+        cache.set(_cache_key(fingerprint), report, timeout=timeout)
+    except Exception as e:
+        logger.warning(f"Could not share startup check report: {e}")
+
+    logger.info(
+        f"Startup checks {report['status']} in {report['duration_ms']}ms "
+        f"(fingerprint {fingerprint})"
+    )
+    return report
+
+
+def _pending_report(fingerprint: str) -> Dict[str, Any]:
+    return {"fingerprint": fingerprint, "status": STATUS_UNKNOWN, "checked_at": None,
+            "duration_ms": None, "checks": {}}
+
+
+def prime_startup_checks() -> threading.Thread:
+    """Run the probes on a background thread, once per fingerprint per process"""
+    fingerprint = migration_fingerprint()
+    with _priming_lock:
+        worker = _priming.get(fingerprint)
+        if worker is not None:
+            return worker
+
+        def target():
+            try:
+                run_startup_checks(force=True)
+            except Exception as e:
+                logger.error(f"Startup checks failed: {e}")
+            finally:
+                connections.close_all()
+                with _priming_lock:
+                    _priming.pop(fingerprint, None)
+
+        worker = _priming[fingerprint] = threading.Thread(
+            target=target, name="startup-checks", daemon=True
+        )
+        worker.start()
+        return worker
+
+
+def get_startup_report(run_if_missing: bool = True, wait: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Return the report for this deployment, running the probes on first use.
+
+    On first use the probes start on a background thread and a report with
+    status "unknown" is returned until they finish; ``wait`` runs them in the
+    caller instead. With COURSES_STARTUP_CHECKS_MODE = "off" nothing is run
+    and None is returned unless a report already exists.
+    """
+    fingerprint = migration_fingerprint()
+    report = _reports.get(fingerprint)
+    if report is None:
+        try:
+            report = cache.get(_cache_key(fingerprint))
+        except Exception as e:
+            logger.warning(f"Could not read startup check report: {e}")
+        if report is not None:
+            _reports[fingerprint] = report
+
+    if report is None and run_if_missing and get_mode() != MODE_OFF:
+        if wait:
+            return run_startup_checks(force=True)
+        prime_startup_checks()
+        report = _reports.get(fingerprint) or _pending_report(fingerprint)
+    return report
+
+
+def reset_startup_checks():
+    """Forget reports held by this process (for tests)"""
+    global _fingerprint
+    _reports.clear()
+    _fingerprint = None
+
+
+# ====================================
+# BUILT-IN PROBES
+# ====================================
+
+@register_probe("database", critical=True)
+def check_database():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        if cursor.fetchone()[0] != 1:
+            return STATUS_ERROR, "unexpected response to SELECT 1"
+    return STATUS_OK, "connected"
+
+
+@register_probe("migrations", budget=10.0)
+def check_migrations():
+    from django.db.migrations.executor import MigrationExecutor
+
+    executor = MigrationExecutor(connection)
+    pending = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    if pending:
+        names = [f"{migration.app_label}.{migration.name}" for migration, _ in pending]
+        logger.warning(f"Pending migrations detected: {names[:20]}")
+        return STATUS_WARNING, {"pending": len(names), "migrations": names[:20]}
+    return STATUS_OK, "up to date"
+
+
+@register_probe("cache")
+def check_cache():
+    test_key = f"{CACHE_KEY_PREFIX}_cache_test"
+    cache.set(test_key, "cache_test_value", timeout=60)
+    value = cache.get(test_key)
+    cache.delete(test_key)
+    if value != "cache_test_value":
+        return STATUS_ERROR, "cache round trip returned a different value"
+    return STATUS_OK, "connected"
+
+
+@register_probe("monitoring")
+def initialize_monitoring():
+    from django.apps import apps
+
+    apps.get_app_config("courses").initialize_monitoring()
+    return STATUS_OK, "counters initialized"
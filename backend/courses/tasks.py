@@ -0,0 +1,33 @@
+#
+# File Path: backend/courses/tasks.py
+# Folder Path: backend/courses/
+# Date Created: 2026-10-18 00:00:00
+# Version: 1.0.0
+#
+# Periodic tasks for the courses app
+
+import logging
+
+from celery import shared_task
+
+from . import leaderboards, recommendations
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="courses.compute_recommendations", ignore_result=True)
+def compute_recommendations_task():
+    """
+    Rebuild related-course and personal recommendation lists.
+    Scheduled every RECOMMENDATION_REFRESH_INTERVAL seconds by CELERY_BEAT_SCHEDULE.
+    """
+    return recommendations.compute_recommendations()
+
+
+@shared_task(name="courses.reconcile_leaderboards", ignore_result=True)
+def reconcile_leaderboards_task():
+    """
+    Rebuild the current leaderboards and study streaks from Progress rows.
+    Scheduled every LEADERBOARD_RECONCILE_INTERVAL seconds by CELERY_BEAT_SCHEDULE.
+    """
+    return leaderboards.reconcile()
@@ -0,0 +1,152 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from courses.benchmarks import DatasetGenerator, ScenarioRunner, compare_results, purge_dataset
+from courses.benchmarks import scenarios as benchmark_scenarios
+from courses.benchmarks.scenarios import Scenario, error_count, percentile
+from courses.models import Course, Enrollment, Review
+
+SEED = 7
+
+
+def _dataset_rows(seed):
+    prefix = f"bench-{seed}-"
+    courses = list(
+        Course.objects.filter(slug__startswith=prefix)
+        .order_by("slug")
+        .values_list("slug", "title", "price", "level", "is_published", "enrolled_students_count")
+    )
+    enrollments = sorted(
+        Enrollment.objects.filter(course__slug__startswith=prefix)
+        .values_list("user__username", "course__slug", "status")
+    )
+    reviews = sorted(
+        Review.objects.filter(course__slug__startswith=prefix)
+        .values_list("user__username", "course__slug", "rating")
+    )
+    return courses, enrollments, reviews
+
+
+def _scenario(p95, queries, status_codes=None):
+    return {
+        "latency_ms": {"p50": p95, "p95": p95},
+        "queries": {"p50": queries, "max": queries},
+        "status_codes": status_codes or {"200": 20},
+    }
+
+
+def _result(**scenarios):
+    return {"scenarios": scenarios}
+
+
+# Benchmark dataset generator tests
+class DatasetGeneratorTests(TestCase):
+    def test_same_seed_generates_the_same_rows(self):
+        counts = DatasetGenerator("tiny", seed=SEED).run()
+        first = _dataset_rows(SEED)
+
+        purge_dataset(SEED)
+        self.assertFalse(Course.objects.filter(slug__startswith=f"bench-{SEED}-").exists())
+        self.assertEqual(DatasetGenerator("tiny", seed=SEED).run(), counts)
+        self.assertEqual(_dataset_rows(SEED), first)
+
+        self.assertEqual(len(first[0]), 20)
+        self.assertEqual(counts["enrollment"], len(first[1]))
+
+    def test_other_seeds_generate_other_rows(self):
+        DatasetGenerator("tiny", seed=SEED).run()
+        DatasetGenerator("tiny", seed=SEED + 1).run()
+
+        first, second = _dataset_rows(SEED), _dataset_rows(SEED + 1)
+        self.assertEqual(len(first[0]), len(second[0]))
+        self.assertNotEqual(
+            [row[1:] for row in first[0]], [row[1:] for row in second[0]]
+        )
+
+    def test_unknown_scale_is_rejected(self):
+        with self.assertRaisesMessage(ValueError, "Unknown scale 'huge'"):
+            DatasetGenerator("huge")
+
+
+# Scenario runner tests
+class ScenarioRunnerTests(TestCase):
+    def setUp(self):
+        DatasetGenerator("tiny", seed=SEED).run()
+
+    def test_non_2xx_responses_are_counted_as_errors(self):
+        scenarios = {
+            "course_detail": benchmark_scenarios.SCENARIOS["course_detail"],
+            "missing_course": Scenario("missing_course", "/api/courses/no-such-course/"),
+        }
+        with mock.patch.dict(benchmark_scenarios.SCENARIOS, scenarios, clear=True):
+            results = ScenarioRunner(seed=SEED, iterations=2, warmup=0).run()
+
+        self.assertEqual(results["course_detail"]["status_codes"], {"200": 2})
+        self.assertEqual(results["course_detail"]["errors"], 0)
+        self.assertEqual(results["missing_course"]["status_codes"], {"404": 2})
+        self.assertEqual(results["missing_course"]["errors"], 2)
+
+    def test_missing_dataset_is_reported(self):
+        with self.assertRaisesMessage(LookupError, "No benchmark dataset for seed 99"):
+            ScenarioRunner(seed=99)
+
+
+# Percentile tests
+class PercentileTests(SimpleTestCase):
+    def test_nearest_rank(self):
+        values = list(range(10, 0, -1))
+        self.assertEqual(percentile(values, 50), 5)
+        self.assertEqual(percentile(values, 90), 9)
+        self.assertEqual(percentile(values, 95), 10)
+        self.assertEqual(percentile(values, 0), 1)
+        self.assertEqual(percentile(values, 100), 10)
+
+    def test_whole_ranks_are_not_rounded_up(self):
+        values = list(range(1, 21))
+        self.assertEqual(percentile(values, 95), 19)
+        self.assertEqual(percentile(values, 50), 10)
+        self.assertEqual(percentile([3.5], 95), 3.5)
+
+    def test_error_count(self):
+        self.assertEqual(error_count({"200": 3, "204": 1, "304": 2, "500": 1}), 3)
+
+
+# Result comparison tests
+class CompareResultsTests(SimpleTestCase):
+    def _row(self, base, new, **kwargs):
+        return compare_results(_result(s=base), _result(s=new), **kwargs)[0]
+
+    def test_latency_regression_needs_relative_and_absolute_growth(self):
+        self.assertEqual(self._row(_scenario(100, 5), _scenario(130, 5))["status"], "regression")
+        self.assertEqual(self._row(_scenario(100, 5), _scenario(115, 5))["status"], "ok")
+        # +50% but only 2ms: noise on a fast endpoint
+        self.assertEqual(self._row(_scenario(4, 5), _scenario(6, 5))["status"], "ok")
+        self.assertEqual(self._row(_scenario(100, 5), _scenario(70, 5))["status"], "improvement")
+
+    def test_query_growth_is_a_regression(self):
+        row = self._row(_scenario(100, 5), _scenario(100, 6))
+        self.assertEqual((row["status"], row["reasons"]), ("regression", ["queries 5 -> 6"]))
+        self.assertEqual(self._row(_scenario(100, 5), _scenario(100, 6), query_tolerance=1)["status"], "ok")
+        self.assertEqual(self._row(_scenario(100, 5), _scenario(100, 4))["status"], "improvement")
+
+    def test_new_error_status_is_a_regression(self):
+        # Failing fast and without queries must not read as an improvement
+        row = self._row(_scenario(100, 5), _scenario(10, 1, {"500": 20}))
+        self.assertEqual(row["status"], "regression")
+        self.assertEqual(row["reasons"], ["status ['200'] -> ['500']"])
+
+        row = self._row(_scenario(100, 5), _scenario(100, 5, {"200": 19, "404": 1}))
+        self.assertEqual(row["status"], "regression")
+
+    def test_other_status_changes_are_regressions(self):
+        row = self._row(_scenario(100, 5), _scenario(100, 5, {"201": 20}))
+        self.assertEqual(row["status"], "regression")
+
+    def test_errors_going_away_is_an_improvement(self):
+        row = self._row(_scenario(10, 1, {"200": 10, "500": 10}), _scenario(100, 5))
+        self.assertEqual((row["status"], row["reasons"]), ("improvement", []))
+
+    def test_added_and_dropped_scenarios(self):
+        rows = compare_results(_result(old=_scenario(1, 1)), _result(new=_scenario(1, 1)))
+        self.assertEqual([(r["scenario"], r["status"]) for r in rows], [("new", "new"), ("old", "missing")])
@@ -0,0 +1,174 @@
+from io import StringIO
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from courses.models import Category, CategoryClosure, Course
+
+
+def _links():
+    return set(CategoryClosure.objects.values_list("ancestor__name", "descendant__name", "depth"))
+
+
+# Category closure table tests
+class CategoryClosureTests(TestCase):
+    def setUp(self):
+        # Science > Physics > Optics, Science > Biology, Arts
+        self.science = Category.objects.create(name="Science")
+        self.physics = Category.objects.create(name="Physics", parent=self.science)
+        self.optics = Category.objects.create(name="Optics", parent=self.physics)
+        self.biology = Category.objects.create(name="Biology", parent=self.science)
+        self.arts = Category.objects.create(name="Arts")
+
+    def _names(self, categories):
+        return [c.name for c in categories]
+
+    def test_insert_links_every_ancestor(self):
+        self.assertEqual(_links(), {
+            ("Science", "Science", 0), ("Physics", "Physics", 0), ("Optics", "Optics", 0),
+            ("Biology", "Biology", 0), ("Arts", "Arts", 0),
+            ("Science", "Physics", 1), ("Science", "Optics", 2), ("Physics", "Optics", 1),
+            ("Science", "Biology", 1),
+        })
+
+    def test_bulk_inserted_nodes_are_linked_in_order(self):
+        lenses = Category(name="Lenses", slug="lenses", parent=self.optics)
+        Category.objects.bulk_create([lenses])
+        coatings = Category(name="Coatings", slug="coatings", parent=lenses)
+        Category.objects.bulk_create([coatings])
+
+        CategoryClosure.objects.insert_nodes([lenses, coatings])
+
+        self.assertEqual(
+            self._names(coatings.get_ancestors()), ["Science", "Physics", "Optics", "Lenses"]
+        )
+        self.assertEqual(CategoryClosure.objects.check_consistency()["missing"], [])
+
+    def test_moving_a_subtree_relinks_its_descendants(self):
+        self.physics.parent = self.arts
+        self.physics.save()
+
+        self.assertEqual(self._names(self.optics.get_ancestors()), ["Arts", "Physics"])
+        self.assertEqual(self._names(self.science.get_descendants()), ["Biology"])
+        self.assertEqual(self._names(self.arts.get_descendants()), ["Physics", "Optics"])
+        self.assertEqual(CategoryClosure.objects.check_consistency(), {
+            "missing": [], "unexpected": [], "cycles": [],
+        })
+
+        self.physics.parent = None
+        self.physics.save()
+        self.assertEqual(self._names(self.optics.get_ancestors()), ["Physics"])
+        self.assertEqual(self._names(self.arts.get_descendants()), [])
+
+    def test_moving_under_own_descendant_is_rejected(self):
+        for new_parent in (self.optics, self.physics):
+            self.physics.parent = new_parent
+            with self.assertRaises(ValidationError):
+                self.physics.save()
+
+        self.physics.refresh_from_db()
+        self.assertEqual(self.physics.parent, self.science)
+        self.assertEqual(CategoryClosure.objects.check_consistency()["unexpected"], [])
+
+    def test_delete_detaches_the_subtree(self):
+        self.physics.delete()
+
+        self.optics.refresh_from_db()
+        self.assertIsNone(self.optics.parent_id)
+        self.assertEqual(self._names(self.optics.get_ancestors()), [])
+        self.assertEqual(self._names(self.science.get_descendants()), ["Biology"])
+        self.assertEqual(CategoryClosure.objects.check_consistency(), {
+            "missing": [], "unexpected": [], "cycles": [],
+        })
+
+    def test_inactive_ancestor_hides_its_branch(self):
+        course = Course.objects.create(
+            title="Light Basics", category=self.optics, description="Optics course", is_published=True
+        )
+        Course.objects.create(
+            title="Cells", category=self.biology, description="Biology course", is_published=True
+        )
+        self.assertEqual(self.science.get_subtree_course_count(), 2)
+
+        Category.objects.filter(pk=self.physics.pk).update(is_active=False)
+
+        self.assertEqual(
+            set(self.science._get_descendant_ids()), {self.science.pk, self.biology.pk}
+        )
+        self.assertEqual(self.science.get_subtree_course_count(), 1)
+        self.assertNotIn(course, self.science.get_all_courses())
+        # The inactive category still lists its own subtree
+        self.assertEqual(set(self.physics._get_descendant_ids()), {self.physics.pk, self.optics.pk})
+
+        counted = Category.objects.annotate(
+            n=CategoryClosure.objects.subtree_course_count()
+        ).get(pk=self.science.pk)
+        self.assertEqual(counted.n, 1)
+
+    def test_breadcrumbs_run_from_the_root(self):
+        self.assertEqual(
+            [crumb["name"] for crumb in self.optics.get_breadcrumbs()], ["Science", "Physics", "Optics"]
+        )
+        self.assertEqual(self.optics.get_breadcrumbs()[0], {
+            "id": self.science.pk, "name": "Science", "slug": self.science.slug,
+        })
+
+    def test_tree_lookups_are_one_query_at_any_depth(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                self._names(self.science.get_descendants()), ["Biology", "Physics", "Optics"]
+            )
+        with self.assertNumQueries(1):
+            self.assertEqual(self._names(self.optics.get_ancestors(include_self=True)),
+                             ["Science", "Physics", "Optics"])
+        with self.assertNumQueries(1):
+            self.optics.get_breadcrumbs()
+
+    def test_rebuild_repairs_a_corrupted_table(self):
+        # Lose a link, add a bogus one and bypass save() for a parent change
+        CategoryClosure.objects.filter(ancestor=self.science, descendant=self.optics).delete()
+        CategoryClosure.objects.create(ancestor=self.arts, descendant=self.biology, depth=1)
+        Category.objects.filter(pk=self.biology.pk).update(parent=self.physics)
+
+        problems = CategoryClosure.objects.check_consistency()
+        self.assertEqual(problems["missing"], sorted([
+            (self.science.pk, self.optics.pk, 2),
+            (self.physics.pk, self.biology.pk, 1),
+            (self.science.pk, self.biology.pk, 2),
+        ]))
+        self.assertEqual(problems["unexpected"], sorted([
+            (self.arts.pk, self.biology.pk, 1),
+            (self.science.pk, self.biology.pk, 1),
+        ]))
+
+        links, cycles = CategoryClosure.objects.rebuild()
+
+        self.assertEqual((links, cycles), (10, set()))
+        self.assertEqual(CategoryClosure.objects.check_consistency(), {
+            "missing": [], "unexpected": [], "cycles": [],
+        })
+        self.assertEqual(self._names(self.biology.get_ancestors()), ["Science", "Physics"])
+
+    def test_cycles_are_reported_and_isolated(self):
+        Category.objects.filter(pk=self.science.pk).update(parent=self.optics)
+
+        links, cycles = CategoryClosure.objects.rebuild()
+
+        self.assertEqual(cycles, {self.science.pk, self.physics.pk, self.optics.pk, self.biology.pk})
+        self.assertEqual(CategoryClosure.objects.check_consistency()["cycles"], sorted(cycles))
+        self.assertEqual(self._names(self.optics.get_ancestors()), [])
+
+    def test_rebuild_command(self):
+        with self.assertRaisesMessage(CommandError, "inconsistent"):
+            CategoryClosure.objects.filter(ancestor=self.science, descendant=self.optics).delete()
+            call_command("rebuild_category_closure", "--check", stdout=StringIO())
+
+        out = StringIO()
+        call_command("rebuild_category_closure", stdout=out)
+        self.assertIn("Category closure rebuilt: 9 links", out.getvalue())
+
+        out = StringIO()
+        call_command("rebuild_category_closure", "--check", stdout=out)
+        self.assertIn("Category closure table is consistent", out.getvalue())
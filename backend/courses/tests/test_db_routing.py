@@ -0,0 +1,160 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from courses.models import Course
+from educore import db_routing
+from educore.db_routing import (
+    PIN_COOKIE_NAME,
+    ReplicaRouter,
+    ReplicaRoutingMiddleware,
+    use_primary,
+    use_replica,
+)
+
+REPLICA = "replica_routing_test"
+
+
+class _User:
+    is_authenticated = True
+
+    def __init__(self, pk):
+        self.pk = pk
+
+
+# Replica routing tests: a second SQLite alias stands in for the replica.
+# SimpleTestCase keeps the primary outside an atomic block, which would
+# otherwise send every read to it; no query runs on either alias.
+@override_settings(
+    DATABASE_REPLICAS=[REPLICA],
+    DATABASE_REPLICA_DEFAULT_READS=False,
+    DATABASE_READ_YOUR_WRITES_WINDOW=5,
+    DATABASE_REPLICA_MAX_LAG=2,
+)
+class ReplicaRouterTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        connections.settings[REPLICA] = connections.configure_settings({
+            DEFAULT_DB_ALIAS: connections.settings[DEFAULT_DB_ALIAS],
+            REPLICA: {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+        })[REPLICA]
+
+    @classmethod
+    def tearDownClass(cls):
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        db_routing.reset_replica_health()
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def _serve(self, request, write=False):
+        """Run ``request`` through the middleware and return (read alias, response)"""
+        seen = {}
+
+        def view(request):
+            seen["read"] = self.router.db_for_read(Course)
+            if write:
+                self.router.db_for_write(Course)
+                seen["after_write"] = self.router.db_for_read(Course)
+            return HttpResponse()
+
+        with use_replica():
+            response = ReplicaRoutingMiddleware(view)(request)
+        return seen, response
+
+    def test_reads_use_the_primary_without_opt_in(self):
+        self.assertEqual(self.router.db_for_read(Course), DEFAULT_DB_ALIAS)
+        with use_replica():
+            self.assertEqual(self.router.db_for_read(Course), REPLICA)
+
+    def test_routing_is_off_without_replicas(self):
+        with override_settings(DATABASE_REPLICAS=[]), use_replica():
+            self.assertIsNone(self.router.db_for_read(Course))
+            self.assertIsNone(self.router.db_for_write(Course))
+
+    def test_default_reads_cover_safe_methods_only(self):
+        with override_settings(DATABASE_REPLICA_DEFAULT_READS=True):
+            def view(request):
+                return HttpResponse(self.router.db_for_read(Course))
+
+            middleware = ReplicaRoutingMiddleware(view)
+            self.assertEqual(middleware(self.factory.get("/")).content.decode(), REPLICA)
+            self.assertEqual(middleware(self.factory.post("/")).content.decode(), DEFAULT_DB_ALIAS)
+
+    def test_use_primary_overrides_use_replica(self):
+        with use_replica(), use_primary():
+            self.assertEqual(self.router.db_for_read(Course), DEFAULT_DB_ALIAS)
+
+        @use_primary
+        def read():
+            return self.router.db_for_read(Course)
+
+        with override_settings(DATABASE_REPLICA_DEFAULT_READS=True), use_replica():
+            self.assertEqual(read(), DEFAULT_DB_ALIAS)
+
+    def test_class_decorator_wraps_dispatch(self):
+        router = self.router
+
+        @use_replica
+        class View:
+            def dispatch(self):
+                return router.db_for_read(Course)
+
+        self.assertEqual(View().dispatch(), REPLICA)
+
+    def test_writes_go_to_the_primary_and_pin_the_client(self):
+        request = self.factory.post("/")
+        request.user = _User(7)
+
+        seen, response = self._serve(request, write=True)
+
+        self.assertEqual(seen["read"], REPLICA)
+        self.assertEqual(seen["after_write"], DEFAULT_DB_ALIAS)
+        self.assertEqual(response.cookies[PIN_COOKIE_NAME]["max-age"], 5)
+        self.assertTrue(cache.get(db_routing._pin_key(7)))
+
+    def test_pin_cookie_keeps_reads_on_the_primary(self):
+        request = self.factory.get("/")
+        request.COOKIES[PIN_COOKIE_NAME] = "1"
+        self.assertEqual(self._serve(request)[0]["read"], DEFAULT_DB_ALIAS)
+
+    def test_cached_pin_keeps_token_clients_on_the_primary(self):
+        cache.set(db_routing._pin_key(7), 1, 5)
+        request = self.factory.get("/")
+        request.user = _User(7)
+        self.assertEqual(self._serve(request)[0]["read"], DEFAULT_DB_ALIAS)
+
+        request = self.factory.get("/")
+        request.user = _User(8)
+        self.assertEqual(self._serve(request)[0]["read"], REPLICA)
+
+    def test_reads_without_writes_do_not_pin(self):
+        seen, response = self._serve(self.factory.get("/"))
+        self.assertEqual(seen["read"], REPLICA)
+        self.assertNotIn(PIN_COOKIE_NAME, response.cookies)
+
+    def test_lagging_replica_is_skipped(self):
+        with mock.patch.object(db_routing, "replica_lag", return_value=10.0), use_replica():
+            self.assertEqual(self.router.db_for_read(Course), DEFAULT_DB_ALIAS)
+
+    def test_failing_replica_is_skipped(self):
+        with mock.patch.object(db_routing, "replica_lag", side_effect=OSError("down")), use_replica():
+            self.assertEqual(self.router.db_for_read(Course), DEFAULT_DB_ALIAS)
+
+    def test_lag_is_probed_once_per_interval(self):
+        with mock.patch.object(db_routing, "replica_lag", return_value=0.0) as probe, use_replica():
+            self.router.db_for_read(Course)
+            self.router.db_for_read(Course)
+        self.assertEqual(probe.call_count, 1)
+
+    def test_sqlite_replica_reports_no_lag(self):
+        self.assertEqual(db_routing.replica_lag(REPLICA), 0.0)
@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from courses import leaderboards
+from courses.models import Category, Course, Enrollment, Lesson, Module, Progress
+
+
+# Leaderboard tests
+@override_settings(LEADERBOARD_BACKEND="memory", LEADERBOARD_LESSON_POINTS=10)
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        leaderboards.get_backend().clear()
+        leaderboards._pruned["day"] = None
+        User = get_user_model()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.alice = User.objects.create_user(
+                username="boardalice", email="boardalice@example.com", password="pass12345"
+            )
+            self.bob = User.objects.create_user(
+                username="boardbob", email="boardbob@example.com", password="pass12345"
+            )
+        category = Category.objects.create(name="Leaderboard Category")
+        self.course = Course.objects.create(
+            title="Leaderboard Course", category=category, description="Leaderboard course", is_published=True
+        )
+
+    def test_completions_rank_users_globally_and_per_course(self):
+        leaderboards.record_lesson_completion(self.alice.pk, self.course.pk)
+        leaderboards.record_lesson_completion(self.alice.pk, self.course.pk)
+        leaderboards.record_lesson_completion(self.bob.pk, self.course.pk)
+
+        for course_id in (None, self.course.pk):
+            entries = leaderboards.top(course_id=course_id)
+            self.assertEqual([e["user_id"] for e in entries], [self.alice.pk, self.bob.pk])
+            self.assertEqual([e["score"] for e in entries], [20, 10])
+        self.assertEqual(leaderboards.rank_of(self.bob.pk), {"rank": 2, "score": 10, "total": 2})
+        self.assertEqual(leaderboards.top(window=leaderboards.WINDOW_DAILY)[0]["score"], 20)
+
+    def test_streak_grows_on_consecutive_days_and_resets_after_a_gap(self):
+        today = timezone.now()
+        for days_ago in (3, 1, 0, 0):
+            leaderboards.record_lesson_completion(
+                self.alice.pk, self.course.pk, today - timedelta(days=days_ago)
+            )
+
+        self.assertEqual(leaderboards.rank_of(self.alice.pk, leaderboards.STREAKS)["score"], 2)
+
+    def test_broken_streaks_are_pruned(self):
+        leaderboards.record_lesson_completion(self.alice.pk, self.course.pk, timezone.now() - timedelta(days=3))
+        leaderboards.record_lesson_completion(self.bob.pk, self.course.pk)
+
+        entries = leaderboards.top(leaderboards.STREAKS)
+        self.assertEqual([e["user_id"] for e in entries], [self.bob.pk])
+
+    def test_unknown_board_is_rejected(self):
+        with self.assertRaises(ValueError):
+            leaderboards.top("karma")
+        with self.assertRaises(ValueError):
+            leaderboards.top(leaderboards.STREAKS, course_id=self.course.pk)
+
+    def test_reconcile_rebuilds_boards_from_progress(self):
+        leaderboards.record_lesson_completion(self.bob.pk, self.course.pk)
+        module = Module.objects.create(course=self.course, title="Board Module", order=1)
+        lessons = Lesson.objects.bulk_create([
+            Lesson(module=module, title=f"Board Lesson {n}", content="Lesson content here", order=n)
+            for n in (1, 2)
+        ])
+        enrollment = Enrollment.objects.bulk_create([Enrollment(user=self.alice, course=self.course)])[0]
+        # bulk_create skips Progress.save, so the boards only learn of these on reconcile
+        Progress.objects.bulk_create([
+            Progress(enrollment=enrollment, lesson=lesson, is_completed=True, completed_date=timezone.now())
+            for lesson in lessons
+        ])
+
+        leaderboards.reconcile()
+
+        entries = leaderboards.top(course_id=self.course.pk)
+        self.assertEqual([(e["user_id"], e["score"]) for e in entries], [(self.alice.pk, 20)])
+        self.assertEqual(leaderboards.rank_of(self.alice.pk, leaderboards.STREAKS)["score"], 1)
+        self.assertIsNone(leaderboards.rank_of(self.bob.pk))
+
+    def test_endpoint_requires_authentication(self):
+        response = APIClient().get("/api/leaderboards/")
+        self.assertIn(response.status_code, (401, 403))
+
+    def test_endpoint_lists_usernames_and_own_rank(self):
+        leaderboards.record_lesson_completion(self.alice.pk, self.course.pk)
+        client = APIClient()
+        client.force_authenticate(self.bob)
+
+        response = client.get("/api/leaderboards/", {"course": self.course.slug})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"][0]["username"], "boardalice")
+        self.assertIsNone(response.json()["me"])
@@ -0,0 +1,69 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from courses.models import Category, Course, Enrollment, Lesson, Module, Progress
+from courses.permission_matrix import get_access_level, get_permission_context
+from instructor_portal.models import CourseInstructor
+
+
+# Permission matrix tests
+class PermissionMatrixInvalidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        # Run the signals' on-commit invalidations, as after a real commit
+        with self.captureOnCommitCallbacks(execute=True):
+            self.owner = User.objects.create_user(
+                username="matrixowner", email="matrixowner@example.com", password="pass12345"
+            )
+            self.learner = User.objects.create_user(
+                username="matrixlearner", email="matrixlearner@example.com", password="pass12345"
+            )
+        category = Category.objects.create(name="Matrix Category")
+        self.course = Course.objects.create(
+            title="Matrix Course", category=category, description="Permission matrix course"
+        )
+
+    def _fresh(self, user):
+        return get_user_model().objects.get(pk=user.pk)
+
+    def test_cloned_instructors_are_recompiled(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            CourseInstructor.objects.create(course=self.course, instructor=self.learner, is_active=True)
+        self.assertIsNotNone(get_permission_context(self._fresh(self.learner)).instructor_role(self.course.pk))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            clone = self.course.clone_version(self.owner, copy_modules=False)
+
+        context = get_permission_context(self._fresh(self.learner))
+        self.assertIsNotNone(context.instructor_role(clone.pk))
+
+    def test_completion_by_progress_update_is_recompiled(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            enrollment = Enrollment.objects.create(user=self.learner, course=self.course)
+        module = Module.objects.create(course=self.course, title="Matrix Module", order=1)
+        lesson = Lesson.objects.bulk_create([
+            Lesson(module=module, title="Matrix Lesson", content="Lesson content here", order=1)
+        ])[0]
+        Progress.objects.bulk_create([Progress(enrollment=enrollment, lesson=lesson, is_completed=True)])
+        self.assertTrue(get_permission_context(self._fresh(self.learner)).is_enrolled(self.course.pk))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            enrollment._update_progress_sync()
+
+        enrollment.refresh_from_db()
+        self.assertEqual(enrollment.status, "completed")
+        context = get_permission_context(self._fresh(self.learner))
+        self.assertEqual(context.enrollments[self.course.pk], "completed")
+        self.assertFalse(context.is_enrolled(self.course.pk))
+
+    def test_access_level_does_not_compile_the_matrix(self):
+        user = self._fresh(self.learner)
+        with self.assertNumQueries(1):
+            self.assertEqual(get_access_level(user), "registered")
+
+        get_permission_context(user)
+        user = self._fresh(self.learner)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_access_level(user), "registered")
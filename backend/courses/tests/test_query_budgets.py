@@ -0,0 +1,91 @@
+from django.test import TestCase, override_settings
+
+from courses.benchmarks.query_counts import (
+    EndpointCase,
+    QueryCountHarness,
+    build_budgets,
+    check_budgets,
+    discover_cases,
+    load_budgets,
+)
+
+
+def _case(counts, statuses, key="GET /api/courses/"):
+    return EndpointCase(
+        key=key, url=key.split(" ", 1)[1], view="courses.views.CourseViewSet",
+        actor="student", counts=counts, statuses=statuses,
+    )
+
+
+def _budget(counts, statuses):
+    return {"endpoints": {"GET /api/courses/": {
+        "view": "courses.views.CourseViewSet",
+        "queries": counts,
+        "status": {label: str(status) for label, status in statuses.items()},
+    }}}
+
+
+# Query budget check tests
+class CheckBudgetsTests(TestCase):
+    def test_met_budget_passes(self):
+        case = _case({"n2": 5, "n4": 5}, {"n2": 200, "n4": 200})
+        self.assertEqual(check_budgets([case], _budget({"n2": 5, "n4": 5}, {"n2": 200, "n4": 200})), [])
+
+    def test_status_mismatch_fails(self):
+        case = _case({"n2": 1, "n4": 1}, {"n2": 500, "n4": 500})
+        failures = check_budgets([case], _budget({"n2": 5, "n4": 5}, {"n2": 200, "n4": 200}))
+        self.assertEqual(len(failures), 2)
+        self.assertIn("status 500 at n2, expected 200", failures[0])
+
+    def test_growth_fails_even_within_budget(self):
+        case = _case({"n2": 3, "n4": 5}, {"n2": 200, "n4": 200})
+        failures = check_budgets([case], _budget({"n2": 5, "n4": 5}, {"n2": 200, "n4": 200}))
+        self.assertEqual(len(failures), 1)
+        self.assertIn("grows with rows", failures[0])
+
+    def test_over_budget_fails(self):
+        case = _case({"n2": 6, "n4": 6}, {"n2": 200, "n4": 200})
+        failures = check_budgets([case], _budget({"n2": 5, "n4": 5}, {"n2": 200, "n4": 200}))
+        self.assertEqual(len(failures), 2)
+
+    def test_missing_budget_fails(self):
+        case = _case({"n2": 1, "n4": 1}, {"n2": 200, "n4": 200}, key="GET /api/unknown/")
+        failures = check_budgets([case], {"endpoints": {}})
+        self.assertIn("no budget recorded", failures[0])
+
+    def test_build_budgets_round_trips(self):
+        case = _case({"n2": 4, "n4": 4}, {"n2": 200, "n4": 200})
+        self.assertEqual(check_budgets([case], build_budgets([case])), [])
+
+    def test_recorded_budgets_are_flat_and_successful(self):
+        for key, budget in load_budgets()["endpoints"].items():
+            self.assertEqual(len(set(budget["queries"].values())), 1, key)
+            for status in budget["status"].values():
+                self.assertTrue(status.startswith("2"), f"{key}: {status}")
+
+    def test_post_only_actions_are_not_measured(self):
+        keys = {case.key for case in discover_cases()}
+        self.assertNotIn("GET /api/courses/<slug>/enroll/", keys)
+        self.assertNotIn("GET /api/enrollments/<pk>/unenroll/", keys)
+
+
+# Course endpoints measured against the recorded budgets
+class CourseQueryBudgetTests(TestCase):
+    def test_course_endpoints_meet_budgets(self):
+        urls = ("/api/courses/", "/api/courses/<slug>/", "/api/enrollments/", "/api/progress/")
+        cases = [case for case in discover_cases() if case.url in urls]
+        self.assertEqual(len(cases), len(urls))
+
+        QueryCountHarness(cases).run()
+
+        self.assertEqual(check_budgets(cases, load_budgets()), [])
+
+    @override_settings(REQUEST_PROFILER_SAMPLE_RATE=1.0, REQUEST_PROFILER_ENFORCE_BUDGETS=True)
+    def test_declared_view_budgets_hold(self):
+        urls = ("/api/courses/", "/api/courses/<slug>/", "/api/modules/", "/api/lessons/<pk>/")
+        cases = [case for case in discover_cases() if case.url in urls]
+
+        QueryCountHarness(cases).run()
+
+        # A view over its @query_budget raises QueryBudgetExceeded, recorded as the status
+        self.assertEqual(check_budgets(cases, load_budgets()), [])
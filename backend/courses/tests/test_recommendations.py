@@ -0,0 +1,98 @@
+import math
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from courses import recommendations
+from courses.models import Category, Course, Enrollment, Review
+
+
+# Recommendation engine tests
+class CoEnrollmentTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        category = Category.objects.create(name="Recommendation Category")
+        self.courses = [
+            Course.objects.create(
+                title=f"Recommended Course {n}", category=category,
+                description="Recommendation course", is_published=True,
+            )
+            for n in range(4)
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.users = [
+                User.objects.create_user(
+                    username=f"recommender{n}", email=f"recommender{n}@example.com", password="pass12345"
+                )
+                for n in range(3)
+            ]
+        a, b, c, d = self.courses
+        enrolled = {0: [a, b, c], 1: [a, b], 2: [b, d]}
+        # bulk_create skips the enrollment signals, which these tests do not need
+        Enrollment.objects.bulk_create([
+            Enrollment(user=self.users[n], course=course)
+            for n, courses in enrolled.items()
+            for course in courses
+        ])
+        Review.objects.bulk_create([Review(user=self.users[1], course=b, rating=5, content="Great course")])
+
+    def _brute_force(self, catalog):
+        vectors = dict(recommendations.iter_user_interests(100))
+        def weight(user, course):
+            return vectors.get(user, {}).get(course, 0)
+        cosine = {}
+        for a in catalog.summaries:
+            for b in catalog.summaries:
+                dot = sum(weight(user, a) * weight(user, b) for user in vectors)
+                if a != b and dot:
+                    norm = math.sqrt(
+                        sum(weight(user, a) ** 2 for user in vectors)
+                        * sum(weight(user, b) ** 2 for user in vectors)
+                    )
+                    cosine.setdefault(a, {})[b] = dot / norm
+        return cosine
+
+    def test_similarities_match_pairwise_cosine(self):
+        catalog = recommendations.Catalog()
+        index = recommendations.CoEnrollment(catalog, batch_size=2)
+        expected = self._brute_force(catalog)
+
+        for course in self.courses:
+            got = index.similarities(course.pk)
+            want = expected.get(course.pk, {})
+            self.assertEqual(set(got), set(want))
+            for other, score in want.items():
+                self.assertAlmostEqual(got[other], score)
+
+    def test_users_above_course_cap_are_skipped(self):
+        with self.settings(RECOMMENDATION_MAX_USER_COURSES=2):
+            index = recommendations.CoEnrollment(recommendations.Catalog(), batch_size=100)
+        self.assertNotIn(self.users[0].pk, index.user_courses)
+        self.assertNotIn(self.courses[2].pk, index.similarities(self.courses[0].pk))
+
+
+class RelatedCoursesEndpointTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name="Related Category")
+        self.course = Course.objects.create(
+            title="Related Course", category=category, description="Related course", is_published=True
+        )
+        self.client = APIClient()
+
+    def test_course_published_after_last_run_has_empty_list(self):
+        response = self.client.get(f"/api/courses/{self.course.slug}/related/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"results": []})
+
+    def test_unknown_course_is_not_found(self):
+        response = self.client.get("/api/courses/no-such-course/related/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_unpublished_course_is_not_found(self):
+        Course.objects.filter(pk=self.course.pk).update(is_published=False)
+        response = self.client.get(f"/api/courses/{self.course.slug}/related/")
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,57 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from courses.models import Category, Course, Enrollment, Module
+from instructor_portal.course_package import PACKAGE_FORMAT, PACKAGE_VERSION, CourseImporter
+
+
+# Response cache tests
+class BulkWriteInvalidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name="Cache Category")
+        self.course = Course.objects.create(
+            title="Cache Course", category=category, description="Cached course", is_published=True
+        )
+        Module.objects.create(course=self.course, title="Module One", order=1)
+        self.url = f"/api/courses/{self.course.slug}/"
+        self.client = APIClient()
+
+    def _import_modules(self, *titles):
+        records = [{'kind': 'header', 'format': PACKAGE_FORMAT, 'version': PACKAGE_VERSION}]
+        records += [{'kind': 'module', 'ref': n, 'title': title} for n, title in enumerate(titles, 1)]
+        records.append({'kind': 'footer', 'records': len(titles)})
+        with self.captureOnCommitCallbacks(execute=True):
+            CourseImporter(self.course).run(records)
+
+    def test_detail_is_served_from_cache(self):
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'HIT')
+
+    def test_bulk_import_retires_cached_detail(self):
+        first = self.client.get(self.url)
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'HIT')
+
+        self._import_modules("Imported Two", "Imported Three")
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertNotEqual(response['ETag'], first['ETag'])
+        self.assertEqual(len(response.json()['modules']), 3)
+
+    def test_progress_update_retires_cached_user_detail(self):
+        user = get_user_model().objects.create_user(
+            username="cachelearner", email="cachelearner@example.com", password="pass12345"
+        )
+        enrollment = Enrollment.objects.create(user=user, course=self.course)
+        self.client.force_authenticate(user)
+        self.client.get(self.url)
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            enrollment._update_progress_sync()
+
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'MISS')
@@ -0,0 +1,141 @@
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from courses import startup_checks
+
+
+# Startup check tests
+@override_settings(COURSES_STARTUP_CHECKS_MODE="deferred")
+class StartupReportTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        startup_checks.reset_startup_checks()
+        self.release = threading.Event()
+        probes = [startup_checks.StartupProbe("slow", self._slow_probe, budget=5)]
+        patcher = mock.patch.object(startup_checks, "_probes", probes)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.release.set)
+
+    def _slow_probe(self):
+        self.release.wait(5)
+        return startup_checks.STATUS_OK, "done"
+
+    def test_first_report_is_unknown_until_the_probes_finish(self):
+        report = startup_checks.get_startup_report()
+        self.assertEqual(report["status"], startup_checks.STATUS_UNKNOWN)
+        self.assertEqual(report["checks"], {})
+
+        worker = startup_checks.prime_startup_checks()
+        self.assertIs(startup_checks.prime_startup_checks(), worker)
+        self.release.set()
+        worker.join(5)
+
+        report = startup_checks.get_startup_report()
+        self.assertEqual(report["status"], "healthy")
+        self.assertEqual(report["checks"]["slow"]["detail"], "done")
+
+    def test_wait_runs_the_probes_in_the_caller(self):
+        self.release.set()
+        report = startup_checks.get_startup_report(wait=True)
+        self.assertEqual(report["status"], "healthy")
+
+    def test_nothing_runs_when_off(self):
+        with override_settings(COURSES_STARTUP_CHECKS_MODE="off"):
+            self.assertIsNone(startup_checks.get_startup_report())
+        self.assertEqual(startup_checks._priming, {})
+
+
+# Queries issued by a fresh process while Django starts
+SETUP_SCRIPT = textwrap.dedent("""
+    import warnings
+
+    import django
+    from django.db import connections
+
+    warnings.simplefilter("error", RuntimeWarning)
+    queries = []
+    for alias in connections:
+        connections[alias].execute_wrappers.append(
+            lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)
+        )
+    django.setup()
+    print(len(queries))
+    for sql in queries:
+        print(sql)
+""")
+
+
+class StartupQueryTests(SimpleTestCase):
+    databases = {"default"}
+
+    def test_setup_issues_no_queries_with_probes_deferred(self):
+        env = {**os.environ, "COURSES_STARTUP_CHECKS_MODE": startup_checks.MODE_DEFERRED}
+        result = subprocess.run(
+            [sys.executable, "-c", SETUP_SCRIPT], cwd=settings.BASE_DIR, env=env,
+            capture_output=True, text=True, timeout=120,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.splitlines()[-1:], ["0"], result.stdout)
+
+    def test_ready_issues_no_queries(self):
+        from django.apps import apps
+
+        startup_checks.reset_startup_checks()
+        with CaptureQueriesContext(connection) as queries, \
+                mock.patch.object(startup_checks, "run_startup_checks") as run:
+            for config in apps.get_app_configs():
+                config.ready()
+        self.assertEqual(queries.captured_queries, [])
+        run.assert_not_called()
+
+
+@override_settings(COURSES_STARTUP_CHECKS_MODE="deferred", COURSES_STARTUP_CHECK_BUDGET=0.2)
+class ProbeBudgetTests(SimpleTestCase):
+    databases = {"default"}
+
+    def setUp(self):
+        cache.clear()
+        startup_checks.reset_startup_checks()
+        self.addCleanup(startup_checks.reset_startup_checks)
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def test_built_in_probes_finish_within_their_budgets(self):
+        report = startup_checks.run_startup_checks(force=True)
+
+        self.assertEqual(
+            set(report["checks"]), {"database", "migrations", "cache", "monitoring"}
+        )
+        for name, check in report["checks"].items():
+            probe = next(p for p in startup_checks._probes if p.name == name)
+            self.assertNotEqual(check["status"], startup_checks.STATUS_TIMEOUT, name)
+            self.assertLessEqual(check["duration_ms"], (probe.budget or 0.2) * 1000, name)
+        self.assertEqual(report["checks"]["database"]["status"], startup_checks.STATUS_OK)
+
+    def test_slow_probe_is_abandoned_at_its_budget(self):
+        probes = [
+            startup_checks.StartupProbe("hung", lambda: self.release.wait(5), critical=True),
+            startup_checks.StartupProbe("quick", lambda: (startup_checks.STATUS_OK, "fine"), budget=1),
+        ]
+        started = time.monotonic()
+        with mock.patch.object(startup_checks, "_probes", probes):
+            report = startup_checks.run_startup_checks(force=True)
+        elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 1)
+        self.assertEqual(report["status"], "unhealthy")
+        self.assertEqual(report["checks"]["hung"]["status"], startup_checks.STATUS_TIMEOUT)
+        self.assertEqual(report["checks"]["hung"]["detail"], "exceeded 0.2s budget")
+        self.assertEqual(report["checks"]["quick"]["status"], startup_checks.STATUS_OK)
@@ -18,10 +18,10 @@ from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.vary import vary_on_headers
+from educore.ratelimit import AnonSlidingWindowThrottle, SlidingWindowThrottle
 from drf_spectacular.openapi import AutoSchema
 from drf_spectacular.utils import extend_schema
 from rest_framework.routers import DefaultRouter
-from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 
 from . import views
 
@@ -37,11 +37,11 @@ logger = logging.getLogger(__name__)
 
 
 # Consolidated rate limiting classes
-class APIThrottle(UserRateThrottle):
+class APIThrottle(SlidingWindowThrottle):
     scope = "api"
 
 
-class SensitiveAPIThrottle(UserRateThrottle):
+class SensitiveAPIThrottle(SlidingWindowThrottle):
     scope = "sensitive_api"
 
 
@@ -90,7 +90,7 @@ def secure_endpoint(
             from rest_framework.decorators import throttle_classes
 
             result = method_decorator(
-                throttle_classes((throttle_class, AnonRateThrottle)), name="dispatch"
+                throttle_classes((throttle_class, AnonSlidingWindowThrottle)), name="dispatch"
             )(result)
 
             # Apply cache decorators if configured
@@ -120,7 +120,7 @@ def secure_endpoint(
             # Apply DRF throttle classes
             from rest_framework.decorators import throttle_classes
 
-            result = throttle_classes((throttle_class, AnonRateThrottle))(result)
+            result = throttle_classes((throttle_class, AnonSlidingWindowThrottle))(result)
 
             # Apply cache decorators if configured
             if cache_timeout:
@@ -257,6 +257,22 @@ urlpatterns = [
         ),
         name="featured",
     ),
+    # Personal recommendations (per user, so never page-cached)
+    path(
+        "recommendations/",
+        require_http_methods(["GET"])(
+            secure_endpoint()(views.CourseRecommendationsView).as_view()
+        ),
+        name="course-recommendations",
+    ),
+    # Points and study streak leaderboards (include the caller's rank)
+    path(
+        "leaderboards/",
+        require_http_methods(["GET"])(
+            secure_endpoint()(views.LeaderboardView).as_view()
+        ),
+        name="leaderboards",
+    ),
     # =====================================
     # CERTIFICATE VERIFICATION
     # =====================================
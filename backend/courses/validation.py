@@ -261,27 +261,32 @@ def get_unified_user_access_level(user, subscription=None) -> str:
         logger.error(f"Error checking user authentication: {e}")
         return ACCESS_LEVELS['GUEST']
 
-    # Cache key for performance
-    cache_key = f"access_level:{user.id}"
+    if subscription is None:
+        # Read from the user's permission matrix when it is memoized or cached
+        from .permission_matrix import get_access_level
 
-    # Try cache first
-    cached_level = cache.get(cache_key)
-    if cached_level:
-        return cached_level
+        try:
+            return get_access_level(user)
+        except Exception as e:
+            logger.error(f"Error loading permission matrix for user {getattr(user, 'id', 'unknown')}: {e}")
+
+    return resolve_user_access_level(user, subscription)
 
+
+def resolve_user_access_level(user, subscription=None) -> str:
+    """
+    Compute the access level of an authenticated user without caching
+    Used to compile the permission matrix; call get_unified_user_access_level instead
+    """
     try:
         # Staff/superuser always get premium access
         if getattr(user, 'is_staff', False) or getattr(user, 'is_superuser', False):
-            access_level = ACCESS_LEVELS['PREMIUM']
-            cache.set(cache_key, access_level, ACCESS_LEVEL_CACHE_TIMEOUT)
-            return access_level
+            return ACCESS_LEVELS['PREMIUM']
 
         # Check user role for instructor/admin privileges
         user_role = normalize_user_role(getattr(user, 'role', None))
         if user_role in ['instructor', 'administrator', 'staff']:
-            access_level = ACCESS_LEVELS['PREMIUM']
-            cache.set(cache_key, access_level, ACCESS_LEVEL_CACHE_TIMEOUT)
-            return access_level
+            return ACCESS_LEVELS['PREMIUM']
 
         # Get subscription if not provided
         if subscription is None:
@@ -302,23 +307,16 @@ def get_unified_user_access_level(user, subscription=None) -> str:
                 subscription_tier = get_subscription_tier_safe(subscription)
 
                 # Map subscription tier to access level
-                access_level = SUBSCRIPTION_ACCESS_MAPPING.get(
+                return SUBSCRIPTION_ACCESS_MAPPING.get(
                     subscription_tier,
                     ACCESS_LEVELS['REGISTERED']
                 )
 
-                cache.set(cache_key, access_level, ACCESS_LEVEL_CACHE_TIMEOUT)
-                return access_level
-            else:
-                # Inactive subscription falls back to registered
-                access_level = ACCESS_LEVELS['REGISTERED']
-                cache.set(cache_key, access_level, ACCESS_LEVEL_CACHE_TIMEOUT)
-                return access_level
+            # Inactive subscription falls back to registered
+            return ACCESS_LEVELS['REGISTERED']
 
         # Default for authenticated users without active subscription
-        access_level = ACCESS_LEVELS['REGISTERED']
-        cache.set(cache_key, access_level, ACCESS_LEVEL_CACHE_TIMEOUT)
-        return access_level
+        return ACCESS_LEVELS['REGISTERED']
 
     except Exception as e:
         logger.error(f"Error determining user access level for user {getattr(user, 'id', 'unknown')}: {e}")
@@ -326,6 +324,7 @@ def get_unified_user_access_level(user, subscription=None) -> str:
         return ACCESS_LEVELS['REGISTERED']
 
 
+
 def can_user_access_content(user_access_level: str, required_level: str) -> bool:
     """
     Check if user can access content based on access levels with validation
@@ -545,11 +544,9 @@ def validate_instructor_permissions(user) -> bool:
 
         # Check if user has CourseInstructor relationship
         try:
-            from .models import CourseInstructor
-            if CourseInstructor.objects.filter(instructor=user, is_active=True).exists():
+            from .permission_matrix import get_permission_context
+            if get_permission_context(user).is_instructor():
                 return True
-        except ImportError:
-            logger.warning("Could not import CourseInstructor model for permission check")
         except Exception as e:
             logger.error(f"Error checking CourseInstructor relationship: {e}")
 
@@ -704,8 +701,11 @@ def clear_user_access_cache(user_id: int):
     ADDED: Cache management utility
     """
     try:
+        from .permission_matrix import invalidate_permissions
+
         cache_key = f"access_level:{user_id}"
         cache.delete(cache_key)
+        invalidate_permissions(user_id)
         logger.debug(f"Cleared access level cache for user {user_id}")
     except Exception as e:
         logger.error(f"Error clearing access cache for user {user_id}: {e}")
@@ -714,7 +714,8 @@ def clear_user_access_cache(user_id: int):
 # Export all validation functions
 __all__ = [
     'ACCESS_LEVELS', 'SUBSCRIPTION_ACCESS_MAPPING', 'ACCESS_HIERARCHY',
-    'normalize_user_role', 'get_unified_user_access_level', 'can_user_access_content',
+    'normalize_user_role', 'get_unified_user_access_level', 'resolve_user_access_level',
+    'can_user_access_content',
     'validate_lesson_data', 'validate_instructor_permissions', 'validate_course_data',
     'get_access_level_display', 'validate_enrollment_data', 'sanitize_input',
     'validate_content_security', 'clear_user_access_cache'
@@ -19,6 +19,7 @@ from .mixins import (  # Helper functions; Pagination; Mixins; Throttling; Base
     VIEW_CACHE_TIMEOUTS,
     ConsolidatedPermissionMixin,
     OptimizedSerializerMixin,
+    RenderedResponseCacheMixin,
     SafeFilterMixin,
     SecureAPIView,
     SensitiveAPIThrottle,
@@ -39,8 +40,10 @@ from .public import (
     APIVersionView,
     CategoryViewSet,
     CertificateVerificationView,
+    CourseRecommendationsView,
     CourseViewSet,
     FeaturedContentView,
+    LeaderboardView,
     LessonViewSet,
 )
 from .public import (
@@ -135,6 +138,8 @@ __all__ = [
     "CourseProgressView",
     "UnifiedSearchView",
     "FeaturedContentView",
+    "CourseRecommendationsView",
+    "LeaderboardView",
     "CertificateVerificationView",
     "InstructorDashboardView",
     "CourseAnalyticsView",
@@ -156,6 +161,7 @@ __all__ = [
     "ConsolidatedPermissionMixin",
     "StandardContextMixin",
     "SafeFilterMixin",
+    "RenderedResponseCacheMixin",
     # Pagination
     "StandardResultsSetPagination",
     # Helper functions
@@ -27,6 +27,7 @@ from django.db.models import Avg, Count, Prefetch, Q, Sum
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from drf_spectacular.utils import OpenApiParameter, extend_schema
+from educore.db_routing import use_replica
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
@@ -161,6 +162,7 @@ class InstructorDashboardView(
             403: {"description": "Permission denied - instructor access required"},
         }
     )
+    @use_replica
     def get(self, request):
         """Get instructor dashboard data"""
         try:
@@ -171,27 +173,34 @@ class InstructorDashboardView(
                 )
 
             # Get instructor's courses
-            instructor_courses = (
-                Course.objects.filter(
-                    courseinstructor__instructor=request.user,
-                    courseinstructor__is_active=True,
+            instructor_courses = Course.objects.filter(
+                courseinstructor__instructor=request.user,
+                courseinstructor__is_active=True,
+            )
+
+            # Enrollment counts in the same query as the courses
+            courses = list(
+                instructor_courses.annotate(
+                    active_enrollments=Count(
+                        "enrollments",
+                        filter=Q(enrollments__status="active"),
+                        distinct=True,
+                    ),
+                    paid_enrollments=Count(
+                        "enrollments",
+                        filter=Q(enrollments__status__in=["active", "completed"]),
+                        distinct=True,
+                    ),
                 )
-                .select_related("category")
-                .prefetch_related("enrollments")
             )
 
             # Calculate analytics
-            total_courses = instructor_courses.count()
-            total_students = sum(
-                course.enrollments.filter(status="active").count()
-                for course in instructor_courses
-            )
+            total_courses = len(courses)
+            total_students = sum(course.active_enrollments for course in courses)
 
             # Revenue calculation (simplified)
             total_revenue = sum(
-                course.enrollments.filter(status__in=["active", "completed"]).count()
-                * float(course.price)
-                for course in instructor_courses
+                course.paid_enrollments * float(course.price) for course in courses
             )
 
             # Recent activity
@@ -203,8 +212,8 @@ class InstructorDashboardView(
 
             # Course performance
             course_stats = []
-            for course in instructor_courses[:10]:  # Limit to top 10 courses
-                enrollments = course.enrollments.filter(status="active").count()
+            for course in courses[:10]:  # Limit to top 10 courses
+                enrollments = course.active_enrollments
                 rating = float(course.avg_rating) if course.avg_rating else 0.0
 
                 course_stats.append(
@@ -26,12 +26,12 @@ from decimal import Decimal, InvalidOperation
 from typing import Any, Dict, Optional, Union
 
 from django.conf import settings
-from django.core.cache import cache
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 from django.views.decorators.vary import vary_on_headers
+from educore.ratelimit import AnonSlidingWindowThrottle, SlidingWindowThrottle
 from instructor_portal.models import CourseInstructor
 from rest_framework import status
 from rest_framework.authentication import TokenAuthentication
@@ -39,9 +39,9 @@ from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.serializers import ValidationError
-from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 from rest_framework.views import APIView
 
+from .. import response_cache
 from ..validation import get_unified_user_access_level, validate_instructor_permissions
 
 logger = logging.getLogger(__name__)
@@ -501,35 +501,68 @@ VIEW_CACHE_TIMEOUTS = {
 }
 
 
-class SensitiveAPIThrottle(UserRateThrottle):
-    """Throttle class for sensitive API endpoints"""
+class SensitiveAPIThrottle(SlidingWindowThrottle):
+    """Throttle class for sensitive API endpoints, counted separately per view"""
 
     scope = "sensitive_api"
-    rate = getattr(settings, "SENSITIVE_API_THROTTLE_RATE", "100/hour")
+    per_view = True
 
-    def get_cache_key(self, request, view):
-        """Enhanced cache key generation for better security"""
-        try:
-            if request.user.is_authenticated:
-                ident = request.user.pk
-            else:
-                ident = self.get_ident(request)
 
-            # Include view class name for better granularity
-            view_name = view.__class__.__name__
-            return f"throttle_{self.scope}_{view_name}_{ident}"
-        except Exception:
-            return super().get_cache_key(request, view)
+class RenderedResponseCacheMixin:
+    """
+    Serve GET responses from rendered bytes (courses/response_cache.py).
 
+    Views return ``(key, last_modified)`` from get_response_cache_context,
+    or None to skip caching for the request. The lookup runs after
+    authentication, permissions and throttling, so a hit is only ever
+    served to a request that would have been allowed; it is answered
+    with the stored bytes or a 304 without running the handler.
+    """
+
+    response_cache_timeout: Optional[int] = None
+
+    def get_response_cache_context(self, request):
+        return None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._response_cache_context = None
+        if request.method not in ("GET", "HEAD"):
+            return
+        context = self.get_response_cache_context(request)
+        if context is None:
+            return
+        entry = response_cache.get(context[0])
+        if entry is not None:
+            raise response_cache.CachedResponseHit(entry)
+        self._response_cache_context = context
+
+    def handle_exception(self, exc):
+        if isinstance(exc, response_cache.CachedResponseHit):
+            return response_cache.serve(self.request, exc.entry, hit=True)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        context = getattr(self, "_response_cache_context", None)
+        if context and isinstance(response, Response) and response.status_code == 200:
+            key, last_modified = context
+            response.render()
+            entry = response_cache.store(
+                key, response, last_modified, self.response_cache_timeout
+            )
+            return response_cache.serve(request, entry, hit=False)
+        return response
 
-class SecureAPIView(APIView):
+
+class SecureAPIView(RenderedResponseCacheMixin, APIView):
     """
     FIXED: Properly defined SecureAPIView that was referenced but missing
 
     Base view class that enforces:
     - Authentication via Token
     - Rate limiting with appropriate throttle classes
-    - Per-user caching for GET requests
+    - Per-user caching of rendered GET responses with ETag revalidation
     - Standardized error handling
     - Security headers
 
@@ -544,26 +577,14 @@ class SecureAPIView(APIView):
     throttle_classes = [SensitiveAPIThrottle]
     cache_timeout = VIEW_CACHE_TIMEOUTS.get("user", 60)
 
+    @property
+    def response_cache_timeout(self):
+        return self.cache_timeout
+
     @method_decorator(vary_on_headers("Authorization", "Accept-Language"))
     def dispatch(self, request, *args, **kwargs):
-        """Enhanced dispatch with caching and security headers"""
+        """Enhanced dispatch with security headers"""
         try:
-            # Apply cache only for GET requests
-            if request.method == "GET" and self.cache_timeout > 0:
-                cache_key = self._get_cache_key(request)
-                cached_response = cache.get(cache_key)
-
-                if cached_response:
-                    return cached_response
-
-                response = super().dispatch(request, *args, **kwargs)
-
-                # Cache successful responses only
-                if response.status_code == 200:
-                    cache.set(cache_key, response, self.cache_timeout)
-
-                return response
-
             return super().dispatch(request, *args, **kwargs)
 
         except Exception as e:
@@ -573,22 +594,27 @@ class SecureAPIView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    def get_response_cache_context(self, request):
+        """Per-user entries (the request is authenticated at this point)"""
+        if self.cache_timeout <= 0:
+            return None
+        return self._get_cache_key(request), None
+
     def _get_cache_key(self, request) -> str:
         """Generate cache key for the request"""
-        try:
-            user_id = request.user.id if request.user.is_authenticated else "anonymous"
-            path = request.path
-            query_params = sorted(request.query_params.items())
-            query_string = "&".join([f"{k}={v}" for k, v in query_params])
-
-            return get_cache_key(
-                f"secure_view_{self.__class__.__name__}", user_id, path, query_string
-            )
-        except Exception:
-            return f"secure_view_{self.__class__.__name__}_{timezone.now().timestamp()}"
+        user_id = request.user.id if request.user.is_authenticated else "anonymous"
+        return response_cache.entry_key(
+            f"secure_view_{self.__class__.__name__}",
+            user_id,
+            request.path,
+            request.META.get("HTTP_ACCEPT_LANGUAGE", ""),
+            response_cache.request_fingerprint(request),
+        )
 
     def handle_exception(self, exc) -> Response:
         """Standardized exception handling with proper logging"""
+        if isinstance(exc, response_cache.CachedResponseHit):
+            return super().handle_exception(exc)
         try:
             response = super().handle_exception(exc)
 
@@ -683,9 +709,9 @@ class ThrottleMixin:
                     # Staff users get higher limits
                     pass  # No additional throttling for staff
                 else:
-                    throttles.append(SensitiveAPIThrottle())
+                    throttles.append(SensitiveAPIThrottle)
             else:
-                throttles.append(AnonRateThrottle())
+                throttles.append(AnonSlidingWindowThrottle)
 
         except Exception as e:
             logger.error(f"Error setting up throttles: {e}")
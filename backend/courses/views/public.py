@@ -20,12 +20,15 @@ from typing import Union
 
 from courses.serializers.utils import HealthCheckSerializer, VersionInfoSerializer
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.db import IntegrityError, transaction
-from django.db.models import Count, Prefetch, Q, QuerySet
+from django.db.models import Count, Exists, OuterRef, Prefetch, Q, QuerySet
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
+from educore.db_routing import use_replica
+from educore.profiling import query_budget
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
@@ -66,9 +69,12 @@ except ImportError:
 
 from instructor_portal.models import CourseInstructor
 
-from ..models import Category, Certificate, Course, Lesson, Module
+from .. import leaderboards, recommendations, response_cache
+from ..models import Category, Certificate, Course, Enrollment, Lesson, Module
 from ..serializers import (
+    CategoryDetailSerializer,
     CategorySerializer,
+    CategoryTreeSerializer,
     CourseCloneSerializer,
     CourseDetailSerializer,
     CourseSerializer,
@@ -81,6 +87,7 @@ from .mixins import (
     VIEW_CACHE_TIMEOUTS,
     ConsolidatedPermissionMixin,
     OptimizedSerializerMixin,
+    RenderedResponseCacheMixin,
     SafeFilterMixin,
     StandardContextMixin,
     StandardResultsSetPagination,
@@ -91,6 +98,7 @@ from .mixins import (
     validate_certificate_number,
     validate_permissions_and_raise,
 )
+from ..validation import get_unified_user_access_level
 
 logger = logging.getLogger(__name__)
 
@@ -106,11 +114,20 @@ class CategoryViewSet(
         .select_related("parent")
         .order_by("sort_order", "name")
     )
-    serializer_class = CategorySerializer
+    serializer_class = CategoryTreeSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     lookup_field = "slug"
     pagination_class = StandardResultsSetPagination
 
+    def get_queryset(self):
+        """Annotate direct and subtree course counts (one query for any tree depth)"""
+        return self.get_serializer_class().setup_eager_loading(super().get_queryset())
+
+    def get_serializer_class(self):
+        if self.action == "retrieve":
+            return CategoryDetailSerializer
+        return super().get_serializer_class()
+
     filter_mappings = {
         "search": lambda qs, val: qs.filter(
             Q(name__icontains=val) | Q(description__icontains=val)
@@ -127,7 +144,7 @@ class CategoryViewSet(
                 "parent", str, description="Filter by parent category slug"
             ),
         ],
-        responses={200: CategorySerializer(many=True)},
+        responses={200: CategoryTreeSerializer(many=True)},
     )
     def list(self, request, *args, **kwargs):
         """List categories with unified response envelope"""
@@ -141,7 +158,10 @@ class CategoryViewSet(
             )
 
 
+# Read budgets as measured by check_query_counts (courses/benchmarks/query_budgets.json)
+@query_budget(list=11, retrieve=19, featured=8, versions=9, related=3)
 class CourseViewSet(
+    RenderedResponseCacheMixin,
     OptimizedSerializerMixin,
     ConsolidatedPermissionMixin,
     StandardContextMixin,
@@ -150,15 +170,18 @@ class CourseViewSet(
 ):
     """Course management with all critical issues fixed"""
 
-    # Optimized queryset to prevent N+1 queries
-    queryset = Course.objects.select_related(
-        "category", "parent_version"
-    ).prefetch_related(
+    # Optimized queryset to prevent N+1 queries: the category is prefetched
+    # with its published course count, instructors with their profiles.
+    # Modules and lessons are prefetched in get_queryset().
+    queryset = Course.objects.select_related("parent_version").prefetch_related(
+        Prefetch(
+            "category",
+            queryset=CategorySerializer.setup_eager_loading(Category.objects.all()),
+        ),
         Prefetch(
             "courseinstructor_set",
-            queryset=CourseInstructor.objects.select_related("instructor"),
+            queryset=CourseInstructor.objects.select_related("instructor__profile"),
         ),
-        Prefetch("modules", queryset=Module.objects.prefetch_related("lessons")),
         "reviews__user",
     )
 
@@ -207,6 +230,46 @@ class CourseViewSet(
         "status": "completion_status",
     }
 
+    def get_response_cache_context(self, request):
+        """
+        Course detail is cached per access level, or per user once enrolled
+        (the enrollment shapes modules, progress and enrollment info).
+        Instructors and staff see drafts and filtered querysets and are
+        never served from the cache.
+        """
+        if self.action != "retrieve" or self.is_instructor_or_admin():
+            return None
+
+        user = request.user if request.user.is_authenticated else None
+        courses = Course.objects.filter(slug=self.kwargs.get(self.lookup_field))
+        fields = ["id", "updated_date"]
+        if user is not None:
+            courses = courses.annotate(
+                enrolled=Exists(
+                    Enrollment.objects.filter(course=OuterRef("pk"), user=user)
+                )
+            )
+            fields.append("enrolled")
+        row = courses.values(*fields).first()
+        if row is None:
+            return None
+
+        personal = user is not None and row["enrolled"]
+        variant = f"user:{user.pk}" if personal else get_unified_user_access_level(user)
+        tokens = response_cache.generations(
+            *response_cache.course_scopes(row["id"], user.pk if personal else None)
+        )
+        key = response_cache.entry_key(
+            "course_detail",
+            row["id"],
+            variant,
+            *sorted(tokens.values()),
+            request.META.get("HTTP_ACCEPT_LANGUAGE", ""),
+            response_cache.request_fingerprint(request),
+        )
+        last_modified = max([row["updated_date"].timestamp(), *tokens.values()])
+        return key, last_modified
+
     # Update CourseViewSet.get_queryset() method:
 
     def get_queryset(self) -> QuerySet[Course]:
@@ -214,26 +277,23 @@ class CourseViewSet(
         try:
             queryset = super().get_queryset()
 
-            # FIXED: Apply access-level filtering BEFORE pagination to prevent timing attacks
-            user_access_level = get_unified_user_access_level(
-                self.request.user if self.request.user.is_authenticated else None
+            # The detail view serializes every lesson with its resources and
+            # assessment; lists only count lessons
+            lessons = Lesson.objects.all()
+            if self.action == "retrieve":
+                lessons = LessonSerializer.setup_eager_loading(lessons)
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "modules",
+                    queryset=Module.objects.prefetch_related(
+                        Prefetch("lessons", queryset=lessons)
+                    ),
+                )
             )
 
-            # Early filtering based on user access level
-            if not self.request.user.is_authenticated:
-                # Anonymous users: only free published courses
-                queryset = queryset.filter(is_published=True, access_level="guest")
-            elif user_access_level == "premium":
-                # Premium users: all published courses
-                queryset = queryset.filter(is_published=True)
-            elif user_access_level == "registered":
-                # Registered users: free and registered published courses
-                queryset = queryset.filter(
-                    is_published=True, access_level__in=["guest", "registered"]
-                )
-            else:
-                # Fallback: only free published courses
-                queryset = queryset.filter(is_published=True, access_level="guest")
+            # Only published courses are listed; access levels gate lesson
+            # content (Lesson.access_level) in the serializers, not courses
+            queryset = queryset.filter(is_published=True)
 
             # Instructor-only filters
             if self.is_instructor_or_admin() and hasattr(self.request, "query_params"):
@@ -264,6 +324,7 @@ class CourseViewSet(
             OpenApiParameter("instructor", str),
         ]
     )
+    @use_replica
     def list(self, request, *args, **kwargs):
         """List courses with unified response envelope"""
         try:
@@ -283,6 +344,7 @@ class CourseViewSet(
         ]
     )
     @action(detail=False, methods=["get"])
+    @use_replica
     def featured(self, request):
         """Featured courses with safe pagination and proper DRF response"""
         try:
@@ -305,6 +367,40 @@ class CourseViewSet(
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("limit", int, description="Limit number of related courses")
+        ]
+    )
+    @action(detail=True, methods=["get"])
+    @use_replica
+    def related(self, request, slug=None):
+        """
+        Precomputed related courses. Served from the recommendation store
+        without loading the course: one indexed lookup, or a cache hit. A
+        course published after the last run has an empty list until the next.
+        """
+        try:
+            items = recommendations.related_courses(slug)
+            if items is None:
+                return Response(
+                    {"error": "Course not found"}, status=status.HTTP_404_NOT_FOUND
+                )
+
+            limit = safe_int_conversion(
+                request.query_params.get("limit"),
+                recommendations.get_top_n(),
+                min_value=1,
+                max_value=recommendations.get_top_n(),
+            )
+            return Response({"results": items[:limit]})
+        except Exception as e:
+            logger.error(f"Error retrieving related courses: {e}")
+            return Response(
+                {"error": "An error occurred while retrieving related courses"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
     @action(detail=True, methods=["get"])
     def versions(self, request, slug=None):
         """Get all versions of a course"""
@@ -316,11 +412,9 @@ class CourseViewSet(
             original = parent if parent else course
 
             # Get all versions including the original
-            versions = (
-                Course.objects.filter(parent_version=original)
-                .union(Course.objects.filter(id=original.id))
-                .order_by("-created_date")
-            )
+            versions = Course.objects.filter(
+                Q(parent_version=original) | Q(pk=original.pk)
+            ).order_by("-created_date")
 
             serializer = self.get_serializer(versions, many=True)
             return Response(serializer.data)
@@ -434,6 +528,7 @@ class CourseViewSet(
             )
 
 
+@query_budget(list=9, retrieve=8)
 class ModuleViewSet(
     OptimizedSerializerMixin,
     ConsolidatedPermissionMixin,
@@ -445,7 +540,7 @@ class ModuleViewSet(
     queryset = Module.objects.select_related("course").prefetch_related(
         Prefetch(
             "lessons",
-            queryset=Lesson.objects.select_related().prefetch_related("resources"),
+            queryset=LessonSerializer.setup_eager_loading(Lesson.objects.all()),
         )
     )
     serializer_class = ModuleSerializer
@@ -485,14 +580,13 @@ class ModuleViewSet(
             return Module.objects.none()
 
 
+@query_budget(list=8, retrieve=6)
 class LessonViewSet(
     viewsets.ReadOnlyModelViewSet, StandardContextMixin, SafeFilterMixin
 ):
     """Lesson management with proper DRF pagination"""
 
-    queryset = Lesson.objects.select_related("module__course").prefetch_related(
-        "resources", "assessment"
-    )
+    queryset = LessonSerializer.setup_eager_loading(Lesson.objects.all())
     serializer_class = LessonSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     pagination_class = StandardResultsSetPagination
@@ -552,6 +646,7 @@ class UnifiedSearchView(APIView):
         ],
         responses={200: {"description": "Search results"}},
     )
+    @use_replica
     def get(self, request):
         """Perform unified search across content types"""
         try:
@@ -649,6 +744,7 @@ class FeaturedContentView(APIView):
         ],
         responses={200: {"description": "Featured content"}},
     )
+    @use_replica
     def get(self, request):
         """Get featured content across different types"""
         try:
@@ -725,6 +821,114 @@ class FeaturedContentView(APIView):
             )
 
 
+class CourseRecommendationsView(APIView):
+    """
+    Personal course suggestions, precomputed by the recommendation engine.
+    Anonymous users and users without suggestions get popular courses.
+    """
+
+    permission_classes = []
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "limit", int, description="Limit number of recommended courses"
+            ),
+        ],
+        responses={200: {"description": "Recommended courses"}},
+    )
+    @use_replica
+    def get(self, request):
+        """Get recommended courses for the current user"""
+        try:
+            limit = safe_int_conversion(
+                request.query_params.get("limit"),
+                recommendations.get_top_n(),
+                min_value=1,
+                max_value=recommendations.get_top_n(),
+            )
+            items = recommendations.user_recommendations(request.user)
+            return Response({"results": items[:limit]})
+        except Exception as e:
+            logger.error(f"Recommendations error: {e}")
+            return Response(
+                {"error": "An error occurred while retrieving recommendations"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class LeaderboardView(APIView):
+    """
+    Points and study streak leaderboards, read from sorted sets: the cost of
+    a page does not grow with the number of learners. Entries carry
+    usernames, so the boards are only shown to signed-in users.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("board", str, description="points (default) or streaks"),
+            OpenApiParameter("window", str, description="all (default), daily or weekly"),
+            OpenApiParameter("course", str, description="Course slug for a course board"),
+            OpenApiParameter("limit", int, description="Limit number of entries"),
+        ],
+        responses={200: {"description": "Leaderboard"}},
+    )
+    def get(self, request):
+        """Get the top of a leaderboard and the current user's rank"""
+        board = request.query_params.get("board", leaderboards.POINTS)
+        window = request.query_params.get("window", leaderboards.WINDOW_ALL)
+        course_slug = request.query_params.get("course")
+        limit = safe_int_conversion(
+            request.query_params.get("limit", 10), 10, min_value=1, max_value=100
+        )
+
+        try:
+            course_id = None
+            if course_slug:
+                course_id = (
+                    Course.objects.filter(slug=course_slug, is_published=True)
+                    .values_list("id", flat=True)
+                    .first()
+                )
+                if course_id is None:
+                    return Response(
+                        {"error": "Course not found"}, status=status.HTTP_404_NOT_FOUND
+                    )
+
+            try:
+                entries = leaderboards.top(board, course_id, window, limit)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+            me = leaderboards.rank_of(request.user.pk, board, course_id, window)
+
+            usernames = dict(
+                get_user_model()
+                .objects.filter(pk__in=[entry["user_id"] for entry in entries])
+                .values_list("pk", "username")
+            )
+            for entry in entries:
+                entry["username"] = usernames.get(entry["user_id"])
+
+            return Response(
+                {
+                    "board": board,
+                    "window": window,
+                    "course": course_slug,
+                    "results": entries,
+                    "me": me,
+                }
+            )
+        except Exception as e:
+            logger.error(f"Leaderboard error: {e}")
+            return Response(
+                {"error": "An error occurred while retrieving the leaderboard"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
 class CertificateVerificationView(APIView):
     """
     Public certificate verification view
@@ -983,6 +1187,12 @@ class APIHealthCheckView(APIView):
                 },
             }
 
+            # Deferred startup probes; the first health check starts them in the
+            # background and they report "unknown" until the run finishes
+            from ..startup_checks import get_startup_report
+
+            health_data["startup_checks"] = get_startup_report()
+
             # Add enrollment counts safely
             if db_healthy:
                 from ..models import Enrollment
@@ -32,6 +32,7 @@ from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 from drf_spectacular.utils import OpenApiParameter, extend_schema
+from educore.profiling import query_budget
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
@@ -73,6 +74,8 @@ logger = logging.getLogger(__name__)
 # Update EnrollmentViewSet definition and get_queryset method
 
 
+# Read budgets as measured by check_query_counts (courses/benchmarks/query_budgets.json)
+@query_budget(list=7, retrieve=7)
 class EnrollmentViewSet(
     SafeUserQuerysetMixin, viewsets.ModelViewSet, StandardContextMixin
 ):
@@ -84,9 +87,9 @@ class EnrollmentViewSet(
     def get_queryset(self):
         """User's enrollments with schema-compatible filtering"""
         try:
-            base_queryset = Enrollment.objects.select_related(
-                "course__category", "course"
-            ).order_by("-created_date")
+            base_queryset = EnrollmentSerializer.setup_eager_loading(
+                Enrollment.objects.order_by("-created_date")
+            )
             return self._safe_user_filter(base_queryset)
         except Exception as e:
             logger.error(f"Error in EnrollmentViewSet.get_queryset: {e}")
@@ -180,6 +183,7 @@ class EnrollmentViewSet(
 # Update ProgressViewSet definition and get_queryset method
 
 
+@query_budget(list=5, retrieve=4)
 class ProgressViewSet(
     SafeUserQuerysetMixin, viewsets.ModelViewSet, StandardContextMixin
 ):
@@ -191,9 +195,7 @@ class ProgressViewSet(
     def get_queryset(self):
         """Schema-compatible queryset filtering"""
         try:
-            base_queryset = Progress.objects.select_related(
-                "lesson__module__course", "enrollment"
-            )
+            base_queryset = ProgressSerializer.setup_eager_loading(Progress.objects.all())
             return self._safe_user_filter(base_queryset, user_field="enrollment__user")
         except Exception as e:
             logger.error(f"Error in ProgressViewSet.get_queryset: {e}")
@@ -212,7 +214,7 @@ class ReviewViewSet(SafeUserQuerysetMixin, viewsets.ModelViewSet, StandardContex
     def get_queryset(self):
         """Schema-compatible queryset filtering"""
         try:
-            base_queryset = Review.objects.select_related("course")
+            base_queryset = Review.objects.select_related("course", "user__profile")
             return self._safe_user_filter(base_queryset)
         except Exception as e:
             logger.error(f"Error in ReviewViewSet.get_queryset: {e}")
@@ -533,7 +535,7 @@ class UserProgressStatsView(APIView):
             # Get progress records for more detailed stats
             progress_records = Progress.objects.filter(
                 enrollment__user=user
-            ).select_related("lesson__module", "enrollment")
+            ).select_related("lesson__module", "enrollment__course")
 
             # Calculate lessons statistics with null safety
             total_lessons = progress_records.count()
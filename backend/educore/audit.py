@@ -0,0 +1,437 @@
+"""
+File: backend/educore/audit.py
+Folder Path: backend/educore/
+Date Created: 2026-10-18 00:00:00
+Version: 1.0.1
+
+Buffered audit pipeline.
+
+``record()`` builds a plain dict and appends it to a bounded in-process
+buffer; nothing is serialized or written on the caller's thread. A daemon
+thread drains the buffer in batches, when a batch fills up or every
+AUDIT_FLUSH_INTERVAL seconds, and hands each batch to a sink:
+
+- "database": AuditEvent rows via bulk_create (queryable by actor, object
+  and time range, see users.models.AuditEvent)
+- "jsonl": one JSON object per line in a size-rotated file
+- "queue": a local queue.Queue for in-process consumers and tests
+- "logger": one "AUDIT: {...}" log line per event (the former behaviour)
+- or a dotted path to any class with ``write(events)`` and ``close()``
+
+Backpressure: when the buffer is full, events are dropped ("drop") or the
+caller waits up to AUDIT_BLOCK_TIMEOUT for room first ("block"). A batch the
+sink fails to write goes back to the front of the buffer and is retried on
+the next flush; only what no longer fits, or is still buffered at close(),
+is lost. Dropped and failed events are counted in ``stats()`` and in the
+audit_events_total metric. Recording never raises into the caller.
+
+Settings:
+- AUDIT_SINK: sink alias or dotted path (default: "database")
+- AUDIT_BUFFER_SIZE: maximum buffered events (default: 10000)
+- AUDIT_BATCH_SIZE: events per sink write (default: 500)
+- AUDIT_FLUSH_INTERVAL: seconds between flushes of a partial batch (default: 2)
+- AUDIT_OVERFLOW: "drop" or "block" (default: "drop")
+- AUDIT_BLOCK_TIMEOUT: seconds to wait for room in "block" mode (default: 0.05)
+- AUDIT_ASYNC: flush on a background thread; False writes inline (tests)
+- AUDIT_FILE_PATH, AUDIT_FILE_MAX_BYTES, AUDIT_FILE_BACKUP_COUNT: jsonl sink
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from educore.client_ip import get_client_ip
+
+logger = logging.getLogger(__name__)
+
+
+def _json_default(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+# ====================================
+# SINKS
+# ====================================
+
+class DatabaseSink:
+    """Insert events into the AuditEvent table"""
+
+    def __init__(self, batch_size=500):
+        self.batch_size = batch_size
+
+    def write(self, events):
+        from users.models import AuditEvent
+
+        AuditEvent.objects.bulk_create(
+            [
+                AuditEvent(
+                    **{
+                        **event,
+                        "action": event["action"][:100],
+                        "actor_username": event["actor_username"][:150],
+                        "object_type": event["object_type"][:100],
+                        "object_id": event["object_id"][:64],
+                        "user_agent": event["user_agent"][:255],
+                    }
+                )
+                for event in events
+            ],
+            batch_size=self.batch_size,
+        )
+
+    def close(self):
+        pass
+
+
+class JsonlFileSink:
+    """Append events as JSON lines, rotating like logging.RotatingFileHandler"""
+
+    def __init__(self, path=None, max_bytes=None, backup_count=None):
+        self.path = path or getattr(
+            settings, "AUDIT_FILE_PATH", os.path.join(settings.BASE_DIR, "logs", "audit.jsonl")
+        )
+        self.max_bytes = max_bytes if max_bytes is not None else getattr(
+            settings, "AUDIT_FILE_MAX_BYTES", 50 * 1024 * 1024
+        )
+        self.backup_count = backup_count if backup_count is not None else getattr(
+            settings, "AUDIT_FILE_BACKUP_COUNT", 10
+        )
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+    def _rotate(self):
+        for i in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def write(self, events):
+        data = "".join(json.dumps(event, default=_json_default) + "\n" for event in events)
+        with self._lock:
+            if (
+                self.max_bytes
+                and os.path.exists(self.path)
+                and os.path.getsize(self.path) + len(data) > self.max_bytes
+            ):
+                self._rotate()
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(data)
+
+    def close(self):
+        pass
+
+
+class QueueSink:
+    """Hand events to an in-process queue; events that do not fit are dropped"""
+
+    def __init__(self, maxsize=0):
+        self.queue = queue.Queue(maxsize)
+        self.dropped = 0
+
+    def write(self, events):
+        for event in events:
+            try:
+                self.queue.put_nowait(event)
+            except queue.Full:
+                self.dropped += 1
+
+    def drain(self):
+        events = []
+        while True:
+            try:
+                events.append(self.queue.get_nowait())
+            except queue.Empty:
+                return events
+
+    def close(self):
+        pass
+
+
+class LoggerSink:
+    """Write each event as an "AUDIT: {...}" line to this module's logger"""
+
+    def write(self, events):
+        for event in events:
+            logger.info(f"AUDIT: {json.dumps(event, default=_json_default)}")
+
+    def close(self):
+        pass
+
+
+SINKS = {
+    "database": DatabaseSink,
+    "jsonl": JsonlFileSink,
+    "queue": QueueSink,
+    "logger": LoggerSink,
+}
+
+
+def build_sink(name=None):
+    name = name or getattr(settings, "AUDIT_SINK", "database")
+    sink_class = SINKS.get(name) or import_string(name)
+    return sink_class()
+
+
+# ====================================
+# BUFFER
+# ====================================
+
+class AuditBuffer:
+    """Bounded event buffer drained in batches to a sink by a daemon thread"""
+
+    def __init__(self, sink, capacity=10000, batch_size=500, flush_interval=2.0,
+                 overflow="drop", block_timeout=0.05, async_mode=True):
+        if overflow not in ("drop", "block"):
+            raise ValueError(f"Unknown audit overflow policy '{overflow}'")
+        self.sink = sink
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.async_mode = async_mode
+
+        self._events = deque()
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._worker = None
+        self._stopping = False
+        self._counts = {"recorded": 0, "written": 0, "dropped_overflow": 0, "dropped_error": 0}
+        self._reported = dict(self._counts)
+        self._batches = 0
+        self._requeued = 0
+        self._high_water = 0
+
+    def put(self, event):
+        """Buffer one event; returns False if it was dropped"""
+        with self._cond:
+            if len(self._events) >= self.capacity and self.overflow == "block":
+                self._cond.wait_for(lambda: len(self._events) < self.capacity, self.block_timeout)
+            if len(self._events) >= self.capacity:
+                self._counts["dropped_overflow"] += 1
+                return False
+            self._events.append(event)
+            self._counts["recorded"] += 1
+            self._high_water = max(self._high_water, len(self._events))
+            if len(self._events) >= self.batch_size:
+                self._cond.notify_all()
+
+        if self.async_mode:
+            self._ensure_worker()
+        else:
+            self.flush()
+        return True
+
+    def _take_batch(self):
+        with self._cond:
+            batch = [self._events.popleft() for _ in range(min(self.batch_size, len(self._events)))]
+            if batch:
+                self._cond.notify_all()  # wake producers waiting for room
+            return batch
+
+    def flush(self):
+        """Write everything buffered so far"""
+        with self._write_lock:
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    break
+                try:
+                    self.sink.write(batch)
+                except Exception as e:
+                    lost = self._requeue(batch)
+                    logger.error(f"Audit sink {type(self.sink).__name__} failed, "
+                                 f"{len(batch) - lost} events requeued, {lost} lost: {e}")
+                    break  # retried on the next flush
+                with self._cond:
+                    self._counts["written"] += len(batch)
+                    self._batches += 1
+            self._report_metrics()
+
+    def _requeue(self, batch):
+        """Put a failed batch back at the front of the buffer; returns how many did not fit"""
+        with self._cond:
+            room = max(self.capacity - len(self._events), 0)
+            kept = batch[:room]
+            self._events.extendleft(reversed(kept))
+            self._requeued += len(kept)
+            self._counts["dropped_error"] += len(batch) - len(kept)
+            return len(batch) - len(kept)
+
+    def _report_metrics(self):
+        from educore import metrics
+
+        with self._cond:
+            deltas = {k: v - self._reported[k] for k, v in self._counts.items() if k != "recorded"}
+            self._reported = dict(self._counts)
+        for outcome, amount in deltas.items():
+            if amount:
+                metrics.AUDIT_EVENTS.inc(amount, outcome=outcome)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._stopping or len(self._events) >= self.batch_size,
+                    self.flush_interval,
+                )
+                stopping = self._stopping
+            try:
+                self.flush()
+            finally:
+                # The database sink opens a connection on this thread
+                connections.close_all()
+            if stopping:
+                return
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._cond:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._stopping = False
+            self._worker = threading.Thread(target=self._run, name="audit-flush", daemon=True)
+            self._worker.start()
+
+    def close(self, timeout=5.0):
+        """Stop the worker and write what is left"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            worker = self._worker
+        if worker is not None and worker.is_alive():
+            worker.join(timeout)
+        self.flush()
+        with self._cond:
+            lost = len(self._events)
+            self._events.clear()
+            self._counts["dropped_error"] += lost
+        if lost:
+            logger.error(f"Audit sink {type(self.sink).__name__} still failing at close, {lost} events lost")
+            self._report_metrics()
+        self.sink.close()
+
+    def reset_after_fork(self):
+        """Forget the parent's events and worker; the parent flushes its own"""
+        self._events = deque()
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._worker = None
+        self._stopping = False
+
+    def stats(self):
+        with self._cond:
+            return {
+                **self._counts,
+                "buffered": len(self._events),
+                "high_water": self._high_water,
+                "batches": self._batches,
+                "requeued": self._requeued,
+                "capacity": self.capacity,
+                "overflow": self.overflow,
+                "sink": type(self.sink).__name__,
+            }
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    """Return the process-wide buffer configured from settings"""
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = AuditBuffer(
+                    build_sink(),
+                    capacity=getattr(settings, "AUDIT_BUFFER_SIZE", 10000),
+                    batch_size=getattr(settings, "AUDIT_BATCH_SIZE", 500),
+                    flush_interval=getattr(settings, "AUDIT_FLUSH_INTERVAL", 2.0),
+                    overflow=getattr(settings, "AUDIT_OVERFLOW", "drop"),
+                    block_timeout=getattr(settings, "AUDIT_BLOCK_TIMEOUT", 0.05),
+                    async_mode=getattr(settings, "AUDIT_ASYNC", True),
+                )
+                atexit.register(_buffer.close)
+    return _buffer
+
+
+def _after_fork_in_child():
+    if _buffer is not None:
+        _buffer.reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+# ====================================
+# RECORDING
+# ====================================
+
+def record(action, *, source="app", actor=None, actor_id=None, object_type="",
+           object_id=None, success=True, request=None, metadata=None):
+    """
+    Queue one audit event; returns False if it was dropped.
+
+    ``actor`` is a user (anonymous users are recorded without an id);
+    ``actor_id`` can be given instead when only the id is known.
+    """
+    try:
+        if actor is not None and getattr(actor, "is_authenticated", False):
+            actor_id, actor_username = actor.pk, actor.get_username()
+        else:
+            actor_username = ""
+
+        ip_address, user_agent = None, ""
+        if request is not None and hasattr(request, "META"):
+            ip_address = get_client_ip(request)
+            user_agent = request.META.get("HTTP_USER_AGENT", "")
+
+        return get_buffer().put({
+            "timestamp": timezone.now(),
+            "source": source,
+            "action": action,
+            "actor_id": actor_id,
+            "actor_username": actor_username,
+            "object_type": object_type or "",
+            "object_id": "" if object_id is None else str(object_id),
+            "success": success,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "metadata": dict(metadata or {}),
+        })
+    except Exception as e:
+        logger.error(f"Failed to record audit event {action}: {e}")
+        return False
+
+
+def record_many(action, object_ids, **kwargs):
+    """Queue one event per object (e.g. admin bulk actions); returns the number kept"""
+    if not object_ids:
+        return int(record(action, **kwargs))
+    return sum(record(action, object_id=object_id, **kwargs) for object_id in object_ids)
+
+
+def flush():
+    get_buffer().flush()
+
+
+def stats():
+    return get_buffer().stats()
@@ -0,0 +1,44 @@
+"""
+File: backend/educore/client_ip.py
+Folder Path: backend/educore/
+Date Created: 2026-10-19 00:00:00
+Version: 1.0.0
+
+Client address for security decisions (lockouts, audit trail).
+
+X-Forwarded-For is written by whoever sends the request, so its first hop
+cannot be trusted. The address used here is REMOTE_ADDR, or, when the app
+runs behind NUM_PROXIES trusted proxies, the hop the outermost of them
+appended to X-Forwarded-For - the same rule DRF throttles use. Values that
+are not valid IPv4/IPv6 addresses are rejected, so callers never store or
+key on a forged string.
+
+Settings:
+- REST_FRAMEWORK["NUM_PROXIES"]: trusted reverse proxies in front of the
+  app (default: None, use REMOTE_ADDR)
+"""
+
+import ipaddress
+
+from rest_framework.settings import api_settings
+
+
+def parse_ip(value):
+    """``value`` as a normalized IP address string, or None if it is not one"""
+    if not value:
+        return None
+    try:
+        return str(ipaddress.ip_address(value.strip()))
+    except ValueError:
+        return None
+
+
+def get_client_ip(request):
+    """The validated client address of ``request``, or None"""
+    remote_addr = parse_ip(request.META.get("REMOTE_ADDR"))
+    num_proxies = api_settings.NUM_PROXIES
+    forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
+    if num_proxies and forwarded_for:
+        hops = [hop.strip() for hop in forwarded_for.split(",")]
+        return parse_ip(hops[-min(num_proxies, len(hops))]) or remote_addr
+    return remote_addr
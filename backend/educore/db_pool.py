@@ -0,0 +1,374 @@
+"""
+File: backend/educore/db_pool.py
+Folder Path: backend/educore/
+Date Created: 2026-10-18 00:00:00
+Version: 1.0.0
+
+Database connection management: pooling modes, connection budgets and a
+transaction-pooling audit.
+
+Pool modes (DB_POOL_MODE), applied to DATABASES entries by
+``configure_database()`` in settings:
+- "persistent": one connection per thread, kept for CONN_MAX_AGE seconds
+  (the former behaviour)
+- "native": Django's psycopg 3 connection pool, sized from the connection
+  budget. Falls back to "persistent" when psycopg 3 / psycopg_pool are not
+  installed.
+- "pgbouncer": a transaction-mode pooler (PgBouncer, RDS Proxy, ...) sits
+  in front of PostgreSQL. Server-side cursors and prepared statements are
+  disabled, because both outlive a single transaction.
+
+Every mode checks connections before handing them out (CONN_HEALTH_CHECKS).
+The native pool runs psycopg_pool's check on every checkout.
+
+Budget: DB_MAX_CONNECTIONS is what this deployment may open on the server,
+minus DB_RESERVED_CONNECTIONS for migrations, shells and cron. The rest is
+split evenly over the processes that talk to the database (WEB_CONCURRENCY
+web workers plus CELERY_WORKER_CONCURRENCY task workers). A native pool
+never grows past its process's share. A system check warns when
+persistent connections (one per thread) could exceed the budget.
+
+Audit: with DB_POOL_AUDIT set to "warn" or "raise", every connection gets an
+execute wrapper that flags statements which break under transaction
+pooling. On a pooler, the next transaction may run on another server
+connection, so session state set by one transaction is lost or leaks to
+another client:
+- session advisory locks (pg_advisory_lock, not pg_advisory_xact_lock)
+- session settings (SET without LOCAL, RESET, set_config(..., false))
+- LISTEN/UNLISTEN, PREPARE/DEALLOCATE, cursors WITH HOLD, temporary tables
+- server-side cursors (QuerySet.iterator() on PostgreSQL)
+- row locks (FOR UPDATE / FOR SHARE) outside a transaction
+Row locks inside transaction.atomic() are transaction-scoped and safe.
+Findings are grouped by statement kind and calling code location, and are
+served at /api/system/db-pool/. "raise" turns the first occurrence into a
+TransactionPoolingError, for test runs.
+
+Settings:
+- DB_POOL_MODE: "persistent", "native" or "pgbouncer" (default: "persistent")
+- DB_MAX_CONNECTIONS: server connections available to this deployment (default: 100)
+- DB_RESERVED_CONNECTIONS: connections kept free for maintenance (default: 5)
+- WEB_CONCURRENCY, WEB_THREADS: web worker processes and threads per process
+- CELERY_WORKER_CONCURRENCY: Celery worker processes
+- DB_POOL_TIMEOUT: seconds to wait for a pooled connection (default: 10)
+- DB_POOL_AUDIT: "off", "warn" or "raise" (default: "off")
+"""
+
+import logging
+import os
+import re
+import threading
+import traceback
+
+logger = logging.getLogger(__name__)
+
+POOL_MODES = ("persistent", "native", "pgbouncer")
+AUDIT_MODES = ("off", "warn", "raise")
+
+# (kind, pattern, why it breaks) for statements carrying session state
+SESSION_STATE_PATTERNS = [
+    (
+        "advisory_lock",
+        re.compile(r"\bpg_(?:try_)?advisory_(?:un)?lock(?:_shared|_all)?\s*\(", re.I),
+        "session advisory locks outlive the transaction; use pg_advisory_xact_lock",
+    ),
+    (
+        "session_setting",
+        re.compile(r"^\s*(?:SET\s+(?!LOCAL\b|TRANSACTION\b|CONSTRAINTS\b)|RESET\b)", re.I),
+        "session settings leak to other clients; use SET LOCAL inside a transaction",
+    ),
+    (
+        "session_setting",
+        re.compile(r"\bset_config\s*\([^)]*,\s*false\s*\)", re.I),
+        "set_config(..., false) is session-wide; pass true for a transaction-local value",
+    ),
+    (
+        "listen",
+        re.compile(r"^\s*(?:UN)?LISTEN\b", re.I),
+        "notifications are delivered to the server connection, not the client",
+    ),
+    (
+        "prepared_statement",
+        re.compile(r"^\s*(?:PREPARE|DEALLOCATE)\b", re.I),
+        "prepared statements live on one server connection",
+    ),
+    (
+        "cursor_with_hold",
+        re.compile(r"^\s*DECLARE\b.*\bWITH\s+HOLD\b", re.I | re.S),
+        "cursors WITH HOLD outlive the transaction",
+    ),
+    (
+        "temporary_table",
+        re.compile(r"^\s*CREATE\s+(?:GLOBAL\s+|LOCAL\s+)?TEMP(?:ORARY)?\s+TABLE\b(?!.*\bON\s+COMMIT\s+DROP\b)", re.I | re.S),
+        "temporary tables live on one server connection; add ON COMMIT DROP",
+    ),
+]
+ROW_LOCK_PATTERN = re.compile(r"\bFOR\s+(?:NO\s+KEY\s+)?(?:UPDATE|SHARE|KEY\s+SHARE)\b", re.I)
+SQL_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TransactionPoolingError(Exception):
+    """A statement that would break behind a transaction-mode pooler (DB_POOL_AUDIT = "raise")"""
+
+
+# ---------------------------------------------------------------------------
+# Configuration (called from settings, before Django is set up)
+# ---------------------------------------------------------------------------
+
+
+def pooling_available():
+    """True if psycopg 3 and psycopg_pool are installed"""
+    try:
+        import psycopg  # noqa: F401
+        import psycopg_pool  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def connection_budget(max_connections, reserved=0, processes=1):
+    """Connections one process may hold: the usable budget split over processes"""
+    return max(1, (max_connections - reserved) // max(1, processes))
+
+
+def configure_database(database, mode="persistent", max_connections=100, reserved=0,
+                       processes=1, threads=1, pool_timeout=10.0):
+    """
+    Return a copy of a DATABASES entry configured for a pool mode.
+
+    ``processes`` is every process that connects to the database,
+    ``threads`` the threads per web process.
+    """
+    if mode not in POOL_MODES:
+        raise ValueError(f"DB_POOL_MODE must be one of {', '.join(POOL_MODES)}, got '{mode}'")
+
+    database = {**database, "OPTIONS": dict(database.get("OPTIONS", {}))}
+    database["CONN_HEALTH_CHECKS"] = True
+
+    if mode == "native" and pooling_available():
+        budget = connection_budget(max_connections, reserved, processes)
+        max_size = max(1, min(budget, threads))
+        database["CONN_MAX_AGE"] = 0  # the pool owns connection lifetime
+        database["OPTIONS"]["pool"] = {
+            "min_size": 1,
+            "max_size": max_size,
+            "timeout": pool_timeout,
+            "max_idle": 300,
+            "max_lifetime": 3600,
+        }
+    elif mode == "pgbouncer":
+        database["DISABLE_SERVER_SIDE_CURSORS"] = True
+        # Django keeps psycopg 3 from preparing statements unless this is set
+        database["OPTIONS"].pop("server_side_binding", None)
+        database["OPTIONS"].pop("prepare_threshold", None)
+
+    return database
+
+
+# ---------------------------------------------------------------------------
+# Audit
+# ---------------------------------------------------------------------------
+
+
+def _code_location():
+    """First stack frame in project code outside this module"""
+    for frame in reversed(traceback.extract_stack()[:-2]):
+        filename = os.path.abspath(frame.filename)
+        if (
+            filename.startswith(_PROJECT_ROOT)
+            and filename != os.path.abspath(__file__)
+            and "site-packages" not in filename
+        ):
+            return f"{os.path.relpath(filename, _PROJECT_ROOT)}:{frame.lineno} in {frame.name}"
+    return "unknown"
+
+
+def classify(sql, in_transaction=True, server_side_cursor=False):
+    """Transaction-pooling hazards of a statement as ``[(kind, reason), ...]``"""
+    hazards = []
+    if server_side_cursor:
+        hazards.append(("server_side_cursor", "server-side cursors need the same server connection for every fetch"))
+    statement = SQL_COMMENTS.sub(" ", sql or "")
+    for kind, pattern, reason in SESSION_STATE_PATTERNS:
+        if pattern.search(statement):
+            hazards.append((kind, reason))
+    if not in_transaction and ROW_LOCK_PATTERN.search(statement):
+        hazards.append(("row_lock_outside_transaction", "row locks outside a transaction are released immediately"))
+    return hazards
+
+
+class PoolingAudit:
+    """Execute wrapper collecting statements that break under transaction pooling"""
+
+    def __init__(self, mode="warn"):
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._findings = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        connection = context["connection"]
+        raw_cursor = getattr(context["cursor"], "cursor", None)
+        hazards = classify(
+            sql,
+            in_transaction=not connection.get_autocommit(),
+            server_side_cursor=getattr(raw_cursor, "name", None) is not None,
+        )
+        if hazards:
+            self._record(hazards, sql, connection.alias)
+        return execute(sql, params, many, context)
+
+    def _record(self, hazards, sql, alias):
+        location = _code_location()
+        for kind, reason in hazards:
+            key = (kind, location)
+            with self._lock:
+                finding = self._findings.get(key)
+                if finding is None:
+                    finding = self._findings[key] = {
+                        "kind": kind,
+                        "location": location,
+                        "reason": reason,
+                        "database": alias,
+                        "sql": " ".join(str(sql).split())[:300],
+                        "count": 0,
+                    }
+                finding["count"] += 1
+                first = finding["count"] == 1
+
+            if first:
+                message = f"Transaction pooling hazard ({kind}) at {location}: {reason}"
+                if self.mode == "raise":
+                    raise TransactionPoolingError(message)
+                logger.warning(message)
+
+    def findings(self):
+        with self._lock:
+            return sorted(
+                (dict(finding) for finding in self._findings.values()),
+                key=lambda finding: -finding["count"],
+            )
+
+    def reset(self):
+        with self._lock:
+            self._findings.clear()
+
+
+audit = PoolingAudit()
+
+
+def _install_audit(sender, connection, **kwargs):
+    if audit not in connection.execute_wrappers:
+        connection.execute_wrappers.append(audit)
+
+
+def install():
+    """Connect the audit to every database connection when DB_POOL_AUDIT is on"""
+    from django.conf import settings
+    from django.core.checks import Tags, register
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    register(check_connection_budget, Tags.database)
+
+    mode = getattr(settings, "DB_POOL_AUDIT", "off")
+    if mode not in AUDIT_MODES:
+        logger.error(f"DB_POOL_AUDIT must be one of {', '.join(AUDIT_MODES)}, got '{mode}'")
+        return
+    if mode == "off":
+        return
+
+    audit.mode = mode
+    connection_created.connect(_install_audit, dispatch_uid="educore.db_pool.audit")
+    # Connections opened before the app registry was ready
+    for alias in connections:
+        connection = connections[alias]
+        if connection.connection is not None:
+            _install_audit(None, connection)
+
+
+# ---------------------------------------------------------------------------
+# Status and checks
+# ---------------------------------------------------------------------------
+
+
+def _budget_settings():
+    from django.conf import settings
+
+    web_processes = getattr(settings, "WEB_CONCURRENCY", 1)
+    task_processes = getattr(settings, "CELERY_WORKER_CONCURRENCY", 0)
+    return {
+        "mode": getattr(settings, "DB_POOL_MODE", "persistent"),
+        "max_connections": getattr(settings, "DB_MAX_CONNECTIONS", 100),
+        "reserved": getattr(settings, "DB_RESERVED_CONNECTIONS", 0),
+        "web_processes": web_processes,
+        "web_threads": getattr(settings, "WEB_THREADS", 1),
+        "task_processes": task_processes,
+        "processes": web_processes + task_processes,
+    }
+
+
+def pool_status():
+    """Pool mode, connection budget, native pool statistics and audit findings"""
+    from django.conf import settings
+    from django.db import connections
+
+    budget = _budget_settings()
+    status = {
+        **budget,
+        "per_process_budget": connection_budget(
+            budget["max_connections"], budget["reserved"], budget["processes"]
+        ),
+        "pools": {},
+        "audit": {"mode": getattr(settings, "DB_POOL_AUDIT", "off"), "findings": audit.findings()},
+    }
+    for alias in connections:
+        pool = getattr(connections[alias], "pool", None)
+        if pool is not None:
+            status["pools"][alias] = pool.get_stats()
+    return status
+
+
+def check_connection_budget(app_configs=None, **kwargs):
+    """System check: pool mode is usable and peak connections fit the budget"""
+    from django.conf import settings
+    from django.core.checks import Warning
+
+    budget = _budget_settings()
+    usable = budget["max_connections"] - budget["reserved"]
+    messages = []
+
+    if budget["mode"] == "native" and not pooling_available():
+        messages.append(Warning(
+            "DB_POOL_MODE is 'native' but psycopg 3 / psycopg_pool are not installed",
+            hint="pip install 'psycopg[pool]'; persistent connections are used meanwhile.",
+            id="educore.W101",
+        ))
+
+    if budget["mode"] == "native" and pooling_available():
+        # Pools are capped at each process's share of the budget
+        peak = budget["processes"] * connection_budget(
+            budget["max_connections"], budget["reserved"], budget["processes"]
+        )
+    else:
+        peak = budget["web_processes"] * budget["web_threads"] + budget["task_processes"]
+
+    if budget["mode"] != "pgbouncer" and peak > usable:
+        messages.append(Warning(
+            f"Up to {peak} database connections may be opened but only {usable} are budgeted "
+            f"(DB_MAX_CONNECTIONS - DB_RESERVED_CONNECTIONS)",
+            hint="Lower WEB_CONCURRENCY/WEB_THREADS/CELERY_WORKER_CONCURRENCY, raise "
+                 "DB_MAX_CONNECTIONS, or use DB_POOL_MODE = 'native' or 'pgbouncer'.",
+            id="educore.W102",
+        ))
+
+    if budget["mode"] == "pgbouncer":
+        for alias, database in settings.DATABASES.items():
+            if database.get("OPTIONS", {}).get("assume_role"):
+                messages.append(Warning(
+                    f"DATABASES['{alias}'] sets assume_role, a session setting lost behind a transaction pooler",
+                    hint="Connect as the target role instead.",
+                    id="educore.W103",
+                ))
+
+    return messages
@@ -0,0 +1,328 @@
+"""
+File: backend/educore/db_routing.py
+Folder Path: backend/educore/
+Date Created: 2026-10-18 00:00:00
+Version: 1.0.0
+
+Read-replica routing with read-your-writes pinning.
+
+ReplicaRouter sends reads to a replica alias when three things hold:
+- the current code path opted in, either through @use_replica or through
+  DATABASE_REPLICA_DEFAULT_READS on a GET/HEAD/OPTIONS request;
+- the client is not pinned to the primary;
+- the replica is not lagging behind.
+Everything else uses the primary: writes, reads inside a transaction on
+the primary, Celery tasks and management commands. Views and serializers
+opt in or out with decorators that also work as context managers:
+
+    class CourseViewSet(viewsets.ModelViewSet):
+        @use_replica
+        def list(self, request, *args, **kwargs):
+            ...
+
+    @use_primary
+    class EnrollmentSerializer(serializers.ModelSerializer):
+        ...
+
+    with use_replica():
+        Course.objects.count()
+
+Applied to a class, the decorators wrap ``dispatch`` (views) or
+``to_representation`` (serializers).
+
+Read-your-writes: once a request writes, its remaining reads go to the
+primary. ReplicaRoutingMiddleware then pins the client to the primary for
+DATABASE_READ_YOUR_WRITES_WINDOW seconds. Pins are held in a cookie and,
+for authenticated users, in the cache, so token clients that drop cookies
+are pinned too.
+
+Replication lag is measured per replica, at most once per
+DATABASE_REPLICA_LAG_CHECK_INTERVAL seconds per process. A PostgreSQL
+replica is measured with pg_last_xact_replay_timestamp(); other backends
+report no lag. A replica is skipped while its lag exceeds
+DATABASE_REPLICA_MAX_LAG or the probe fails.
+
+Replica aliases are plain DATABASES entries. In tests they mirror the
+primary (``'TEST': {'MIRROR': 'default'}``). Two SQLite aliases are
+enough to exercise the router.
+
+Settings:
+- DATABASE_REPLICAS: replica aliases; routing is off when empty
+- DATABASE_REPLICA_DEFAULT_READS: route all safe-method requests to replicas,
+  not only views decorated with @use_replica (default: False)
+- DATABASE_READ_YOUR_WRITES_WINDOW: seconds a client is pinned after a write (default: 5)
+- DATABASE_REPLICA_MAX_LAG: seconds of lag above which a replica is skipped (default: 2)
+- DATABASE_REPLICA_LAG_CHECK_INTERVAL: seconds between lag probes (default: 5)
+"""
+
+import contextvars
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.functional import SimpleLazyObject, empty
+
+logger = logging.getLogger(__name__)
+
+PIN_COOKIE_NAME = "db_primary_pin"
+PIN_CACHE_PREFIX = "db_routing:pin"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+POSTGRES_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+# Routing state of the current request, set by ReplicaRoutingMiddleware
+_request_state = contextvars.ContextVar("db_routing_request", default=None)
+# True/False while inside @use_replica / @use_primary, None otherwise
+_override = contextvars.ContextVar("db_routing_override", default=None)
+
+_lag_lock = threading.Lock()
+_lag_checks = {}  # alias -> (checked at, lag in seconds or None if the probe failed)
+
+
+def _setting(name, default):
+    return getattr(settings, f"DATABASE_{name}", default)
+
+
+def replica_aliases():
+    return list(_setting("REPLICAS", []))
+
+
+# ---------------------------------------------------------------------------
+# Request state and pinning
+# ---------------------------------------------------------------------------
+
+
+class RoutingState:
+    """Routing state of one request"""
+
+    def __init__(self, request):
+        self.request = request
+        self.safe_method = request.method in SAFE_METHODS
+        self.wrote = False
+        self.pinned = PIN_COOKIE_NAME in request.COOKIES
+        self._checked_user = None
+
+    def user_pk(self):
+        """Primary key of the authenticated user, without triggering authentication"""
+        user = self.request.__dict__.get("user")
+        if isinstance(user, SimpleLazyObject):
+            # Evaluating the lazy user queries the database from inside the router
+            user = None if user._wrapped is empty else user._wrapped
+        if user is not None and getattr(user, "is_authenticated", False):
+            return user.pk
+        return None
+
+    def is_pinned(self):
+        """True if the client wrote within the read-your-writes window"""
+        if self.wrote or self.pinned:
+            return True
+        user_pk = self.user_pk()
+        if user_pk is not None and user_pk != self._checked_user:
+            # DRF authenticates inside the view, so the user can appear mid-request
+            self._checked_user = user_pk
+            try:
+                self.pinned = bool(cache.get(_pin_key(user_pk)))
+            except Exception as exc:
+                logger.warning(f"Could not read primary pin for user {user_pk}: {exc}")
+                self.pinned = True
+        return self.pinned
+
+
+def _pin_key(user_pk):
+    return f"{PIN_CACHE_PREFIX}:{user_pk}"
+
+
+def pin_to_primary(response, state):
+    """Pin the client of a request that wrote to the primary for the window"""
+    window = _setting("READ_YOUR_WRITES_WINDOW", 5)
+    if window <= 0:
+        return
+    response.set_cookie(PIN_COOKIE_NAME, "1", max_age=window, httponly=True, samesite="Lax")
+    user_pk = state.user_pk()
+    if user_pk is not None:
+        try:
+            cache.set(_pin_key(user_pk), 1, window)
+        except Exception as exc:
+            logger.warning(f"Could not pin user {user_pk} to the primary: {exc}")
+
+
+# ---------------------------------------------------------------------------
+# Replica health
+# ---------------------------------------------------------------------------
+
+
+def replica_lag(alias):
+    """Replication lag of a replica in seconds"""
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return 0.0
+    with connection.cursor() as cursor:
+        cursor.execute(POSTGRES_LAG_SQL)
+        return float(cursor.fetchone()[0])
+
+
+def _current_lag(alias):
+    now = time.monotonic()
+    interval = _setting("REPLICA_LAG_CHECK_INTERVAL", 5)
+    with _lag_lock:
+        checked = _lag_checks.get(alias)
+        if checked and now - checked[0] < interval:
+            return checked[1]
+        # Claim the slot so concurrent requests keep using the last result
+        _lag_checks[alias] = (now, checked[1] if checked else 0.0)
+
+    try:
+        lag = replica_lag(alias)
+    except Exception as exc:
+        logger.warning(f"Replica {alias} is unavailable: {exc}")
+        lag = None
+
+    with _lag_lock:
+        _lag_checks[alias] = (now, lag)
+    return lag
+
+
+def healthy_replicas():
+    """Replicas whose last measured lag is within DATABASE_REPLICA_MAX_LAG"""
+    max_lag = _setting("REPLICA_MAX_LAG", 2)
+    healthy = []
+    for alias in replica_aliases():
+        lag = _current_lag(alias)
+        if lag is not None and lag <= max_lag:
+            healthy.append(alias)
+    return healthy
+
+
+def reset_replica_health():
+    """Forget measured lag so the next read probes every replica again"""
+    with _lag_lock:
+        _lag_checks.clear()
+
+
+# ---------------------------------------------------------------------------
+# Router
+# ---------------------------------------------------------------------------
+
+
+class ReplicaRouter:
+    """Database router sending safe reads to healthy replicas"""
+
+    def db_for_read(self, model, **hints):
+        replicas = replica_aliases()
+        if not replicas:
+            return None
+
+        override = _override.get()
+        state = _request_state.get()
+        if override is False:
+            return DEFAULT_DB_ALIAS
+        if override is None and not (
+            state is not None and state.safe_method and _setting("REPLICA_DEFAULT_READS", False)
+        ):
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        if state is not None and state.is_pinned():
+            return DEFAULT_DB_ALIAS
+
+        healthy = healthy_replicas()
+        return random.choice(healthy) if healthy else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        if not replica_aliases():
+            return None
+        state = _request_state.get()
+        if state is not None:
+            state.wrote = True
+        # Explicit, or Django would save instances back to the replica they came from
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replica_aliases():
+            return False
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Opt-in / opt-out decorators
+# ---------------------------------------------------------------------------
+
+
+@contextmanager
+def _routing(replica):
+    token = _override.set(replica)
+    try:
+        yield
+    finally:
+        _override.reset(token)
+
+
+def _routing_decorator(replica):
+    def decorator(target=None):
+        if target is None:
+            return _routing(replica)
+        if isinstance(target, type):
+            for name in ("dispatch", "to_representation"):
+                method = getattr(target, name, None)
+                if method is not None:
+                    setattr(target, name, _routing(replica)(method))
+            return target
+        return _routing(replica)(target)
+
+    return decorator
+
+
+use_replica = _routing_decorator(True)
+use_replica.__doc__ = "Read from replicas in a view, serializer, function or ``with`` block"
+
+use_primary = _routing_decorator(False)
+use_primary.__doc__ = "Read from the primary in a view, serializer, function or ``with`` block"
+
+
+# ---------------------------------------------------------------------------
+# Middleware
+# ---------------------------------------------------------------------------
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Track writes per request and pin writing clients to the primary.
+
+    Place it after AuthenticationMiddleware so session users are known when
+    the response pins them.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_aliases():
+            return self.get_response(request)
+
+        state = RoutingState(request)
+        token = _request_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+
+        if state.wrote:
+            pin_to_primary(response, state)
+        return response
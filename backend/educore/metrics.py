@@ -0,0 +1,363 @@
+"""
+File: backend/educore/metrics.py
+Folder Path: backend/educore/
+Date Created: 2026-10-18 00:00:00
+Version: 1.0.0
+
+Pre-aggregated application metrics in Prometheus text exposition format.
+
+Counters, gauges and histograms are updated incrementally by domain events
+(logins, registrations, session starts and ends, enrollments, course
+completions) and kept in a small store, so a scrape reads O(metrics) values
+and never queries business tables. Gauges that cannot be tracked from events
+alone are re-synced out of band by ``python manage.py reconcile_metrics``.
+
+Stores:
+- "redis": one Redis hash shared by every web and worker process (default)
+- "memory": per-process dictionary, for tests and single-process setups
+
+Recording never raises into the caller. A store failure is logged and the
+sample is recorded by the per-process memory store instead, which scrapes
+read from while the shared store is down.
+
+Settings:
+- METRICS_BACKEND: "redis" or "memory"
+- METRICS_REDIS_URL: Redis URL for the redis store (default: CELERY_BROKER_URL)
+- METRICS_NAMESPACE: key prefix in Redis (default: "educore")
+"""
+
+import logging
+import re
+import threading
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_LABEL_RE = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _series(name, labels):
+    """Sample name with labels, exactly as written in the exposition format"""
+    if not labels:
+        return name
+    pairs = ",".join(f'{key}="{_escape(labels[key])}"' for key in sorted(labels))
+    return f"{name}{{{pairs}}}"
+
+
+def _parse_labels(series):
+    name, _, rest = series.partition("{")
+    labels = {
+        key: re.sub(r"\\(.)", lambda m: "\n" if m.group(1) == "n" else m.group(1), value)
+        for key, value in _LABEL_RE.findall(rest)
+    }
+    return name, labels
+
+
+def _sort_key(item):
+    name, labels = _parse_labels(item[0])
+    le = labels.pop("le", None)
+    return name, sorted(labels.items()), float(le) if le is not None else 0.0
+
+
+def _format_value(value):
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+# ====================================
+# STORES
+# ====================================
+
+class InMemoryMetricsStore:
+    """Per-process store; values are lost on restart"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def increment(self, items):
+        with self._lock:
+            for series, amount in items:
+                self._values[series] = self._values.get(series, 0.0) + amount
+
+    def set(self, items):
+        with self._lock:
+            self._values.update(items)
+
+    def read(self):
+        with self._lock:
+            return dict(self._values)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class RedisMetricsStore:
+    """Store shared by all processes: one hash with a field per series"""
+
+    def __init__(self, url=None, namespace=None):
+        import redis
+
+        self.url = url or getattr(settings, "METRICS_REDIS_URL", settings.CELERY_BROKER_URL)
+        self.key = f"{namespace or getattr(settings, 'METRICS_NAMESPACE', 'educore')}:metrics"
+        self.client = redis.Redis.from_url(self.url)
+
+    def increment(self, items):
+        pipe = self.client.pipeline(transaction=False)
+        for series, amount in items:
+            pipe.hincrbyfloat(self.key, series, amount)
+        pipe.execute()
+
+    def set(self, items):
+        if items:
+            self.client.hset(self.key, mapping=dict(items))
+
+    def read(self):
+        return {
+            field.decode(): float(value)
+            for field, value in self.client.hgetall(self.key).items()
+        }
+
+    def clear(self):
+        self.client.delete(self.key)
+
+
+STORE_CLASSES = {
+    "memory": InMemoryMetricsStore,
+    "redis": RedisMetricsStore,
+}
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(name=None):
+    """Return the store selected by METRICS_BACKEND, or the one named"""
+    name = name or getattr(settings, "METRICS_BACKEND", "redis")
+    with _stores_lock:
+        if name not in _stores:
+            _stores[name] = STORE_CLASSES[name]()
+        return _stores[name]
+
+
+# ====================================
+# METRIC TYPES
+# ====================================
+
+class Metric:
+    type_name = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _labels(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return labels
+
+    def sample_names(self):
+        return (self.name,)
+
+    def _write(self, method, items):
+        try:
+            getattr(get_store(), method)(items)
+            return
+        except Exception as e:
+            logger.warning(f"Metrics store failed for {self.name}, recording in memory: {e}")
+        try:
+            getattr(get_store("memory"), method)(items)
+        except Exception as e:
+            logger.warning(f"Could not record metric {self.name}: {e}")
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self._write("increment", [(_series(self.name, self._labels(labels)), amount)])
+
+
+class Gauge(Metric):
+    type_name = "gauge"
+
+    def inc(self, amount=1, **labels):
+        self._write("increment", [(_series(self.name, self._labels(labels)), amount)])
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        self._write("set", [(_series(self.name, self._labels(labels)), value)])
+
+    def set_many(self, values):
+        """Set several label combinations at once: ``{(("tier", "premium"),): 3}``"""
+        self._write("set", [
+            (_series(self.name, self._labels(dict(labels))), value)
+            for labels, value in values.items()
+        ])
+
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=()):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def sample_names(self):
+        return (f"{self.name}_bucket", f"{self.name}_sum", f"{self.name}_count")
+
+    def observe(self, value, **labels):
+        self.observe_many([value], **labels)
+
+    def observe_many(self, values, **labels):
+        """Record several observations with one store round trip"""
+        labels = self._labels(labels)
+        totals = {}
+        for value in values:
+            for bound in self.buckets + (float("inf"),):
+                if value <= bound:
+                    le = "+Inf" if bound == float("inf") else _format_value(float(bound))
+                    series = _series(f"{self.name}_bucket", {**labels, "le": le})
+                    totals[series] = totals.get(series, 0) + 1
+            sum_series = _series(f"{self.name}_sum", labels)
+            count_series = _series(f"{self.name}_count", labels)
+            totals[sum_series] = totals.get(sum_series, 0) + value
+            totals[count_series] = totals.get(count_series, 0) + 1
+        if totals:
+            self._write("increment", list(totals.items()))
+
+
+# ====================================
+# REGISTRY
+# ====================================
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._samples = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        for sample in metric.sample_names():
+            self._samples[sample] = metric.name
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=()):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def _read(self):
+        """Read the configured store, or this process's memory store if it fails"""
+        try:
+            return get_store().read()
+        except Exception as e:
+            logger.warning(f"Metrics store unavailable, reading in-process samples: {e}")
+            return get_store("memory").read()
+
+    def _grouped(self):
+        groups = {name: [] for name in self._metrics}
+        for series, value in sorted(self._read().items(), key=_sort_key):
+            family = self._samples.get(series.partition("{")[0])
+            if family is not None:
+                groups[family].append((series, value))
+        return groups
+
+    def render(self):
+        """Render every registered metric in Prometheus text exposition format"""
+        lines = []
+        for name, samples in self._grouped().items():
+            metric = self._metrics[name]
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.type_name}")
+            lines.extend(f"{series} {_format_value(value)}" for series, value in samples)
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """Return ``{metric: [{"name", "labels", "value"}, ...]}`` for JSON APIs"""
+        result = {}
+        for name, samples in self._grouped().items():
+            result[name] = []
+            for series, value in samples:
+                sample, labels = _parse_labels(series)
+                result[name].append({"name": sample, "labels": labels, "value": value})
+        return result
+
+
+registry = MetricsRegistry()
+
+
+def on_commit(func, *args, **kwargs):
+    """Record a metric once the current transaction commits"""
+    transaction.on_commit(partial(func, *args, **kwargs))
+
+
+# ====================================
+# APPLICATION METRICS
+# ====================================
+
+SESSION_DURATION_BUCKETS = (300, 900, 3600, 4 * 3600, 12 * 3600, 86400, 3 * 86400, 7 * 86400, 30 * 86400)
+
+USERS_REGISTERED = registry.counter(
+    "users_registered_total", "Accounts created")
+USERS = registry.gauge(
+    "users", "Accounts by state (total is event driven, the rest reconciled)", ["state"])
+LOGINS = registry.counter(
+    "users_logins_total", "Login attempts by result", ["result"])
+ACCOUNT_LOCKOUTS = registry.counter(
+    "users_account_lockouts_total", "Accounts locked after repeated failed logins")
+SESSIONS_CREATED = registry.counter(
+    "user_sessions_created_total", "User sessions started", ["device_type"])
+SESSIONS_ENDED = registry.counter(
+    "user_sessions_ended_total", "User sessions ended", ["reason"])
+SESSIONS_ACTIVE = registry.gauge(
+    "user_sessions_active", "Sessions currently marked active")
+SESSION_DURATION = registry.histogram(
+    "user_session_duration_seconds", "Lifetime of ended sessions",
+    buckets=SESSION_DURATION_BUCKETS)
+SUBSCRIPTIONS = registry.gauge(
+    "subscriptions", "Subscriptions by tier and status (reconciled)", ["tier", "status"])
+ENROLLMENTS = registry.counter(
+    "courses_enrollments_total", "Course enrollments created")
+COMPLETIONS = registry.counter(
+    "courses_completions_total", "Course enrollments completed")
+AUDIT_EVENTS = registry.counter(
+    "audit_events_total", "Audit events leaving the buffer, by outcome", ["outcome"])
+RATE_LIMITED = registry.counter(
+    "rate_limited_requests_total", "Requests rejected by rate limits", ["group", "tier"])
+RECONCILED_AT = registry.gauge(
+    "metrics_reconciled_timestamp_seconds", "Unix time gauges were last re-synced from the database")
+
+
+def record_sessions_ended(created_ats, reason, now):
+    """Record the end of sessions started at ``created_ats``"""
+    created_ats = list(created_ats)
+    if not created_ats:
+        return
+    SESSIONS_ENDED.inc(len(created_ats), reason=reason)
+    SESSIONS_ACTIVE.dec(len(created_ats))
+    SESSION_DURATION.observe_many(
+        [max((now - created).total_seconds(), 0) for created in created_ats]
+    )
@@ -0,0 +1,435 @@
+"""
+File: backend/educore/profiling.py
+Folder Path: backend/educore/
+Date Created: 2026-10-18 00:00:00
+Version: 1.0.0
+
+Per-request query and timing profiler.
+
+RequestProfilerMiddleware records, for every sampled request:
+
+- SQL statement count and total database time (all aliases)
+- duplicate statements by fingerprint, flagging likely N+1 patterns
+- cache hits and misses
+- time spent rendering DRF serializer ``.data``
+- total wall time
+
+Results are aggregated per view (HTTP method + URL route) into in-process
+histograms served by the staff-only ``/api/system/profiling/`` endpoint.
+Each process keeps its own numbers, so under several workers every worker
+reports the traffic it served.
+
+Views can declare a query budget with ``@query_budget``. Exceeding it is
+logged and counted, and raises QueryBudgetExceeded when
+REQUEST_PROFILER_ENFORCE_BUDGETS is on (intended for the test suite).
+
+Settings:
+- REQUEST_PROFILER_ENABLED: turn profiling on (default: True)
+- REQUEST_PROFILER_SAMPLE_RATE: fraction of requests profiled (default: 1.0
+  under DEBUG, otherwise 0)
+- REQUEST_PROFILER_N_PLUS_ONE_THRESHOLD: repeats of one statement that
+  count as N+1 (default: 5)
+- REQUEST_PROFILER_ENFORCE_BUDGETS: raise on budget violations (default: False)
+- REQUEST_PROFILER_HEADERS: add Server-Timing / X-Query-Count headers
+"""
+
+import bisect
+import contextvars
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+TOP_FINGERPRINTS = 10
+
+_current = contextvars.ContextVar("request_profile", default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in enforcement mode when a view issues more queries than declared"""
+
+
+def _setting(name, default):
+    return getattr(settings, f"REQUEST_PROFILER_{name}", default)
+
+
+# ====================================
+# QUERY FINGERPRINTS
+# ====================================
+
+_IN_LIST_RE = re.compile(r"\(\s*%s(?:\s*,\s*%s)+\s*\)")
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint_sql(sql):
+    """Normalize a statement so repeats with different parameters compare equal"""
+    sql = _IN_LIST_RE.sub("(%s, ...)", sql)
+    sql = _LITERAL_RE.sub("?", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+# ====================================
+# PER-REQUEST PROFILE
+# ====================================
+
+class RequestProfile:
+    """Counters collected while one request is being handled"""
+
+    __slots__ = ("queries", "db_time", "fingerprints", "cache_hits", "cache_misses",
+                 "serializer_time", "_serializer_depth")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.fingerprints = Counter()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.serializer_time = 0.0
+        self._serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute wrapper (see connection.execute_wrapper)"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+            self.fingerprints[fingerprint_sql(sql)] += 1
+
+    def duplicates(self, threshold):
+        return [(fp, n) for fp, n in self.fingerprints.most_common() if n >= threshold]
+
+
+def current_profile():
+    """Return the profile of the request being handled, or None"""
+    return _current.get()
+
+
+# ====================================
+# CACHE AND SERIALIZER INSTRUMENTATION
+# ====================================
+
+_instrument_lock = threading.Lock()
+_instrumented = False
+_MISSING = object()
+
+
+def _wrap_cache_get(get):
+    @wraps(get)
+    def instrumented(self, key, default=None, version=None):
+        profile = _current.get()
+        if profile is None:
+            return get(self, key, default, version)
+        value = get(self, key, _MISSING, version)
+        if value is _MISSING:
+            profile.cache_misses += 1
+            return default
+        profile.cache_hits += 1
+        return value
+
+    return instrumented
+
+
+def _wrap_cache_get_many(get_many):
+    @wraps(get_many)
+    def instrumented(self, keys, version=None):
+        result = get_many(self, keys, version)
+        profile = _current.get()
+        if profile is not None:
+            keys = list(keys) if not isinstance(keys, (list, tuple)) else keys
+            profile.cache_hits += len(result)
+            profile.cache_misses += max(len(keys) - len(result), 0)
+        return result
+
+    return instrumented
+
+
+def _wrap_serializer_data(fget):
+    @wraps(fget)
+    def instrumented(self):
+        profile = _current.get()
+        if profile is None:
+            return fget(self)
+        profile._serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return fget(self)
+        finally:
+            profile._serializer_depth -= 1
+            if profile._serializer_depth == 0:
+                profile.serializer_time += time.perf_counter() - started
+
+    return instrumented
+
+
+def instrument():
+    """Patch configured cache backends and DRF serializers once per process"""
+    global _instrumented
+    with _instrument_lock:
+        if _instrumented:
+            return
+        for alias in getattr(settings, "CACHES", {}):
+            backend_class = type(caches[alias])
+            if getattr(backend_class, "_profiler_instrumented", False):
+                continue
+            backend_class.get = _wrap_cache_get(backend_class.get)
+            backend_class.get_many = _wrap_cache_get_many(backend_class.get_many)
+            backend_class._profiler_instrumented = True
+
+        try:
+            from rest_framework.serializers import BaseSerializer
+
+            BaseSerializer.data = property(_wrap_serializer_data(BaseSerializer.data.fget))
+        except ImportError:
+            pass
+        _instrumented = True
+
+
+# ====================================
+# AGGREGATION
+# ====================================
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum and max"""
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Upper bucket bound containing the q-th observation"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds + (None,), self.counts):
+            seen += n
+            if seen >= rank:
+                return bound if bound is not None else self.max
+        return self.max
+
+    def as_dict(self):
+        labels = [f"le_{b}" for b in self.bounds] + ["inf"]
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count, 2) if self.count else None,
+            "max": round(self.max, 2),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class ViewStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.budget_violations = 0
+        self.n_plus_one_requests = 0
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.db_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.serializer_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.duplicates = Counter()  # fingerprint -> worst repeat count seen
+
+    def as_dict(self):
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "budget_violations": self.budget_violations,
+            "n_plus_one_requests": self.n_plus_one_requests,
+            "latency_ms": self.latency_ms.as_dict(),
+            "db_ms": self.db_ms.as_dict(),
+            "serializer_ms": self.serializer_ms.as_dict(),
+            "queries": self.queries.as_dict(),
+            "cache": {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "hit_ratio": round(self.cache_hits / lookups, 3) if lookups else None,
+            },
+            "top_duplicates": [
+                {"fingerprint": fp, "max_repeats": n}
+                for fp, n in self.duplicates.most_common(TOP_FINGERPRINTS)
+            ],
+        }
+
+
+class ProfileRegistry:
+    """Thread-safe, in-process aggregation of request profiles per view"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+        self.started = time.time()
+
+    def record(self, view, profile, elapsed, status_code, duplicates, over_budget):
+        with self._lock:
+            stats = self._views.get(view)
+            if stats is None:
+                stats = self._views[view] = ViewStats()
+            stats.requests += 1
+            stats.errors += status_code >= 500
+            stats.budget_violations += over_budget
+            stats.latency_ms.observe(elapsed * 1000)
+            stats.db_ms.observe(profile.db_time * 1000)
+            stats.serializer_ms.observe(profile.serializer_time * 1000)
+            stats.queries.observe(profile.queries)
+            stats.cache_hits += profile.cache_hits
+            stats.cache_misses += profile.cache_misses
+            if duplicates:
+                stats.n_plus_one_requests += 1
+                for fp, n in duplicates:
+                    if n > stats.duplicates[fp]:
+                        stats.duplicates[fp] = n
+                if len(stats.duplicates) > TOP_FINGERPRINTS * 5:
+                    stats.duplicates = Counter(dict(stats.duplicates.most_common(TOP_FINGERPRINTS)))
+
+    def snapshot(self, sort="queries"):
+        with self._lock:
+            views = {name: stats.as_dict() for name, stats in self._views.items()}
+        key = {
+            "queries": lambda item: item[1]["queries"]["max"],
+            "latency": lambda item: item[1]["latency_ms"]["max"],
+            "requests": lambda item: item[1]["requests"],
+        }.get(sort, lambda item: item[1]["queries"]["max"])
+        return {
+            "since": self.started,
+            "views": dict(sorted(views.items(), key=key, reverse=True)),
+        }
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+            self.started = time.time()
+
+
+registry = ProfileRegistry()
+
+
+# ====================================
+# QUERY BUDGETS
+# ====================================
+
+def query_budget(default=None, **per_action):
+    """
+    Declare the maximum number of queries a view may issue per request.
+
+    Works on function views and view classes; viewsets can give per-action
+    budgets, e.g. ``@query_budget(10, list=5, retrieve=3)``.
+    """
+
+    def decorator(view):
+        view.query_budget = {"default": default, **per_action}
+        return view
+
+    return decorator
+
+
+def get_query_budget(resolver_match, method):
+    func = resolver_match.func
+    owner = getattr(func, "view_class", None) or getattr(func, "cls", None)
+    budgets = getattr(func, "query_budget", None) or getattr(owner, "query_budget", None)
+    if not budgets:
+        return None
+    action = (getattr(func, "actions", None) or {}).get(method.lower())
+    if action and budgets.get(action) is not None:
+        return budgets[action]
+    return budgets.get("default")
+
+
+# ====================================
+# MIDDLEWARE
+# ====================================
+
+class RequestProfilerMiddleware:
+    """
+    Profile requests and aggregate the results per view.
+
+    Place it near the top of MIDDLEWARE so authentication and session
+    queries are attributed to the request as well.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = _setting("ENABLED", True)
+        if self.enabled:
+            instrument()
+
+    def __call__(self, request):
+        sample_rate = _setting("SAMPLE_RATE", 1.0 if settings.DEBUG else 0.0)
+        if not self.enabled or random.random() >= sample_rate:
+            return self.get_response(request)
+
+        profile = RequestProfile()
+        token = _current.set(profile)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        elapsed = time.perf_counter() - started
+
+        self._finish(request, response, profile, elapsed)
+        return response
+
+    def _finish(self, request, response, profile, elapsed):
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return
+
+        route = (match.route or match.view_name).lstrip("^").rstrip("$")
+        view = f"{request.method} {route}"
+        duplicates = profile.duplicates(_setting("N_PLUS_ONE_THRESHOLD", 5))
+        budget = get_query_budget(match, request.method)
+        over_budget = budget is not None and profile.queries > budget
+
+        registry.record(view, profile, elapsed, response.status_code, duplicates, over_budget)
+
+        if duplicates:
+            worst, repeats = duplicates[0]
+            logger.warning(f"Possible N+1 in {view}: {repeats}x {worst[:200]}")
+
+        if _setting("HEADERS", settings.DEBUG):
+            response["X-Query-Count"] = str(profile.queries)
+            response["Server-Timing"] = (
+                f"db;dur={profile.db_time * 1000:.1f}, "
+                f"serializer;dur={profile.serializer_time * 1000:.1f}, "
+                f"total;dur={elapsed * 1000:.1f}"
+            )
+
+        if over_budget:
+            message = f"{view} issued {profile.queries} queries (budget {budget})"
+            if _setting("ENFORCE_BUDGETS", False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(f"Query budget exceeded: {message}")
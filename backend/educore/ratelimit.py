@@ -0,0 +1,448 @@
+"""
+File: backend/educore/ratelimit.py
+Folder Path: backend/educore/
+Date Created: 2026-10-18 00:00:00
+Version: 1.0.0
+
+Sliding-window rate limiting for DRF views.
+
+Every rule ("60/min", "1000/hour", ...) is a sliding-window counter: the
+count of the current fixed window plus the previous window's count weighted
+by how much of it still overlaps the sliding window. That is three numbers
+per rule, so memory per client stays constant however many requests it
+makes (DRF's cache throttles keep a pickled list of every request time).
+All rules of a policy are checked and incremented in one atomic step, a Lua
+script on Redis, so concurrent requests cannot both take the last slot.
+
+Policies are configured per endpoint group (the throttle ``scope``) and
+per tier. A tier is the client's access level ("guest", "registered",
+"premium"), so paying subscribers get larger burst and sustained limits.
+Groups are keyed per user, per IP, or per user falling back to the IP
+for anonymous requests:
+
+    RATE_LIMIT_POLICIES = {
+        "api": {
+            "key": "user_or_ip",
+            "tiers": {
+                "guest": ["20/min", "300/hour"],
+                "premium": ["120/min", "5000/hour"],
+                "*": ["60/min", "1000/hour"],
+            },
+        },
+    }
+
+Allowed and rejected requests carry RateLimit-Limit, RateLimit-Remaining,
+RateLimit-Reset and RateLimit-Policy headers (added by
+RateLimitHeadersMiddleware) for the most restrictive rule; rejections also
+get Retry-After. A backend failure is logged and the request is counted by
+the per-process memory backend instead, so limits still hold per worker
+while the shared backend is down.
+
+Backends:
+- "redis": counters shared by every process (default)
+- "memory": per-process dictionary, for tests and single-process setups
+
+Settings:
+- RATE_LIMIT_ENABLED: turn rate limiting off entirely (default: True)
+- RATE_LIMIT_BACKEND: "redis" or "memory"
+- RATE_LIMIT_REDIS_URL: Redis URL for the redis backend (default: CELERY_BROKER_URL)
+- RATE_LIMIT_NAMESPACE: key prefix in Redis (default: "educore")
+- RATE_LIMIT_POLICIES: policies by group; unknown groups use "default"
+"""
+
+import logging
+import math
+import re
+import threading
+import time
+
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+from educore import metrics
+
+logger = logging.getLogger(__name__)
+
+KEY_TYPES = ("user", "ip", "user_or_ip")
+
+_RATE_RE = re.compile(
+    r"^\s*(\d+)\s*/\s*(\d*)\s*(s|sec|second|m|min|minute|h|hour|d|day)s?\s*$"
+)
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """'100/hour' -> (100, 3600); '20/10s' -> (20, 10)"""
+    match = _RATE_RE.match(rate)
+    if not match:
+        raise ValueError(f"Invalid rate '{rate}'")
+    limit, multiplier, unit = match.groups()
+    return int(limit), int(multiplier or 1) * _UNIT_SECONDS[unit[0]]
+
+
+# ====================================
+# SLIDING WINDOW
+# ====================================
+
+def evaluate_rule(state, limit, window_ms, now_ms, cost):
+    """
+    Apply one rule to its stored (window, current, previous) state.
+
+    Returns (new_state, allowed, remaining, reset_ms, retry_ms). The Lua
+    script in RedisRateLimitBackend is a line-by-line port of this function.
+    """
+    index = now_ms // window_ms
+    window, current, previous = state or (index, 0, 0)
+    if window == index - 1:
+        window, current, previous = index, 0, current
+    elif window != index:
+        window, current, previous = index, 0, 0
+
+    elapsed = (now_ms - index * window_ms) / window_ms
+    used = previous * (1 - elapsed) + current
+    reset_ms = index * window_ms + window_ms - now_ms
+
+    if used + cost <= limit:
+        remaining = math.floor(limit - used - cost)
+        return (window, current + cost, previous), True, remaining, reset_ms, 0
+
+    # Time until the weighted count leaves room for this request
+    if previous > 0 and limit - current - cost >= 0:
+        retry_ms = (1 - (limit - current - cost) / previous - elapsed) * window_ms
+    elif cost <= limit and current > 0:
+        retry_ms = reset_ms + (1 - (limit - cost) / current) * window_ms
+    else:
+        retry_ms = reset_ms + window_ms
+    return (window, current, previous), False, 0, reset_ms, max(math.ceil(retry_ms), 1)
+
+
+class RuleResult:
+    """Outcome of one rule for one request"""
+
+    __slots__ = ("limit", "window", "allowed", "remaining", "reset", "retry_after")
+
+    def __init__(self, limit, window, allowed, remaining, reset_ms, retry_ms):
+        self.limit = limit
+        self.window = window
+        self.allowed = allowed
+        self.remaining = remaining
+        self.reset = math.ceil(reset_ms / 1000)
+        self.retry_after = math.ceil(retry_ms / 1000)
+
+
+class InMemoryRateLimitBackend:
+    """Per-process counters; limits are not shared between workers"""
+
+    SWEEP_EVERY = 1000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states = {}
+        self._expires = {}
+        self._calls = 0
+
+    def hit(self, key, rules, cost=1, now=None):
+        now_ms = int((now if now is not None else time.time()) * 1000)
+        with self._lock:
+            self._calls += 1
+            if self._calls % self.SWEEP_EVERY == 0:
+                self._sweep(now_ms)
+
+            states = self._states.get(key)
+            if states is None or len(states) != len(rules):
+                states = [None] * len(rules)
+            outcomes = [
+                evaluate_rule(state, limit, window * 1000, now_ms, cost)
+                for state, (limit, window) in zip(states, rules)
+            ]
+            allowed = all(outcome[1] for outcome in outcomes)
+            if allowed:
+                self._states[key] = [outcome[0] for outcome in outcomes]
+                self._expires[key] = now_ms + 2 * max(window for _, window in rules) * 1000
+
+        results = []
+        for (limit, window), (_, rule_allowed, remaining, reset_ms, retry_ms) in zip(rules, outcomes):
+            if not allowed and rule_allowed:
+                remaining += cost  # nothing was taken from this rule
+            results.append(RuleResult(limit, window, allowed, remaining, reset_ms, retry_ms))
+        return results
+
+    def _sweep(self, now_ms):
+        for key in [key for key, expires in self._expires.items() if expires < now_ms]:
+            self._states.pop(key, None)
+            self._expires.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._states.clear()
+            self._expires.clear()
+
+
+# KEYS[1]: hash holding w<n>, c<n>, p<n> for every rule n
+# ARGV: now_ms, cost, then limit and window_ms for every rule
+# Returns: allowed, then remaining, reset_ms, retry_ms for every rule
+SLIDING_WINDOW_LUA = """
+local now = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+local rules = (#ARGV - 2) / 2
+local states = {}
+local outcomes = {}
+local allowed = 1
+local longest = 0
+
+for n = 1, rules do
+    local limit = tonumber(ARGV[1 + 2 * n])
+    local window_ms = tonumber(ARGV[2 + 2 * n])
+    if window_ms > longest then longest = window_ms end
+
+    local index = math.floor(now / window_ms)
+    local fields = redis.call('HMGET', KEYS[1], 'w' .. n, 'c' .. n, 'p' .. n)
+    local window = tonumber(fields[1]) or index
+    local current = tonumber(fields[2]) or 0
+    local previous = tonumber(fields[3]) or 0
+    if window == index - 1 then
+        window, current, previous = index, 0, current
+    elseif window ~= index then
+        window, current, previous = index, 0, 0
+    end
+
+    local elapsed = (now - index * window_ms) / window_ms
+    local used = previous * (1 - elapsed) + current
+    local reset_ms = index * window_ms + window_ms - now
+    local retry_ms = 0
+    local remaining = 0
+
+    if used + cost <= limit then
+        remaining = math.floor(limit - used - cost)
+    else
+        allowed = 0
+        if previous > 0 and limit - current - cost >= 0 then
+            retry_ms = (1 - (limit - current - cost) / previous - elapsed) * window_ms
+        elseif cost <= limit and current > 0 then
+            retry_ms = reset_ms + (1 - (limit - cost) / current) * window_ms
+        else
+            retry_ms = reset_ms + window_ms
+        end
+        retry_ms = math.max(math.ceil(retry_ms), 1)
+    end
+
+    states[n] = {window, current, previous}
+    outcomes[n] = {remaining, reset_ms, retry_ms}
+end
+
+if allowed == 1 then
+    for n = 1, rules do
+        redis.call('HSET', KEYS[1], 'w' .. n, states[n][1], 'c' .. n, states[n][2] + cost,
+                   'p' .. n, states[n][3])
+    end
+    redis.call('PEXPIRE', KEYS[1], 2 * longest)
+end
+
+local result = {allowed}
+for n = 1, rules do
+    local remaining = outcomes[n][1]
+    if allowed == 0 and outcomes[n][3] == 0 then
+        remaining = remaining + cost
+    end
+    table.insert(result, remaining)
+    table.insert(result, outcomes[n][2])
+    table.insert(result, outcomes[n][3])
+end
+return result
+"""
+
+
+class RedisRateLimitBackend:
+    """Counters shared by all processes, one hash per client and group"""
+
+    def __init__(self, url=None, namespace=None):
+        import redis
+
+        self.url = url or getattr(settings, "RATE_LIMIT_REDIS_URL", settings.CELERY_BROKER_URL)
+        self.prefix = f"{namespace or getattr(settings, 'RATE_LIMIT_NAMESPACE', 'educore')}:ratelimit"
+        self.client = redis.Redis.from_url(self.url)
+        self.script = self.client.register_script(SLIDING_WINDOW_LUA)
+
+    def hit(self, key, rules, cost=1, now=None):
+        now_ms = int((now if now is not None else time.time()) * 1000)
+        args = [now_ms, cost]
+        for limit, window in rules:
+            args.extend([limit, window * 1000])
+        reply = self.script(keys=[f"{self.prefix}:{key}"], args=args)
+        allowed = bool(reply[0])
+        return [
+            RuleResult(limit, window, allowed, *map(int, reply[1 + 3 * n:4 + 3 * n]))
+            for n, (limit, window) in enumerate(rules)
+        ]
+
+    def clear(self):
+        for key in self.client.scan_iter(f"{self.prefix}:*"):
+            self.client.delete(key)
+
+
+BACKEND_CLASSES = {
+    "memory": InMemoryRateLimitBackend,
+    "redis": RedisRateLimitBackend,
+}
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(name=None):
+    """Return the backend selected by RATE_LIMIT_BACKEND, or the one named"""
+    name = name or getattr(settings, "RATE_LIMIT_BACKEND", "redis")
+    with _backends_lock:
+        if name not in _backends:
+            _backends[name] = BACKEND_CLASSES[name]()
+        return _backends[name]
+
+
+def hit(key, rules):
+    """Count a request on the configured backend, or in memory if it fails"""
+    try:
+        return get_backend().hit(key, rules)
+    except Exception as e:
+        logger.error(f"Rate limit backend failed for {key}, counting in memory: {e}")
+    return get_backend("memory").hit(key, rules)
+
+
+# ====================================
+# POLICIES
+# ====================================
+
+_parsed_policies = {}
+
+
+def get_policy(group):
+    """Return (key type, {tier: [(limit, window), ...]}) for an endpoint group"""
+    policies = getattr(settings, "RATE_LIMIT_POLICIES", {})
+    config = policies.get(group) or policies.get("default") or {}
+    cache_key = (group, id(config))
+    if cache_key not in _parsed_policies:
+        key_type = config.get("key", "user_or_ip")
+        if key_type not in KEY_TYPES:
+            raise ValueError(f"Unknown rate limit key '{key_type}' for group '{group}'")
+        tiers = {
+            tier: sorted((parse_rate(rate) for rate in rates), key=lambda rule: rule[1])
+            for tier, rates in config.get("tiers", {}).items()
+        }
+        _parsed_policies[cache_key] = (key_type, tiers)
+    return _parsed_policies[cache_key]
+
+
+def get_tier(user):
+    from courses.validation import get_unified_user_access_level
+
+    if user is None or not user.is_authenticated:
+        return "guest"
+    return get_unified_user_access_level(user)
+
+
+# ====================================
+# DRF THROTTLES
+# ====================================
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Throttle requests with the RATE_LIMIT_POLICIES entry for ``scope``.
+
+    ``per_view`` keeps separate counters for every view using the class;
+    ``anonymous_only`` leaves authenticated requests alone.
+    """
+
+    scope = "default"
+    per_view = False
+    anonymous_only = False
+
+    def __init__(self):
+        self.results = []
+
+    def get_ident_key(self, request, key_type):
+        user = getattr(request, "user", None)
+        if key_type != "ip" and user is not None and user.is_authenticated:
+            return f"user:{user.pk}"
+        if key_type == "user" and not (user is not None and user.is_authenticated):
+            return None
+        return f"ip:{self.get_ident(request)}"
+
+    def allow_request(self, request, view):
+        if not getattr(settings, "RATE_LIMIT_ENABLED", True):
+            return True
+        user = getattr(request, "user", None)
+        if self.anonymous_only and user is not None and user.is_authenticated:
+            return True
+
+        key_type, tiers = get_policy(self.scope)
+        tier = get_tier(user)
+        rules = tiers.get(tier) or tiers.get("*")
+        ident = self.get_ident_key(request, key_type)
+        if not rules or ident is None:
+            return True
+
+        key = f"{self.scope}:{ident}"
+        if self.per_view:
+            key = f"{key}:{view.__class__.__name__}"
+        self.results = hit(key, rules)
+        _attach(request, self.results)
+        if all(result.allowed for result in self.results):
+            return True
+
+        metrics.RATE_LIMITED.inc(group=self.scope, tier=tier)
+        return False
+
+    def wait(self):
+        blocked = [result.retry_after for result in self.results if not result.allowed]
+        return max(blocked) if blocked else None
+
+
+class AnonSlidingWindowThrottle(SlidingWindowThrottle):
+    """Anonymous requests only, counted per IP (replaces AnonRateThrottle)"""
+
+    scope = "anon"
+    anonymous_only = True
+
+
+class UserSlidingWindowThrottle(SlidingWindowThrottle):
+    """Per user, or per IP for anonymous requests (replaces UserRateThrottle)"""
+
+    scope = "user"
+
+
+# ====================================
+# HEADERS
+# ====================================
+
+def _attach(request, results):
+    # Stored on the Django request so the middleware sees it
+    http_request = getattr(request, "_request", request)
+    http_request.rate_limit_results = getattr(http_request, "rate_limit_results", []) + list(results)
+
+
+def rate_limit_headers(results):
+    """RateLimit-* headers describing the most restrictive rule"""
+    if not results:
+        return {}
+    binding = min(results, key=lambda result: (result.allowed, result.remaining, -result.reset))
+    return {
+        "RateLimit-Limit": str(binding.limit),
+        "RateLimit-Remaining": str(binding.remaining),
+        "RateLimit-Reset": str(binding.reset if binding.allowed else binding.retry_after),
+        "RateLimit-Policy": ", ".join(
+            f"{result.limit};w={result.window}"
+            for result in sorted(results, key=lambda result: result.window)
+        ),
+    }
+
+
+class RateLimitHeadersMiddleware:
+    """Copy the results recorded by the throttles into response headers"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        for header, value in rate_limit_headers(getattr(request, "rate_limit_results", None)).items():
+            response[header] = value
+        return response
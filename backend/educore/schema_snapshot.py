@@ -0,0 +1,522 @@
+"""
+File: backend/educore/schema_snapshot.py
+Folder Path: backend/educore/
+Date Created: 2026-10-18 00:00:00
+Version: 1.0.0
+
+Batched schema introspection: snapshot, diff against models, sampling.
+
+A snapshot holds the columns, indexes, constraints and approximate row
+count of every table, read in a few catalog queries per backend instead of
+several queries per table:
+
+- PostgreSQL: three pg_catalog queries (columns with pg_class.reltuples,
+  indexes, constraints)
+- SQLite: three queries joining sqlite_master with the pragma table-valued
+  functions; row counts come from sqlite_stat1 when ANALYZE has been run
+- other backends: Django's introspection API, table by table
+
+Snapshots are cached under a fingerprint of the applied migrations, so
+running ``migrate`` invalidates them; SCHEMA_SNAPSHOT_CACHE_TIMEOUT bounds
+how long schema changes made outside migrations can go unnoticed.
+
+``diff_models()`` compares a snapshot with model state (tables, columns,
+nullability, unique and db_index fields, Meta.indexes/constraints) and
+``sample_models()`` loads a few rows of each model on a bounded thread
+pool, catching columns the ORM selects but the table lacks, bad data and
+permission problems.
+
+Settings:
+- SCHEMA_SNAPSHOT_CACHE_TIMEOUT: seconds a snapshot is reused (default: 3600)
+- SCHEMA_SAMPLE_WORKERS: default size of the sampling pool (default: 4)
+"""
+
+import hashlib
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "schema_snapshot"
+SNAPSHOT_VERSION = 1
+
+# pg_constraint.contype -> constraint type
+POSTGRES_CONSTRAINT_TYPES = {
+    "p": "primary key",
+    "u": "unique",
+    "f": "foreign key",
+    "c": "check",
+    "x": "exclusion",
+}
+
+POSTGRES_COLUMNS_SQL = """
+    SELECT c.relname, a.attname, pg_catalog.format_type(a.atttypid, a.atttypmod),
+           NOT a.attnotnull, pg_catalog.pg_get_expr(d.adbin, d.adrelid), c.reltuples
+    FROM pg_catalog.pg_class c
+    JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+    JOIN pg_catalog.pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+    LEFT JOIN pg_catalog.pg_attrdef d ON d.adrelid = c.oid AND d.adnum = a.attnum
+    WHERE c.relkind IN ('r', 'p', 'v', 'm', 'f') AND n.nspname = ANY(current_schemas(false))
+    ORDER BY c.relname, a.attnum
+"""
+
+POSTGRES_INDEXES_SQL = """
+    SELECT t.relname, i.relname, ix.indisunique, ix.indisprimary,
+           ARRAY(
+               SELECT a.attname
+               FROM unnest(ix.indkey::int2[]) WITH ORDINALITY AS k(attnum, ord)
+               JOIN pg_catalog.pg_attribute a ON a.attrelid = t.oid AND a.attnum = k.attnum
+               ORDER BY k.ord
+           )
+    FROM pg_catalog.pg_index ix
+    JOIN pg_catalog.pg_class t ON t.oid = ix.indrelid
+    JOIN pg_catalog.pg_class i ON i.oid = ix.indexrelid
+    JOIN pg_catalog.pg_namespace n ON n.oid = t.relnamespace
+    WHERE n.nspname = ANY(current_schemas(false))
+"""
+
+POSTGRES_CONSTRAINTS_SQL = """
+    SELECT t.relname, con.conname, con.contype,
+           ARRAY(
+               SELECT a.attname
+               FROM unnest(con.conkey) WITH ORDINALITY AS k(attnum, ord)
+               JOIN pg_catalog.pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+               ORDER BY k.ord
+           ),
+           ft.relname
+    FROM pg_catalog.pg_constraint con
+    JOIN pg_catalog.pg_class t ON t.oid = con.conrelid
+    JOIN pg_catalog.pg_namespace n ON n.oid = t.relnamespace
+    LEFT JOIN pg_catalog.pg_class ft ON ft.oid = con.confrelid
+    WHERE n.nspname = ANY(current_schemas(false))
+"""
+
+SQLITE_COLUMNS_SQL = """
+    SELECT m.name, p.name, p.type, p."notnull", p.dflt_value, p.pk
+    FROM sqlite_master m JOIN pragma_table_info(m.name) p
+    WHERE m.type IN ('table', 'view') AND m.name NOT LIKE 'sqlite_%'
+    ORDER BY m.name, p.cid
+"""
+
+SQLITE_INDEXES_SQL = """
+    SELECT m.name, il.name, il."unique", il.origin, ii.name
+    FROM sqlite_master m
+    JOIN pragma_index_list(m.name) il
+    JOIN pragma_index_info(il.name) ii
+    WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%'
+    ORDER BY m.name, il.name, ii.seqno
+"""
+
+SQLITE_FOREIGN_KEYS_SQL = """
+    SELECT m.name, fk.id, fk."table", fk."from"
+    FROM sqlite_master m JOIN pragma_foreign_key_list(m.name) fk
+    WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%'
+    ORDER BY m.name, fk.id, fk.seq
+"""
+
+
+def _empty_table() -> Dict[str, Any]:
+    return {"columns": {}, "indexes": {}, "constraints": {}, "rows": None}
+
+
+class SchemaSnapshot:
+    """Columns, indexes, constraints and approximate row counts of every table
+
+    ``tables`` maps table names to::
+
+        {
+            "columns": {name: {"type": str, "null": bool, "default": str or None}},
+            "indexes": {name: {"columns": [...], "unique": bool, "primary": bool}},
+            "constraints": {name: {"type": str, "columns": [...], "references": table or None}},
+            "rows": approximate row count, or None if the database has no estimate,
+        }
+    """
+
+    def __init__(self, vendor: str, alias: str, tables: Dict[str, Dict[str, Any]],
+                 taken_at: Optional[str] = None, duration: float = 0.0, queries: int = 0):
+        self.vendor = vendor
+        self.alias = alias
+        self.tables = tables
+        self.taken_at = taken_at or timezone.now().isoformat()
+        self.duration = duration
+        self.queries = queries
+        self.cached = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": SNAPSHOT_VERSION,
+            "vendor": self.vendor,
+            "alias": self.alias,
+            "taken_at": self.taken_at,
+            "duration": self.duration,
+            "queries": self.queries,
+            "tables": self.tables,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Optional["SchemaSnapshot"]:
+        if data.get("version") != SNAPSHOT_VERSION:
+            return None
+        return cls(data["vendor"], data["alias"], data["tables"], data["taken_at"],
+                   data["duration"], data["queries"])
+
+    def has_table(self, table: str) -> bool:
+        return table in self.tables
+
+    def columns(self, table: str) -> Dict[str, Dict[str, Any]]:
+        return self.tables.get(table, {}).get("columns", {})
+
+    def approx_rows(self, table: str) -> Optional[int]:
+        return self.tables.get(table, {}).get("rows")
+
+    def object_names(self, table: str) -> set:
+        """Names of the table's indexes and constraints"""
+        info = self.tables.get(table, {})
+        return set(info.get("indexes", {})) | set(info.get("constraints", {}))
+
+    def has_index_on(self, table: str, columns: List[str], unique: bool = False) -> bool:
+        """True if an index or constraint covers the columns
+
+        A unique index must be on exactly these columns; otherwise any index
+        whose leading columns are these columns will do.
+        """
+        info = self.tables.get(table, {})
+        candidates = list(info.get("indexes", {}).values()) + [
+            {"columns": c["columns"], "unique": c["type"] in ("primary key", "unique")}
+            for c in info.get("constraints", {}).values()
+            if c["type"] in ("primary key", "unique")
+        ]
+        for candidate in candidates:
+            if unique:
+                if candidate["unique"] and sorted(candidate["columns"]) == sorted(columns):
+                    return True
+            elif candidate["columns"][:len(columns)] == list(columns):
+                return True
+        return False
+
+
+@dataclass
+class SchemaIssue:
+    """A difference between model state and the database"""
+
+    model: str
+    table: str
+    kind: str
+    detail: str
+    severity: str = "error"  # "error" breaks queries, "warning" is drift
+
+    def to_dict(self) -> Dict[str, str]:
+        return asdict(self)
+
+    def __str__(self) -> str:
+        return f"{self.model} ({self.table}): {self.detail}"
+
+
+def _postgres_tables(cursor) -> Dict[str, Dict[str, Any]]:
+    tables = {}
+
+    cursor.execute(POSTGRES_COLUMNS_SQL)
+    for table, column, data_type, nullable, default, reltuples in cursor.fetchall():
+        info = tables.setdefault(table, _empty_table())
+        info["columns"][column] = {"type": data_type, "null": nullable, "default": default}
+        # reltuples is -1 (PostgreSQL 14+) or 0 for tables never vacuumed or analyzed
+        info["rows"] = int(reltuples) if reltuples and reltuples > 0 else None
+
+    cursor.execute(POSTGRES_INDEXES_SQL)
+    for table, name, unique, primary, columns in cursor.fetchall():
+        if table in tables:
+            tables[table]["indexes"][name] = {"columns": list(columns), "unique": unique, "primary": primary}
+
+    cursor.execute(POSTGRES_CONSTRAINTS_SQL)
+    for table, name, contype, columns, references in cursor.fetchall():
+        if table in tables:
+            tables[table]["constraints"][name] = {
+                "type": POSTGRES_CONSTRAINT_TYPES.get(contype, contype),
+                "columns": list(columns or []),
+                "references": references,
+            }
+
+    return tables
+
+
+def _sqlite_tables(cursor) -> Dict[str, Dict[str, Any]]:
+    tables = {}
+    primary_keys = {}
+
+    cursor.execute(SQLITE_COLUMNS_SQL)
+    for table, column, data_type, notnull, default, pk in cursor.fetchall():
+        info = tables.setdefault(table, _empty_table())
+        info["columns"][column] = {"type": data_type, "null": not notnull and not pk, "default": default}
+        if pk:
+            primary_keys.setdefault(table, []).append((pk, column))
+
+    for table, columns in primary_keys.items():
+        tables[table]["constraints"][f"{table}__pk"] = {
+            "type": "primary key",
+            "columns": [column for _, column in sorted(columns)],
+            "references": None,
+        }
+
+    # origin: "pk" and "u" are PRIMARY KEY and UNIQUE constraints, "c" CREATE INDEX
+    cursor.execute(SQLITE_INDEXES_SQL)
+    for table, name, unique, origin, column in cursor.fetchall():
+        if origin == "c":
+            index = tables[table]["indexes"].setdefault(
+                name, {"columns": [], "unique": bool(unique), "primary": False}
+            )
+        else:
+            index = tables[table]["constraints"].setdefault(
+                name, {"type": "primary key" if origin == "pk" else "unique", "columns": [], "references": None}
+            )
+        index["columns"].append(column)
+
+    # SQLite does not name foreign keys, nor report CHECK constraints
+    cursor.execute(SQLITE_FOREIGN_KEYS_SQL)
+    for table, fk_id, references, column in cursor.fetchall():
+        constraint = tables[table]["constraints"].setdefault(
+            f"{table}__fk_{fk_id}", {"type": "foreign key", "columns": [], "references": references}
+        )
+        constraint["columns"].append(column)
+
+    # Row estimates exist only after ANALYZE; the first number of a stat is the row count
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+    if cursor.fetchone():
+        cursor.execute("SELECT tbl, stat FROM sqlite_stat1")
+        for table, stat in cursor.fetchall():
+            if table in tables and stat:
+                rows = int(str(stat).split()[0])
+                tables[table]["rows"] = max(rows, tables[table]["rows"] or 0)
+
+    return tables
+
+
+def _introspected_tables(connection, cursor) -> Dict[str, Dict[str, Any]]:
+    """Any backend: Django's introspection API, three calls per table"""
+    introspection = connection.introspection
+    tables = {}
+
+    for table_info in introspection.get_table_list(cursor):
+        table = table_info.name
+        info = tables.setdefault(table, _empty_table())
+
+        for column in introspection.get_table_description(cursor, table):
+            info["columns"][column.name] = {
+                "type": column.type_code if isinstance(column.type_code, str) else str(column.type_code),
+                "null": bool(column.null_ok),
+                "default": column.default,
+            }
+
+        for name, constraint in introspection.get_constraints(cursor, table).items():
+            columns = list(constraint["columns"] or [])
+            if constraint["primary_key"]:
+                info["constraints"][name] = {"type": "primary key", "columns": columns, "references": None}
+            elif constraint["foreign_key"]:
+                info["constraints"][name] = {
+                    "type": "foreign key", "columns": columns, "references": constraint["foreign_key"][0],
+                }
+            elif constraint["check"]:
+                info["constraints"][name] = {"type": "check", "columns": columns, "references": None}
+            elif constraint["index"]:
+                info["indexes"][name] = {"columns": columns, "unique": bool(constraint["unique"]), "primary": False}
+            elif constraint["unique"]:
+                info["constraints"][name] = {"type": "unique", "columns": columns, "references": None}
+
+    return tables
+
+
+class _QueryCounter:
+    """execute_wrapper() counting the statements a snapshot needs"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def take_snapshot(using: str = "default") -> SchemaSnapshot:
+    """Read the schema of a database in as few catalog queries as the backend allows"""
+    connection = connections[using]
+    counter = _QueryCounter()
+    started = time.monotonic()
+
+    with connection.execute_wrapper(counter), connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            tables = _postgres_tables(cursor)
+        elif connection.vendor == "sqlite":
+            tables = _sqlite_tables(cursor)
+        else:
+            tables = _introspected_tables(connection, cursor)
+
+    snapshot = SchemaSnapshot(
+        vendor=connection.vendor,
+        alias=using,
+        tables=tables,
+        duration=time.monotonic() - started,
+        queries=counter.count,
+    )
+    logger.debug(
+        "Schema snapshot of %s: %d tables in %d queries, %.3fs",
+        using, len(tables), snapshot.queries, snapshot.duration,
+    )
+    return snapshot
+
+
+def schema_fingerprint(using: str = "default") -> str:
+    """Hash of the database identity and its applied migrations"""
+    connection = connections[using]
+    recorder = MigrationRecorder(connection)
+    applied = sorted(f"{app}.{name}" for app, name in recorder.applied_migrations()) if recorder.has_table() else []
+    identity = [connection.vendor, str(connection.settings_dict.get("NAME")), str(connection.settings_dict.get("HOST"))]
+    return hashlib.sha256("\n".join(identity + applied).encode("utf-8")).hexdigest()[:16]
+
+
+def get_snapshot(using: str = "default", refresh: bool = False) -> SchemaSnapshot:
+    """Cached schema snapshot; ``refresh`` reads the catalogs again"""
+    timeout = getattr(settings, "SCHEMA_SNAPSHOT_CACHE_TIMEOUT", 3600)
+    key = f"{CACHE_KEY_PREFIX}:{using}:{schema_fingerprint(using)}"
+
+    if not refresh:
+        try:
+            data = cache.get(key)
+        except Exception as exc:
+            logger.warning("Schema snapshot cache unavailable: %s", exc)
+            data = None
+        snapshot = SchemaSnapshot.from_dict(data) if data else None
+        if snapshot is not None:
+            snapshot.cached = True
+            return snapshot
+
+    snapshot = take_snapshot(using)
+    try:
+        cache.set(key, snapshot.to_dict(), timeout=timeout)
+    except Exception as exc:
+        logger.warning("Could not cache schema snapshot: %s", exc)
+    return snapshot
+
+
+def _model_label(model) -> str:
+    return f"{model._meta.app_label}.{model.__name__}"
+
+
+def checked_models(models: Iterable) -> List:
+    """Models backed by a table of their own: concrete, managed and not proxies"""
+    return [
+        model for model in models
+        if model._meta.managed and not model._meta.proxy and not model._meta.abstract
+    ]
+
+
+def diff_models(snapshot: SchemaSnapshot, models: Iterable) -> List[SchemaIssue]:
+    """Differences between model state and the snapshot"""
+    issues = []
+
+    for model in checked_models(models):
+        opts = model._meta
+        label = _model_label(model)
+        table = opts.db_table
+
+        if not snapshot.has_table(table):
+            issues.append(SchemaIssue(label, table, "missing_table", f"table {table} does not exist"))
+            continue
+
+        columns = snapshot.columns(table)
+        model_columns = set()
+
+        for field in opts.local_concrete_fields:
+            column = field.column
+            model_columns.add(column)
+
+            if column not in columns:
+                issues.append(SchemaIssue(label, table, "missing_column", f"column {column} ({field.name}) is missing"))
+                continue
+
+            if not field.primary_key and field.null != columns[column]["null"]:
+                expected = "nullable" if field.null else "NOT NULL"
+                issues.append(SchemaIssue(
+                    label, table, "nullability", f"column {column} should be {expected}", "warning",
+                ))
+
+            if field.unique and not field.primary_key and not snapshot.has_index_on(table, [column], unique=True):
+                issues.append(SchemaIssue(
+                    label, table, "missing_unique", f"column {column} has no unique constraint", "warning",
+                ))
+            elif field.db_index and not field.unique and not snapshot.has_index_on(table, [column]):
+                issues.append(SchemaIssue(
+                    label, table, "missing_index", f"column {column} has no index", "warning",
+                ))
+
+        for column in sorted(set(columns) - model_columns):
+            if not columns[column]["null"] and columns[column]["default"] is None:
+                issues.append(SchemaIssue(
+                    label, table, "extra_column",
+                    f"column {column} is NOT NULL without default but not on the model; inserts will fail",
+                ))
+            else:
+                issues.append(SchemaIssue(label, table, "extra_column", f"column {column} is not on the model", "warning"))
+
+        names = snapshot.object_names(table)
+        for index in opts.indexes:
+            if index.name and index.name not in names:
+                issues.append(SchemaIssue(label, table, "missing_index", f"index {index.name} is missing", "warning"))
+        for constraint in opts.constraints:
+            # SQLite does not report CHECK constraints
+            if snapshot.vendor == "sqlite" and type(constraint).__name__ == "CheckConstraint":
+                continue
+            if constraint.name not in names and not (
+                getattr(constraint, "fields", None)
+                and snapshot.has_index_on(
+                    table, [opts.get_field(name).column for name in constraint.fields],
+                    unique=type(constraint).__name__ == "UniqueConstraint",
+                )
+            ):
+                issues.append(SchemaIssue(
+                    label, table, "missing_constraint", f"constraint {constraint.name} is missing", "warning",
+                ))
+
+    return issues
+
+
+def _sample_model(model, using: str, size: int, own_connection: bool) -> Dict[str, Any]:
+    started = time.monotonic()
+    result = {"model": _model_label(model), "table": model._meta.db_table, "ok": True, "rows": 0, "error": None}
+    try:
+        result["rows"] = len(list(model._base_manager.using(using).all()[:size]))
+    except Exception as exc:
+        result.update(ok=False, error=f"{type(exc).__name__}: {exc}")
+    finally:
+        if own_connection:
+            # Pool threads open a connection of their own; don't leave it behind
+            connections[using].close()
+    result["duration"] = time.monotonic() - started
+    return result
+
+
+def sample_models(models: Iterable, using: str = "default", size: int = 5,
+                  max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Load up to ``size`` rows of every model on a bounded thread pool
+
+    Results are returned in model order as dicts with model, table, ok,
+    rows, error and duration.
+    """
+    models = checked_models(models)
+    if max_workers is None:
+        max_workers = getattr(settings, "SCHEMA_SAMPLE_WORKERS", 4)
+
+    connection = connections[using]
+    if connection.vendor == "sqlite" and connection.is_in_memory_db():
+        # Another thread would open a different, empty in-memory database
+        return [_sample_model(model, using, size, own_connection=False) for model in models]
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="schema-sample") as pool:
+        return list(pool.map(lambda model: _sample_model(model, using, size, own_connection=True), models))
@@ -34,6 +34,7 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 from .db_settings import *
+from .db_pool import configure_database
 
 load_dotenv()
 
@@ -113,12 +114,15 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'educore.profiling.RequestProfilerMiddleware',  # Per-view query/timing profiles
+    'educore.ratelimit.RateLimitHeadersMiddleware',  # RateLimit-* response headers
     'django.contrib.sessions.middleware.SessionMiddleware',
     'users.authentication.SecurityMiddleware',  # ADDED: Custom security middleware
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'educore.db_routing.ReplicaRoutingMiddleware',  # Read-your-writes pinning for replica reads
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware',
@@ -162,6 +166,43 @@ DATABASES = {
     }
 }
 
+# Connection management (educore/db_pool.py): 'persistent', 'native' (psycopg 3 pool) or
+# 'pgbouncer' (behind a transaction-mode pooler)
+DB_POOL_MODE = os.getenv('DB_POOL_MODE', 'persistent')
+DB_MAX_CONNECTIONS = int(os.getenv('DB_MAX_CONNECTIONS', 100))  # server connections for this deployment
+DB_RESERVED_CONNECTIONS = int(os.getenv('DB_RESERVED_CONNECTIONS', 5))  # migrations, shells, cron
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))  # seconds to wait for a pooled connection
+# Flag statements that break under transaction pooling: 'off', 'warn' or 'raise'
+DB_POOL_AUDIT = os.getenv('DB_POOL_AUDIT', 'off')
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', 2))  # web worker processes
+WEB_THREADS = int(os.getenv('WEB_THREADS', 1))  # threads per web worker
+CELERY_WORKER_CONCURRENCY = int(os.getenv('CELERY_WORKER_CONCURRENCY', 4))
+DATABASES['default'] = configure_database(
+    DATABASES['default'],
+    mode=DB_POOL_MODE,
+    max_connections=DB_MAX_CONNECTIONS,
+    reserved=DB_RESERVED_CONNECTIONS,
+    processes=WEB_CONCURRENCY + CELERY_WORKER_CONCURRENCY,
+    threads=WEB_THREADS,
+    pool_timeout=DB_POOL_TIMEOUT,
+)
+
+# Read replicas (educore/db_routing.py): comma-separated hosts, added as replica_1, replica_2, ...
+DB_REPLICA_HOSTS = [host.strip() for host in os.getenv('DB_REPLICA_HOSTS', '').split(',') if host.strip()]
+for _index, _host in enumerate(DB_REPLICA_HOSTS, start=1):
+    DATABASES[f'replica_{_index}'] = {
+        **DATABASES['default'],
+        'HOST': _host,
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_REPLICAS = [f'replica_{_index}' for _index in range(1, len(DB_REPLICA_HOSTS) + 1)]
+DATABASE_ROUTERS = ['educore.db_routing.ReplicaRouter']
+# Route every GET request to replicas, not only views decorated with @use_replica
+DATABASE_REPLICA_DEFAULT_READS = os.getenv('DATABASE_REPLICA_DEFAULT_READS', 'False') == 'True'
+DATABASE_READ_YOUR_WRITES_WINDOW = 5  # seconds a client reads from the primary after writing
+DATABASE_REPLICA_MAX_LAG = 2  # seconds
+DATABASE_REPLICA_LAG_CHECK_INTERVAL = 5  # seconds
+
 # FIXED: A-203 - Cache configuration for delete_pattern support
 CACHES = {
     'default': {
@@ -173,6 +214,29 @@ CACHES = {
     }
 }
 
+# Rendered API responses (course detail) with ETag revalidation, seconds
+COURSE_RESPONSE_CACHE_TIMEOUT = int(os.environ.get('COURSE_RESPONSE_CACHE_TIMEOUT', 300))
+
+# Compiled per-user permission matrix (enrollments, instructor roles, access level), seconds
+COURSE_PERMISSION_MATRIX_TIMEOUT = int(os.environ.get('COURSE_PERMISSION_MATRIX_TIMEOUT', 900))
+
+# Precomputed recommendations (courses/recommendations.py), rebuilt by the
+# courses.compute_recommendations task (see CELERY_BEAT_SCHEDULE)
+RECOMMENDATION_TOP_N = int(os.environ.get('RECOMMENDATION_TOP_N', 20))
+RECOMMENDATION_BATCH_SIZE = int(os.environ.get('RECOMMENDATION_BATCH_SIZE', 500))
+RECOMMENDATION_WEIGHTS = {'co_enrollment': 0.6, 'category': 0.25, 'tags': 0.15}
+RECOMMENDATION_MAX_USER_COURSES = 200
+RECOMMENDATION_CANDIDATE_LIMIT = 500
+RECOMMENDATION_CACHE_TIMEOUT = int(os.environ.get('RECOMMENDATION_CACHE_TIMEOUT', 3600))
+RECOMMENDATION_REFRESH_INTERVAL = int(os.environ.get('RECOMMENDATION_REFRESH_INTERVAL', 6 * 3600))
+
+# Points and study streak leaderboards (courses/leaderboards.py), rebuilt from
+# Progress rows by the courses.reconcile_leaderboards task (see CELERY_BEAT_SCHEDULE)
+LEADERBOARD_BACKEND = os.getenv('LEADERBOARD_BACKEND', 'redis')  # 'redis' or 'memory'
+LEADERBOARD_NAMESPACE = 'educore'
+LEADERBOARD_LESSON_POINTS = int(os.environ.get('LEADERBOARD_LESSON_POINTS', 10))
+LEADERBOARD_RECONCILE_INTERVAL = int(os.environ.get('LEADERBOARD_RECONCILE_INTERVAL', 3600))
+
 # Authentication backends
 AUTHENTICATION_BACKENDS = [
     'social_core.backends.google.GoogleOAuth2',   # Google OAuth2
@@ -356,17 +420,57 @@ REST_FRAMEWORK = {
         # Allow unauthenticated users to read, but not write
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
-    'DEFAULT_THROTTLE_RATES': {
-        'user': '1000/day',        # Default user throttle
-        'anon': '100/day',         # Default anonymous user throttle
-        'sensitive_api': '100/hour',   # For sensitive endpoints
-        'api': '1000/hour',        # General API throttle rate
-        'login': '20/hour',        # Login attempt throttle
-        'register': '10/hour',     # Registration throttle
-        'password_reset': '5/hour' # Password reset throttle
-    },
-
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # Trusted reverse proxies in front of the app; X-Forwarded-For is only
+    # read past them (throttles, lockouts and audit, see educore/client_ip.py)
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', '0')) or None,
+}
+
+# Sliding-window rate limits (educore/ratelimit.py), replacing DRF's cache
+# throttle rates. Each group lists burst and sustained rules per access
+# level ('guest', 'registered', 'premium', '*' for any other); 'key' is
+# 'user', 'ip' or 'user_or_ip'. Groups without an entry use 'default'.
+RATE_LIMIT_ENABLED = True
+RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'redis')  # 'redis' or 'memory'
+RATE_LIMIT_POLICIES = {
+    'default': {
+        'key': 'user_or_ip',
+        'tiers': {
+            'guest': ['20/min', '100/day'],
+            'registered': ['60/min', '1000/day'],
+            'premium': ['120/min', '5000/day'],
+        },
+    },
+    'anon': {'key': 'ip', 'tiers': {'*': ['20/min', '100/day']}},
+    'user': {
+        'key': 'user_or_ip',
+        'tiers': {
+            'guest': ['20/min', '100/day'],
+            'registered': ['60/min', '1000/day'],
+            'premium': ['120/min', '5000/day'],
+        },
+    },
+    'api': {
+        'key': 'user_or_ip',
+        'tiers': {
+            'guest': ['30/min', '300/hour'],
+            'registered': ['60/min', '1000/hour'],
+            'premium': ['150/min', '3000/hour'],
+        },
+    },
+    'sensitive_api': {
+        'key': 'user_or_ip',
+        'tiers': {
+            '*': ['20/min', '100/hour'],
+            'premium': ['40/min', '300/hour'],
+        },
+    },
+    'login': {'key': 'ip', 'tiers': {'*': ['5/min', '20/hour']}},
+    'register': {'key': 'ip', 'tiers': {'*': ['3/min', '10/hour']}},
+    'password_reset': {'key': 'ip', 'tiers': {'*': ['2/min', '5/hour']}},
+    'email_verify': {'key': 'ip', 'tiers': {'*': ['3/min', '10/hour']}},
+    'auth': {'key': 'ip', 'tiers': {'*': ['5/min', '10/hour']}},
+    'verification': {'key': 'ip', 'tiers': {'*': ['2/min', '5/hour']}},
 }
 
 # JWT Authentication settings - FIXED: A-205 - Use separate JWT signing key
@@ -433,9 +537,74 @@ ALLOWED_ADMIN_ROLES = [
 # Custom user model
 AUTH_USER_MODEL = 'users.CustomUser'
 
+# Courses startup checks (courses/startup_checks.py): "deferred" starts them in the
+# background on the first health check (reported as "unknown" until done) or runs
+# them via `manage.py run_startup_checks`, "eager" in ready()
+COURSES_STARTUP_CHECKS_MODE = os.getenv('COURSES_STARTUP_CHECKS_MODE', 'deferred')
+COURSES_STARTUP_CHECK_BUDGET = 2.0  # seconds per probe
+
+# Schema snapshots (educore/schema_snapshot.py) used by check_db and the model inspector;
+# cached per set of applied migrations
+SCHEMA_SNAPSHOT_CACHE_TIMEOUT = 3600
+SCHEMA_SAMPLE_WORKERS = 4
+
+# Per-request profiler (educore/profiling.py), served at /api/system/profiling/
+# Sampling is off unless DEBUG; set REQUEST_PROFILER_SAMPLE_RATE (e.g. 0.01) to
+# profile a fraction of production traffic
+REQUEST_PROFILER_ENABLED = os.getenv('REQUEST_PROFILER_ENABLED', 'True') == 'True'
+REQUEST_PROFILER_SAMPLE_RATE = float(os.getenv('REQUEST_PROFILER_SAMPLE_RATE', '1.0' if DEBUG else '0'))
+REQUEST_PROFILER_N_PLUS_ONE_THRESHOLD = 5  # repeats of one statement per request
+REQUEST_PROFILER_ENFORCE_BUDGETS = os.getenv('REQUEST_PROFILER_ENFORCE_BUDGETS', 'False') == 'True'
+REQUEST_PROFILER_HEADERS = DEBUG  # Server-Timing / X-Query-Count response headers
+
+# Pre-aggregated metrics (educore/metrics.py), served at /api/user/metrics/
+# Gauges are re-synced by `python manage.py reconcile_metrics` (e.g. hourly cron)
+METRICS_BACKEND = os.getenv('METRICS_BACKEND', 'redis')  # 'redis' or 'memory'
+METRICS_NAMESPACE = 'educore'
+
+# Buffered audit pipeline (educore/audit.py); events are queryable in the
+# AuditEvent table and at /api/system/audit/ when AUDIT_SINK is 'database'
+AUDIT_SINK = os.getenv('AUDIT_SINK', 'database')  # 'database', 'jsonl', 'queue', 'logger' or a dotted path
+AUDIT_BUFFER_SIZE = 10000
+AUDIT_BATCH_SIZE = 500
+AUDIT_FLUSH_INTERVAL = 2.0  # seconds
+AUDIT_OVERFLOW = 'drop'  # 'drop' or 'block' (wait up to AUDIT_BLOCK_TIMEOUT for room)
+AUDIT_BLOCK_TIMEOUT = 0.05
+AUDIT_ASYNC = True
+AUDIT_FILE_PATH = os.path.join(BASE_DIR, 'logs', 'audit.jsonl')
+AUDIT_FILE_MAX_BYTES = 50 * 1024 * 1024
+AUDIT_FILE_BACKUP_COUNT = 10
+
+# Login telemetry (users/login_telemetry.py): failed logins are counted in
+# Redis, not on the user row, and lock accounts and client IPs for 'base'
+# seconds after 'threshold' failures within 'window', doubling per repeat
+# lockout up to 'max'. Attempts are written as LoginLog rows in batches by
+# the users.flush_login_logs task (see CELERY_BEAT_SCHEDULE).
+LOGIN_TELEMETRY_BACKEND = os.getenv('LOGIN_TELEMETRY_BACKEND', 'redis')  # 'redis' or 'memory'
+LOGIN_LOCKOUT_POLICIES = {
+    'account': {'threshold': 5, 'window': 900, 'base': 900, 'max': 86400, 'memory': 86400},
+    'ip': {'threshold': 20, 'window': 900, 'base': 300, 'max': 86400, 'memory': 86400},
+}
+LOGIN_LOG_BUFFER_SIZE = 100000
+LOGIN_LOG_BATCH_SIZE = 1000
+LOGIN_LOG_FLUSH_INTERVAL = 30  # seconds
+
 # Email verification settings
 EMAIL_VERIFICATION_TIMEOUT_DAYS = 2  # Days
 
+# Email delivery - use django.core.mail.backends.console.EmailBackend or
+# django.core.mail.backends.filebased.EmailBackend (with EMAIL_FILE_PATH) locally
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_FILE_PATH = os.getenv('EMAIL_FILE_PATH', os.path.join(BASE_DIR, 'logs', 'emails'))
+
+# Instructor notification email outbox (instructor_portal/notification_outbox.py)
+NOTIFICATION_OUTBOX_BATCH_SIZE = 200  # notifications claimed per drain
+NOTIFICATION_OUTBOX_MAX_ATTEMPTS = 5
+NOTIFICATION_OUTBOX_RETRY_BACKOFF = 60  # seconds, doubled per failed attempt
+NOTIFICATION_OUTBOX_MAX_BACKOFF = 3600  # seconds
+NOTIFICATION_OUTBOX_DIGEST_THRESHOLD = 3  # pending notifications that become one digest
+NOTIFICATION_OUTBOX_TIME_LIMIT = 240  # seconds per drain task and its lock; below the 300s claim lease
+
 # Security settings - FIXED: A-202 - Enhanced security headers
 SECURE_SSL_REDIRECT = os.getenv('SECURE_SSL_REDIRECT', 'False').lower() == 'true'
 SECURE_HSTS_SECONDS = 63072000  # FIXED: A-202 - Extended HSTS duration
@@ -513,10 +682,35 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
+CELERY_BEAT_SCHEDULE = {
+    'flush-login-logs': {
+        'task': 'users.flush_login_logs',
+        'schedule': LOGIN_LOG_FLUSH_INTERVAL,
+    },
+    'compute-recommendations': {
+        'task': 'courses.compute_recommendations',
+        'schedule': RECOMMENDATION_REFRESH_INTERVAL,
+    },
+    'reconcile-leaderboards': {
+        'task': 'courses.reconcile_leaderboards',
+        'schedule': LEADERBOARD_RECONCILE_INTERVAL,
+    },
+}
 
 # AI Course Builder settings
 AI_BUILDER_DEFAULT_MODEL = os.environ.get('AI_BUILDER_DEFAULT_MODEL', 'gpt-4o-mini')
 AI_GENERATION_TIMEOUT = int(os.environ.get('AI_GENERATION_TIMEOUT', 60000))  # milliseconds
+AI_BUILDER_PROVIDER = os.environ.get('AI_BUILDER_PROVIDER', 'ai_course_builder.providers.LocalStubProvider')
+AI_GENERATION_CONCURRENCY = int(os.environ.get('AI_GENERATION_CONCURRENCY', 4))  # parallel batches per draft
+AI_PROMPT_CACHE_TIMEOUT = 7 * 24 * 3600  # memoized prompt results, seconds
+AI_PROGRESS_BROKER = os.environ.get('AI_PROGRESS_BROKER', 'redis')  # 'redis' or 'memory'
+AI_PROGRESS_REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+AI_PROGRESS_LONG_POLL_TIMEOUT = 25  # seconds a progress long-poll may wait
+AI_PROGRESS_STREAM_MAX_SECONDS = 300  # SSE connections close after this; clients reconnect
+# Open SSE streams and waiting long-polls per process; each holds a worker
+# thread, so run these endpoints under gevent or ASGI workers, or keep this
+# below threads per process
+AI_PROGRESS_STREAM_MAX_CONNECTIONS = int(os.environ.get('AI_PROGRESS_STREAM_MAX_CONNECTIONS', 20))
 
 # File version: 4.1.0
 # Last updated: 2025-06-06 by AI course builder implementation
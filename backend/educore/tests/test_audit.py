@@ -0,0 +1,214 @@
+import os
+import unittest
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from educore import audit
+from educore.audit import AuditBuffer, DatabaseSink, QueueSink
+from users.models import AuditEvent
+
+
+def _event(action, **kwargs):
+    return {
+        "timestamp": "2026-10-18T00:00:00+00:00",
+        "source": "test",
+        "action": action,
+        "actor_id": None,
+        "actor_username": "",
+        "object_type": "",
+        "object_id": "",
+        "success": True,
+        "ip_address": None,
+        "user_agent": "",
+        "metadata": {},
+        **kwargs,
+    }
+
+
+class _FlakySink:
+    """Fails the first ``failures`` writes, then records batches"""
+
+    def __init__(self, failures=1, on_failure=None):
+        self.failures = failures
+        self.on_failure = on_failure
+        self.batches = []
+
+    def write(self, events):
+        if self.failures:
+            self.failures -= 1
+            if self.on_failure:
+                self.on_failure()
+            raise ConnectionError("sink down")
+        self.batches.append([event["action"] for event in events])
+
+    def close(self):
+        pass
+
+
+# Audit buffer flush trigger tests
+class AuditBufferFlushTests(SimpleTestCase):
+    def _buffer(self, **kwargs):
+        buffer = AuditBuffer(QueueSink(), **kwargs)
+        self.addCleanup(buffer.close, timeout=1)
+        return buffer
+
+    def test_full_batch_wakes_the_worker(self):
+        buffer = self._buffer(batch_size=3, flush_interval=60)
+        for n in range(3):
+            buffer.put(_event(f"event.{n}"))
+
+        # Well before the 60s interval
+        self.assertEqual(buffer.sink.queue.get(timeout=2)["action"], "event.0")
+        self.assertEqual(len(buffer.sink.drain()), 2)
+        self.assertEqual(buffer.stats()["batches"], 1)
+
+    def test_partial_batch_waits_for_the_interval(self):
+        buffer = self._buffer(batch_size=100, flush_interval=0.1)
+        buffer.put(_event("lonely"))
+
+        self.assertEqual(buffer.sink.queue.get(timeout=2)["action"], "lonely")
+        self.assertEqual(buffer.stats()["written"], 1)
+
+    def test_partial_batch_is_not_written_early(self):
+        buffer = self._buffer(batch_size=3, flush_interval=60)
+        buffer.put(_event("first"))
+        buffer.put(_event("second"))
+
+        buffer._worker.join(0.2)
+        self.assertTrue(buffer._worker.is_alive())
+        self.assertEqual(buffer.sink.drain(), [])
+        self.assertEqual(buffer.stats()["buffered"], 2)
+
+        buffer.close(timeout=1)
+        self.assertEqual([e["action"] for e in buffer.sink.drain()], ["first", "second"])
+
+    def test_overflow_drops_when_full(self):
+        buffer = AuditBuffer(QueueSink(), capacity=2, batch_size=10)
+        with mock.patch.object(buffer, "_ensure_worker"):
+            results = [buffer.put(_event(f"event.{n}")) for n in range(3)]
+
+        self.assertEqual(results, [True, True, False])
+        self.assertEqual(buffer.stats()["dropped_overflow"], 1)
+
+
+# Audit sink failure tests
+class AuditBufferFailureTests(SimpleTestCase):
+    def _buffer(self, sink, **kwargs):
+        buffer = AuditBuffer(sink, **kwargs)
+        patcher = mock.patch.object(buffer, "_ensure_worker")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return buffer
+
+    def test_failed_batch_is_requeued_in_order(self):
+        buffer = self._buffer(_FlakySink(), batch_size=2)
+        for n in range(3):
+            buffer.put(_event(f"event.{n}"))
+
+        with self.assertLogs("educore.audit", "ERROR"):
+            buffer.flush()
+        stats = buffer.stats()
+        self.assertEqual((stats["buffered"], stats["requeued"], stats["written"]), (3, 2, 0))
+
+        buffer.flush()
+        self.assertEqual(buffer.sink.batches, [["event.0", "event.1"], ["event.2"]])
+        stats = buffer.stats()
+        self.assertEqual((stats["buffered"], stats["written"], stats["dropped_error"]), (0, 3, 0))
+
+    def test_requeue_keeps_only_what_fits(self):
+        def late_events():
+            for n in range(2):
+                buffer.put(_event(f"late.{n}"))
+
+        # New events arrive while the sink is failing
+        buffer = self._buffer(_FlakySink(on_failure=late_events), capacity=4, batch_size=4)
+        for n in range(4):
+            buffer.put(_event(f"event.{n}"))
+
+        with self.assertLogs("educore.audit", "ERROR") as logs:
+            buffer.flush()
+
+        self.assertIn("2 events requeued, 2 lost", logs.output[0])
+        self.assertEqual(buffer.stats()["dropped_error"], 2)
+        buffer.flush()
+        self.assertEqual(buffer.sink.batches, [["event.0", "event.1", "late.0", "late.1"]])
+
+    def test_close_counts_events_the_sink_never_took(self):
+        buffer = self._buffer(_FlakySink(failures=10), batch_size=2)
+        for n in range(3):
+            buffer.put(_event(f"event.{n}"))
+
+        with self.assertLogs("educore.audit", "ERROR") as logs:
+            buffer.close()
+
+        self.assertIn("still failing at close, 3 events lost", logs.output[-1])
+        stats = buffer.stats()
+        self.assertEqual((stats["buffered"], stats["dropped_error"]), (0, 3))
+
+    def test_sync_mode_retries_on_the_next_put(self):
+        buffer = AuditBuffer(_FlakySink(), async_mode=False)
+        with self.assertLogs("educore.audit", "ERROR"):
+            buffer.put(_event("first"))
+        buffer.put(_event("second"))
+
+        self.assertEqual(buffer.sink.batches, [["first", "second"]])
+
+
+# Audit database sink tests
+class DatabaseSinkTests(TestCase):
+    def test_buffered_events_are_inserted_in_batches(self):
+        buffer = AuditBuffer(DatabaseSink(batch_size=500), batch_size=2)
+        with mock.patch.object(buffer, "_ensure_worker"):
+            for n in range(4):
+                buffer.put(_event(f"event.{n}", object_type="course", object_id=str(n)))
+            buffer.put(_event("x" * 150, user_agent="agent/" + "y" * 300))
+
+        # One INSERT per buffer batch of two
+        with self.assertNumQueries(3):
+            buffer.flush()
+
+        self.assertEqual(AuditEvent.objects.count(), 5)
+        self.assertEqual(AuditEvent.objects.for_object("course", 2).get().action, "event.2")
+        long_event = AuditEvent.objects.get(action__startswith="x")
+        self.assertEqual((len(long_event.action), len(long_event.user_agent)), (100, 255))
+        self.assertEqual(buffer.stats()["batches"], 3)
+
+
+# Fork safety tests
+class AuditForkTests(SimpleTestCase):
+    def test_after_fork_hook_resets_the_process_buffer(self):
+        buffer = AuditBuffer(QueueSink(), batch_size=10)
+        with mock.patch.object(buffer, "_ensure_worker"):
+            buffer.put(_event("parent"))
+        buffer._worker = mock.Mock(is_alive=mock.Mock(return_value=True))
+        old_cond = buffer._cond
+
+        with mock.patch.object(audit, "_buffer", buffer):
+            audit._after_fork_in_child()
+
+        self.assertEqual(buffer.stats()["buffered"], 0)
+        self.assertIsNone(buffer._worker)
+        self.assertIsNot(buffer._cond, old_cond)
+
+    @unittest.skipUnless(hasattr(os, "register_at_fork"), "os.register_at_fork is not available")
+    def test_child_does_not_inherit_held_locks_or_events(self):
+        buffer = AuditBuffer(QueueSink(), batch_size=10)
+        with mock.patch.object(buffer, "_ensure_worker"):
+            buffer.put(_event("parent"))
+
+        with mock.patch.object(audit, "_buffer", buffer):
+            # As if the parent's worker were mid-flush at fork time
+            with buffer._write_lock:
+                pid = os.fork()
+                if pid == 0:
+                    code = 1
+                    try:
+                        if buffer._write_lock.acquire(blocking=False) and buffer.stats()["buffered"] == 0:
+                            code = 0
+                    finally:
+                        os._exit(code)
+                _, status = os.waitpid(pid, 0)
+
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+        self.assertEqual(buffer.stats()["buffered"], 1)
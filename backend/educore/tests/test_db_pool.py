@@ -0,0 +1,192 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from educore import db_pool
+from educore.db_pool import (
+    PoolingAudit, TransactionPoolingError, classify, configure_database, connection_budget,
+)
+
+DATABASE = {
+    "ENGINE": "django.db.backends.postgresql",
+    "NAME": "educore",
+    "CONN_MAX_AGE": 600,
+    "OPTIONS": {"sslmode": "prefer", "prepare_threshold": 5, "server_side_binding": True},
+}
+
+
+def _kinds(sql, **kwargs):
+    return [kind for kind, _ in classify(sql, **kwargs)]
+
+
+# Pool mode configuration tests
+class ConfigureDatabaseTests(SimpleTestCase):
+    def test_persistent_mode_keeps_connections_and_checks_them(self):
+        database = configure_database(DATABASE, mode="persistent")
+
+        self.assertEqual(database["CONN_MAX_AGE"], 600)
+        self.assertTrue(database["CONN_HEALTH_CHECKS"])
+        self.assertNotIn("pool", database["OPTIONS"])
+        self.assertNotIn("DISABLE_SERVER_SIDE_CURSORS", database)
+        self.assertNotIn("CONN_HEALTH_CHECKS", DATABASE)
+
+    def test_native_mode_sizes_the_pool_from_the_budget(self):
+        with mock.patch.object(db_pool, "pooling_available", return_value=True):
+            database = configure_database(
+                DATABASE, mode="native", max_connections=100, reserved=10, processes=6, threads=8,
+                pool_timeout=3,
+            )
+
+        self.assertEqual(database["CONN_MAX_AGE"], 0)
+        self.assertEqual(database["OPTIONS"]["pool"], {
+            "min_size": 1, "max_size": 8, "timeout": 3, "max_idle": 300, "max_lifetime": 3600,
+        })
+        self.assertEqual(database["OPTIONS"]["sslmode"], "prefer")
+        self.assertNotIn("pool", DATABASE["OPTIONS"])
+
+    def test_native_pool_never_exceeds_the_process_share(self):
+        with mock.patch.object(db_pool, "pooling_available", return_value=True):
+            database = configure_database(
+                DATABASE, mode="native", max_connections=40, reserved=4, processes=9, threads=16,
+            )
+
+        # (40 - 4) // 9 connections for this process, although it runs 16 threads
+        self.assertEqual(database["OPTIONS"]["pool"]["max_size"], 4)
+
+    def test_native_mode_without_psycopg_pool_falls_back_to_persistent(self):
+        with mock.patch.object(db_pool, "pooling_available", return_value=False):
+            database = configure_database(DATABASE, mode="native")
+
+        self.assertEqual(database, configure_database(DATABASE, mode="persistent"))
+
+    def test_pgbouncer_mode_disables_session_bound_features(self):
+        database = configure_database(DATABASE, mode="pgbouncer")
+
+        self.assertTrue(database["DISABLE_SERVER_SIDE_CURSORS"])
+        self.assertEqual(database["OPTIONS"], {"sslmode": "prefer"})
+        self.assertEqual(DATABASE["OPTIONS"]["prepare_threshold"], 5)
+
+    def test_unknown_mode_is_rejected(self):
+        message = "DB_POOL_MODE must be one of persistent, native, pgbouncer"
+        with self.assertRaisesMessage(ValueError, message):
+            configure_database(DATABASE, mode="session")
+
+
+# Connection budget tests
+class ConnectionBudgetTests(SimpleTestCase):
+    def test_usable_connections_are_split_evenly(self):
+        self.assertEqual(connection_budget(100, reserved=5, processes=4), 23)
+        self.assertEqual(connection_budget(100), 100)
+
+    def test_every_process_gets_at_least_one_connection(self):
+        self.assertEqual(connection_budget(10, reserved=5, processes=20), 1)
+        self.assertEqual(connection_budget(10, reserved=5, processes=0), 5)
+
+    def test_system_check_counts_threads_of_persistent_connections(self):
+        settings = {
+            "DB_POOL_MODE": "persistent", "DB_MAX_CONNECTIONS": 20, "DB_RESERVED_CONNECTIONS": 2,
+            "WEB_CONCURRENCY": 4, "WEB_THREADS": 4, "CELERY_WORKER_CONCURRENCY": 4,
+        }
+        with self.settings(**settings):
+            self.assertEqual([m.id for m in db_pool.check_connection_budget()], ["educore.W102"])
+        with self.settings(**{**settings, "WEB_THREADS": 3}):
+            self.assertEqual(db_pool.check_connection_budget(), [])
+        with self.settings(**{**settings, "DB_POOL_MODE": "pgbouncer"}):
+            self.assertEqual(db_pool.check_connection_budget(), [])
+
+
+# Transaction pooling hazard tests
+class ClassifyTests(SimpleTestCase):
+    def test_session_settings_but_not_transaction_local_ones(self):
+        self.assertEqual(_kinds("SET statement_timeout = 0"), ["session_setting"])
+        self.assertEqual(_kinds("set search_path to tenant"), ["session_setting"])
+        self.assertEqual(_kinds("RESET ALL"), ["session_setting"])
+        self.assertEqual(_kinds("SELECT set_config('app.user', '7', false)"), ["session_setting"])
+
+        self.assertEqual(_kinds("SET LOCAL statement_timeout = 0"), [])
+        self.assertEqual(_kinds("SET TRANSACTION ISOLATION LEVEL SERIALIZABLE"), [])
+        self.assertEqual(_kinds("SET CONSTRAINTS ALL DEFERRED"), [])
+        self.assertEqual(_kinds("SELECT set_config('app.user', '7', true)"), [])
+
+    def test_session_advisory_locks_but_not_transaction_ones(self):
+        for sql in ("SELECT pg_advisory_lock(42)", "SELECT pg_try_advisory_lock(42)",
+                    "SELECT pg_advisory_unlock(42)", "SELECT pg_advisory_lock_shared(1, 2)",
+                    "SELECT pg_advisory_unlock_all()"):
+            self.assertEqual(_kinds(sql), ["advisory_lock"], sql)
+
+        self.assertEqual(_kinds("SELECT pg_advisory_xact_lock(42)"), [])
+        self.assertEqual(_kinds("SELECT pg_try_advisory_xact_lock_shared(42)"), [])
+
+    def test_temporary_tables_need_on_commit_drop(self):
+        self.assertEqual(_kinds("CREATE TEMP TABLE scratch (id int)"), ["temporary_table"])
+        self.assertEqual(_kinds("CREATE LOCAL TEMPORARY TABLE scratch (id int)"), ["temporary_table"])
+        self.assertEqual(_kinds("CREATE TEMP TABLE scratch (id int) ON COMMIT DROP"), [])
+        self.assertEqual(_kinds("CREATE TABLE scratch (id int)"), [])
+
+    def test_row_locks_only_outside_a_transaction(self):
+        sql = 'SELECT * FROM "courses_course" WHERE "id" = %s FOR UPDATE'
+        self.assertEqual(_kinds(sql, in_transaction=False), ["row_lock_outside_transaction"])
+        self.assertEqual(_kinds(sql, in_transaction=True), [])
+        self.assertEqual(_kinds("SELECT 1 FOR NO KEY UPDATE SKIP LOCKED", in_transaction=False),
+                         ["row_lock_outside_transaction"])
+        self.assertEqual(
+            _kinds("SELECT 1 FOR KEY SHARE", in_transaction=False), ["row_lock_outside_transaction"]
+        )
+
+    def test_other_session_state(self):
+        self.assertEqual(_kinds("LISTEN course_updates"), ["listen"])
+        self.assertEqual(_kinds("PREPARE q AS SELECT 1"), ["prepared_statement"])
+        self.assertEqual(_kinds("DECLARE c CURSOR WITH HOLD FOR SELECT 1"), ["cursor_with_hold"])
+        self.assertEqual(_kinds("SELECT 1", server_side_cursor=True), ["server_side_cursor"])
+
+    def test_comments_and_literals_in_plain_queries_are_ignored(self):
+        self.assertEqual(_kinds("/* SET statement_timeout = 0 */ SELECT 1"), [])
+        self.assertEqual(_kinds("SELECT 1 -- FOR UPDATE", in_transaction=False), [])
+        self.assertEqual(_kinds("SELECT * FROM settings WHERE name = 'reset'"), [])
+
+
+# Pooling audit tests
+class PoolingAuditTests(TestCase):
+    def _context(self, autocommit, cursor_name=None):
+        fake = mock.Mock(alias="default", get_autocommit=mock.Mock(return_value=autocommit))
+        return {"connection": fake, "cursor": SimpleNamespace(cursor=SimpleNamespace(name=cursor_name))}
+
+    def _run(self, audit, sql, context):
+        return audit(lambda *args: "executed", sql, None, False, context)
+
+    def test_findings_are_grouped_by_kind_and_location(self):
+        audit = PoolingAudit("warn")
+        sql = "SELECT * FROM t FOR UPDATE"
+
+        with self.assertLogs("educore.db_pool", "WARNING") as logs:
+            for _ in range(3):
+                self.assertEqual(self._run(audit, sql, self._context(autocommit=True)), "executed")
+            self._run(audit, sql, self._context(autocommit=False))
+
+        self.assertEqual(len(logs.output), 1)
+        finding = audit.findings()[0]
+        self.assertEqual((finding["kind"], finding["count"]), ("row_lock_outside_transaction", 3))
+        self.assertTrue(finding["location"].startswith("educore/tests/test_db_pool.py:"))
+
+        audit.reset()
+        self.assertEqual(audit.findings(), [])
+
+    def test_server_side_cursors_are_flagged(self):
+        audit = PoolingAudit("warn")
+        with self.assertLogs("educore.db_pool", "WARNING"):
+            self._run(audit, "SELECT 1", self._context(autocommit=False, cursor_name="_django_curs_1"))
+
+        self.assertEqual([f["kind"] for f in audit.findings()], ["server_side_cursor"])
+
+    def test_raise_mode_stops_the_statement(self):
+        audit = PoolingAudit("raise")
+
+        with connection.execute_wrapper(audit), connection.cursor() as cursor:
+            with self.assertRaisesMessage(TransactionPoolingError, "temporary_table"):
+                cursor.execute("CREATE TEMP TABLE scratch (id integer)")
+            # Harmless statements still reach the database
+            cursor.execute("SELECT 1")
+
+        self.assertEqual(audit.findings()[0]["database"], "default")
@@ -0,0 +1,166 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import ResolverMatch
+from rest_framework.test import APIClient
+
+from educore import profiling
+from educore.profiling import Histogram, QueryBudgetExceeded, RequestProfilerMiddleware, fingerprint_sql
+
+
+@profiling.query_budget(1)
+def budgeted_view(request):
+    return HttpResponse()
+
+
+def _query_view(queries, view=budgeted_view, status=200):
+    """get_response stand-in that resolves to ``view`` and runs ``queries`` statements"""
+
+    def get_response(request):
+        request.resolver_match = ResolverMatch(view, (), {}, route="api/budgeted/")
+        with connection.cursor() as cursor:
+            for n in range(queries):
+                cursor.execute("SELECT %s", [n])
+        return HttpResponse(status=status)
+
+    return get_response
+
+
+# SQL fingerprint tests
+class FingerprintTests(SimpleTestCase):
+    def test_literals_and_in_lists_are_normalized(self):
+        self.assertEqual(
+            fingerprint_sql("SELECT *  FROM t\n WHERE id IN (%s, %s, %s) AND name = 'o''brien' LIMIT 21"),
+            "SELECT * FROM t WHERE id IN (%s, ...) AND name = ? LIMIT ?",
+        )
+        self.assertEqual(
+            fingerprint_sql("SELECT * FROM t WHERE id IN (%s, %s)"),
+            fingerprint_sql("SELECT * FROM t WHERE id IN (%s, %s, %s, %s)"),
+        )
+
+    def test_identifiers_with_digits_are_kept(self):
+        self.assertEqual(fingerprint_sql('SELECT "t2"."col1" FROM "t2"'), 'SELECT "t2"."col1" FROM "t2"')
+
+
+# Histogram tests
+class HistogramTests(SimpleTestCase):
+    def test_values_fall_into_the_first_bucket_at_or_above_them(self):
+        histogram = Histogram((5, 10, 25))
+        for value in (1, 5, 6, 10, 30):
+            histogram.observe(value)
+
+        data = histogram.as_dict()
+        self.assertEqual(data["buckets"], {"le_5": 2, "le_10": 2, "le_25": 0, "inf": 1})
+        self.assertEqual((data["count"], data["avg"], data["max"]), (5, 10.4, 30))
+        self.assertEqual((data["p50"], data["p95"]), (10, 30))
+
+    def test_empty_histogram(self):
+        data = Histogram((5,)).as_dict()
+        self.assertEqual((data["count"], data["avg"], data["p50"]), (0, None, None))
+
+
+# Request profiler middleware tests
+@override_settings(REQUEST_PROFILER_ENABLED=True, REQUEST_PROFILER_HEADERS=True)
+class RequestProfilerMiddlewareTests(TestCase):
+    def setUp(self):
+        profiling.registry.reset()
+        self.addCleanup(profiling.registry.reset)
+        # Use the DEBUG-dependent default rather than the rate resolved at settings load
+        unset = override_settings()
+        unset.enable()
+        self.addCleanup(unset.disable)
+        del settings.REQUEST_PROFILER_SAMPLE_RATE
+        self.request = RequestFactory().get("/api/budgeted/")
+
+    def _views(self):
+        return profiling.registry.snapshot()["views"]
+
+    @override_settings(DEBUG=False)
+    def test_requests_are_not_sampled_outside_debug(self):
+        response = RequestProfilerMiddleware(_query_view(1))(self.request)
+        self.assertEqual(self._views(), {})
+        self.assertNotIn("X-Query-Count", response)
+
+    @override_settings(DEBUG=True)
+    def test_every_request_is_sampled_under_debug(self):
+        response = RequestProfilerMiddleware(_query_view(1))(self.request)
+
+        stats = self._views()["GET api/budgeted/"]
+        self.assertEqual((stats["requests"], stats["queries"]["max"]), (1, 1))
+        self.assertEqual(response["X-Query-Count"], "1")
+
+    @override_settings(DEBUG=False, REQUEST_PROFILER_SAMPLE_RATE=0.5)
+    def test_sample_rate_applies_per_request(self):
+        middleware = RequestProfilerMiddleware(_query_view(0))
+        with mock.patch.object(profiling.random, "random", side_effect=[0.7, 0.2]):
+            middleware(self.request)
+            middleware(self.request)
+        self.assertEqual(self._views()["GET api/budgeted/"]["requests"], 1)
+
+    @override_settings(DEBUG=True, REQUEST_PROFILER_N_PLUS_ONE_THRESHOLD=3)
+    def test_repeated_statements_are_reported_as_n_plus_one(self):
+        with self.assertLogs("educore.profiling", "WARNING") as logs:
+            RequestProfilerMiddleware(_query_view(4))(self.request)
+
+        stats = self._views()["GET api/budgeted/"]
+        self.assertEqual(stats["n_plus_one_requests"], 1)
+        self.assertEqual(stats["top_duplicates"], [{"fingerprint": "SELECT %s", "max_repeats": 4}])
+        self.assertIn("Possible N+1", logs.output[0])
+
+    @override_settings(DEBUG=True, REQUEST_PROFILER_ENFORCE_BUDGETS=True)
+    def test_budget_is_enforced(self):
+        middleware = RequestProfilerMiddleware(_query_view(2))
+        with self.assertRaisesMessage(QueryBudgetExceeded, "GET api/budgeted/ issued 2 queries (budget 1)"):
+            middleware(self.request)
+
+        RequestProfilerMiddleware(_query_view(1))(self.request)
+        self.assertEqual(self._views()["GET api/budgeted/"]["budget_violations"], 1)
+
+    @override_settings(DEBUG=True, REQUEST_PROFILER_ENFORCE_BUDGETS=False)
+    def test_budget_violations_are_logged_when_not_enforced(self):
+        with self.assertLogs("educore.profiling", "WARNING") as logs:
+            RequestProfilerMiddleware(_query_view(2))(self.request)
+        self.assertIn("Query budget exceeded", logs.output[0])
+        self.assertEqual(self._views()["GET api/budgeted/"]["budget_violations"], 1)
+
+    def test_per_action_budgets(self):
+        def view(request):
+            return HttpResponse()
+
+        view.actions = {"get": "list", "post": "create"}
+        profiling.query_budget(10, list=3)(view)
+        match = ResolverMatch(view, (), {}, route="api/items/")
+        self.assertEqual(profiling.get_query_budget(match, "GET"), 3)
+        self.assertEqual(profiling.get_query_budget(match, "POST"), 10)
+
+
+# Profiling endpoint tests
+class ProfilingEndpointTests(TestCase):
+    url = "/api/system/profiling/"
+
+    def setUp(self):
+        User = get_user_model()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username="profuser", email="profuser@example.com", password="pass12345"
+        )
+        self.admin = User.objects.create_user(
+            username="profadmin", email="profadmin@example.com", password="pass12345", is_staff=True
+        )
+
+    def test_non_admins_are_rejected(self):
+        self.assertIn(self.client.get(self.url).status_code, (401, 403))
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.assertEqual(self.client.delete(self.url).status_code, 403)
+
+    def test_admins_read_and_reset_the_profiles(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(self.url, {"sort": "requests"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("views", response.data)
+        self.assertEqual(self.client.delete(self.url).status_code, 204)
@@ -0,0 +1,236 @@
+import copy
+import threading
+import time
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.recorder import MigrationRecorder
+from django.test import TestCase, override_settings
+
+from courses.models import Category
+from educore import schema_snapshot
+from educore.schema_snapshot import (
+    SchemaSnapshot, diff_models, get_snapshot, sample_models, schema_fingerprint, take_snapshot,
+)
+from users.models import AuditEvent
+
+AUDIT_TABLE = AuditEvent._meta.db_table
+
+
+def _issues(snapshot, model):
+    return {(issue.kind, issue.detail) for issue in diff_models(snapshot, [model])}
+
+
+# SQLite schema snapshot tests
+@skipUnless(connection.vendor == "sqlite", "SQLite catalog queries")
+class SqliteSnapshotTests(TestCase):
+    def test_catalogs_are_read_in_a_fixed_number_of_queries(self):
+        snapshot = take_snapshot()
+
+        self.assertEqual(snapshot.vendor, "sqlite")
+        # Columns, indexes, foreign keys and the sqlite_stat1 probe, however many tables
+        self.assertEqual(snapshot.queries, 4)
+        self.assertGreater(len(snapshot.tables), 20)
+
+        columns = snapshot.columns(AUDIT_TABLE)
+        self.assertFalse(columns["action"]["null"])
+        self.assertTrue(columns["actor_id"]["null"])
+        self.assertFalse(columns["id"]["null"])
+        self.assertIn("audit_actor_time_idx", snapshot.object_names(AUDIT_TABLE))
+        self.assertTrue(snapshot.has_index_on(AUDIT_TABLE, ["timestamp"]))
+        self.assertTrue(snapshot.has_index_on(AUDIT_TABLE, ["id"], unique=True))
+        self.assertFalse(snapshot.has_index_on(AUDIT_TABLE, ["timestamp"], unique=True))
+
+        constraints = snapshot.tables[Category._meta.db_table]["constraints"].values()
+        self.assertIn(
+            {"type": "foreign key", "columns": ["parent_id"], "references": Category._meta.db_table},
+            list(constraints),
+        )
+        self.assertIsNone(snapshot.approx_rows(AUDIT_TABLE))
+
+    def test_row_estimates_come_from_analyze(self):
+        Category.objects.create(name="Snapshot Category")
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        snapshot = take_snapshot()
+
+        self.assertEqual(snapshot.queries, 5)
+        self.assertEqual(snapshot.approx_rows(Category._meta.db_table), Category.objects.count())
+
+    def test_models_match_the_test_database(self):
+        snapshot = take_snapshot()
+        self.assertEqual(diff_models(snapshot, [AuditEvent, Category]), [])
+
+    def test_snapshot_round_trips_through_a_dict(self):
+        snapshot = take_snapshot()
+        restored = SchemaSnapshot.from_dict(snapshot.to_dict())
+
+        self.assertEqual(restored.tables, snapshot.tables)
+        self.assertIsNone(SchemaSnapshot.from_dict({**snapshot.to_dict(), "version": 0}))
+
+
+# Schema diff tests
+class DiffModelsTests(TestCase):
+    def setUp(self):
+        self.snapshot = take_snapshot()
+
+    def _tampered(self, change):
+        tables = copy.deepcopy(self.snapshot.tables)
+        change(tables[AUDIT_TABLE])
+        return SchemaSnapshot(self.snapshot.vendor, "default", tables)
+
+    def test_dropped_index_is_detected(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP INDEX "audit_actor_time_idx"')
+
+        self.assertEqual(_issues(take_snapshot(), AuditEvent), {
+            ("missing_index", "index audit_actor_time_idx is missing"),
+        })
+
+    def test_missing_column_is_an_error(self):
+        snapshot = self._tampered(lambda table: table["columns"].pop("user_agent"))
+
+        issues = diff_models(snapshot, [AuditEvent])
+
+        self.assertEqual([(i.kind, i.severity) for i in issues], [("missing_column", "error")])
+        self.assertEqual(
+            str(issues[0]), f"users.AuditEvent ({AUDIT_TABLE}): column user_agent (user_agent) is missing"
+        )
+
+    def test_unindexed_db_index_field_is_drift(self):
+        def drop_timestamp_indexes(table):
+            for name, index in list(table["indexes"].items()):
+                if index["columns"][0] == "timestamp":
+                    del table["indexes"][name]
+
+        self.assertEqual(_issues(self._tampered(drop_timestamp_indexes), AuditEvent), {
+            ("missing_index", "column timestamp has no index"),
+        })
+
+    def test_extra_and_nullability_differences(self):
+        def change(table):
+            table["columns"]["legacy"] = {"type": "integer", "null": False, "default": None}
+            table["columns"]["notes"] = {"type": "text", "null": True, "default": None}
+            table["columns"]["action"]["null"] = True
+
+        self.assertEqual(_issues(self._tampered(change), AuditEvent), {
+            (
+                "extra_column",
+                "column legacy is NOT NULL without default but not on the model; inserts will fail",
+            ),
+            ("extra_column", "column notes is not on the model"),
+            ("nullability", "column action should be NOT NULL"),
+        })
+
+    def test_missing_table(self):
+        snapshot = self._tampered(lambda table: None)
+        del snapshot.tables[AUDIT_TABLE]
+
+        self.assertEqual(
+            _issues(snapshot, AuditEvent), {("missing_table", f"table {AUDIT_TABLE} does not exist")}
+        )
+
+
+# Snapshot cache tests
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class SnapshotCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Outside the class transaction: SQLite cannot create tables inside it
+        MigrationRecorder(connection).ensure_schema()
+        super().setUpClass()
+
+    def setUp(self):
+        cache.clear()
+
+    def test_snapshot_is_reused_until_migrations_change(self):
+        first = get_snapshot()
+        self.assertFalse(first.cached)
+
+        with self.assertNumQueries(2):  # migration table probe and applied migrations only
+            second = get_snapshot()
+        self.assertTrue(second.cached)
+        self.assertEqual(second.tables, first.tables)
+
+        fingerprint = schema_fingerprint()
+        MigrationRecorder(connection).record_applied("users", "9999_snapshot_test")
+        self.assertNotEqual(schema_fingerprint(), fingerprint)
+
+        self.assertFalse(get_snapshot().cached)
+        self.assertTrue(get_snapshot().cached)
+
+    def test_refresh_reads_the_catalogs_again(self):
+        get_snapshot()
+        self.assertFalse(get_snapshot(refresh=True).cached)
+
+    def test_unavailable_cache_falls_back_to_a_fresh_snapshot(self):
+        with mock.patch.object(schema_snapshot.cache, "get", side_effect=ConnectionError("down")), \
+                mock.patch.object(schema_snapshot.cache, "set", side_effect=ConnectionError("down")), \
+                self.assertLogs("educore.schema_snapshot", "WARNING") as logs:
+            snapshot = get_snapshot()
+
+        self.assertFalse(snapshot.cached)
+        self.assertEqual(len(logs.output), 2)
+
+
+# Model sampling tests
+class SampleModelsTests(TestCase):
+    @skipUnless(connection.vendor == "sqlite", "in-memory SQLite test database")
+    def test_in_memory_database_is_sampled_inline(self):
+        Category.objects.create(name="Sampled Category")
+
+        with mock.patch.object(schema_snapshot, "ThreadPoolExecutor") as pool:
+            results = sample_models([Category, AuditEvent], size=5)
+
+        pool.assert_not_called()
+        self.assertEqual(
+            [(r["model"], r["ok"]) for r in results], [("courses.Category", True), ("users.AuditEvent", True)]
+        )
+        self.assertEqual(results[0]["rows"], 1)
+
+    def test_column_missing_from_the_table_fails_the_sample(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'ALTER TABLE "{AUDIT_TABLE}" DROP COLUMN "user_agent"')
+
+        category, audit = (
+            schema_snapshot._sample_model(model, "default", 5, own_connection=False)
+            for model in (Category, AuditEvent)
+        )
+
+        self.assertTrue(category["ok"])
+        self.assertFalse(audit["ok"])
+        self.assertIn("user_agent", audit["error"])
+
+    def test_pool_is_bounded_and_keeps_model_order(self):
+        lock = threading.Lock()
+        running, peak = [0], [0]
+
+        def sample(model, using, size, own_connection):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            return {"model": model.__name__, "own_connection": own_connection}
+
+        models = [Category, AuditEvent] * 4
+        with mock.patch.object(connection, "is_in_memory_db", return_value=False, create=True), \
+                mock.patch.object(schema_snapshot, "_sample_model", side_effect=sample):
+            results = sample_models(models, max_workers=2)
+
+        self.assertEqual([r["model"] for r in results], [m.__name__ for m in models])
+        self.assertTrue(all(r["own_connection"] for r in results))
+        self.assertEqual(peak[0], 2)
+
+    @override_settings(SCHEMA_SAMPLE_WORKERS=3)
+    def test_pool_size_defaults_to_the_setting(self):
+        executor = schema_snapshot.ThreadPoolExecutor
+        with mock.patch.object(connection, "is_in_memory_db", return_value=False, create=True), \
+                mock.patch.object(schema_snapshot, "ThreadPoolExecutor", wraps=executor) as pool, \
+                mock.patch.object(schema_snapshot, "_sample_model", return_value={}):
+            sample_models([Category])
+
+        self.assertEqual(pool.call_args.kwargs["max_workers"], 3)
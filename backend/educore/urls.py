@@ -32,7 +32,7 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
 
-from .views import db_status, db_stats, test_static, test_admin_static
+from .views import audit_events, db_pool_status, db_status, db_stats, profiling_stats, test_static, test_admin_static
 from instructor_portal.views import debug_courses
 
 
@@ -58,6 +58,9 @@ urlpatterns = [
     # System endpoints
     path('api/system/db-status/', db_status, name='db-status'),
     path('api/system/db-stats/', db_stats, name='db-stats'),
+    path('api/system/profiling/', profiling_stats, name='profiling-stats'),
+    path('api/system/db-pool/', db_pool_status, name='db-pool-status'),
+    path('api/system/audit/', audit_events, name='audit-events'),
 
     # Include AI course builder URLs (non-API)
     path('', include('ai_course_builder.urls')),
@@ -114,8 +114,17 @@ class EndpointExtractor:
         callback = pattern.callback
         methods = []
 
+        # Django REST Framework ViewSet: only the methods mapped to actions
+        # (checked first, the viewset class implements none of them itself)
+        if getattr(callback, 'actions', None):
+            try:
+                methods = [m.upper() for m in callback.actions.keys()]
+            except Exception:
+                # Fallback if DRF viewset evaluation fails (e.g., DB access)
+                methods = ['GET']
+
         # Class-based views
-        if hasattr(callback, 'view_class'):
+        elif hasattr(callback, 'view_class'):
             view_class = callback.view_class
             if hasattr(view_class, 'http_method_names'):
                 # Only include methods that are actually implemented
@@ -137,16 +146,6 @@ class EndpointExtractor:
             methods = [m.upper() for m in callback.allowed_methods
                       if m.upper() not in ['OPTIONS', 'TRACE']]
 
-        # Check for Django REST Framework ViewSet with lazy evaluation
-        elif hasattr(callback, 'actions'):
-            try:
-                # DRF ViewSet - get methods from actions (actual mapped methods)
-                action_methods = {m.upper() for m in callback.actions.keys()}
-                methods = list(action_methods)
-            except Exception:
-                # Fallback if DRF viewset evaluation fails (e.g., DB access)
-                methods = ['GET']
-
         # Default for function-based views (most only handle GET)
         return methods if methods else ['GET']
 
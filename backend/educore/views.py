@@ -43,6 +43,81 @@ def db_stats(request):
         return JsonResponse({"status": "error", "message": str(e)}, status=500)
 
 
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def profiling_stats(request):
+    """Per-view query and timing profiles of this process; DELETE resets them"""
+    from .profiling import registry
+
+    if request.method == 'DELETE':
+        registry.reset()
+        return Response(status=204)
+    return Response(registry.snapshot(sort=request.query_params.get('sort', 'queries')))
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def db_pool_status(request):
+    """Connection pool mode, budget and transaction-pooling audit findings; DELETE resets the findings"""
+    from .db_pool import audit, pool_status
+
+    if request.method == 'DELETE':
+        audit.reset()
+        return Response(status=204)
+    return Response(pool_status())
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def audit_events(request):
+    """
+    Query the audit trail by actor, object and time range.
+
+    Filters: actor (user id), object_type, object_id, action, since, until
+    (ISO datetimes) and limit (default 100, max 500). Also reports the
+    buffer statistics of this process.
+    """
+    from django.utils import timezone
+    from django.utils.dateparse import parse_datetime
+
+    from users.models import AuditEvent
+
+    from . import audit
+
+    params = request.query_params
+    events = AuditEvent.objects.all()
+    if params.get('actor'):
+        events = events.for_actor(params['actor'])
+    if params.get('object_type'):
+        events = events.for_object(params['object_type'], params.get('object_id'))
+    if params.get('action'):
+        events = events.filter(action=params['action'])
+    bounds = {}
+    for name in ('since', 'until'):
+        if params.get(name):
+            try:
+                bounds[name] = parse_datetime(params[name])
+            except ValueError:
+                bounds[name] = None
+            if bounds[name] is None:
+                return Response({'error': f'{name} must be an ISO 8601 datetime'}, status=400)
+            if timezone.is_naive(bounds[name]):
+                bounds[name] = timezone.make_aware(bounds[name])
+    try:
+        limit = max(min(int(params.get('limit', 100)), 500), 1)
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=400)
+    events = events.between(bounds.get('since'), bounds.get('until'))
+
+    return Response({
+        'pipeline': audit.stats(),
+        'results': list(events.values(
+            'id', 'timestamp', 'source', 'action', 'actor_id', 'actor_username',
+            'object_type', 'object_id', 'success', 'ip_address', 'metadata',
+        )[:limit]),
+    })
+
+
 def test_static(request):
     """Simple view to test static files"""
     return HttpResponse("""
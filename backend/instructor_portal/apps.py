@@ -9,20 +9,38 @@
 # Last Modified By: sujibeautysalon
 # Last Modified: 2025-06-21 18:51:00 UTC
 # User: sujibeautysalon
-# Version: 2.0.1
+# Version: 2.0.2
 #
 # Application Configuration for the Instructor Portal
 #
+# Version 2.0.2 Changes:
+# - CHANGED: Periodic task rows are written after migrate instead of in
+#   ready(), so starting a process issues no queries
+#
 # Version 2.0.1 Changes:
 # - FIXED: Changed register_cleanup_tasks to setup_periodic_tasks
 # - RESOLVED: Import error that was causing startup warnings
 
 from django.apps import AppConfig
 from django.conf import settings
+from django.db.models.signals import post_migrate
 import logging
 import os
 
 
+def register_periodic_tasks(sender, **kwargs):
+    """Create or update the Celery Beat schedule once migrations have run"""
+    logger = logging.getLogger(__name__)
+    try:
+        from .tasks import setup_periodic_tasks
+        if setup_periodic_tasks():
+            logger.info("Instructor Portal maintenance tasks registered successfully")
+        else:
+            logger.warning("Maintenance tasks setup completed with warnings")
+    except Exception as e:
+        logger.warning(f"Failed to register maintenance tasks: {e}")
+
+
 class InstructorPortalConfig(AppConfig):
     """
     App configuration for the instructor portal module
@@ -43,18 +61,10 @@ class InstructorPortalConfig(AppConfig):
             from . import signals
             logger.debug("Instructor Portal signals registered")
 
-            # Register periodic tasks if enabled
+            # Register periodic tasks if enabled; the schedule lives in the
+            # database, so it is written after migrate rather than on every start
             if getattr(settings, 'ENABLE_INSTRUCTOR_PORTAL_TASKS', True):
-                try:
-                    # FIXED: Use existing setup_periodic_tasks instead of non-existent register_cleanup_tasks
-                    from .tasks import setup_periodic_tasks
-                    success = setup_periodic_tasks()
-                    if success:
-                        logger.info("Instructor Portal maintenance tasks registered successfully")
-                    else:
-                        logger.warning("Maintenance tasks setup completed with warnings")
-                except Exception as e:
-                    logger.warning(f"Failed to register maintenance tasks: {e}")
+                post_migrate.connect(register_periodic_tasks, sender=self)
 
             # Initialize course statistics cache
             if getattr(settings, 'PRELOAD_INSTRUCTOR_STATS', False):
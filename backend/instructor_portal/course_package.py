@@ -0,0 +1,596 @@
+#
+# File Path: instructor_portal/course_package.py
+# Folder Path: instructor_portal/
+# Date Created: 2026-10-18
+# Version: 1.0.0
+#
+# Streaming course package format used by the import/export tasks
+#
+# A package is a JSON Lines stream: one header record, one record per
+# module/lesson/resource/assessment/question/answer, and one footer record.
+# Every record names its ``kind``; content records carry their source ``ref``
+# and, for children, the ``parent`` ref, so a package can be written and read
+# one line at a time.
+#
+#   {"kind": "header", "format": "eduplatform.course", "version": 1, ...}
+#   {"kind": "module", "ref": 12, "title": "...", "order": 1, ...}
+#   {"kind": "lesson", "ref": 40, "parent": 12, "title": "...", ...}
+#   ...
+#   {"kind": "footer", "records": 2417}
+
+import gzip
+import io
+import json
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, List, Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Max, Sum
+from django.utils import timezone
+
+from courses import response_cache
+from courses.constants import AccessLevel, LessonType
+from courses.models import (
+    Answer,
+    Assessment,
+    Course,
+    Lesson,
+    Module,
+    Question,
+    Resource,
+)
+
+logger = logging.getLogger(__name__)
+
+PACKAGE_FORMAT = 'eduplatform.course'
+PACKAGE_VERSION = 1
+
+# Content record types in parent-before-child order
+RECORD_TYPES = ('module', 'lesson', 'resource', 'assessment', 'question', 'answer')
+
+PARENT_TYPES = {
+    'lesson': 'module',
+    'resource': 'lesson',
+    'assessment': 'lesson',
+    'question': 'assessment',
+    'answer': 'question',
+}
+
+RECORD_MODELS = {
+    'module': Module,
+    'lesson': Lesson,
+    'resource': Resource,
+    'assessment': Assessment,
+    'question': Question,
+    'answer': Answer,
+}
+
+# Foreign key attribute set on each child model when its parent is resolved
+PARENT_FIELDS = {
+    'lesson': 'module_id',
+    'resource': 'lesson_id',
+    'assessment': 'lesson_id',
+    'question': 'assessment_id',
+    'answer': 'question_id',
+}
+
+
+def _field_choices(model, field_name):
+    return {choice for choice, _ in model._meta.get_field(field_name).choices}
+
+
+EXPORT_FIELDS = {
+    'module': ('title', 'description', 'order', 'duration_minutes', 'is_published'),
+    'lesson': (
+        'title', 'content', 'guest_content', 'registered_content', 'access_level',
+        'type', 'activity_type', 'order', 'duration_minutes', 'has_assessment',
+        'has_lab', 'is_free_preview', 'video_url', 'transcript',
+    ),
+    'resource': (
+        'title', 'type', 'description', 'url', 'file', 'premium', 'order',
+        'duration_minutes', 'file_size', 'mime_type',
+    ),
+    'assessment': (
+        'title', 'description', 'passing_score', 'max_attempts', 'time_limit_minutes',
+        'randomize_questions', 'show_correct_answers', 'show_results',
+    ),
+    'question': ('question_text', 'question_type', 'points', 'order', 'explanation'),
+    'answer': ('answer_text', 'is_correct', 'explanation', 'order'),
+}
+
+EXPORT_ORDERING = {
+    'module': ('order',),
+    'lesson': ('module__order', 'order'),
+    'resource': ('lesson__module__order', 'lesson__order', 'order'),
+    'assessment': ('lesson__module__order', 'lesson__order'),
+    'question': ('assessment__lesson__module__order', 'assessment__lesson__order', 'order'),
+    'answer': (
+        'question__assessment__lesson__module__order', 'question__assessment__lesson__order',
+        'question__order', 'order',
+    ),
+}
+
+# Lookup from each model back to its course
+COURSE_LOOKUPS = {
+    'module': 'course',
+    'lesson': 'module__course',
+    'resource': 'lesson__module__course',
+    'assessment': 'lesson__module__course',
+    'question': 'assessment__lesson__module__course',
+    'answer': 'question__assessment__lesson__module__course',
+}
+
+
+class CoursePackageError(ValueError):
+    """Raised when a course package is malformed or fails validation"""
+
+    def __init__(self, message: str, line: Optional[int] = None):
+        self.line = line
+        super().__init__(f"line {line}: {message}" if line else message)
+
+
+# ====================================
+# READING AND WRITING
+# ====================================
+
+class _SizeLimitedReader(io.RawIOBase):
+    """Binary reader that fails once more than ``limit`` bytes were read"""
+
+    def __init__(self, raw: IO, limit: int):
+        self.raw = raw
+        self.limit = limit
+        self.consumed = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self.raw.read(len(buffer))
+        self.consumed += len(data)
+        if self.consumed > self.limit:
+            raise CoursePackageError(f"decompressed package exceeds {self.limit} bytes")
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        try:
+            self.raw.close()
+        finally:
+            super().close()
+
+
+def open_package_stream(fileobj: IO, compressed: bool = False,
+                        max_size: Optional[int] = None) -> IO:
+    """
+    Wrap a binary file object as a text stream, decompressing gzip if requested.
+
+    ``max_size`` caps the decompressed bytes read from a compressed package,
+    so a small archive cannot expand without bound.
+    """
+    if compressed:
+        fileobj = gzip.GzipFile(fileobj=fileobj, mode='rb')
+        if max_size is not None:
+            fileobj = io.BufferedReader(_SizeLimitedReader(fileobj, max_size))
+    return io.TextIOWrapper(fileobj, encoding='utf-8')
+
+
+def iter_jsonl_records(stream: Iterable) -> Iterator[Dict[str, Any]]:
+    """Yield package records from a JSON Lines stream one line at a time"""
+    for line_no, line in enumerate(stream, 1):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise CoursePackageError(f"invalid JSON ({e.msg})", line_no)
+        if not isinstance(record, dict):
+            raise CoursePackageError("record must be a JSON object", line_no)
+        record['_line'] = line_no
+        yield record
+
+
+def iter_nested_records(document: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Convert a nested course document into package records.
+
+    Accepts the legacy ``{"modules": [{"lessons": [...]}]}`` shape where
+    lessons may carry ``resources`` and an ``assessment`` with ``questions``
+    and ``answers``. Refs are synthesised in document order.
+    """
+    if not isinstance(document, dict) or not isinstance(document.get('modules'), list):
+        raise CoursePackageError("document must contain a 'modules' list")
+
+    counter = iter(range(1, 1 << 62))
+    yield {'kind': 'header', 'format': PACKAGE_FORMAT, 'version': PACKAGE_VERSION}
+
+    def children(data, key, record_type, parent_ref):
+        for item in data.get(key) or []:
+            if not isinstance(item, dict):
+                raise CoursePackageError(f"{record_type} entries must be objects")
+            ref = next(counter)
+            fields = {k: v for k, v in item.items() if not isinstance(v, (list, dict))}
+            yield ref, item, {**fields, 'kind': record_type, 'ref': ref, 'parent': parent_ref}
+
+    for module_ref, module, record in children(document, 'modules', 'module', None):
+        yield record
+        for lesson_ref, lesson, record in children(module, 'lessons', 'lesson', module_ref):
+            yield record
+            yield from (r for _, _, r in children(lesson, 'resources', 'resource', lesson_ref))
+            assessment = lesson.get('assessment')
+            if isinstance(assessment, dict):
+                wrapper = {'assessment': [assessment]}
+                for assessment_ref, data, record in children(wrapper, 'assessment', 'assessment', lesson_ref):
+                    yield record
+                    for question_ref, question, record in children(data, 'questions', 'question', assessment_ref):
+                        yield record
+                        yield from (r for _, _, r in children(question, 'answers', 'answer', question_ref))
+
+
+class CourseExporter:
+    """
+    Stream a course tree as package records.
+
+    Each level is read with a single ``values().iterator()`` query so the
+    course is never materialised in memory, regardless of its size.
+    """
+
+    def __init__(self, course: Course, chunk_size: int = 500):
+        self.course = course
+        self.chunk_size = chunk_size
+
+    def _queryset(self, record_type: str):
+        model = RECORD_MODELS[record_type]
+        return model.objects.filter(**{COURSE_LOOKUPS[record_type]: self.course})
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        counts = {t: self._queryset(t).count() for t in RECORD_TYPES}
+        yield {
+            'kind': 'header',
+            'format': PACKAGE_FORMAT,
+            'version': PACKAGE_VERSION,
+            'exported_at': timezone.now().isoformat(),
+            'course': {
+                'id': self.course.id,
+                'title': self.course.title,
+                'subtitle': self.course.subtitle,
+                'level': self.course.level,
+            },
+            'counts': counts,
+        }
+
+        written = 0
+        for record_type in RECORD_TYPES:
+            parent_field = PARENT_FIELDS.get(record_type)
+            columns = ['id'] + list(EXPORT_FIELDS[record_type])
+            if parent_field:
+                columns.append(parent_field)
+
+            rows = (
+                self._queryset(record_type)
+                .order_by(*EXPORT_ORDERING[record_type])
+                .values(*columns)
+                .iterator(chunk_size=self.chunk_size)
+            )
+            for row in rows:
+                record = {'kind': record_type, 'ref': row.pop('id')}
+                if parent_field:
+                    record['parent'] = row.pop(parent_field)
+                record.update(row)
+                written += 1
+                yield record
+
+        yield {'kind': 'footer', 'records': written}
+
+    def write(self, stream: IO) -> int:
+        """Write the package to a text stream, returning the content record count"""
+        written = 0
+        for record in self.iter_records():
+            stream.write(json.dumps(record, cls=DjangoJSONEncoder))
+            stream.write('\n')
+            if record['kind'] in RECORD_MODELS:
+                written += 1
+        return written
+
+
+# ====================================
+# IMPORT
+# ====================================
+
+def _text(record, field, *, required=False, min_len=0, max_len=None, default=''):
+    value = record.get(field, default)
+    if value is None:
+        value = default
+    if not isinstance(value, str):
+        raise CoursePackageError(f"{record['kind']}.{field} must be a string", record.get('_line'))
+    if required and len(value.strip()) < max(min_len, 1):
+        raise CoursePackageError(
+            f"{record['kind']}.{field} must be at least {max(min_len, 1)} characters",
+            record.get('_line'),
+        )
+    if max_len and len(value) > max_len:
+        raise CoursePackageError(
+            f"{record['kind']}.{field} exceeds {max_len} characters", record.get('_line')
+        )
+    return value
+
+
+def _int(record, field, *, default=0, minimum=0, maximum=None):
+    value = record.get(field, default)
+    if value is None:
+        value = default
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise CoursePackageError(f"{record['kind']}.{field} must be an integer", record.get('_line'))
+    if value < minimum or (maximum is not None and value > maximum):
+        raise CoursePackageError(f"{record['kind']}.{field} is out of range", record.get('_line'))
+    return value
+
+
+def _bool(record, field, default=False):
+    value = record.get(field, default)
+    if value is None:
+        return default
+    if not isinstance(value, bool):
+        raise CoursePackageError(f"{record['kind']}.{field} must be a boolean", record.get('_line'))
+    return value
+
+
+def _is_ref(value):
+    # Refs key lookup tables, so only scalar JSON values are accepted
+    return isinstance(value, (int, str)) and not isinstance(value, bool)
+
+
+def _choice(record, field, choices, default):
+    value = record.get(field) or default
+    if value not in choices:
+        raise CoursePackageError(
+            f"{record['kind']}.{field} has unsupported value '{value}'", record.get('_line')
+        )
+    return value
+
+
+class CourseImporter:
+    """
+    Validate package records and insert them into a course.
+
+    Records are buffered and flushed level by level with ``bulk_create`` once
+    ``batch_size`` records are pending, so a package is read in one pass and
+    the number of INSERT statements grows with ``records / batch_size``.
+    Callers are responsible for wrapping ``run`` in a transaction.
+    """
+
+    def __init__(self, course: Course, batch_size: int = 500,
+                 progress_callback: Optional[Callable[[int, int], None]] = None):
+        self.course = course
+        self.batch_size = batch_size
+        self.progress_callback = progress_callback
+
+        self.processed = 0
+        self.total = 0
+        self.counts = {t: 0 for t in RECORD_TYPES}
+
+        self._buffer: Dict[str, List] = defaultdict(list)
+        self._buffered = 0
+        self._seen = {t: set() for t in RECORD_TYPES}
+        self._pks: Dict[str, Dict[Any, int]] = {t: {} for t in RECORD_TYPES}
+        self._positions: Dict[tuple, int] = defaultdict(int)
+        self._module_offset = 0
+        self._assessed_lessons = set()
+
+    # -- record builders ---------------------------------------------------
+
+    def _build_module(self, record, position):
+        return Module(
+            course=self.course,
+            title=_text(record, 'title', required=True, min_len=2, max_len=255),
+            description=_text(record, 'description'),
+            order=_int(record, 'order', default=position, minimum=1) + self._module_offset,
+            duration_minutes=_int(record, 'duration_minutes'),
+            is_published=_bool(record, 'is_published'),
+        )
+
+    def _build_lesson(self, record, position):
+        return Lesson(
+            title=_text(record, 'title', required=True, min_len=2, max_len=255),
+            content=_text(record, 'content', required=True, min_len=10),
+            guest_content=_text(record, 'guest_content'),
+            registered_content=_text(record, 'registered_content'),
+            access_level=_choice(record, 'access_level', _field_choices(Lesson, 'access_level'), AccessLevel.REGISTERED.code),
+            type=_choice(record, 'type', _field_choices(Lesson, 'type'), LessonType.VIDEO.code),
+            activity_type=_choice(record, 'activity_type', _field_choices(Lesson, 'activity_type'), 'video'),
+            order=_int(record, 'order', default=position, minimum=1),
+            duration_minutes=_int(record, 'duration_minutes'),
+            has_assessment=_bool(record, 'has_assessment'),
+            has_lab=_bool(record, 'has_lab'),
+            is_free_preview=_bool(record, 'is_free_preview'),
+            video_url=_text(record, 'video_url', max_len=200),
+            transcript=_text(record, 'transcript'),
+        )
+
+    def _build_resource(self, record, position):
+        return Resource(
+            title=_text(record, 'title', required=True, min_len=2, max_len=255),
+            type=_choice(record, 'type', _field_choices(Resource, 'type'), None),
+            description=_text(record, 'description'),
+            url=_text(record, 'url', max_len=200),
+            file=_text(record, 'file', max_len=100) or None,
+            premium=_bool(record, 'premium'),
+            order=_int(record, 'order', default=position, minimum=1),
+            duration_minutes=_int(record, 'duration_minutes'),
+            file_size=record.get('file_size') if isinstance(record.get('file_size'), int) else None,
+            mime_type=_text(record, 'mime_type', max_len=100),
+        )
+
+    def _build_assessment(self, record, position):
+        time_limit = _int(record, 'time_limit_minutes')
+        return Assessment(
+            title=_text(record, 'title', required=True, min_len=2, max_len=255),
+            description=_text(record, 'description'),
+            passing_score=_int(record, 'passing_score', default=70, maximum=100),
+            max_attempts=_int(record, 'max_attempts', default=3, minimum=1),
+            time_limit=time_limit,
+            time_limit_minutes=time_limit,
+            randomize_questions=_bool(record, 'randomize_questions'),
+            show_correct_answers=_bool(record, 'show_correct_answers', True),
+            show_results=_bool(record, 'show_results', True),
+        )
+
+    def _build_question(self, record, position):
+        text = _text(record, 'question_text') or _text(record, 'text', required=True)
+        explanation = _text(record, 'explanation') or _text(record, 'feedback')
+        return Question(
+            question_text=text,
+            text=text,
+            question_type=_choice(record, 'question_type', _field_choices(Question, 'question_type'), 'multiple_choice'),
+            points=_int(record, 'points', default=1, minimum=1),
+            order=_int(record, 'order', default=position, minimum=1),
+            explanation=explanation,
+            feedback=explanation,
+        )
+
+    def _build_answer(self, record, position):
+        text = _text(record, 'answer_text', max_len=500) or _text(record, 'text', required=True, max_len=500)
+        return Answer(
+            answer_text=text,
+            text=text,
+            is_correct=_bool(record, 'is_correct'),
+            explanation=_text(record, 'explanation'),
+            order=_int(record, 'order', default=position, minimum=1),
+        )
+
+    # -- pipeline ----------------------------------------------------------
+
+    def _check_header(self, record):
+        if record.get('kind') != 'header':
+            raise CoursePackageError("package must start with a header record", record.get('_line'))
+        if record.get('format') != PACKAGE_FORMAT:
+            raise CoursePackageError(f"unknown package format '{record.get('format')}'", record.get('_line'))
+        if record.get('version') != PACKAGE_VERSION:
+            raise CoursePackageError(f"unsupported package version {record.get('version')}", record.get('_line'))
+        counts = record.get('counts') or {}
+        self.total = sum(v for v in counts.values() if isinstance(v, int))
+
+    def _add(self, record):
+        record_type = record.get('kind')
+        if record_type not in RECORD_MODELS:
+            raise CoursePackageError(f"unknown record type '{record_type}'", record.get('_line'))
+
+        ref = record.get('ref')
+        if not _is_ref(ref):
+            raise CoursePackageError(f"{record_type}.ref must be an integer or string", record.get('_line'))
+        if ref in self._seen[record_type]:
+            raise CoursePackageError(f"{record_type} ref '{ref}' is duplicated", record.get('_line'))
+
+        parent_type = PARENT_TYPES.get(record_type)
+        parent_ref = record.get('parent')
+        if parent_type and not (_is_ref(parent_ref) and parent_ref in self._seen[parent_type]):
+            raise CoursePackageError(
+                f"{record_type} references unknown {parent_type} '{parent_ref}'", record.get('_line')
+            )
+
+        if record_type == 'assessment' and parent_ref in self._assessed_lessons:
+            raise CoursePackageError(f"lesson '{parent_ref}' has more than one assessment", record.get('_line'))
+
+        self._positions[(record_type, parent_ref)] += 1
+        instance = getattr(self, f'_build_{record_type}')(record, self._positions[(record_type, parent_ref)])
+        self._seen[record_type].add(ref)
+        self._buffer[record_type].append((ref, parent_ref, instance))
+        self._buffered += 1
+        self.counts[record_type] += 1
+
+        if record_type == 'assessment':
+            self._assessed_lessons.add(parent_ref)
+
+        if self._buffered >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Insert all buffered records, parents first"""
+        for record_type in RECORD_TYPES:
+            pending = self._buffer.pop(record_type, None)
+            if not pending:
+                continue
+
+            parent_type = PARENT_TYPES.get(record_type)
+            instances = []
+            for _, parent_ref, instance in pending:
+                if parent_type:
+                    setattr(instance, PARENT_FIELDS[record_type], self._pks[parent_type][parent_ref])
+                instances.append(instance)
+
+            RECORD_MODELS[record_type].objects.bulk_create(instances, batch_size=self.batch_size)
+
+            pks = self._pks[record_type]
+            for (ref, _, _), instance in zip(pending, instances):
+                pks[ref] = instance.pk
+
+        self.processed += self._buffered
+        self._buffered = 0
+        if self.progress_callback:
+            self.progress_callback(self.processed, max(self.total, self.processed))
+
+    def _finalize(self):
+        """Recompute derived fields once instead of per-row signal work"""
+        lesson_pks = [self._pks['lesson'][ref] for ref in self._assessed_lessons]
+        if lesson_pks:
+            Lesson.objects.filter(pk__in=lesson_pks).update(has_assessment=True)
+
+        module_totals = (
+            Lesson.objects.filter(module__course=self.course)
+            .values('module_id')
+            .annotate(total=Sum('duration_minutes'))
+        )
+        modules = [
+            Module(pk=row['module_id'], duration_minutes=row['total'] or 0)
+            for row in module_totals
+        ]
+        if modules:
+            Module.objects.bulk_update(modules, ['duration_minutes'], batch_size=self.batch_size)
+
+        course_total = (
+            Module.objects.filter(course=self.course).aggregate(total=Sum('duration_minutes'))['total'] or 0
+        )
+        Course.objects.filter(pk=self.course.pk).update(
+            duration_minutes=course_total, updated_date=timezone.now()
+        )
+
+        # bulk_create and update() send no signals, so cached course
+        # responses are retired here
+        course_id = self.course.pk
+        transaction.on_commit(lambda: response_cache.bump_course(course_id))
+
+    def run(self, records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Consume package records and return per-type insert counts"""
+        records = iter(records)
+        header = next(records, None)
+        if header is None:
+            raise CoursePackageError("package is empty")
+        self._check_header(header)
+
+        self._module_offset = (
+            Module.objects.filter(course=self.course).aggregate(max_order=Max('order'))['max_order'] or 0
+        )
+
+        footer = None
+        for record in records:
+            if record.get('kind') == 'footer':
+                footer = record
+                continue
+            if footer is not None:
+                raise CoursePackageError("records found after footer", record.get('_line'))
+            self._add(record)
+
+        self.flush()
+
+        expected = footer.get('records') if footer else None
+        imported = sum(self.counts.values())
+        if expected is not None and expected != imported:
+            raise CoursePackageError(f"footer declares {expected} records, found {imported}")
+
+        self._finalize()
+        logger.info(f"Imported {imported} records into course {self.course.id}: {self.counts}")
+        return {'items_processed': imported, 'counts': dict(self.counts)}
@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-18 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('instructor_portal', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='instructornotification',
+            name='email_status',
+            field=models.CharField(choices=[('none', 'Not Requested'), ('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed'), ('skipped', 'Skipped')], default='none', max_length=10, verbose_name='Email Status'),
+        ),
+        migrations.AddField(
+            model_name='instructornotification',
+            name='email_attempts',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Email Attempts'),
+        ),
+        migrations.AddField(
+            model_name='instructornotification',
+            name='email_next_attempt_at',
+            field=models.DateTimeField(blank=True, help_text='Earliest time the outbox may (re)try sending this email', null=True, verbose_name='Next Email Attempt At'),
+        ),
+        migrations.AddField(
+            model_name='instructornotification',
+            name='email_last_error',
+            field=models.TextField(blank=True, verbose_name='Last Email Error'),
+        ),
+        migrations.AddIndex(
+            model_name='instructornotification',
+            index=models.Index(fields=['email_status', 'email_next_attempt_at'], name='instructor__email_s_10d046_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-19 01:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('instructor_portal', '0002_notification_outbox'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='instructornotification',
+            name='notification_type',
+            field=models.CharField(choices=[('course_published', 'Course Published'), ('course_updated', 'Course Updated'), ('course_approved', 'Course Approved'), ('course_rejected', 'Course Rejected'), ('new_enrollment', 'New Enrollment'), ('new_review', 'New Review'), ('course_completed', 'Course Completed by Student'), ('tier_upgraded', 'Tier Upgraded'), ('revenue_milestone', 'Revenue Milestone Reached'), ('system_announcement', 'System Announcement'), ('account_warning', 'Account Warning')], max_length=30, verbose_name='Notification Type'),
+        ),
+    ]
@@ -8,21 +8,26 @@
 # Last Modified By: softTechSolutions2001
 # Last Modified: 2025-06-27 03:48:02 UTC
 # User: softTechSolutions2001
-# Version: 1.0.0
+# Version: 1.1.0
 #
 # Instructor notifications model - Notification system for instructors
 # Restored from original models.py to maintain backward compatibility
+#
+# Version 1.1.0 Changes:
+# - ADDED: Email outbox state (status, attempts, next attempt, last error)
+# - CHANGED: create_notification queues email instead of sending in-request
+# - ADDED: bulk_create_notifications / notify_course_instructors for fan-out
+# - ADDED: COURSE_UPDATED type, sent to collaborators on course updates
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.core.cache import cache
 from django.db.models.signals import post_save
 from django.dispatch import receiver
-from django.conf import settings
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -36,6 +41,7 @@ class InstructorNotification(models.Model):
 
     class NotificationType(models.TextChoices):
         COURSE_PUBLISHED = 'course_published', _('Course Published')
+        COURSE_UPDATED = 'course_updated', _('Course Updated')
         COURSE_APPROVED = 'course_approved', _('Course Approved')
         COURSE_REJECTED = 'course_rejected', _('Course Rejected')
         NEW_ENROLLMENT = 'new_enrollment', _('New Enrollment')
@@ -52,6 +58,13 @@ class InstructorNotification(models.Model):
         HIGH = 'high', _('High Priority')
         URGENT = 'urgent', _('Urgent')
 
+    class EmailStatus(models.TextChoices):
+        NOT_REQUESTED = 'none', _('Not Requested')
+        PENDING = 'pending', _('Pending')
+        SENT = 'sent', _('Sent')
+        FAILED = 'failed', _('Failed')
+        SKIPPED = 'skipped', _('Skipped')
+
     instructor = models.ForeignKey(
         'InstructorProfile',
         on_delete=models.CASCADE,
@@ -138,6 +151,31 @@ class InstructorNotification(models.Model):
         verbose_name=_('Email Sent At')
     )
 
+    # Email outbox state, drained by instructor_portal.tasks.drain_notification_outbox
+    email_status = models.CharField(
+        max_length=10,
+        choices=EmailStatus.choices,
+        default=EmailStatus.NOT_REQUESTED,
+        verbose_name=_('Email Status')
+    )
+
+    email_attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name=_('Email Attempts')
+    )
+
+    email_next_attempt_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('Next Email Attempt At'),
+        help_text=_('Earliest time the outbox may (re)try sending this email')
+    )
+
+    email_last_error = models.TextField(
+        blank=True,
+        verbose_name=_('Last Email Error')
+    )
+
     # Timestamps
     created_date = models.DateTimeField(
         auto_now_add=True,
@@ -160,6 +198,7 @@ class InstructorNotification(models.Model):
             models.Index(fields=['instructor', 'notification_type']),
             models.Index(fields=['priority', 'created_date']),
             models.Index(fields=['expires_at']),
+            models.Index(fields=['email_status', 'email_next_attempt_at']),
         ]
 
     def __str__(self):
@@ -192,78 +231,66 @@ class InstructorNotification(models.Model):
             return False
 
     def send_email_notification(self) -> bool:
-        """Send email notification if enabled"""
+        """
+        Send this notification's email immediately, bypassing the outbox.
+
+        The row is claimed first, as a drain claims it, so an email that was
+        already sent or is claimed by a running drain is not sent twice.
+        """
         try:
             if (self.email_sent or
                 not self.instructor.email_notifications or
                 not self.instructor.user.email):
                 return False
 
-            from django.core.mail import send_mail
-            from django.template.loader import render_to_string
-
-            context = {
-                'instructor': self.instructor,
-                'notification': self,
-                'action_url': self.action_url,
-                'site_url': getattr(settings, 'SITE_URL', 'https://example.com')
-            }
-
-            # Choose template based on notification type
-            template_map = {
-                self.NotificationType.COURSE_PUBLISHED: 'emails/course_published_notification.html',
-                self.NotificationType.NEW_ENROLLMENT: 'emails/new_enrollment_notification.html',
-                self.NotificationType.NEW_REVIEW: 'emails/new_review_notification.html',
-                self.NotificationType.TIER_UPGRADED: 'emails/tier_upgraded_notification.html',
-            }
-
-            template = template_map.get(
-                self.notification_type,
-                'emails/generic_notification.html'
-            )
-
-            html_message = render_to_string(f'instructor_portal/{template}', context)
-
-            send_mail(
-                subject=f"[Instructor Portal] {self.title}",
-                message=self.message,  # Plain text fallback
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[self.instructor.user.email],
-                html_message=html_message,
-                fail_silently=True
-            )
+            from instructor_portal.notification_outbox import claim_notification, deliver_notifications
 
-            self.email_sent = True
-            self.email_sent_at = timezone.now()
-            self.save(update_fields=['email_sent', 'email_sent_at'])
+            if not claim_notification(self):
+                return False
 
-            logger.info(f"Sent email notification to {self.instructor.display_name}")
-            return True
+            result = deliver_notifications([self])
+            self.refresh_from_db(fields=['email_sent', 'email_sent_at', 'email_status',
+                                         'email_attempts', 'email_next_attempt_at'])
+            return result['sent'] > 0
 
         except Exception as e:
             logger.error(f"Error sending email notification: {e}")
             return False
 
+    @classmethod
+    def _build(cls, instructor, notification_type: str, title: str, message: str,
+               **kwargs) -> 'InstructorNotification':
+        send_email = kwargs.get('send_email', True)
+        return cls(
+            instructor=instructor,
+            notification_type=notification_type,
+            title=title,
+            message=message,
+            priority=kwargs.get('priority', cls.Priority.MEDIUM),
+            action_url=kwargs.get('action_url', ''),
+            action_text=kwargs.get('action_text', ''),
+            metadata=kwargs.get('metadata', {}),
+            expires_at=kwargs.get('expires_at'),
+            email_status=cls.EmailStatus.PENDING if send_email else cls.EmailStatus.NOT_REQUESTED,
+            email_next_attempt_at=timezone.now() if send_email else None,
+        )
+
+    @staticmethod
+    def _schedule_email_drain():
+        """Drain the email outbox once the current transaction commits"""
+        from instructor_portal.notification_outbox import schedule_drain
+        transaction.on_commit(schedule_drain)
+
     @classmethod
     def create_notification(cls, instructor, notification_type: str,
                           title: str, message: str, **kwargs) -> 'InstructorNotification':
-        """Create a new notification"""
+        """Create a new notification; its email is queued in the outbox"""
         try:
-            notification = cls.objects.create(
-                instructor=instructor,
-                notification_type=notification_type,
-                title=title,
-                message=message,
-                priority=kwargs.get('priority', cls.Priority.MEDIUM),
-                action_url=kwargs.get('action_url', ''),
-                action_text=kwargs.get('action_text', ''),
-                metadata=kwargs.get('metadata', {}),
-                expires_at=kwargs.get('expires_at')
-            )
+            notification = cls._build(instructor, notification_type, title, message, **kwargs)
+            notification.save()
 
-            # Send email notification if enabled
-            if kwargs.get('send_email', True):
-                notification.send_email_notification()
+            if notification.email_status == cls.EmailStatus.PENDING:
+                cls._schedule_email_drain()
 
             logger.info(f"Created notification for {instructor.display_name}: {title}")
             return notification
@@ -272,6 +299,42 @@ class InstructorNotification(models.Model):
             logger.error(f"Error creating notification: {e}")
             raise
 
+    @classmethod
+    def bulk_create_notifications(cls, instructors: Iterable, notification_type: str,
+                                  title: str, message: str, **kwargs) -> List['InstructorNotification']:
+        """Create the same notification for many instructors with one insert"""
+        notifications = [
+            cls._build(instructor, notification_type, title, message, **kwargs)
+            for instructor in instructors
+        ]
+        if not notifications:
+            return []
+
+        cls.objects.bulk_create(notifications, batch_size=500)
+        if kwargs.get('send_email', True):
+            cls._schedule_email_drain()
+
+        logger.info(f"Created {len(notifications)} '{notification_type}' notifications")
+        return notifications
+
+    @classmethod
+    def notify_course_instructors(cls, course, notification_type: str, title: str,
+                                  message: str, exclude_user=None, **kwargs) -> List['InstructorNotification']:
+        """Notify every active instructor of a course (e.g. collaborators on an update)"""
+        from .profile import InstructorProfile
+
+        profiles = InstructorProfile.objects.filter(
+            user__courseinstructor__course=course,
+            user__courseinstructor__is_active=True,
+        ).distinct()
+        if exclude_user is not None:
+            profiles = profiles.exclude(user=exclude_user)
+
+        metadata = {'course_id': course.id, **kwargs.pop('metadata', {})}
+        return cls.bulk_create_notifications(
+            profiles, notification_type, title, message, metadata=metadata, **kwargs
+        )
+
     @classmethod
     def cleanup_expired_notifications(cls) -> int:
         """Clean up expired notifications"""
@@ -0,0 +1,309 @@
+#
+# File Path: instructor_portal/notification_outbox.py
+# Folder Path: instructor_portal/
+# Date Created: 2026-10-18
+# Version: 1.0.0
+#
+# Email outbox for instructor notifications
+#
+# Notifications are stored with email_status=PENDING and sent later by the
+# drain_notification_outbox task instead of inside the request that created
+# them. A drain claims a batch of due rows, groups them per instructor
+# (several pending notifications become one digest email), renders them with
+# compiled templates cached per process and sends everything over a single
+# email backend connection. Failed emails are retried with exponential
+# backoff until NOTIFICATION_OUTBOX_MAX_ATTEMPTS is reached.
+#
+# Any Django email backend works; set EMAIL_BACKEND to the console or
+# file-based backend for local development and tests.
+
+import logging
+import random
+from collections import defaultdict
+from datetime import timedelta
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.template import TemplateDoesNotExist, engines
+from django.template.loader import get_template
+from django.utils import timezone
+
+from .models import InstructorNotification
+
+logger = logging.getLogger(__name__)
+
+DRAIN_SCHEDULED_KEY = 'instructor_notifications:drain_scheduled'
+
+TEMPLATE_MAP = {
+    InstructorNotification.NotificationType.COURSE_PUBLISHED: 'emails/course_published_notification.html',
+    InstructorNotification.NotificationType.NEW_ENROLLMENT: 'emails/new_enrollment_notification.html',
+    InstructorNotification.NotificationType.NEW_REVIEW: 'emails/new_review_notification.html',
+    InstructorNotification.NotificationType.TIER_UPGRADED: 'emails/tier_upgraded_notification.html',
+}
+GENERIC_TEMPLATE = 'emails/generic_notification.html'
+DIGEST_TEMPLATE = 'emails/notification_digest.html'
+
+# Used when the project does not ship a template of its own
+FALLBACK_SOURCES = {
+    GENERIC_TEMPLATE: (
+        '<p>Hi {{ instructor.display_name }},</p>'
+        '<h2>{{ notification.title }}</h2><p>{{ notification.message|linebreaksbr }}</p>'
+        '{% if action_url %}<p><a href="{{ site_url }}{{ action_url }}">'
+        '{{ notification.action_text|default:"Open" }}</a></p>{% endif %}'
+    ),
+    DIGEST_TEMPLATE: (
+        '<p>Hi {{ instructor.display_name }},</p>'
+        '<p>You have {{ notifications|length }} new notifications:</p><ul>'
+        '{% for notification in notifications %}<li><strong>{{ notification.title }}</strong>'
+        '<br>{{ notification.message }}{% if notification.action_url %} '
+        '<a href="{{ site_url }}{{ notification.action_url }}">{{ notification.action_text|default:"Open" }}</a>'
+        '{% endif %}</li>{% endfor %}</ul>'
+    ),
+}
+
+
+def _setting(name: str, default):
+    return getattr(settings, f'NOTIFICATION_OUTBOX_{name}', default)
+
+
+# ====================================
+# TEMPLATES
+# ====================================
+
+_compiled_templates: Dict[str, Any] = {}
+
+
+def get_email_template(name: str):
+    """Return a compiled template, loading (or falling back) once per process"""
+    template = _compiled_templates.get(name)
+    if template is None:
+        try:
+            template = get_template(f'instructor_portal/{name}')
+        except TemplateDoesNotExist:
+            fallback = FALLBACK_SOURCES.get(name, FALLBACK_SOURCES[GENERIC_TEMPLATE])
+            template = engines['django'].from_string(fallback)
+        _compiled_templates[name] = template
+    return template
+
+
+def _site_url() -> str:
+    return getattr(settings, 'SITE_URL', 'https://example.com')
+
+
+def build_notification_email(notification) -> EmailMultiAlternatives:
+    """Build the email for a single notification"""
+    instructor = notification.instructor
+    template = get_email_template(TEMPLATE_MAP.get(notification.notification_type, GENERIC_TEMPLATE))
+    html = template.render({
+        'instructor': instructor,
+        'notification': notification,
+        'action_url': notification.action_url,
+        'site_url': _site_url(),
+    })
+    message = EmailMultiAlternatives(
+        subject=f"[Instructor Portal] {notification.title}",
+        body=notification.message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[instructor.user.email],
+    )
+    message.attach_alternative(html, 'text/html')
+    return message
+
+
+def build_digest_email(instructor, notifications) -> EmailMultiAlternatives:
+    """Build one digest email covering several notifications"""
+    html = get_email_template(DIGEST_TEMPLATE).render({
+        'instructor': instructor,
+        'notifications': notifications,
+        'site_url': _site_url(),
+    })
+    body = "\n\n".join(f"{n.title}\n{n.message}" for n in notifications)
+    message = EmailMultiAlternatives(
+        subject=f"[Instructor Portal] {len(notifications)} new notifications",
+        body=body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[instructor.user.email],
+    )
+    message.attach_alternative(html, 'text/html')
+    return message
+
+
+# ====================================
+# DELIVERY
+# ====================================
+
+def _retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff with jitter, capped at NOTIFICATION_OUTBOX_MAX_BACKOFF"""
+    base = _setting('RETRY_BACKOFF', 60)
+    delay = min(base * (2 ** max(attempts - 1, 0)), _setting('MAX_BACKOFF', 3600))
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def _record_results(sent: List, skipped: List, failed: List):
+    """Persist delivery results with a handful of UPDATE statements"""
+    now = timezone.now()
+    Status = InstructorNotification.EmailStatus
+
+    if sent:
+        InstructorNotification.objects.filter(pk__in=[n.pk for n in sent]).update(
+            email_status=Status.SENT, email_sent=True, email_sent_at=now,
+            email_attempts=F('email_attempts') + 1, email_next_attempt_at=None, email_last_error='',
+        )
+    if skipped:
+        InstructorNotification.objects.filter(pk__in=[n.pk for n in skipped]).update(
+            email_status=Status.SKIPPED, email_next_attempt_at=None,
+        )
+    if failed:
+        max_attempts = _setting('MAX_ATTEMPTS', 5)
+        for notification, error in failed:
+            notification.email_attempts += 1
+            notification.email_last_error = error[:1000]
+            if notification.email_attempts >= max_attempts:
+                notification.email_status = Status.FAILED
+                notification.email_next_attempt_at = None
+            else:
+                notification.email_next_attempt_at = now + _retry_delay(notification.email_attempts)
+        InstructorNotification.objects.bulk_update(
+            [n for n, _ in failed],
+            ['email_attempts', 'email_last_error', 'email_status', 'email_next_attempt_at'],
+        )
+
+
+def deliver_notifications(notifications, connection=None) -> Dict[str, int]:
+    """
+    Send emails for the given notifications over one backend connection.
+
+    Instructors with at least NOTIFICATION_OUTBOX_DIGEST_THRESHOLD pending
+    notifications receive a single digest. Notifications must have
+    ``instructor__user`` loaded to avoid per-row queries.
+    """
+    digest_threshold = _setting('DIGEST_THRESHOLD', 3)
+
+    groups = defaultdict(list)
+    for notification in notifications:
+        groups[notification.instructor_id].append(notification)
+
+    outgoing, skipped = [], []
+    for group in groups.values():
+        instructor = group[0].instructor
+        if not instructor.email_notifications or not instructor.user.email:
+            skipped.extend(group)
+        elif len(group) >= digest_threshold:
+            outgoing.append((build_digest_email(instructor, group), group))
+        else:
+            outgoing.extend((build_notification_email(n), [n]) for n in group)
+
+    sent, failed = [], []
+    digests = 0
+    if outgoing:
+        connection = connection or get_connection(fail_silently=False)
+        try:
+            connection.open()
+            for message, group in outgoing:
+                try:
+                    message.connection = connection
+                    connection.send_messages([message])
+                    sent.extend(group)
+                    digests += len(group) > 1
+                except Exception as e:
+                    failed.extend((n, str(e)) for n in group)
+        except Exception as e:
+            # Could not reach the backend at all; every message is retried later
+            logger.error(f"Email backend unavailable: {e}")
+            done = {n.pk for n in sent} | {n.pk for n, _ in failed}
+            failed.extend((n, str(e)) for _, group in outgoing for n in group if n.pk not in done)
+        finally:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    _record_results(sent, skipped, failed)
+    return {'sent': len(sent), 'skipped': len(skipped), 'failed': len(failed), 'digests': digests}
+
+
+def _due_filter(now):
+    return Q(email_status=InstructorNotification.EmailStatus.PENDING) & (
+        Q(email_next_attempt_at__lte=now) | Q(email_next_attempt_at__isnull=True)
+    )
+
+
+def _lease_until(now):
+    return now + timedelta(seconds=_setting('LEASE_SECONDS', 300))
+
+
+def claim_notification(notification) -> bool:
+    """
+    Claim one notification for an immediate send.
+
+    Only unsent rows that are not queued or are due are claimed, with the
+    same lease a drain takes; False means the email was already sent or a
+    drain holds it.
+    """
+    now = timezone.now()
+    Status = InstructorNotification.EmailStatus
+    claimed = InstructorNotification.objects.filter(
+        Q(pk=notification.pk, email_sent=False)
+        & (_due_filter(now) | Q(email_status=Status.NOT_REQUESTED))
+    ).update(email_status=Status.PENDING, email_next_attempt_at=_lease_until(now))
+    if claimed:
+        notification.email_status = Status.PENDING
+    return bool(claimed)
+
+
+def drain_outbox(batch_size: int = None) -> Dict[str, Any]:
+    """
+    Claim one batch of due notifications and send their emails.
+
+    Claimed rows get their next attempt pushed out by a lease, so concurrent
+    drains skip them and a crashed worker's batch is retried once the lease
+    expires.
+    """
+    batch_size = batch_size or _setting('BATCH_SIZE', 200)
+    now = timezone.now()
+
+    with transaction.atomic():
+        ids = list(
+            InstructorNotification.objects.select_for_update(skip_locked=True)
+            .filter(_due_filter(now))
+            .order_by('email_next_attempt_at')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if ids:
+            InstructorNotification.objects.filter(pk__in=ids).update(
+                email_next_attempt_at=_lease_until(now)
+            )
+
+    if not ids:
+        return {'status': 'completed', 'sent': 0, 'skipped': 0, 'failed': 0, 'digests': 0, 'remaining': False}
+
+    notifications = list(
+        InstructorNotification.objects.select_related('instructor__user')
+        .filter(pk__in=ids)
+        .order_by('instructor_id', 'created_date')
+    )
+    result = deliver_notifications(notifications)
+    result['status'] = 'completed'
+    result['remaining'] = InstructorNotification.objects.filter(_due_filter(timezone.now())).exists()
+    logger.info(f"Notification outbox drained: {result}")
+    return result
+
+
+def schedule_drain():
+    """Queue one outbox drain, coalescing bursts of new notifications"""
+    if not cache.add(DRAIN_SCHEDULED_KEY, True, _setting('SCHEDULE_DEBOUNCE', 10)):
+        return
+    try:
+        from .tasks import CELERY_AVAILABLE, drain_notification_outbox
+        if CELERY_AVAILABLE:
+            drain_notification_outbox.delay()
+        else:
+            drain_notification_outbox()
+    except Exception as e:
+        # The periodic drain picks the notifications up later
+        cache.delete(DRAIN_SCHEDULED_KEY)
+        logger.warning(f"Could not schedule notification outbox drain: {e}")
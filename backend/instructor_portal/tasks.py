@@ -22,6 +22,8 @@ from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
 
+from educore import audit
+
 # Flexible task backend imports
 try:
     from celery import shared_task, Task
@@ -43,38 +45,38 @@ User = get_user_model()
 # Unified configuration
 CONFIG = {
     'MAX_IMPORT_SIZE': 50 * 1024 * 1024,  # 50MB
+    'MAX_DECOMPRESSED_IMPORT_SIZE': 500 * 1024 * 1024,  # 500MB read from a .gz package
     'MAX_PROCESSING_TIME': 3600,  # 1 hour
     'MAX_RETRIES': 3,
     'RETRY_BACKOFF': 60,
     'BATCH_SIZE': 100,
     'TASK_LOCK_TIMEOUT': 3600,
-    'ALLOWED_FORMATS': {'json', 'csv', 'xml'},
+    'ALLOWED_FORMATS': {'json', 'jsonl', 'csv', 'xml'},
+    'IMPORT_FORMATS': {'json', 'jsonl'},
+    'PROGRESS_INTERVAL': 1.0,  # seconds between task state updates
     'MAX_STORAGE_KEY_LENGTH': 500,
     'AUDIT_LOG_MAX_SIZE': 1000
 }
 
+# Hard time limit of one outbox drain. Its task lock expires with it, so a
+# killed worker blocks the one-minute drain schedule for minutes, not an hour.
+OUTBOX_TIME_LIMIT = getattr(settings, 'NOTIFICATION_OUTBOX_TIME_LIMIT', 240)
+
 # ====================================
 # CORE UTILITIES
 # ====================================
 
 def audit_log(task_name: str, action: str, user_id: Optional[int] = None,
               metadata: Optional[Dict] = None):
-    """Lean audit logging with size limits"""
+    """Lean audit logging with size limits, via the buffered audit pipeline"""
     try:
-        log_data = {
-            'task': task_name,
-            'action': action,
-            'user_id': user_id,
-            'timestamp': timezone.now().isoformat(),
-            'metadata': metadata or {}
-        }
+        metadata = metadata or {}
+        size = len(json.dumps(metadata, default=str))
+        if size > CONFIG['AUDIT_LOG_MAX_SIZE']:
+            metadata = {'truncated': True, 'size': size}
 
-        # Truncate large metadata
-        log_str = json.dumps(log_data)
-        if len(log_str) > CONFIG['AUDIT_LOG_MAX_SIZE']:
-            log_data['metadata'] = {'truncated': True, 'size': len(log_str)}
-
-        logger.info(f"TASK_AUDIT: {json.dumps(log_data)}")
+        audit.record(action, source='task', actor_id=user_id, object_type='task',
+                     object_id=task_name, metadata=metadata)
     except Exception as e:
         logger.error(f"Audit log failed: {e}")
 
@@ -191,8 +193,45 @@ class MockTask:
 # TASK IMPLEMENTATIONS
 # ====================================
 
-def _import_course_impl(course_id: int, storage_key: str, user_id: int, format: str = 'json') -> Dict[str, Any]:
-    """Streamlined course import implementation"""
+def _get_course_for_user(course_id: int, user_id: int):
+    """Load a course after checking the user may manage it"""
+    if not check_permissions(user_id, 'instructor'):
+        raise PermissionError("Insufficient permissions")
+
+    from courses.models import Course
+    course = Course.objects.get(id=course_id)
+    user = User.objects.get(id=user_id)
+
+    if not (user.is_staff or course.courseinstructor_set.filter(
+        instructor=user, is_active=True).exists()):
+        raise PermissionError("No access to this course")
+
+    return course
+
+def _progress_reporter(task, course_id: int) -> Optional[Callable[[int, int], None]]:
+    """Build a throttled callback that publishes import progress as task state"""
+    if task is None or not hasattr(task, 'update_state'):
+        return None
+
+    last_update = [0.0]
+
+    def report(processed: int, total: int):
+        now = time.time()
+        if now - last_update[0] < CONFIG['PROGRESS_INTERVAL'] and processed < total:
+            return
+        last_update[0] = now
+        task.update_state(state='PROGRESS', meta={
+            'course_id': course_id,
+            'processed': processed,
+            'total': total,
+            'percent': round(processed * 100 / total, 1) if total else 0,
+        })
+
+    return report
+
+def _import_course_impl(course_id: int, storage_key: str, user_id: int, format: str = 'json',
+                        task=None) -> Dict[str, Any]:
+    """Import a course package from storage into an existing course"""
     start_time = time.time()
 
     try:
@@ -200,34 +239,47 @@ def _import_course_impl(course_id: int, storage_key: str, user_id: int, format:
         params = validate_params(course_id=course_id, storage_key=storage_key,
                                user_id=user_id, format=format)
 
-        if not check_permissions(params['user_id'], 'instructor'):
-            raise PermissionError("Insufficient permissions")
+        if params['format'] not in CONFIG['IMPORT_FORMATS']:
+            raise ValueError(f"Import not supported for format: {params['format']}")
+
+        course = _get_course_for_user(params['course_id'], params['user_id'])
 
-        # Validate course access
-        from courses.models import Course
-        course = Course.objects.get(id=params['course_id'])
-        user = User.objects.get(id=params['user_id'])
+        from django.core.files.storage import default_storage
+        from .course_package import (
+            CourseImporter, iter_jsonl_records, iter_nested_records, open_package_stream,
+        )
 
-        if not (user.is_staff or course.courseinstructor_set.filter(
-            instructor=user, is_active=True).exists()):
-            raise PermissionError("No access to this course")
+        if default_storage.size(params['storage_key']) > CONFIG['MAX_IMPORT_SIZE']:
+            raise ValueError("Import file exceeds maximum size")
 
-        # Mock data processing (replace with actual implementation)
-        mock_data = {
-            'modules': [{'title': 'Sample Module', 'lessons': [{'title': 'Sample Lesson'}]}]
-        }
+        importer = CourseImporter(
+            course,
+            batch_size=CONFIG['BATCH_SIZE'] * 5,
+            progress_callback=_progress_reporter(task, params['course_id']),
+        )
 
-        # Process import
-        with transaction.atomic():
-            processed_count = len(mock_data.get('modules', []))
-            # Add actual import logic here
+        with default_storage.open(params['storage_key'], 'rb') as fh:
+            stream = open_package_stream(
+                fh,
+                compressed=params['storage_key'].endswith('.gz'),
+                max_size=CONFIG['MAX_DECOMPRESSED_IMPORT_SIZE'],
+            )
+            if params['format'] == 'jsonl':
+                records = iter_jsonl_records(stream)
+            else:
+                # Legacy nested documents are small enough to parse whole
+                records = iter_nested_records(json.load(stream))
+
+            with transaction.atomic():
+                summary = importer.run(records)
 
         duration = time.time() - start_time
 
         return {
             'status': 'completed',
             'course_id': params['course_id'],
-            'items_processed': processed_count,
+            'items_processed': summary['items_processed'],
+            'counts': summary['counts'],
             'duration': round(duration, 2)
         }
 
@@ -239,6 +291,52 @@ def _import_course_impl(course_id: int, storage_key: str, user_id: int, format:
             'duration': round(time.time() - start_time, 2)
         }
 
+def _export_course_impl(course_id: int, storage_key: str, user_id: int) -> Dict[str, Any]:
+    """Stream a course package into storage"""
+    start_time = time.time()
+
+    try:
+        params = validate_params(course_id=course_id, storage_key=storage_key, user_id=user_id)
+        course = _get_course_for_user(params['course_id'], params['user_id'])
+
+        import gzip
+        import io
+        import tempfile
+        from django.core.files import File
+        from django.core.files.storage import default_storage
+        from .course_package import CourseExporter
+
+        # Spool to disk past 5MB so large courses never sit in memory
+        with tempfile.SpooledTemporaryFile(max_size=5 * 1024 * 1024) as spool:
+            target = spool
+            if params['storage_key'].endswith('.gz'):
+                target = gzip.GzipFile(fileobj=spool, mode='wb')
+            text = io.TextIOWrapper(target, encoding='utf-8')
+            records = CourseExporter(course).write(text)
+            text.flush()
+            text.detach()
+            if target is not spool:
+                target.close()
+
+            spool.seek(0)
+            saved_key = default_storage.save(params['storage_key'], File(spool))
+
+        return {
+            'status': 'completed',
+            'course_id': params['course_id'],
+            'storage_key': saved_key,
+            'items_processed': records,
+            'duration': round(time.time() - start_time, 2)
+        }
+
+    except Exception as e:
+        logger.error(f"Course export failed: {e}")
+        return {
+            'status': 'failed',
+            'error': str(e),
+            'duration': round(time.time() - start_time, 2)
+        }
+
 def _cleanup_sessions_impl() -> Dict[str, Any]:
     """Streamlined session cleanup"""
     try:
@@ -261,6 +359,18 @@ def _cleanup_sessions_impl() -> Dict[str, Any]:
         logger.error(f"Session cleanup failed: {e}")
         return {'status': 'failed', 'error': str(e)}
 
+def _drain_notification_outbox_impl(batch_size: Optional[int] = None) -> Dict[str, Any]:
+    """Send one batch of queued notification emails"""
+    from .notification_outbox import DRAIN_SCHEDULED_KEY, drain_outbox
+
+    # Notifications created from now on schedule a new drain
+    cache.delete(DRAIN_SCHEDULED_KEY)
+    try:
+        return drain_outbox(batch_size)
+    except Exception as e:
+        logger.error(f"Notification outbox drain failed: {e}")
+        return {'status': 'failed', 'error': str(e)}
+
 def _generate_analytics_impl(user_id: int) -> Dict[str, Any]:
     """Streamlined analytics generation"""
     try:
@@ -292,7 +402,12 @@ if CELERY_AVAILABLE and shared_task:
     @shared_task(bind=True, base=UnifiedTask)
     def import_course_from_key(self, course_id: int, storage_key: str, user_id: int, **kwargs):
         """Import course from storage key"""
-        return _import_course_impl(course_id, storage_key, user_id, **kwargs)
+        return _import_course_impl(course_id, storage_key, user_id, task=self, **kwargs)
+
+    @shared_task(bind=True, base=UnifiedTask)
+    def export_course_to_key(self, course_id: int, storage_key: str, user_id: int):
+        """Export course package to storage key"""
+        return _export_course_impl(course_id, storage_key, user_id)
 
     @shared_task(bind=True, base=UnifiedTask)
     @task_lock('cleanup_sessions')
@@ -306,6 +421,16 @@ if CELERY_AVAILABLE and shared_task:
         """Generate user analytics"""
         return _generate_analytics_impl(user_id)
 
+    @shared_task(bind=True, base=UnifiedTask, soft_time_limit=OUTBOX_TIME_LIMIT - 30,
+                 time_limit=OUTBOX_TIME_LIMIT)
+    @task_lock('notification_outbox', timeout=OUTBOX_TIME_LIMIT)
+    def drain_notification_outbox(self, batch_size: Optional[int] = None):
+        """Drain the instructor notification email outbox"""
+        result = _drain_notification_outbox_impl(batch_size)
+        if result.get('remaining'):
+            self.apply_async(kwargs={'batch_size': batch_size}, countdown=1)
+        return result
+
     @shared_task(bind=True, base=UnifiedTask)
     @task_lock('cleanup_files')
     def cleanup_orphaned_files(self):
@@ -320,8 +445,10 @@ if CELERY_AVAILABLE and shared_task:
 else:
     # Fallback implementations
     import_course_from_key = MockTask(_import_course_impl, 'import_course_from_key')
+    export_course_to_key = MockTask(_export_course_impl, 'export_course_to_key')
     cleanup_expired_sessions = MockTask(_cleanup_sessions_impl, 'cleanup_expired_sessions')
     generate_analytics = MockTask(_generate_analytics_impl, 'generate_analytics')
+    drain_notification_outbox = MockTask(_drain_notification_outbox_impl, 'drain_notification_outbox')
     cleanup_orphaned_files = MockTask(lambda: {'status': 'completed'}, 'cleanup_orphaned_files')
 
 # ====================================
@@ -373,7 +500,7 @@ def setup_periodic_tasks():
         return False
 
     try:
-        from django_celery_beat.models import PeriodicTask, CrontabSchedule
+        from django_celery_beat.models import PeriodicTask, CrontabSchedule, IntervalSchedule
 
         # Daily cleanup at 2 AM
         schedule, _ = CrontabSchedule.objects.get_or_create(
@@ -403,6 +530,20 @@ def setup_periodic_tasks():
             }
         )
 
+        # Notification outbox every minute, picking up retries whose backoff expired
+        interval, _ = IntervalSchedule.objects.get_or_create(
+            every=1, period=IntervalSchedule.MINUTES
+        )
+
+        PeriodicTask.objects.update_or_create(
+            name="notification_outbox_drain",
+            defaults={
+                'interval': interval,
+                'task': 'instructor_portal.tasks.drain_notification_outbox',
+                'enabled': True
+            }
+        )
+
         logger.info("Periodic tasks configured successfully")
         return True
 
@@ -416,9 +557,11 @@ def setup_periodic_tasks():
 
 __all__ = [
     'import_course_from_key',
+    'export_course_to_key',
     'cleanup_expired_sessions',
     'generate_analytics',
     'cleanup_orphaned_files',
+    'drain_notification_outbox',
     'get_task_status',
     'cancel_task',
     'setup_periodic_tasks',
@@ -0,0 +1,148 @@
+import gzip
+import io
+import json
+
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase
+
+from courses.models import Answer, Category, Course, Lesson, Module
+from instructor_portal.course_package import (
+    PACKAGE_FORMAT,
+    PACKAGE_VERSION,
+    CourseExporter,
+    CourseImporter,
+    CoursePackageError,
+    iter_jsonl_records,
+    iter_nested_records,
+    open_package_stream,
+)
+
+
+def _gzipped(records):
+    return io.BytesIO(gzip.compress("".join(json.dumps(r) + "\n" for r in records).encode()))
+
+
+# Course package reading tests
+class OpenPackageStreamTests(SimpleTestCase):
+    def test_compressed_package_within_limit_is_read(self):
+        records = [{"kind": "header"}, {"kind": "footer", "records": 0}]
+        stream = open_package_stream(_gzipped(records), compressed=True, max_size=1024)
+        self.assertEqual([r["kind"] for r in iter_jsonl_records(stream)], ["header", "footer"])
+
+    def test_decompressed_size_is_capped(self):
+        # Compresses to about a kilobyte
+        records = [{"kind": "module", "title": "x" * 100_000}]
+        stream = open_package_stream(_gzipped(records), compressed=True, max_size=10_000)
+        with self.assertRaisesMessage(CoursePackageError, "exceeds 10000 bytes"):
+            list(iter_jsonl_records(stream))
+
+    def test_uncompressed_package_is_not_wrapped(self):
+        stream = open_package_stream(io.BytesIO(b'{"kind": "header"}\n'), max_size=1)
+        self.assertEqual(next(iter_jsonl_records(stream))["kind"], "header")
+
+
+def _lesson(title, minutes, **extra):
+    return {"title": title, "content": f"Content for {title}", "duration_minutes": minutes, **extra}
+
+
+DOCUMENT = {"modules": [
+    {"title": "First Module", "lessons": [
+        _lesson("Opening Lesson", 10, resources=[{"title": "Slides", "type": "document"}]),
+        _lesson("Quiz Lesson", 20, assessment={
+            "title": "Checkpoint", "questions": [
+                {"question_text": "Pick one", "answers": [
+                    {"answer_text": "Right", "is_correct": True},
+                    {"answer_text": "Wrong"},
+                ]},
+            ],
+        }),
+    ]},
+    {"title": "Second Module", "lessons": [_lesson("Closing Lesson", 5)]},
+]}
+
+
+def _package(*records):
+    header = {"kind": "header", "format": PACKAGE_FORMAT, "version": PACKAGE_VERSION}
+    return [header, *records]
+
+
+class CoursePackageImportTests(TestCase):
+    def setUp(self):
+        category = Category.objects.create(name="Package Category")
+        self.source = Course.objects.create(
+            title="Package Source", category=category, description="Package source course"
+        )
+        self.target = Course.objects.create(
+            title="Package Target", category=category, description="Package target course"
+        )
+
+    def _import(self, course, records, **kwargs):
+        with transaction.atomic(), self.captureOnCommitCallbacks(execute=True):
+            return CourseImporter(course, **kwargs).run(records)
+
+    def test_export_then_import_reproduces_the_course(self):
+        self._import(self.source, iter_nested_records(DOCUMENT))
+
+        stream = io.StringIO()
+        written = CourseExporter(self.source, chunk_size=2).write(stream)
+        stream.seek(0)
+        result = self._import(self.target, iter_jsonl_records(stream))
+
+        self.assertEqual(result["items_processed"], written)
+        self.assertEqual(
+            result["counts"],
+            {"module": 2, "lesson": 3, "resource": 1, "assessment": 1, "question": 1, "answer": 2},
+        )
+        modules = list(Module.objects.filter(course=self.target).order_by("order"))
+        self.assertEqual([(m.title, m.duration_minutes) for m in modules], [("First Module", 30), ("Second Module", 5)])
+        self.target.refresh_from_db()
+        self.assertEqual(self.target.duration_minutes, 35)
+        lesson = Lesson.objects.get(module__course=self.target, title="Quiz Lesson")
+        self.assertTrue(lesson.has_assessment)
+        self.assertEqual(
+            list(Answer.objects.filter(question__assessment__lesson=lesson).values_list("answer_text", "is_correct")),
+            [("Right", True), ("Wrong", False)],
+        )
+
+    def test_import_into_a_course_appends_after_existing_modules(self):
+        self._import(self.target, iter_nested_records(DOCUMENT))
+        self._import(self.target, iter_nested_records(DOCUMENT))
+        orders = list(Module.objects.filter(course=self.target).order_by("order").values_list("order", flat=True))
+        self.assertEqual(orders, [1, 2, 3, 4])
+
+    def test_invalid_refs_are_reported_per_row(self):
+        module = {"kind": "module", "ref": 1, "title": "Only Module"}
+        cases = [
+            ([module, {**module, "_line": 3}], "module ref '1' is duplicated"),
+            ([{**module, "ref": [1]}], "module.ref must be an integer or string"),
+            ([{**module, "ref": None}], "module.ref must be an integer or string"),
+            ([module, {"kind": "lesson", "ref": 2, "parent": 9, **_lesson("Orphan", 1)}],
+             "lesson references unknown module '9'"),
+            ([module, {"kind": "lesson", "ref": 2, "parent": [1], **_lesson("Orphan", 1)}],
+             "lesson references unknown module '[1]'"),
+            ([{"kind": "chapter", "ref": 1}], "unknown record type 'chapter'"),
+        ]
+        for records, message in cases:
+            with self.subTest(message=message), self.assertRaisesMessage(CoursePackageError, message):
+                self._import(self.target, _package(*records))
+        self.assertFalse(Module.objects.filter(course=self.target).exists())
+
+    def test_footer_count_must_match(self):
+        records = _package({"kind": "module", "ref": 1, "title": "Only Module"}, {"kind": "footer", "records": 2})
+        with self.assertRaisesMessage(CoursePackageError, "footer declares 2 records, found 1"):
+            self._import(self.target, records)
+
+    def test_large_import_uses_a_fixed_number_of_queries(self):
+        modules = 20
+        document = {"modules": [
+            {"title": f"Module {m}", "lessons": [_lesson(f"Lesson {m}-{n}", 1) for n in range(100)]}
+            for m in range(modules)
+        ]}
+        # Savepoint, module order offset, 41 INSERTs, module and course
+        # duration totals with their two UPDATEs. SQLite caps an INSERT at
+        # 999 parameters (58 lesson rows), so other backends need fewer.
+        with self.assertNumQueries(48):
+            result = self._import(self.target, iter_nested_records(document), batch_size=500)
+        self.assertEqual(result["counts"]["lesson"], 2000)
+        self.target.refresh_from_db()
+        self.assertEqual(self.target.duration_minutes, 2000)
@@ -0,0 +1,228 @@
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from courses.models import Category, Course
+from instructor_portal import notification_outbox
+from instructor_portal.models import CourseInstructor, InstructorNotification, InstructorProfile
+from instructor_portal.views.course_views import InstructorCourseViewSet
+
+Status = InstructorNotification.EmailStatus
+NotificationType = InstructorNotification.NotificationType
+
+
+def _instructor(username):
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        user = get_user_model().objects.create_user(
+            username=username, email=f"{username}@example.com", password="pass12345"
+        )
+    # bulk_create skips the profile post_save setup, which is not under test here
+    return InstructorProfile.objects.bulk_create([
+        InstructorProfile(user=user, display_name=username.title(), status=InstructorProfile.Status.ACTIVE)
+    ])[0]
+
+
+# Notification outbox tests
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    NOTIFICATION_OUTBOX_MAX_ATTEMPTS=3,
+    NOTIFICATION_OUTBOX_RETRY_BACKOFF=60,
+    NOTIFICATION_OUTBOX_MAX_BACKOFF=3600,
+    NOTIFICATION_OUTBOX_DIGEST_THRESHOLD=3,
+)
+class NotificationOutboxTests(TestCase):
+    def setUp(self):
+        self.alice = _instructor("alice")
+        self.bob = _instructor("bob")
+        self.carol = _instructor("carol")
+
+    def _notify(self, instructors, title="Heads up", **kwargs):
+        return InstructorNotification.bulk_create_notifications(
+            instructors, NotificationType.SYSTEM_ANNOUNCEMENT, title, f"{title} message", **kwargs
+        )
+
+    def test_bulk_creation_queues_every_email_with_one_insert(self):
+        with CaptureQueriesContext(connection) as queries:
+            notifications = self._notify([self.alice, self.bob, self.carol])
+
+        inserts = [q for q in queries.captured_queries if q["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(len(notifications), 3)
+        self.assertEqual(
+            set(InstructorNotification.objects.values_list("email_status", flat=True)), {Status.PENDING}
+        )
+
+        self._notify([self.alice], send_email=False)
+        self.assertEqual(InstructorNotification.objects.filter(email_status=Status.NOT_REQUESTED).count(), 1)
+
+    def test_drain_sends_the_batch_over_one_connection(self):
+        self._notify([self.alice, self.bob, self.carol])
+
+        with mock.patch.object(
+            notification_outbox, "get_connection", wraps=notification_outbox.get_connection
+        ) as get_connection:
+            result = notification_outbox.drain_outbox()
+
+        get_connection.assert_called_once()
+        self.assertEqual((result["sent"], result["failed"], result["remaining"]), (3, 0, False))
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), [
+            "alice@example.com", "bob@example.com", "carol@example.com",
+        ])
+        for notification in InstructorNotification.objects.all():
+            self.assertEqual(notification.email_status, Status.SENT)
+            self.assertTrue(notification.email_sent)
+            self.assertIsNone(notification.email_next_attempt_at)
+
+        self.assertEqual(notification_outbox.drain_outbox()["sent"], 0)
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_drain_leases_claimed_rows_and_respects_batch_size(self):
+        self._notify([self.alice, self.bob, self.carol])
+
+        with mock.patch.object(notification_outbox, "deliver_notifications", return_value={}) as deliver:
+            result = notification_outbox.drain_outbox(batch_size=2)
+
+        self.assertEqual(len(deliver.call_args.args[0]), 2)
+        self.assertTrue(result["remaining"])
+        leased = InstructorNotification.objects.filter(email_next_attempt_at__gt=timezone.now())
+        self.assertEqual(leased.count(), 2)
+
+        # Leased rows are skipped by the next drain; the third one is still due
+        result = notification_outbox.drain_outbox(batch_size=2)
+        self.assertEqual(result["sent"], 1)
+        self.assertEqual(mail.outbox[0].to, ["carol@example.com"])
+
+    def test_pending_notifications_above_threshold_become_one_digest(self):
+        for title in ("First", "Second", "Third"):
+            self._notify([self.alice], title=title)
+        self._notify([self.bob], title="Only")
+
+        result = notification_outbox.drain_outbox()
+
+        self.assertEqual((result["sent"], result["digests"]), (4, 1))
+        self.assertEqual(len(mail.outbox), 2)
+        digest = next(m for m in mail.outbox if m.to == ["alice@example.com"])
+        self.assertEqual(digest.subject, "[Instructor Portal] 3 new notifications")
+        self.assertIn("Second message", digest.body)
+
+    def test_instructors_without_email_notifications_are_skipped(self):
+        InstructorProfile.objects.filter(pk=self.bob.pk).update(email_notifications=False)
+        self._notify([self.alice, self.bob])
+
+        result = notification_outbox.drain_outbox()
+
+        self.assertEqual((result["sent"], result["skipped"]), (1, 1))
+        self.assertEqual(
+            InstructorNotification.objects.get(instructor=self.bob).email_status, Status.SKIPPED
+        )
+
+    def test_failed_sends_back_off_until_max_attempts(self):
+        self._notify([self.alice])
+        backend = "django.core.mail.backends.locmem.EmailBackend.send_messages"
+
+        for attempt in (1, 2):
+            before = timezone.now()
+            with mock.patch(backend, side_effect=ConnectionError("refused")), \
+                    mock.patch.object(notification_outbox.random, "uniform", return_value=1.0):
+                result = notification_outbox.drain_outbox()
+            self.assertEqual(result["failed"], 1)
+
+            notification = InstructorNotification.objects.get()
+            self.assertEqual(notification.email_status, Status.PENDING)
+            self.assertEqual(notification.email_attempts, attempt)
+            self.assertEqual(notification.email_last_error, "refused")
+            delay = notification.email_next_attempt_at - before
+            self.assertGreaterEqual(delay, timedelta(seconds=60 * 2 ** (attempt - 1)))
+            self.assertLess(delay, timedelta(seconds=60 * 2 ** (attempt - 1) + 5))
+
+            # Not due again until the backoff has passed
+            self.assertEqual(notification_outbox.drain_outbox()["sent"], 0)
+            InstructorNotification.objects.update(email_next_attempt_at=timezone.now())
+
+        with mock.patch(backend, side_effect=ConnectionError("refused")):
+            notification_outbox.drain_outbox()
+
+        notification = InstructorNotification.objects.get()
+        self.assertEqual(notification.email_status, Status.FAILED)
+        self.assertEqual(notification.email_attempts, 3)
+        self.assertIsNone(notification.email_next_attempt_at)
+        self.assertEqual(notification_outbox.drain_outbox()["failed"], 0)
+        self.assertEqual(mail.outbox, [])
+
+    def test_backoff_is_capped(self):
+        with mock.patch.object(notification_outbox.random, "uniform", return_value=1.0):
+            self.assertEqual(notification_outbox._retry_delay(1), timedelta(seconds=60))
+            self.assertEqual(notification_outbox._retry_delay(4), timedelta(seconds=480))
+            self.assertEqual(notification_outbox._retry_delay(20), timedelta(seconds=3600))
+
+    def test_immediate_send_claims_the_row(self):
+        notification = self._notify([self.alice])[0]
+
+        self.assertTrue(notification.send_email_notification())
+        self.assertEqual(notification.email_status, Status.SENT)
+        self.assertEqual(len(mail.outbox), 1)
+
+        # Already sent, so neither another immediate send nor a drain repeats it
+        notification.email_sent = False
+        self.assertFalse(notification.send_email_notification())
+        self.assertEqual(notification_outbox.drain_outbox()["sent"], 0)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_immediate_send_skips_rows_held_by_a_drain(self):
+        notification = self._notify([self.alice])[0]
+        InstructorNotification.objects.filter(pk=notification.pk).update(
+            email_next_attempt_at=timezone.now() + timedelta(minutes=5)
+        )
+
+        self.assertFalse(notification.send_email_notification())
+        self.assertEqual(mail.outbox, [])
+
+    def test_immediate_send_of_an_unqueued_notification(self):
+        notification = self._notify([self.alice], send_email=False)[0]
+
+        self.assertTrue(notification.send_email_notification())
+        self.assertEqual(InstructorNotification.objects.get().email_status, Status.SENT)
+        self.assertEqual(len(mail.outbox), 1)
+
+
+# Course update notification tests
+class CourseUpdateNotificationTests(TestCase):
+    def setUp(self):
+        self.owner = _instructor("owner")
+        self.editor = _instructor("editor")
+        self.former = _instructor("former")
+        category = Category.objects.create(name="Outbox Category")
+        self.course = Course.objects.create(
+            title="Shared Course", category=category, description="Shared course"
+        )
+        CourseInstructor.objects.bulk_create([
+            CourseInstructor(course=self.course, instructor=self.owner.user, is_lead=True),
+            CourseInstructor(course=self.course, instructor=self.editor.user),
+            CourseInstructor(course=self.course, instructor=self.former.user, is_active=False),
+        ])
+
+    def test_update_notifies_other_active_instructors(self):
+        view = InstructorCourseViewSet()
+        view.request = SimpleNamespace(user=self.editor.user)
+        serializer = mock.Mock(validated_data={"title": "Renamed", "description": "New"})
+        serializer.save.return_value = self.course
+
+        with mock.patch("instructor_portal.views.course_views.audit_log") as audit_log:
+            view.perform_update(serializer)
+
+        notification = InstructorNotification.objects.get()
+        self.assertEqual(notification.instructor, self.owner)
+        self.assertEqual(notification.notification_type, NotificationType.COURSE_UPDATED)
+        self.assertEqual(notification.email_status, Status.PENDING)
+        self.assertEqual(notification.message, '"Shared Course" was updated by editor.')
+        self.assertEqual(notification.metadata, {
+            "course_id": self.course.id, "updated_by": self.editor.user.id, "fields": ["description", "title"],
+        })
+        audit_log.assert_called_once()
@@ -36,9 +36,10 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 from rest_framework.exceptions import ValidationError, PermissionDenied
 
+from educore.ratelimit import AnonSlidingWindowThrottle, UserSlidingWindowThrottle
+
 from ..models import InstructorProfile, TierManager
 from ..serializers import InstructorProfileSerializer  # InstructorRegistrationSerializer not found in refactored codebase
 from .mixins import (
@@ -50,13 +51,11 @@ User = get_user_model()
 logger = logging.getLogger(__name__)
 
 # Custom throttle classes for authentication endpoints
-class AuthRateThrottle(AnonRateThrottle):
+class AuthRateThrottle(AnonSlidingWindowThrottle):
     scope = 'auth'
-    rate = '10/hour'
 
-class VerificationRateThrottle(AnonRateThrottle):
+class VerificationRateThrottle(AnonSlidingWindowThrottle):
     scope = 'verification'
-    rate = '5/hour'
 
 
 class InstructorRegistrationView(APIView):
@@ -501,7 +500,7 @@ class InstructorApprovalView(APIView):
     COMPLETELY REVISED: Full approval workflow for admin use
     """
     permission_classes = [IsAuthenticated]
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [UserSlidingWindowThrottle]
 
     def post(self, request):
         """Approve or reject instructor application"""
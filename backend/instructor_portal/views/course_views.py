@@ -21,7 +21,6 @@ from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework import viewsets, status, permissions, serializers, mixins
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import ValidationError, PermissionDenied as DRFPermissionDenied
 from django.db import transaction, IntegrityError
@@ -29,16 +28,18 @@ from django.db.models import Q, Count, Prefetch, Avg
 from django.shortcuts import get_object_or_404
 from django.core.exceptions import PermissionDenied
 from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
 
 # Import from courses app
 from courses.models import Course, Module, Lesson, Resource
 from courses.permissions import IsInstructorOrAdmin
 from courses.utils import clear_course_caches, validate_file_security
 from courses.validation import validate_course_data, validate_lesson_data, sanitize_input
+from educore.ratelimit import UserSlidingWindowThrottle
 
 # Import from instructor portal
 from ..models import (
-    InstructorProfile, CourseInstructor, TierManager
+    InstructorProfile, CourseInstructor, InstructorNotification, TierManager
 )
 from ..serializers import (
     InstructorCourseSerializer, InstructorModuleSerializer,
@@ -61,7 +62,7 @@ class InstructorCourseViewSet(InstructorBaseViewSet):
     parser_classes = (MultiPartParser, FormParser, JSONParser)
     serializer_class = InstructorCourseSerializer
     permission_classes = [IsAuthenticated, IsInstructorOrAdmin]
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [UserSlidingWindowThrottle]
     lookup_field = 'slug'
     resource_name = 'course'
 
@@ -80,8 +81,8 @@ class InstructorCourseViewSet(InstructorBaseViewSet):
         else:
             # FIXED: Use CourseInstructor model for filtering
             courses = Course.objects.filter(
-                courseinstructor_set__instructor=user,
-                courseinstructor_set__is_active=True
+                courseinstructor__instructor=user,
+                courseinstructor__is_active=True
             ).select_related('category', 'parent_version')
 
         # Enhanced prefetching with CourseInstructor
@@ -175,6 +176,31 @@ class InstructorCourseViewSet(InstructorBaseViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    def perform_update(self, serializer):
+        """Save course changes and notify the other instructors of the course"""
+        user = self.request.user
+        with transaction.atomic():
+            course = serializer.save()
+            clear_course_caches(course.id)
+
+            # One bulk insert for every collaborator; their emails go through the outbox
+            InstructorNotification.notify_course_instructors(
+                course,
+                InstructorNotification.NotificationType.COURSE_UPDATED,
+                _('Course Updated'),
+                _('"{course_title}" was updated by {name}.').format(
+                    course_title=course.title, name=user.get_full_name() or user.username
+                ),
+                exclude_user=user,
+                action_url=f'/instructor/courses/{course.id}/',
+                action_text=_('View Course'),
+                metadata={'updated_by': user.id, 'fields': sorted(serializer.validated_data)},
+            )
+
+        audit_log(user, 'course_updated', 'course', course.id, {
+            'fields': sorted(serializer.validated_data)
+        }, request=self.request)
+
     @require_instructor_profile
     @require_permission('manage')
     @tier_required('silver')
@@ -286,7 +312,7 @@ class InstructorModuleViewSet(InstructorBaseViewSet):
     """
     serializer_class = InstructorModuleSerializer
     permission_classes = [IsAuthenticated, IsInstructorOrAdmin]
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [UserSlidingWindowThrottle]
     resource_name = 'module'
 
     def get_queryset(self):
@@ -463,7 +489,7 @@ class InstructorLessonViewSet(InstructorBaseViewSet):
     """
     serializer_class = InstructorLessonSerializer
     permission_classes = [IsAuthenticated, IsInstructorOrAdmin]
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [UserSlidingWindowThrottle]
     resource_name = 'lesson'
 
     def get_queryset(self):
@@ -622,7 +648,7 @@ class InstructorResourceViewSet(InstructorBaseViewSet):
     parser_classes = (MultiPartParser, FormParser, JSONParser)
     serializer_class = InstructorResourceSerializer
     permission_classes = [IsAuthenticated, IsInstructorOrAdmin]
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [UserSlidingWindowThrottle]
     resource_name = 'resource'
 
     def get_queryset(self):
@@ -664,7 +690,7 @@ class InstructorResourceViewSet(InstructorBaseViewSet):
 
     @require_instructor_profile
     @action(detail=False, methods=['post'], url_path='presigned-url',
-            throttle_classes=[UserRateThrottle])
+            throttle_classes=[UserSlidingWindowThrottle])
     def presigned_url(self, request):
         """
         Enhanced presigned URL generation with security validation and tier checking
@@ -797,7 +823,7 @@ class InstructorResourceViewSet(InstructorBaseViewSet):
             )
 
     @require_instructor_profile
-    @action(detail=False, methods=['post'], throttle_classes=[UserRateThrottle])
+    @action(detail=False, methods=['post'], throttle_classes=[UserSlidingWindowThrottle])
     def upload_complete(self, request):
         """Handle upload completion and create resource record"""
         instructor_profile = request.instructor_profile
@@ -32,10 +32,11 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.throttling import UserRateThrottle
 from rest_framework.exceptions import ValidationError
 
 from courses.models import Course, Enrollment, Review
+from educore.db_routing import use_replica
+from educore.ratelimit import UserSlidingWindowThrottle
 from ..models import CourseInstructor
 from ..models import (
     InstructorProfile, InstructorDashboard, InstructorAnalytics, TierManager
@@ -56,9 +57,10 @@ class InstructorDashboardViewSet(viewsets.ViewSet):
     COMPLETELY REVISED: Advanced dashboard with real-time analytics and caching
     """
     permission_classes = [IsAuthenticated]
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [UserSlidingWindowThrottle]
 
     @require_instructor_profile
+    @use_replica
     def list(self, request):
         """Get comprehensive dashboard data with advanced caching"""
         instructor_profile = request.instructor_profile
@@ -198,6 +200,7 @@ class InstructorDashboardViewSet(viewsets.ViewSet):
 
     @require_instructor_profile
     @action(detail=False, methods=['get'])
+    @use_replica
     def analytics_summary(self, request):
         """Get enhanced analytics summary for dashboard with trend analysis"""
         instructor_profile = request.instructor_profile
@@ -618,7 +621,7 @@ class InstructorAnalyticsViewSet(viewsets.ViewSet):
     Enhanced API endpoint for instructor analytics with advanced features
     """
     permission_classes = [IsAuthenticated]
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [UserSlidingWindowThrottle]
 
     @require_instructor_profile
     def list(self, request):
@@ -778,7 +781,7 @@ class InstructorAnalyticsViewSet(viewsets.ViewSet):
 class StudentManagementView(viewsets.ViewSet):
     """Enhanced student management with detailed analytics"""
     permission_classes = [IsAuthenticated]
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [UserSlidingWindowThrottle]
 
     @require_instructor_profile
     def list(self, request):
@@ -814,7 +817,7 @@ class StudentManagementView(viewsets.ViewSet):
 class RevenueAnalyticsView(viewsets.ViewSet):
     """Enhanced revenue analytics with detailed financial insights"""
     permission_classes = [IsAuthenticated]
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [UserSlidingWindowThrottle]
 
     @require_instructor_profile
     def list(self, request):
@@ -15,7 +15,6 @@
 # Contains all base functionality extracted from original monolithic views.py
 
 import functools
-import json
 import logging
 import re
 import uuid
@@ -64,7 +63,6 @@ from django.db.models import (
 )
 from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, render
-from django.utils import timezone
 from django.utils.text import slugify
 from rest_framework import mixins, permissions, serializers, status, viewsets
 from rest_framework.decorators import action
@@ -73,7 +71,8 @@ from rest_framework.exceptions import ValidationError
 from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+from educore import audit
 
 # Import instructor portal models with correct TierManager
 from ..models import (
@@ -295,51 +294,35 @@ def scrub_sensitive_data(data: Dict[str, Any]) -> Dict[str, Any]:
 
 def audit_log(
     user,
-    action: str,
+    action_name: str,
     resource_type: str,
     resource_id: Optional[int] = None,
     metadata: Optional[Dict] = None,
     success: bool = True,
     request=None,
 ):
-    """Comprehensive audit logging for security monitoring with enhanced metadata"""
+    """
+    Comprehensive audit logging for security monitoring with enhanced metadata.
+    Events go to the buffered audit pipeline (educore/audit.py).
+    """
     try:
-        # Get user IP if request is available
-        ip_address = None
-        if request and hasattr(request, "META"):
-            ip_address = request.META.get("REMOTE_ADDR", None)
-            # Check for X-Forwarded-For header
-            forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
-            if forwarded_for:
-                ip_address = forwarded_for.split(",")[0].strip()
-
-        # Get user agent if request is available
-        user_agent = None
-        if request and hasattr(request, "META"):
-            user_agent = request.META.get("HTTP_USER_AGENT")
-
-        # Build log entry
-        log_entry = {
-            "timestamp": timezone.now().isoformat(),
-            "user_id": user.id if user and user.is_authenticated else None,
-            "username": (
-                user.username if user and user.is_authenticated else "anonymous"
-            ),
-            "action": action,
-            "resource_type": resource_type,
-            "resource_id": resource_id,
-            "metadata": scrub_sensitive_data(metadata or {}),
-            "success": success,
-            "ip_address": ip_address,
-            "user_agent": user_agent,
-        }
+        metadata = scrub_sensitive_data(metadata or {})
 
         # Add instructor profile info if available
         if user and user.is_authenticated and hasattr(user, "instructor_profile"):
-            log_entry["instructor_tier"] = user.instructor_profile.tier
-            log_entry["instructor_status"] = user.instructor_profile.status
-
-        logger.info(f"AUDIT: {json.dumps(log_entry)}")
+            metadata["instructor_tier"] = user.instructor_profile.tier
+            metadata["instructor_status"] = user.instructor_profile.status
+
+        audit.record(
+            action_name,
+            source="api",
+            actor=user,
+            object_type=resource_type,
+            object_id=resource_id,
+            success=success,
+            request=request,
+            metadata=metadata,
+        )
 
     except Exception as e:
         logger.error(f"Failed to create audit log: {e}", exc_info=True)
@@ -31,9 +31,9 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import ValidationError, PermissionDenied
-from rest_framework.throttling import UserRateThrottle
 
 from courses.models import Course, Enrollment
+from educore.ratelimit import UserSlidingWindowThrottle
 from ..models import CourseInstructor
 from ..models import InstructorProfile, InstructorAnalytics, InstructorDashboard, TierManager
 from ..serializers import InstructorProfileSerializer, InstructorSettingsSerializer
@@ -54,7 +54,7 @@ class InstructorProfileViewSet(InstructorBaseViewSet):
     """
     serializer_class = InstructorProfileSerializer
     permission_classes = [IsAuthenticated]
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [UserSlidingWindowThrottle]
     resource_name = 'instructor_profile'
 
     def get_queryset(self):
@@ -666,7 +666,7 @@ class InstructorSettingsViewSet(viewsets.ViewSet):
     COMPLETELY REVISED: Full settings management system
     """
     permission_classes = [IsAuthenticated]
-    throttle_classes = [UserRateThrottle]
+    throttle_classes = [UserSlidingWindowThrottle]
 
     @require_instructor_profile
     def retrieve(self, request, pk=None):
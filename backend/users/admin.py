@@ -26,7 +26,9 @@ from django.utils import timezone
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 
+from . import login_telemetry
 from .models import (
+    AuditEvent,
     EmailVerification,
     LoginLog,
     PasswordReset,
@@ -209,6 +211,8 @@ class CustomUserAdmin(UserAdmin):
 
     def reset_failed_attempts(self, request: HttpRequest, queryset: QuerySet) -> None:
         """Reset failed login attempts for selected users."""
+        for email in queryset.values_list("email", flat=True):
+            login_telemetry.reset_account(email)
         updated = queryset.update(failed_login_attempts=0, ban_expires_at=None)
         self.message_user(
             request, f"Reset failed login attempts for {updated} user(s)."
@@ -373,6 +377,27 @@ class LoginLogAdmin(admin.ModelAdmin):
         return False
 
 
+class AuditEventAdmin(admin.ModelAdmin):
+    """Read-only browser for the audit trail."""
+
+    list_display = (
+        "timestamp", "source", "action", "actor_username", "object_type", "object_id", "success"
+    )
+    list_filter = ("source", "success", "object_type", "timestamp")
+    search_fields = ("action", "actor_username", "object_id", "ip_address")
+    date_hierarchy = "timestamp"
+    list_per_page = 100
+    show_full_result_count = False  # the table is large; skip the COUNT(*)
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(
+        self, request: HttpRequest, obj: Optional[AuditEvent] = None
+    ) -> bool:
+        return False
+
+
 class UserSessionAdmin(admin.ModelAdmin):
     """Enhanced admin for UserSession model."""
 
@@ -481,6 +506,7 @@ admin.site.register(User, CustomUserAdmin)
 admin.site.register(EmailVerification, EmailVerificationAdmin)
 admin.site.register(PasswordReset, PasswordResetAdmin)
 admin.site.register(LoginLog, LoginLogAdmin)
+admin.site.register(AuditEvent, AuditEventAdmin)
 admin.site.register(UserSession, UserSessionAdmin)
 admin.site.register(Subscription, SubscriptionAdmin)
 
@@ -0,0 +1,584 @@
+"""
+File: backend/users/login_telemetry.py
+Purpose: Login attempt counters, brute-force lockouts and buffered LoginLog writes
+Date Created: 2026-10-18 00:00:00 UTC
+Version: 1.0.0
+
+A login attempt touches no database row. Failures are counted in atomic
+counters, per account (the normalized email) and per client IP, and the
+lockout decision is made from those counters in the same atomic step:
+
+- ``threshold`` failures within ``window`` seconds lock the subject;
+- the first lockout lasts ``base`` seconds, each further one twice as long
+  as the previous, up to ``max``;
+- the lockout count is forgotten ``memory`` seconds after the last lockout,
+  and an account's count is reset by a successful login.
+
+Attempts made while a subject is locked are rejected before the password is
+checked and are logged but not counted, so a burst cannot push a lockout
+further out.
+Accounts are keyed by email, not user id, so unknown emails are locked the
+same way as real ones and a lockout reveals nothing about which exist.
+Client IPs come from educore.client_ip: REMOTE_ADDR, or the hop appended by
+the trusted proxies, validated - a forged X-Forwarded-For can neither dodge
+an IP lockout nor lock out someone else's address.
+
+Attempts are appended to a bounded buffer and written as LoginLog rows in
+batches by the ``flush_login_logs`` task (users/tasks.py); emails are
+resolved to users once per batch. The user row is only written when an
+account lockout starts, so the admin and JWT authentication still see
+``ban_expires_at``, or when a successful login has to clear it. An attack
+burst of N failed logins therefore costs about N / LOGIN_LOG_BATCH_SIZE
+inserts, and one update per lockout. Every attempt is counted in the
+users_logins_total metric when it is made, by result (success, failure or
+blocked).
+
+Attempts for emails without an account have no user for a LoginLog row and
+are written to the audit trail instead ("login_unknown_account"). If a batch
+insert fails, its rows are retried one by one: rows the database rejects
+are dropped and counted, and when the database is unreachable the rest of
+the batch is put back in the buffer for the next run.
+
+Backends:
+- "redis": counters and buffer shared by every process (default); Lua
+  scripts keep counting and locking atomic
+- "memory": per-process dictionaries, for tests and single-process setups
+If Redis fails, the call is logged and answered by a per-process memory
+backend, so logins keep working with per-process limits.
+
+Settings:
+- LOGIN_TELEMETRY_BACKEND: "redis" or "memory" (default: "redis")
+- LOGIN_TELEMETRY_REDIS_URL: Redis URL for the redis backend (default: CELERY_BROKER_URL)
+- LOGIN_TELEMETRY_NAMESPACE: key prefix in Redis (default: "educore")
+- LOGIN_LOCKOUT_POLICIES: {"account": {...}, "ip": {...}} with threshold,
+  window, base, max and memory in seconds
+- LOGIN_LOG_BUFFER_SIZE: buffered attempts kept before the oldest are dropped (default: 100000)
+- LOGIN_LOG_BATCH_SIZE: LoginLog rows written per insert (default: 1000)
+- LOGIN_LOG_FLUSH_INTERVAL: seconds between flush_login_logs runs (default: 30)
+"""
+
+import json
+import logging
+import math
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import DatabaseError, InterfaceError, OperationalError, transaction
+
+from educore import audit, metrics
+from educore.client_ip import get_client_ip
+
+from .models import (
+    EXTENDED_LOCKOUT_HOURS,
+    LOCKOUT_DURATION_MINUTES,
+    LOCKOUT_THRESHOLD,
+    MAX_LOGIN_ATTEMPTS,
+    LoginLog,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLICIES = {
+    "account": {
+        "threshold": LOCKOUT_THRESHOLD,
+        "window": 900,
+        "base": LOCKOUT_DURATION_MINUTES * 60,
+        "max": EXTENDED_LOCKOUT_HOURS * 3600,
+        "memory": 86400,
+    },
+    "ip": {"threshold": 20, "window": 900, "base": 300, "max": 86400, "memory": 86400},
+}
+
+
+def get_policy(scope):
+    policy = dict(DEFAULT_POLICIES[scope])
+    policy.update(getattr(settings, "LOGIN_LOCKOUT_POLICIES", {}).get(scope, {}))
+    return policy
+
+
+def lockout_duration(policy, strikes):
+    """Seconds the ``strikes``-th lockout lasts: base, 2 x base, 4 x base, ... up to max"""
+    return min(policy["base"] * 2 ** (strikes - 1), policy["max"])
+
+
+class LockoutStatus:
+    """Outcome of a lockout check or a recorded failure"""
+
+    __slots__ = ("scope", "locked_until", "failures", "started")
+
+    def __init__(self, scope=None, locked_until=0.0, failures=0, started=False):
+        self.scope = scope
+        self.locked_until = locked_until
+        self.failures = failures
+        self.started = started
+
+    @property
+    def locked(self):
+        return self.locked_until > time.time()
+
+    @property
+    def retry_after(self):
+        return max(0, math.ceil(self.locked_until - time.time()))
+
+    @property
+    def message(self):
+        if self.scope == "account":
+            minutes = max(1, math.ceil(self.retry_after / 60))
+            return f"Account temporarily locked. Try again in {minutes} minutes."
+        return "Too many login attempts. Please try again later."
+
+
+# ====================================
+# BACKENDS
+# ====================================
+
+class InMemoryLoginBackend:
+    """Per-process counters and buffer; limits are not shared between workers"""
+
+    SWEEP_EVERY = 1000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}  # key -> (value, expires at)
+        self._logs = deque()
+        self._calls = 0
+
+    def _get(self, key, now):
+        entry = self._values.get(key)
+        if entry is None or entry[1] <= now:
+            return None
+        return entry[0]
+
+    def locks(self, subjects, now=None):
+        now = now if now is not None else time.time()
+        with self._lock:
+            return {subject: self._get(("lock", subject), now) or 0.0 for subject in subjects}
+
+    def fail(self, subjects, now=None):
+        now = now if now is not None else time.time()
+        results = {}
+        with self._lock:
+            self._calls += 1
+            if self._calls % self.SWEEP_EVERY == 0:
+                self._sweep(now)
+
+            for subject, policy in subjects:
+                locked_until = self._get(("lock", subject), now)
+                if locked_until:
+                    results[subject] = (0, locked_until, 0)
+                    continue
+
+                failures = self._get(("fail", subject), now)
+                if failures is None:
+                    failures, expires = 1, now + policy["window"]
+                else:
+                    failures, expires = failures + 1, self._values[("fail", subject)][1]
+                if failures < policy["threshold"]:
+                    self._values[("fail", subject)] = (failures, expires)
+                    results[subject] = (failures, 0.0, 0)
+                    continue
+
+                strikes = (self._get(("strike", subject), now) or 0) + 1
+                duration = lockout_duration(policy, strikes)
+                locked_until = now + duration
+                self._values[("strike", subject)] = (strikes, locked_until + policy["memory"])
+                self._values[("lock", subject)] = (locked_until, locked_until)
+                self._values.pop(("fail", subject), None)
+                results[subject] = (failures, locked_until, strikes)
+        return results
+
+    def reset(self, subjects):
+        with self._lock:
+            for subject in subjects:
+                for kind in ("fail", "strike", "lock"):
+                    self._values.pop((kind, subject), None)
+
+    def push_log(self, entry, limit):
+        with self._lock:
+            self._logs.append(entry)
+            while len(self._logs) > limit:
+                self._logs.popleft()
+
+    def pop_logs(self, count):
+        with self._lock:
+            return [self._logs.popleft() for _ in range(min(count, len(self._logs)))]
+
+    def pending_logs(self):
+        return len(self._logs)
+
+    def _sweep(self, now):
+        for key in [key for key, (_, expires) in self._values.items() if expires <= now]:
+            self._values.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+            self._logs.clear()
+
+
+# KEYS: fail, strike and lock key of every subject
+# ARGV: now_ms, then threshold, window_ms, base_ms, max_ms and memory_ms of every subject
+# Returns: failures, locked_until_ms and strikes of every subject
+LOGIN_FAILURE_LUA = """
+local now = tonumber(ARGV[1])
+local result = {}
+
+for n = 1, #KEYS / 3 do
+    local fail_key, strike_key, lock_key = KEYS[3 * n - 2], KEYS[3 * n - 1], KEYS[3 * n]
+    local threshold = tonumber(ARGV[5 * n - 3])
+    local window = tonumber(ARGV[5 * n - 2])
+    local base = tonumber(ARGV[5 * n - 1])
+    local longest = tonumber(ARGV[5 * n])
+    local memory = tonumber(ARGV[5 * n + 1])
+
+    local locked_until = tonumber(redis.call('GET', lock_key) or '0')
+    if locked_until > now then
+        table.insert(result, 0)
+        table.insert(result, locked_until)
+        table.insert(result, 0)
+    else
+        local failures = redis.call('INCR', fail_key)
+        if failures == 1 then
+            redis.call('PEXPIRE', fail_key, window)
+        end
+        if failures < threshold then
+            table.insert(result, failures)
+            table.insert(result, 0)
+            table.insert(result, 0)
+        else
+            local strikes = redis.call('INCR', strike_key)
+            local duration = math.min(base * 2 ^ (strikes - 1), longest)
+            locked_until = now + duration
+            redis.call('PEXPIRE', strike_key, duration + memory)
+            redis.call('SET', lock_key, locked_until, 'PX', duration)
+            redis.call('DEL', fail_key)
+            table.insert(result, failures)
+            table.insert(result, locked_until)
+            table.insert(result, strikes)
+        end
+    end
+end
+return result
+"""
+
+
+class RedisLoginBackend:
+    """Counters and buffer shared by all processes"""
+
+    def __init__(self, url=None, namespace=None):
+        import redis
+
+        self.url = url or getattr(settings, "LOGIN_TELEMETRY_REDIS_URL", settings.CELERY_BROKER_URL)
+        self.prefix = f"{namespace or getattr(settings, 'LOGIN_TELEMETRY_NAMESPACE', 'educore')}:login"
+        self.client = redis.Redis.from_url(self.url)
+        self.script = self.client.register_script(LOGIN_FAILURE_LUA)
+        self.log_key = f"{self.prefix}:log"
+
+    def _key(self, kind, subject):
+        return f"{self.prefix}:{kind}:{subject}"
+
+    def locks(self, subjects, now=None):
+        values = self.client.mget([self._key("lock", subject) for subject in subjects])
+        return {
+            subject: int(value) / 1000 if value else 0.0
+            for subject, value in zip(subjects, values)
+        }
+
+    def fail(self, subjects, now=None):
+        now_ms = int((now if now is not None else time.time()) * 1000)
+        keys, args = [], [now_ms]
+        for subject, policy in subjects:
+            keys.extend(self._key(kind, subject) for kind in ("fail", "strike", "lock"))
+            args.extend(
+                [policy["threshold"]]
+                + [int(policy[name] * 1000) for name in ("window", "base", "max", "memory")]
+            )
+        reply = self.script(keys=keys, args=args)
+        return {
+            subject: (int(reply[3 * n]), int(reply[3 * n + 1]) / 1000, int(reply[3 * n + 2]))
+            for n, (subject, _) in enumerate(subjects)
+        }
+
+    def reset(self, subjects):
+        self.client.delete(
+            *[self._key(kind, subject) for subject in subjects for kind in ("fail", "strike", "lock")]
+        )
+
+    def push_log(self, entry, limit):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.rpush(self.log_key, json.dumps(entry))
+        pipe.ltrim(self.log_key, -limit, -1)
+        pipe.execute()
+
+    def pop_logs(self, count):
+        pipe = self.client.pipeline(transaction=True)
+        pipe.lrange(self.log_key, 0, count - 1)
+        pipe.ltrim(self.log_key, count, -1)
+        entries, _ = pipe.execute()
+        return [json.loads(entry) for entry in entries]
+
+    def pending_logs(self):
+        return self.client.llen(self.log_key)
+
+    def clear(self):
+        for key in self.client.scan_iter(f"{self.prefix}:*"):
+            self.client.delete(key)
+
+
+BACKEND_CLASSES = {
+    "memory": InMemoryLoginBackend,
+    "redis": RedisLoginBackend,
+}
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(name=None):
+    """Return the backend selected by LOGIN_TELEMETRY_BACKEND"""
+    name = name or getattr(settings, "LOGIN_TELEMETRY_BACKEND", "redis")
+    with _backends_lock:
+        if name not in _backends:
+            _backends[name] = BACKEND_CLASSES[name]()
+        return _backends[name]
+
+
+def _call(method, *args):
+    """Call the configured backend, falling back to the per-process one"""
+    try:
+        return getattr(get_backend(), method)(*args)
+    except Exception as exc:
+        logger.warning(f"Login telemetry backend failed, using process-local counters: {exc}")
+        return getattr(get_backend("memory"), method)(*args)
+
+
+# ====================================
+# RECORDING
+# ====================================
+
+def normalize_email(email):
+    return (email or "").strip().lower()
+
+
+def client_ip(request):
+    return get_client_ip(request) if request is not None else None
+
+
+def _subjects(email, ip):
+    subjects = []
+    if email:
+        subjects.append(("account", f"account:{normalize_email(email)}"))
+    if ip:
+        subjects.append(("ip", f"ip:{ip}"))
+    return subjects
+
+
+def _buffer(email, request, successful, user=None, result=None):
+    metrics.LOGINS.inc(result=result or ("success" if successful else "failure"))
+    entry = {
+        "email": normalize_email(email),
+        "user_id": user.pk if user is not None else None,
+        "ip": client_ip(request) or "0.0.0.0",
+        "user_agent": (request.META.get("HTTP_USER_AGENT", "Unknown") if request else "Unknown")[:500],
+        "successful": successful,
+        "timestamp": time.time(),
+    }
+    _call("push_log", entry, getattr(settings, "LOGIN_LOG_BUFFER_SIZE", 100000))
+
+
+def check_lockout(email, request=None):
+    """The longest active lockout of the account or the client IP, if any"""
+    subjects = _subjects(email, client_ip(request))
+    locks = _call("locks", [subject for _, subject in subjects])
+    status = LockoutStatus()
+    for scope, subject in subjects:
+        if locks[subject] > status.locked_until:
+            status = LockoutStatus(scope, locks[subject])
+    return status
+
+
+def record_blocked(email, request=None):
+    """Buffer an attempt rejected by a lockout; it is not counted again"""
+    _buffer(email, request, False, result="blocked")
+
+
+def record_failure(email, request=None, user=None):
+    """
+    Count a failed login for the account and the client IP, lock whichever
+    reached its threshold and buffer the attempt for LoginLog
+    """
+    _buffer(email, request, False, user)
+
+    subjects = _subjects(email, client_ip(request))
+    outcomes = _call("fail", [(subject, get_policy(scope)) for scope, subject in subjects])
+
+    status = LockoutStatus()
+    for scope, subject in subjects:
+        failures, locked_until, strikes = outcomes[subject]
+        if scope == "account":
+            status.failures = failures
+        if locked_until > status.locked_until:
+            status.scope, status.locked_until, status.started = scope, locked_until, bool(strikes)
+        if strikes and scope == "account":
+            _start_account_lockout(email, failures, locked_until, user)
+    return status
+
+
+def _start_account_lockout(email, failures, locked_until, user=None):
+    """Mirror a new account lockout on the user row, one update per lockout"""
+    from django.contrib.auth import get_user_model
+
+    ban_expires_at = datetime.fromtimestamp(locked_until, tz=timezone.utc)
+    failures = min(failures, MAX_LOGIN_ATTEMPTS)
+    users = get_user_model().objects.filter(email__iexact=normalize_email(email))
+    if users.update(failed_login_attempts=failures, ban_expires_at=ban_expires_at):
+        metrics.on_commit(metrics.ACCOUNT_LOCKOUTS.inc)
+    if user is not None:
+        user.failed_login_attempts, user.ban_expires_at = failures, ban_expires_at
+
+
+def record_success(user, request=None):
+    """Clear the account's counters and buffer the attempt for LoginLog"""
+    _buffer(user.email, request, True, user)
+    reset_account(user.email)
+
+    if user.failed_login_attempts or user.ban_expires_at:
+        type(user).objects.filter(pk=user.pk).update(failed_login_attempts=0, ban_expires_at=None)
+        user.failed_login_attempts, user.ban_expires_at = 0, None
+
+
+def reset_account(email):
+    """Forget an account's failures and lockouts, e.g. when an admin unlocks it"""
+    _call("reset", [subject for _, subject in _subjects(email, None)])
+
+
+# ====================================
+# FLUSHING
+# ====================================
+
+def flush_logs(batch_size=None, max_batches=None):
+    """
+    Write buffered attempts as LoginLog rows, one bulk insert per batch.
+    Attempts for emails without an account go to the audit trail.
+
+    Returns ``(written, unknown, dropped)``: rows inserted, attempts audited
+    for unknown accounts and rows the database rejected.
+    """
+    batch_size = batch_size or getattr(settings, "LOGIN_LOG_BATCH_SIZE", 1000)
+    written = unknown = dropped = batches = 0
+
+    while max_batches is None or batches < max_batches:
+        entries = _call("pop_logs", batch_size)
+        if not entries:
+            break
+        batches += 1
+
+        try:
+            rows, unknown_entries = _build_rows(entries)
+        except (OperationalError, InterfaceError) as exc:
+            logger.error(f"Login log flush failed, re-queueing {len(entries)} attempts: {exc}")
+            _requeue(entries)
+            break
+
+        for entry in unknown_entries:
+            _audit_unknown(entry)
+        unknown += len(unknown_entries)
+
+        inserted, rejected, pending = _insert_rows(rows, batch_size)
+        written += inserted
+        dropped += rejected
+        if pending:
+            _requeue(pending)
+            break
+
+        if len(entries) < batch_size:
+            break
+
+    return written, unknown, dropped
+
+
+def _build_rows(entries):
+    """LoginLog rows paired with their entries, and the entries without an account"""
+    from django.contrib.auth import get_user_model
+    from django.db.models.functions import Lower
+
+    emails = {entry["email"] for entry in entries if entry["user_id"] is None}
+    user_ids = dict(
+        get_user_model().objects.annotate(email_lower=Lower("email"))
+        .filter(email_lower__in=emails)
+        .values_list("email_lower", "pk")
+    ) if emails else {}
+
+    rows, unknown_entries = [], []
+    for entry in entries:
+        user_id = entry["user_id"] or user_ids.get(entry["email"])
+        if user_id is None:
+            unknown_entries.append(entry)
+            continue
+        rows.append((entry, LoginLog(
+            user_id=user_id,
+            ip_address=entry["ip"],
+            user_agent=entry["user_agent"],
+            successful=entry["successful"],
+            timestamp=datetime.fromtimestamp(entry["timestamp"], tz=timezone.utc),
+        )))
+    return rows, unknown_entries
+
+
+def _insert_rows(rows, batch_size):
+    """
+    Bulk insert ``rows``, falling back to one insert per row if that fails.
+    Returns ``(inserted, rejected, pending)``; ``pending`` are the entries
+    left unwritten because the database became unreachable.
+    """
+    if not rows:
+        return 0, 0, []
+    try:
+        with transaction.atomic():
+            LoginLog.objects.bulk_create([row for _, row in rows], batch_size=batch_size)
+        return len(rows), 0, []
+    except DatabaseError as exc:
+        logger.warning(f"Login log batch insert failed, retrying {len(rows)} rows one by one: {exc}")
+
+    inserted = rejected = 0
+    for n, (entry, row) in enumerate(rows):
+        try:
+            with transaction.atomic():
+                LoginLog.objects.bulk_create([row])
+            inserted += 1
+        except (OperationalError, InterfaceError) as exc:
+            logger.error(f"Login log flush failed, re-queueing {len(rows) - n} attempts: {exc}")
+            return inserted, rejected, [entry for entry, _ in rows[n:]]
+        except DatabaseError as exc:
+            logger.warning(f"Dropping login attempt for user {row.user_id}: {exc}")
+            rejected += 1
+    return inserted, rejected, []
+
+
+def _requeue(entries):
+    limit = getattr(settings, "LOGIN_LOG_BUFFER_SIZE", 100000)
+    for entry in entries:
+        _call("push_log", entry, limit)
+
+
+def _audit_unknown(entry):
+    audit.record(
+        "login_unknown_account",
+        source="login",
+        object_type="login",
+        success=False,
+        metadata={
+            "email": entry["email"],
+            "ip_address": entry["ip"],
+            "user_agent": entry["user_agent"],
+            "attempted_at": datetime.fromtimestamp(entry["timestamp"], tz=timezone.utc).isoformat(),
+        },
+    )
+
+
+def pending_logs():
+    """Attempts buffered and not yet written"""
+    return _call("pending_logs")
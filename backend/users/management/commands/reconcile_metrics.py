@@ -0,0 +1,39 @@
+# python manage.py reconcile_metrics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+
+from educore import metrics
+from users.models import Subscription, UserSession
+
+
+class Command(BaseCommand):
+    help = "Re-sync metric gauges (users, active sessions, subscriptions) from the database"
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+
+        users = User.objects.aggregate(
+            total=Count("id"),
+            active=Count("id", filter=Q(is_active=True)),
+            verified=Count("id", filter=Q(is_email_verified=True)),
+        )
+        metrics.USERS.set_many({(("state", state),): value for state, value in users.items()})
+
+        metrics.SESSIONS_ACTIVE.set(UserSession.objects.filter(is_active=True).count())
+
+        subscriptions = {
+            (("tier", tier), ("status", sub_status)): 0
+            for tier, _ in Subscription.SUBSCRIPTION_TIERS
+            for sub_status, _ in Subscription.STATUS_CHOICES
+        }
+        for row in Subscription.objects.values("tier", "status").annotate(n=Count("id")):
+            subscriptions[(("tier", row["tier"]), ("status", row["status"]))] = row["n"]
+        metrics.SUBSCRIPTIONS.set_many(subscriptions)
+
+        metrics.RECONCILED_AT.set(time.time())
+        self.stdout.write(self.style.SUCCESS(
+            f"Reconciled metrics: {users['total']} users, {len(subscriptions)} subscription series"
+        ))
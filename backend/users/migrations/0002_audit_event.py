@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-18 23:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timestamp', models.DateTimeField(db_index=True)),
+                ('source', models.CharField(help_text='Subsystem that recorded the event (api, admin, signal, task)', max_length=30)),
+                ('action', models.CharField(max_length=100)),
+                ('actor_id', models.BigIntegerField(blank=True, null=True)),
+                ('actor_username', models.CharField(blank=True, max_length=150)),
+                ('object_type', models.CharField(blank=True, max_length=100)),
+                ('object_id', models.CharField(blank=True, max_length=64)),
+                ('success', models.BooleanField(default=True)),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('user_agent', models.CharField(blank=True, max_length=255)),
+                ('metadata', models.JSONField(blank=True, default=dict)),
+            ],
+            options={
+                'verbose_name': 'Audit Event',
+                'verbose_name_plural': 'Audit Events',
+                'ordering': ['-timestamp'],
+                'indexes': [models.Index(fields=['actor_id', 'timestamp'], name='audit_actor_time_idx'), models.Index(fields=['object_type', 'object_id', 'timestamp'], name='audit_object_time_idx'), models.Index(fields=['action', 'timestamp'], name='audit_action_time_idx')],
+            },
+        ),
+    ]
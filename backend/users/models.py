@@ -26,10 +26,12 @@ from django.core.validators import (
     RegexValidator,
 )
 from django.db import models, transaction
-from django.db.models import CheckConstraint, F, Q, UniqueConstraint
+from django.db.models import CheckConstraint, Q, UniqueConstraint
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from educore import metrics
+
 from .managers import CustomUserManager
 
 # Constants
@@ -37,7 +39,6 @@ MAX_LOGIN_ATTEMPTS = 999
 LOCKOUT_DURATION_MINUTES = 15
 EXTENDED_LOCKOUT_HOURS = 24
 LOCKOUT_THRESHOLD = 5
-EXTENDED_LOCKOUT_THRESHOLD = 10
 EMAIL_VERIFICATION_HOURS = 48
 PASSWORD_RESET_HOURS = 24
 SESSION_EXTENSION_HOURS = 24
@@ -55,7 +56,8 @@ class LoginLog(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="login_logs"
     )
-    timestamp = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Set by the writer: rows are flushed in batches after the attempt (login_telemetry)
+    timestamp = models.DateTimeField(default=timezone.now, db_index=True)
     ip_address = models.GenericIPAddressField(db_index=True)
     user_agent = models.TextField(max_length=500)
     successful = models.BooleanField(default=False, db_index=True)
@@ -76,6 +78,66 @@ class LoginLog(models.Model):
         return f"{status} login for {self.user.email} at {self.timestamp}"
 
 
+class AuditEventQuerySet(models.QuerySet):
+    def for_actor(self, actor_id):
+        return self.filter(actor_id=actor_id)
+
+    def for_object(self, object_type, object_id=None):
+        queryset = self.filter(object_type=object_type)
+        if object_id is not None:
+            queryset = queryset.filter(object_id=str(object_id))
+        return queryset
+
+    def between(self, start=None, end=None):
+        queryset = self
+        if start is not None:
+            queryset = queryset.filter(timestamp__gte=start)
+        if end is not None:
+            queryset = queryset.filter(timestamp__lt=end)
+        return queryset
+
+
+class AuditEvent(models.Model):
+    """
+    Structured audit trail written in batches by educore/audit.py.
+    Actor and object are stored by value (no foreign keys) so events
+    outlive the rows they describe and inserts never lock those rows.
+    """
+
+    timestamp = models.DateTimeField(db_index=True)
+    source = models.CharField(
+        max_length=30, help_text="Subsystem that recorded the event (api, admin, signal, task)"
+    )
+    action = models.CharField(max_length=100)
+    actor_id = models.BigIntegerField(null=True, blank=True)
+    actor_username = models.CharField(max_length=150, blank=True)
+    object_type = models.CharField(max_length=100, blank=True)
+    object_id = models.CharField(max_length=64, blank=True)
+    success = models.BooleanField(default=True)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    user_agent = models.CharField(max_length=255, blank=True)
+    metadata = models.JSONField(default=dict, blank=True)
+
+    objects = AuditEventQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("Audit Event")
+        verbose_name_plural = _("Audit Events")
+        indexes = [
+            models.Index(fields=["actor_id", "timestamp"], name="audit_actor_time_idx"),
+            models.Index(
+                fields=["object_type", "object_id", "timestamp"], name="audit_object_time_idx"
+            ),
+            models.Index(fields=["action", "timestamp"], name="audit_action_time_idx"),
+        ]
+        ordering = ["-timestamp"]
+
+    def __str__(self):
+        actor = self.actor_username or "system"
+        target = f"{self.object_type}({self.object_id})" if self.object_type else ""
+        return f"{self.action} {target} by {actor} at {self.timestamp}"
+
+
 class CustomUser(AbstractUser, PermissionsMixin):
     """
     Custom User model with email authentication and role-based permissions.
@@ -173,64 +235,21 @@ class CustomUser(AbstractUser, PermissionsMixin):
         """Check if the user has a specific role."""
         return self.role == role
 
-    @transaction.atomic
     def record_login_attempt(self, successful=False, request=None):
         """
-        FIXED: M-401 - Record a login attempt without self-import.
-        Using direct LoginLog reference since it's defined above.
+        Record a login attempt in login telemetry (users/login_telemetry.py).
+        Failures are counted outside the database and LoginLog rows are
+        written in batches; this row is only updated when a lockout starts
+        or a successful login clears one. Returns True if the account is locked.
         """
-        # Extract IP and User-Agent from request if available
-        ip_address = "0.0.0.0"
-        user_agent = "Unknown"
-
-        if request:
-            # Simple extraction to avoid circular imports
-            x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR", "")
-            if x_forwarded_for:
-                ip_address = x_forwarded_for.split(",")[0].strip()
-            else:
-                ip_address = request.META.get("HTTP_X_REAL_IP", "") or request.META.get(
-                    "REMOTE_ADDR", "0.0.0.0"
-                )
-            user_agent = request.META.get("HTTP_USER_AGENT", "Unknown")[:500]
-
-        # Record the login attempt
-        LoginLog.objects.create(
-            user=self,
-            ip_address=ip_address,
-            user_agent=user_agent,
-            successful=successful,
-        )
+        from . import login_telemetry
 
         if successful:
-            # Reset failed attempts on successful login
-            CustomUser.objects.filter(pk=self.pk).update(
-                failed_login_attempts=0, ban_expires_at=None
-            )
+            login_telemetry.record_success(self, request)
             return False
 
-        # Handle failed login attempt with atomic increment
-        CustomUser.objects.filter(pk=self.pk).update(
-            failed_login_attempts=F("failed_login_attempts") + 1
-        )
-
-        # Refresh from DB to get updated value
-        self.refresh_from_db(fields=["failed_login_attempts"])
-
-        # Implement exponential backoff for repeated failed attempts
-        ban_until = None
-        if self.failed_login_attempts >= EXTENDED_LOCKOUT_THRESHOLD:
-            # Ban for 24 hours after 10 failed attempts
-            ban_until = timezone.now() + timedelta(hours=EXTENDED_LOCKOUT_HOURS)
-        elif self.failed_login_attempts >= LOCKOUT_THRESHOLD:
-            # Ban for 15 minutes after 5 failed attempts
-            ban_until = timezone.now() + timedelta(minutes=LOCKOUT_DURATION_MINUTES)
-
-        if ban_until:
-            CustomUser.objects.filter(pk=self.pk).update(ban_expires_at=ban_until)
-            self.ban_expires_at = ban_until
-
-        return self.is_account_locked()
+        status = login_telemetry.record_failure(self.email, request, user=self)
+        return (status.locked and status.scope == "account") or self.is_account_locked()
 
     def is_account_locked(self):
         """
@@ -527,8 +546,13 @@ class UserSession(models.Model):
     @transaction.atomic
     def invalidate(self):
         """Invalidate this session."""
+        was_active = self.is_active
         self.is_active = False
         self.save(update_fields=["is_active"])
+        if was_active:
+            metrics.on_commit(
+                metrics.record_sessions_ended, [self.created_at], "invalidated", timezone.now()
+            )
 
 
 class Subscription(models.Model):
@@ -14,6 +14,7 @@ FIXES APPLIED:
 import re
 from typing import Any, Dict
 
+from django.conf import settings
 from django.contrib.auth import authenticate, get_user_model
 from django.contrib.auth.password_validation import validate_password
 from django.core.cache import cache
@@ -24,6 +25,7 @@ from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from . import login_telemetry
 from .models import EmailVerification, PasswordReset, Profile, Subscription, UserSession
 
 User = get_user_model()
@@ -656,17 +658,12 @@ class LoginSerializer(serializers.Serializer):
         email = data.get("email")
         password = data.get("password")
 
-        # Check if IP is rate limited
+        # Reject locked accounts and IPs before checking the password
         request = self.context.get("request")
-        if request:
-            ip = request.META.get("REMOTE_ADDR", "unknown")
-            rate_limit_key = f"login_attempts:{ip}"
-            attempts = cache.get(rate_limit_key, 0)
-
-            if attempts > 20:  # Stricter than view-level rate limiting
-                raise serializers.ValidationError(
-                    "Too many login attempts. Please try again later."
-                )
+        lockout = login_telemetry.check_lockout(email, request)
+        if lockout.locked:
+            login_telemetry.record_blocked(email, request)
+            raise serializers.ValidationError(lockout.message)
 
         # Attempt authentication
         user = authenticate(request=request, username=email, password=password)
@@ -675,9 +672,8 @@ class LoginSerializer(serializers.Serializer):
         generic_error = "Unable to log in with provided credentials."
 
         if user is None:
-            # Increment rate limit counter
-            if request:
-                cache.set(rate_limit_key, attempts + 1, timeout=3600)
+            # Count the failure per account and IP; may start a lockout
+            login_telemetry.record_failure(email, request)
             raise serializers.ValidationError(generic_error)
 
         # Additional security checks
@@ -22,6 +22,8 @@ from django.db import transaction
 from django.template.loader import render_to_string
 from django.utils import timezone
 
+from educore import metrics
+
 from .models import UserSession
 
 logger = logging.getLogger(__name__)
@@ -351,6 +353,21 @@ class EmailService:
             raise
 
 
+def _end_sessions(queryset, reason):
+    """Deactivate the active sessions in ``queryset`` and record them in metrics."""
+    now = timezone.now()
+    ended = list(queryset.filter(is_active=True).values_list("pk", "created_at"))
+    if not ended:
+        return 0
+    count = UserSession.objects.filter(
+        pk__in=[pk for pk, _ in ended], is_active=True
+    ).update(is_active=False)
+    metrics.on_commit(
+        metrics.record_sessions_ended, [created for _, created in ended], reason, now
+    )
+    return count
+
+
 class SessionService:
     """Centralized session management service."""
 
@@ -384,7 +401,7 @@ class SessionService:
         if exclude_session_key:
             queryset = queryset.exclude(session_key=exclude_session_key)
 
-        updated_count = queryset.update(is_active=False)
+        updated_count = _end_sessions(queryset, "invalidated")
         logger.info(f"Invalidated {updated_count} sessions for user")
 
         return updated_count
@@ -406,9 +423,10 @@ class SessionService:
     @staticmethod
     def cleanup_expired_sessions():
         """Clean up expired sessions (for background task)."""
-        expired_count = UserSession.objects.filter(
-            expires_at__lt=timezone.now(), is_active=True
-        ).update(is_active=False)
+        expired_count = _end_sessions(
+            UserSession.objects.filter(expires_at__lt=timezone.now(), is_active=True),
+            "expired",
+        )
 
         if expired_count > 0:
             logger.info(f"Cleaned up {expired_count} expired sessions")
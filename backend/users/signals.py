@@ -10,6 +10,7 @@ HANDLES:
 - Subscription creation for new users
 - Security logging for model changes
 - Cleanup tasks for deleted users
+- Metrics updates for registrations, logins and sessions
 """
 
 import logging
@@ -18,6 +19,9 @@ from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
+from django.utils import timezone
+
+from educore import metrics
 
 from .models import Profile, Subscription, UserSession
 
@@ -214,6 +218,35 @@ def log_session_activity(sender, instance, created, **kwargs):
         logger.error(f"Error logging session activity: {str(e)}")
 
 
+# Metrics (educore/metrics.py); recorded on commit so rolled back rows don't count
+# (login attempts are counted by users/login_telemetry.py when they are made)
+@receiver(post_save, sender=User)
+def count_user_registration(sender, instance, created, **kwargs):
+    if created:
+        metrics.on_commit(metrics.USERS_REGISTERED.inc)
+        metrics.on_commit(metrics.USERS.inc, state="total")
+
+
+@receiver(post_delete, sender=User)
+def count_user_deletion(sender, instance, **kwargs):
+    metrics.on_commit(metrics.USERS.dec, state="total")
+
+
+@receiver(post_save, sender=UserSession)
+def count_session_start(sender, instance, created, **kwargs):
+    if created and instance.is_active:
+        metrics.on_commit(metrics.SESSIONS_CREATED.inc, device_type=instance.device_type)
+        metrics.on_commit(metrics.SESSIONS_ACTIVE.inc)
+
+
+@receiver(post_delete, sender=UserSession)
+def count_session_deletion(sender, instance, **kwargs):
+    if instance.is_active:
+        metrics.on_commit(
+            metrics.record_sessions_ended, [instance.created_at], "deleted", timezone.now()
+        )
+
+
 # Custom signal for password changes
 from django.dispatch import Signal
 
@@ -0,0 +1,29 @@
+"""
+File: backend/users/tasks.py
+Purpose: Periodic tasks for the users app
+Date Created: 2026-10-18 00:00:00 UTC
+Version: 1.0.0
+"""
+
+import logging
+
+from celery import shared_task
+
+from . import login_telemetry
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="users.flush_login_logs", ignore_result=True)
+def flush_login_logs_task():
+    """
+    Write buffered login attempts as LoginLog rows in batches.
+    Scheduled every LOGIN_LOG_FLUSH_INTERVAL seconds by CELERY_BEAT_SCHEDULE.
+    """
+    written, unknown, dropped = login_telemetry.flush_logs()
+    if written or unknown or dropped:
+        logger.info(
+            f"Flushed {written} login attempts, audited {unknown} for unknown accounts, "
+            f"dropped {dropped}"
+        )
+    return written
@@ -1,3 +1,372 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.db import OperationalError
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from educore import audit, metrics, ratelimit
+from educore.client_ip import get_client_ip
+
+from . import login_telemetry
+from .models import AuditEvent, LoginLog, Subscription, UserSession
+from .services import SessionService
+from .views import LoginRateThrottle
+
+POLICIES = {
+    "account": {"threshold": 3, "window": 900, "base": 60, "max": 300, "memory": 3600},
+    "ip": {"threshold": 10, "window": 900, "base": 60, "max": 300, "memory": 3600},
+}
+
+
+# Login telemetry tests
+@override_settings(LOGIN_TELEMETRY_BACKEND="memory", METRICS_BACKEND="memory",
+                   LOGIN_LOCKOUT_POLICIES=POLICIES)
+class LoginTelemetryTests(TestCase):
+    def setUp(self):
+        login_telemetry.get_backend("memory").clear()
+        metrics.get_store().clear()
+        self.factory = RequestFactory()
+        self.user = get_user_model().objects.create_user(
+            username="telemetry", email="telemetry@example.com", password="pass12345"
+        )
+
+    def _request(self, remote_addr="203.0.113.7", **meta):
+        return self.factory.post("/api/token/", REMOTE_ADDR=remote_addr, **meta)
+
+    def _logins(self):
+        samples = metrics.registry.snapshot()["users_logins_total"]
+        return {sample["labels"]["result"]: sample["value"] for sample in samples}
+
+    def test_attempts_are_buffered_and_flushed_in_one_batch(self):
+        request = self._request()
+        login_telemetry.record_failure("Telemetry@Example.com", request)
+        login_telemetry.record_success(self.user, request)
+        self.assertEqual(LoginLog.objects.count(), 0)
+        self.assertEqual(login_telemetry.pending_logs(), 2)
+
+        self.assertEqual(login_telemetry.flush_logs(), (2, 0, 0))
+        self.assertEqual(login_telemetry.pending_logs(), 0)
+        logs = LoginLog.objects.filter(user=self.user)
+        self.assertEqual(sorted(logs.values_list("successful", flat=True)), [False, True])
+        self.assertEqual(set(logs.values_list("ip_address", flat=True)), {"203.0.113.7"})
+
+    def test_unknown_accounts_are_audited(self):
+        with mock.patch("users.login_telemetry.audit.record") as record:
+            login_telemetry.record_failure("nobody@example.com", self._request())
+            self.assertEqual(login_telemetry.flush_logs(), (0, 1, 0))
+
+        record.assert_called_once()
+        self.assertEqual(record.call_args.args[0], "login_unknown_account")
+        self.assertEqual(record.call_args.kwargs["metadata"]["email"], "nobody@example.com")
+        self.assertEqual(LoginLog.objects.count(), 0)
+
+    def test_failed_batch_is_requeued(self):
+        login_telemetry.record_failure(self.user.email, self._request())
+        login_telemetry.record_failure(self.user.email, self._request())
+        with mock.patch.object(LoginLog.objects, "bulk_create", side_effect=OperationalError("down")):
+            self.assertEqual(login_telemetry.flush_logs(), (0, 0, 0))
+        self.assertEqual(login_telemetry.pending_logs(), 2)
+
+        self.assertEqual(login_telemetry.flush_logs(), (2, 0, 0))
+
+    def test_lockout_backoff_doubles(self):
+        backend = login_telemetry.get_backend()
+        policy = login_telemetry.get_policy("account")
+        subjects = [("account:backoff@example.com", policy)]
+
+        backend.fail(subjects, now=1000)
+        backend.fail(subjects, now=1001)
+        failures, locked_until, strikes = backend.fail(subjects, now=1002)[subjects[0][0]]
+        self.assertEqual((failures, locked_until, strikes), (3, 1062, 1))
+        self.assertEqual(backend.fail(subjects, now=1010)[subjects[0][0]], (0, 1062, 0))
+
+        for now in (1100, 1101, 1102):
+            outcome = backend.fail(subjects, now=now)[subjects[0][0]]
+        self.assertEqual(outcome, (3, 1102 + 120, 2))
+
+    def test_account_lockout_blocks_login(self):
+        request = self._request()
+        for _ in range(3):
+            status = login_telemetry.record_failure(self.user.email, request)
+        self.assertTrue(status.locked)
+        self.assertTrue(status.started)
+        self.assertEqual(status.scope, "account")
+        self.assertTrue(login_telemetry.check_lockout(self.user.email, request).locked)
+
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.ban_expires_at)
+
+    def test_attempts_are_counted_when_made(self):
+        request = self._request()
+        login_telemetry.record_failure(self.user.email, request)
+        login_telemetry.record_blocked(self.user.email, request)
+        login_telemetry.record_success(self.user, request)
+        self.assertEqual(self._logins(), {"failure": 1, "blocked": 1, "success": 1})
+
+        login_telemetry.flush_logs()
+        self.assertEqual(self._logins(), {"failure": 1, "blocked": 1, "success": 1})
+
+    def test_malformed_ip_is_not_buffered(self):
+        request = self._request(remote_addr="not-an-ip")
+        self.assertIsNone(login_telemetry.client_ip(request))
+
+        status = login_telemetry.record_failure(self.user.email, request)
+        self.assertEqual(status.failures, 1)
+        self.assertEqual(login_telemetry.flush_logs(), (1, 0, 0))
+        self.assertEqual(LoginLog.objects.get().ip_address, "0.0.0.0")
+
+
+class ClientIpTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_forwarded_for_is_ignored_without_trusted_proxies(self):
+        request = self.factory.get("/", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="198.51.100.9")
+        self.assertEqual(get_client_ip(request), "10.0.0.1")
+
+    def test_trusted_proxy_hop_is_used(self):
+        rest_framework = {**settings.REST_FRAMEWORK, "NUM_PROXIES": 1}
+        with override_settings(REST_FRAMEWORK=rest_framework):
+            request = self.factory.get(
+                "/", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="1.2.3.4, 198.51.100.9"
+            )
+            self.assertEqual(get_client_ip(request), "198.51.100.9")
+
+            request = self.factory.get("/", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="forged")
+            self.assertEqual(get_client_ip(request), "10.0.0.1")
+
+    def test_invalid_address_is_rejected(self):
+        request = self.factory.get("/", REMOTE_ADDR="<script>")
+        self.assertIsNone(get_client_ip(request))
+
+    def test_audit_events_store_validated_addresses(self):
+        buffer = audit.AuditBuffer(audit.DatabaseSink(), async_mode=False)
+        forged = self.factory.get("/", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="not-an-ip")
+        invalid = self.factory.get("/", REMOTE_ADDR="<script>")
+        with mock.patch.object(audit, "_buffer", buffer):
+            audit.record("client_ip.forged", request=forged)
+            audit.record("client_ip.invalid", request=invalid)
+            audit.flush()
+
+        addresses = dict(AuditEvent.objects.values_list("action", "ip_address"))
+        self.assertEqual(addresses, {"client_ip.forged": "10.0.0.1", "client_ip.invalid": None})
+
+
+class _FailingRateLimitBackend:
+    def hit(self, key, rules, cost=1, now=None):
+        raise ConnectionError("backend down")
+
+
+RATE_POLICIES = {"login": {"key": "ip", "tiers": {"*": ["2/min", "5/hour"]}}}
+
+
+# Sliding-window rate limit tests
+@override_settings(RATE_LIMIT_BACKEND="memory", RATE_LIMIT_POLICIES=RATE_POLICIES)
+class RateLimitTests(TestCase):
+    def setUp(self):
+        ratelimit.get_backend("memory").clear()
+        self.factory = RequestFactory()
+
+    def _allowed(self, remote_addr="203.0.113.7"):
+        request = self.factory.post("/api/token/", REMOTE_ADDR=remote_addr)
+        request.user = AnonymousUser()
+        return LoginRateThrottle().allow_request(request, None)
+
+    def test_parse_rate(self):
+        self.assertEqual(ratelimit.parse_rate("100/hour"), (100, 3600))
+        self.assertEqual(ratelimit.parse_rate("20/10s"), (20, 10))
+        with self.assertRaises(ValueError):
+            ratelimit.parse_rate("often")
+
+    def test_limit_applies_per_ip(self):
+        self.assertTrue(self._allowed())
+        self.assertTrue(self._allowed())
+        self.assertFalse(self._allowed())
+        self.assertTrue(self._allowed("203.0.113.8"))
+
+    def test_previous_window_is_weighted_by_overlap(self):
+        backend = ratelimit.InMemoryRateLimitBackend()
+        rules = [(10, 60)]
+        for _ in range(10):
+            backend.hit("client", rules, now=60)
+        # Just into the next window, nearly all of the previous 10 still count
+        self.assertFalse(backend.hit("client", rules, now=121)[0].allowed)
+        # Three quarters in, only 2.5 of them do
+        self.assertTrue(backend.hit("client", rules, now=165)[0].allowed)
+
+    def test_rejected_request_takes_nothing_from_other_rules(self):
+        backend = ratelimit.InMemoryRateLimitBackend()
+        rules = [(1, 60), (10, 3600)]
+        backend.hit("client", rules, now=0)
+        results = backend.hit("client", rules, now=1)
+        self.assertFalse(results[0].allowed)
+        self.assertEqual(results[1].remaining, 9)
+        self.assertGreater(results[0].retry_after, 0)
+
+    def test_backend_failure_counts_in_memory(self):
+        self.addCleanup(ratelimit._backends.pop, "failing", None)
+        with mock.patch.dict(ratelimit.BACKEND_CLASSES, {"failing": _FailingRateLimitBackend}), \
+                override_settings(RATE_LIMIT_BACKEND="failing"):
+            self.assertTrue(self._allowed())
+            self.assertTrue(self._allowed())
+            self.assertFalse(self._allowed())
+
+
+def _samples(name):
+    return {
+        tuple(sorted(sample["labels"].items())): sample["value"]
+        for sample in metrics.registry.snapshot()[name]
+    }
+
+
+# Metrics registry tests
+@override_settings(METRICS_BACKEND="memory")
+class MetricsRegistryTests(SimpleTestCase):
+    def setUp(self):
+        metrics.get_store().clear()
+        self.addCleanup(metrics.get_store().clear)
+        self.registry = metrics.MetricsRegistry()
+
+    def test_counters_and_gauges_are_rendered_in_exposition_format(self):
+        requests = self.registry.counter("test_requests_total", "Requests served", ["method"])
+        queue = self.registry.gauge("test_queue_depth", "Jobs waiting")
+        requests.inc(method="GET")
+        requests.inc(2, method="GET")
+        requests.inc(method='P"OST')
+        queue.set(7)
+        queue.dec(2.5)
+
+        self.assertEqual(self.registry.render(), (
+            "# HELP test_requests_total Requests served\n"
+            "# TYPE test_requests_total counter\n"
+            'test_requests_total{method="GET"} 3\n'
+            'test_requests_total{method="P\\"OST"} 1\n'
+            "# HELP test_queue_depth Jobs waiting\n"
+            "# TYPE test_queue_depth gauge\n"
+            "test_queue_depth 4.5\n"
+        ))
+        self.assertEqual(self.registry.snapshot()["test_requests_total"][1]["labels"], {"method": 'P"OST'})
+
+    def test_histogram_buckets_are_cumulative(self):
+        durations = self.registry.histogram("test_duration_seconds", "Durations", buckets=(1, 5))
+        durations.observe_many([0.5, 3, 10])
+
+        lines = self.registry.render().splitlines()[2:]
+        self.assertEqual(lines, [
+            'test_duration_seconds_bucket{le="1"} 1',
+            'test_duration_seconds_bucket{le="5"} 2',
+            'test_duration_seconds_bucket{le="+Inf"} 3',
+            "test_duration_seconds_count 3",
+            "test_duration_seconds_sum 13.5",
+        ])
+
+    def test_invalid_samples_are_rejected(self):
+        requests = self.registry.counter("test_requests_total", "Requests served", ["method"])
+        with self.assertRaises(ValueError):
+            requests.inc(-1, method="GET")
+        with self.assertRaises(ValueError):
+            requests.inc(path="/")
+        with self.assertRaises(ValueError):
+            self.registry.gauge("test_requests_total", "Duplicate")
+
+    def test_unreachable_redis_falls_back_to_memory(self):
+        queue = self.registry.gauge("test_queue_depth", "Jobs waiting")
+        unreachable = metrics.RedisMetricsStore(url="redis://127.0.0.1:1/0")
+        with mock.patch.dict(metrics._stores, {"redis": unreachable}), \
+                override_settings(METRICS_BACKEND="redis"):
+            with self.assertLogs("educore.metrics", "WARNING"):
+                queue.inc(3)
+                queue.dec()
+                rendered = self.registry.render()
+
+        self.assertIn("test_queue_depth 2\n", rendered)
+        self.assertEqual(metrics.get_store("memory").read(), {"test_queue_depth": 2.0})
+
+
+# Application metrics tests
+@override_settings(METRICS_BACKEND="memory")
+class UserMetricsTests(TestCase):
+    def setUp(self):
+        metrics.get_store().clear()
+        self.addCleanup(metrics.get_store().clear)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = get_user_model().objects.create_user(
+                username="metrics", email="metrics@example.com", password="pass12345"
+            )
+
+    def _start_session(self, key, created_at):
+        with self.captureOnCommitCallbacks(execute=True):
+            session = UserSession.objects.create(
+                user=self.user, session_key=key, ip_address="203.0.113.7", user_agent="tests",
+                expires_at=timezone.now() + timedelta(hours=1),
+            )
+        UserSession.objects.filter(pk=session.pk).update(created_at=created_at)
+
+    def test_ending_sessions_decrements_the_active_gauge(self):
+        now = timezone.now()
+        self._start_session("first", now - timedelta(minutes=10))
+        self._start_session("second", now - timedelta(hours=2))
+        self.assertEqual(_samples("user_sessions_active"), {(): 2})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(SessionService.invalidate_user_sessions(self.user, exclude_current=False), 2)
+            self.assertEqual(SessionService.invalidate_user_sessions(self.user, exclude_current=False), 0)
+
+        self.assertEqual(_samples("user_sessions_active"), {(): 0})
+        self.assertEqual(_samples("user_sessions_ended_total"), {(("reason", "invalidated"),): 2})
+        durations = {
+            sample["labels"].get("le"): sample["value"]
+            for sample in metrics.registry.snapshot()["user_session_duration_seconds"]
+            if sample["name"].endswith("_bucket")
+        }
+        self.assertEqual((durations["900"], durations["3600"], durations["14400"]), (1, 1, 2))
+
+    def test_rolled_back_sessions_are_not_counted(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            UserSession.objects.create(
+                user=self.user, session_key="rolled-back", ip_address="203.0.113.7", user_agent="tests",
+                expires_at=timezone.now() + timedelta(hours=1),
+            )
+        self.assertNotIn("user_sessions_active", metrics.get_store().read())
+
+    def test_reconcile_corrects_drifted_gauges(self):
+        self._start_session("live", timezone.now())
+        metrics.SESSIONS_ACTIVE.set(40)
+        metrics.USERS.set(-3, state="total")
+
+        call_command("reconcile_metrics", stdout=mock.Mock())
+
+        self.assertEqual(_samples("user_sessions_active"), {(): 1})
+        users = _samples("users")
+        self.assertEqual(users[(("state", "total"),)], 1)
+        self.assertEqual(users[(("state", "verified"),)], 0)
+        # Every tier/status pair is reported, including the empty ones
+        subscriptions = _samples("subscriptions")
+        pairs = len(Subscription.SUBSCRIPTION_TIERS) * len(Subscription.STATUS_CHOICES)
+        self.assertEqual(len(subscriptions), pairs)
+        self.assertEqual(sum(subscriptions.values()), Subscription.objects.count())
+        self.assertIn((), _samples("metrics_reconciled_timestamp_seconds"))
+
+    def test_endpoint_is_admin_only_and_serves_both_formats(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get("/api/user/metrics/").status_code, 403)
+
+        admin = get_user_model().objects.create_user(
+            username="metricsadmin", email="metricsadmin@example.com", password="pass12345",
+            is_superuser=True,
+        )
+        client.force_authenticate(admin)
+        response = client.get("/api/user/metrics/", {"format": "prometheus"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], metrics.PROMETHEUS_CONTENT_TYPE)
+        self.assertIn("# TYPE users_registered_total counter", response.content.decode())
+
+        response = client.get("/api/user/metrics/")
+        self.assertEqual(response.data["metrics"]["users_registered_total"][0]["value"], 1)
@@ -33,10 +33,10 @@ from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 from django.views.decorators.csrf import csrf_exempt
 from django_ratelimit.decorators import ratelimit
+from educore.ratelimit import AnonSlidingWindowThrottle
 from rest_framework import generics, permissions, status, views, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle
 from rest_framework_simplejwt.tokens import RefreshToken
 from tenacity import stop_after_delay  # FIXED: V-305
 from tenacity import (
@@ -112,20 +112,21 @@ class SecurityError(Exception):
     pass
 
 
-# Throttle classes
-class LoginRateThrottle(AnonRateThrottle):
+# Throttle classes; limits are configured in RATE_LIMIT_POLICIES
+class RegistrationRateThrottle(AnonSlidingWindowThrottle):
+    scope = "register"
+
+
+class LoginRateThrottle(AnonSlidingWindowThrottle):
     scope = "login"
-    rate = LOGIN_RATE_LIMIT
 
 
-class PasswordResetRateThrottle(AnonRateThrottle):
+class PasswordResetRateThrottle(AnonSlidingWindowThrottle):
     scope = "password_reset"
-    rate = PASSWORD_RESET_RATE_LIMIT
 
 
-class EmailVerifyRateThrottle(AnonRateThrottle):
+class EmailVerifyRateThrottle(AnonSlidingWindowThrottle):
     scope = "email_verify"
-    rate = EMAIL_VERIFY_RATE_LIMIT
 
 
 def validate_frontend_url(url: str) -> bool:
@@ -160,7 +161,7 @@ class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserCreateSerializer
     permission_classes = [permissions.AllowAny]
-    throttle_classes = [AnonRateThrottle]
+    throttle_classes = [RegistrationRateThrottle]
 
     @transaction.atomic
     def create(self, request, *args, **kwargs):
@@ -23,8 +23,8 @@ from .django_env import DjangoRefectionManager, import_safely
 from .parsers.ast_parser import FileAnalyzer
 from .parsers.url_parser import DjangoURLParser, APIEndpointIdentifier
 from .utils import (
-    setup_logging, FileCacheManager, ProgressTracker, 
-    timed, parallel_process, truncate_text
+    setup_logging, FileCacheManager, ASTSummaryCache, ProgressTracker, Phase,
+    default_cache_dir, run_phases, timed, parallel_process, truncate_text
 )
 
 logger = logging.getLogger('backend_analyzer')
@@ -36,7 +36,8 @@ class BackendAnalyzer:
     def __init__(self, backend_path, verbose=False, exclude_apps=None, max_issues_to_show=100,
                  use_django_reflection=True, use_subprocess_isolation=True, subprocess_timeout=30, 
                  fail_on_error=False, output_openapi=False, output_typescript=False, 
-                 config_file=None, log_file=None, plugins=None):
+                 config_file=None, log_file=None, plugins=None, parallel_phases=True,
+                 max_workers=None, use_cache=True, cache_dir=None):
         """
         Initialize the backend analyzer.
         
@@ -54,6 +55,10 @@ class BackendAnalyzer:
             config_file: Path to config file
             log_file: Path to log file
             plugins: List of AnalyzerPlugin instances to extend functionality
+            parallel_phases: If True, run independent analysis phases concurrently
+            max_workers: Maximum number of phases running at once
+            use_cache: If True, reuse per-file results from previous runs
+            cache_dir: Directory for the persistent cache (default: ~/.cache/backend_analyzer/...)
         """
         self.backend_path = os.path.abspath(backend_path)
         self.verbose = verbose
@@ -67,6 +72,8 @@ class BackendAnalyzer:
         self.output_typescript = output_typescript
         self.config_file = config_file
         self.plugins = plugins or []
+        self.parallel_phases = parallel_phases
+        self.max_workers = max_workers
         
         # Setup logging
         setup_logging(verbose=verbose, log_file=log_file)
@@ -74,6 +81,14 @@ class BackendAnalyzer:
         # Initialize file cache
         self.file_cache = FileCacheManager(max_size=200)
         
+        # Results of unchanged files are reused across runs
+        self.summary_cache = None
+        if use_cache:
+            try:
+                self.summary_cache = ASTSummaryCache(cache_dir or default_cache_dir(self.backend_path))
+            except OSError as e:
+                logger.warning(f"Persistent analysis cache disabled: {str(e)}")
+        
         # Data structures to store analysis results
         self.apps = set()
         self.models = {}  # app_name.model_name -> ModelInfo
@@ -159,22 +174,26 @@ class BackendAnalyzer:
         logger.info("Starting full backend analysis...")
         
         try:
-            # Basic project analysis
-            self.find_django_apps()
-            self.analyze_models()
-            self.analyze_serializers()
-            self.analyze_views()
-            self.analyze_urls()
-            self.identify_api_endpoints()
-            self.analyze_permissions()
-            self.analyze_settings()
-            
-            # Analyze authentication
-            auth_data = self.analyze_authentication()
+            # Phases run as soon as the phases they read from have finished
+            results = run_phases([
+                Phase('apps', self.find_django_apps),
+                Phase('models', self.analyze_models, ['apps']),
+                Phase('serializers', self.analyze_serializers, ['models']),
+                Phase('views', self.analyze_views, ['apps']),
+                Phase('urls', self.analyze_urls, ['apps']),
+                Phase('endpoints', self.identify_api_endpoints, ['urls', 'views']),
+                Phase('permissions', self.analyze_permissions, ['views']),
+                Phase('settings', self.analyze_settings),
+                Phase('authentication', self.analyze_authentication, ['apps']),
+                Phase('issues', self.detect_compatibility_issues, ['serializers', 'views', 'urls']),
+                Phase('er_diagram', self.generate_er_diagram, ['models']),
+            ], max_workers=self.max_workers, parallel=self.parallel_phases)
+            auth_data = results['authentication']
+            er_diagram = results['er_diagram']
             
-            # Detect issues and generate ER diagram
-            self.detect_compatibility_issues()
-            er_diagram = self.generate_er_diagram()
+            if self.summary_cache:
+                logger.info(f"Analysis cache: {self.summary_cache.hits} files reused, "
+                            f"{self.summary_cache.misses} parsed")
             
             # Prepare final report data
             analysis_data = {
@@ -747,7 +766,8 @@ class BackendAnalyzer:
         """Analyze a models.py file to extract model information"""
         try:
             # Use the FileAnalyzer with AST NodeVisitor pattern
-            analyzer = FileAnalyzer(models_path, app_name, file_cache=self.file_cache)
+            analyzer = FileAnalyzer(models_path, app_name, file_cache=self.file_cache,
+                                    summary_cache=self.summary_cache)
             models = analyzer.analyze_models()
             
             # Add the models to our collection
@@ -784,7 +804,8 @@ class BackendAnalyzer:
             
             try:
                 # Use the FileAnalyzer with AST NodeVisitor pattern
-                analyzer = FileAnalyzer(serializers_path, app_name, file_cache=self.file_cache)
+                analyzer = FileAnalyzer(serializers_path, app_name, file_cache=self.file_cache,
+                                        summary_cache=self.summary_cache)
                 serializers = analyzer.analyze_serializers()
                 
                 # Add the serializers to our collection
@@ -850,7 +871,8 @@ class BackendAnalyzer:
         """Analyze a views.py file to extract view information"""
         try:
             # Use the FileAnalyzer with AST NodeVisitor pattern
-            analyzer = FileAnalyzer(views_path, app_name, file_cache=self.file_cache)
+            analyzer = FileAnalyzer(views_path, app_name, file_cache=self.file_cache,
+                                    summary_cache=self.summary_cache)
             views = analyzer.analyze_views()
             
             # Add the views to our collection
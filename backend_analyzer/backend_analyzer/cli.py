@@ -109,6 +109,31 @@ def parse_args():
         help='Timeout for subprocess in seconds'
     )
     
+    parser.add_argument(
+        '--sequential',
+        action='store_true',
+        help='Run analysis phases one after another instead of concurrently'
+    )
+    
+    parser.add_argument(
+        '--max_workers',
+        type=int,
+        default=None,
+        help='Maximum number of analysis phases running at once'
+    )
+    
+    parser.add_argument(
+        '--no_cache',
+        action='store_true',
+        help='Parse every file instead of reusing results from previous runs'
+    )
+    
+    parser.add_argument(
+        '--cache_dir',
+        type=str,
+        help='Directory for the persistent analysis cache (default: ~/.cache/backend_analyzer/<project>)'
+    )
+    
     parser.add_argument(
         '--fail_on_error', 
         action='store_true',
@@ -410,7 +435,11 @@ def main():
             output_typescript=args.output_typescript,
             config_file=args.config_file,
             log_file=args.log_file,
-            plugins=plugins
+            plugins=plugins,
+            parallel_phases=not args.sequential,
+            max_workers=args.max_workers,
+            use_cache=not args.no_cache,
+            cache_dir=args.cache_dir
         )
         
         # Run the analysis
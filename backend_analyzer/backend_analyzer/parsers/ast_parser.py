@@ -459,19 +459,22 @@ class ViewVisitor(ast.NodeVisitor):
 class FileAnalyzer:
     """Analyzes Python files for Django components."""
     
-    def __init__(self, file_path: str, app_name: str, file_cache=None):
+    def __init__(self, file_path: str, app_name: str, file_cache=None, summary_cache=None):
         """
         Initialize the file analyzer.
         
         Args:
             file_path: Path to the file to analyze
             app_name: Name of the Django app
-            file_cache: Optional FileCacheManager for caching
+            file_cache: Optional FileCacheManager for caching parsed ASTs
+            summary_cache: Optional ASTSummaryCache for caching results across runs
         """
         self.file_path = file_path
         self.app_name = app_name
         self.file_cache = file_cache
+        self.summary_cache = summary_cache
         self._ast = None
+        self._content_hash = None
     
     def read_file(self) -> str:
         """Read the file content."""
@@ -482,11 +485,10 @@ class FileAnalyzer:
         """Parse the file into an AST."""
         if self._ast is not None:
             return self._ast
-            
-        # Check if we can use the cache
+        
+        cache_key = None
         if self.file_cache:
             # Create a cache key based on file path, mtime, and size
-            import os
             file_stat = os.stat(self.file_path)
             cache_key = f"{self.file_path}:{file_stat.st_mtime}:{file_stat.st_size}"
             
@@ -501,28 +503,38 @@ class FileAnalyzer:
         self._ast = ast.parse(source_code)
         
         # Store in cache if available
-        if self.file_cache:
+        if cache_key:
             self.file_cache.put(cache_key, self._ast)
             
         return self._ast
     
+    def _run_visitor(self, kind: str, visitor_class, attr: str) -> list:
+        """Run a visitor over the file, reusing a result cached for this exact content."""
+        cache_kind = f"{kind}:{self.app_name}"
+        if self.summary_cache:
+            if self._content_hash is None:
+                with open(self.file_path, 'rb') as f:
+                    self._content_hash = self.summary_cache.content_hash(f.read())
+            cached = self.summary_cache.get(self.file_path, self._content_hash, cache_kind)
+            if cached is not None:
+                return cached
+        
+        visitor = visitor_class(self.app_name)
+        visitor.visit(self.parse_ast())
+        result = getattr(visitor, attr)
+        
+        if self.summary_cache:
+            self.summary_cache.put(self.file_path, self._content_hash, cache_kind, result)
+        return result
+    
     def analyze_models(self) -> List[ModelInfo]:
         """Extract Django model information from the file."""
-        tree = self.parse_ast()
-        visitor = ModelVisitor(self.app_name)
-        visitor.visit(tree)
-        return visitor.models
+        return self._run_visitor('models', ModelVisitor, 'models')
     
     def analyze_serializers(self) -> List[SerializerInfo]:
         """Extract DRF serializer information from the file."""
-        tree = self.parse_ast()
-        visitor = SerializerVisitor(self.app_name)
-        visitor.visit(tree)
-        return visitor.serializers
+        return self._run_visitor('serializers', SerializerVisitor, 'serializers')
     
     def analyze_views(self) -> List[ViewInfo]:
         """Extract Django view information from the file."""
-        tree = self.parse_ast()
-        visitor = ViewVisitor(self.app_name)
-        visitor.visit(tree)
-        return visitor.views 
\ No newline at end of file
+        return self._run_visitor('views', ViewVisitor, 'views')
@@ -7,10 +7,15 @@ progress tracking, and other common operations.
 
 import os
 import sys
+import hashlib
 import logging
+import pickle
+import tempfile
+import threading
 import time
+from collections import OrderedDict
 from typing import Dict, List, Optional, Any, Callable, Union
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from functools import wraps
 
 # Set up the logger
@@ -237,9 +242,10 @@ def timed(logger_instance=None):
 
 class FileCacheManager:
     """
-    Cache manager for file contents to avoid repeated disk reads.
+    Least-recently-used cache for file contents and parsed ASTs.
     
-    This improves performance when the same files need to be read multiple times.
+    This improves performance when the same files need to be read or parsed
+    multiple times. Lookups and evictions are O(1).
     """
     
     def __init__(self, max_size: int = 100):
@@ -247,11 +253,43 @@ class FileCacheManager:
         Initialize the cache manager.
         
         Args:
-            max_size: Maximum number of files to keep in cache
+            max_size: Maximum number of entries to keep in cache
         """
-        self.cache = {}
+        self.cache = OrderedDict()
         self.max_size = max_size
-        self.access_count = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Return a cached value and mark it as most recently used.
+        
+        Args:
+            key: Cache key
+            default: Value returned when the key is not cached
+        """
+        with self._lock:
+            if key not in self.cache:
+                self.misses += 1
+                return default
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return self.cache[key]
+    
+    def put(self, key: str, value: Any):
+        """
+        Store a value, evicting the least recently used entry if full.
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        with self._lock:
+            self.cache[key] = value
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.max_size:
+                self.cache.popitem(last=False)
     
     def read_file(self, file_path: str, encoding: str = 'utf-8') -> str:
         """
@@ -270,26 +308,16 @@ class FileCacheManager:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
         
-        # Update access count
-        self.access_count[file_path] = self.access_count.get(file_path, 0) + 1
-        
         # Return from cache if available
-        if file_path in self.cache:
-            return self.cache[file_path]
+        content = self.get(file_path)
+        if content is not None:
+            return content
         
         # Read file and add to cache
         try:
             with open(file_path, 'r', encoding=encoding) as f:
                 content = f.read()
-            
-            # Manage cache size
-            if len(self.cache) >= self.max_size:
-                # Remove least accessed file
-                least_accessed = min(self.access_count, key=self.access_count.get)
-                del self.cache[least_accessed]
-                del self.access_count[least_accessed]
-            
-            self.cache[file_path] = content
+            self.put(file_path, content)
             return content
         except Exception as e:
             logger.error(f"Error reading file {file_path}: {str(e)}")
@@ -302,14 +330,196 @@ class FileCacheManager:
         Args:
             file_path: Specific file to invalidate, or None to invalidate all
         """
-        if file_path:
-            file_path = os.path.abspath(file_path)
-            if file_path in self.cache:
-                del self.cache[file_path]
-                del self.access_count[file_path]
-        else:
-            self.cache.clear()
-            self.access_count.clear()
+        with self._lock:
+            if file_path:
+                self.cache.pop(os.path.abspath(file_path), None)
+            else:
+                self.cache.clear()
+
+
+class ASTSummaryCache:
+    """
+    On-disk cache of per-file analysis results (models, serializers, views).
+    
+    Entries are keyed by file path plus a hash of the file content, so an
+    unchanged file is never parsed again across runs while any edit, however
+    small, invalidates it. Results are stored as one pickle per source file
+    in ``cache_dir``; entries written by another analyzer version are ignored.
+    """
+    
+    FORMAT_VERSION = 1
+    
+    def __init__(self, cache_dir: str):
+        """
+        Initialize the cache.
+        
+        Args:
+            cache_dir: Directory holding the cache files (created if missing)
+        """
+        from . import __version__
+        
+        self.cache_dir = cache_dir
+        self.version = f"{__version__}:{self.FORMAT_VERSION}"
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    @staticmethod
+    def content_hash(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+    
+    def _entry_path(self, file_path: str) -> str:
+        digest = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.pickle")
+    
+    def _load(self, file_path: str) -> Optional[Dict[str, Any]]:
+        if file_path in self._entries:
+            return self._entries[file_path]
+        entry = None
+        try:
+            with open(self._entry_path(file_path), 'rb') as f:
+                entry = pickle.load(f)
+            if entry.get('version') != self.version:
+                entry = None
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable cache entry for {file_path}: {str(e)}")
+        self._entries[file_path] = entry
+        return entry
+    
+    def get(self, file_path: str, content_hash: str, kind: str) -> Any:
+        """
+        Return the cached result of ``kind`` for this file content, or None.
+        
+        Args:
+            file_path: Path of the analyzed file
+            content_hash: Hash of the current file content
+            kind: Result type, e.g. "models:courses"
+        """
+        file_path = os.path.abspath(file_path)
+        with self._lock:
+            entry = self._load(file_path)
+            if entry and entry['hash'] == content_hash and kind in entry['results']:
+                self.hits += 1
+                return entry['results'][kind]
+            self.misses += 1
+            return None
+    
+    def put(self, file_path: str, content_hash: str, kind: str, value: Any):
+        """
+        Store a result and write the file's entry to disk.
+        
+        Args:
+            file_path: Path of the analyzed file
+            content_hash: Hash of the content the result was computed from
+            kind: Result type, e.g. "models:courses"
+            value: Picklable analysis result
+        """
+        file_path = os.path.abspath(file_path)
+        with self._lock:
+            entry = self._load(file_path)
+            if not entry or entry['hash'] != content_hash:
+                entry = {'version': self.version, 'path': file_path,
+                         'hash': content_hash, 'results': {}}
+            entry['results'][kind] = value
+            self._entries[file_path] = entry
+            
+            # Write atomically so a concurrent or interrupted run never
+            # sees a partial file
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self._entry_path(file_path))
+            except Exception as e:
+                logger.warning(f"Could not write analysis cache for {file_path}: {str(e)}")
+    
+    def clear(self):
+        """Remove every cache entry."""
+        with self._lock:
+            self._entries.clear()
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.pickle'):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+
+def default_cache_dir(backend_path: str) -> str:
+    """Per-project cache directory under ~/.cache/backend_analyzer"""
+    digest = hashlib.sha1(os.path.abspath(backend_path).encode('utf-8')).hexdigest()[:16]
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'backend_analyzer', digest)
+
+
+class Phase:
+    """A named analysis step and the phases whose results it needs."""
+    
+    def __init__(self, name: str, func: Callable[[], Any], depends_on: List[str] = None):
+        self.name = name
+        self.func = func
+        self.depends_on = list(depends_on or [])
+
+
+def run_phases(phases: List[Phase], max_workers: int = None, parallel: bool = True) -> Dict[str, Any]:
+    """
+    Run phases in dependency order, independent phases concurrently.
+    
+    A phase starts as soon as every phase it depends on has finished. The
+    first phase to raise stops scheduling; phases already running are left
+    to finish and the exception is re-raised.
+    
+    Args:
+        phases: Phases to run
+        max_workers: Maximum number of phases running at once
+        parallel: If False, run the phases one by one in dependency order
+        
+    Returns:
+        Dictionary mapping phase names to their return values
+    """
+    by_name = {phase.name: phase for phase in phases}
+    for phase in phases:
+        unknown = [dep for dep in phase.depends_on if dep not in by_name]
+        if unknown:
+            raise ValueError(f"Phase {phase.name} depends on unknown phases: {unknown}")
+    
+    # Kahn's algorithm; also rejects dependency cycles up front
+    order, done = [], set()
+    pending = list(phases)
+    while pending:
+        ready = [p for p in pending if all(dep in done for dep in p.depends_on)]
+        if not ready:
+            raise ValueError(f"Phase dependency cycle among: {[p.name for p in pending]}")
+        for phase in ready:
+            order.append(phase)
+            done.add(phase.name)
+            pending.remove(phase)
+    
+    results = {}
+    if not parallel:
+        for phase in order:
+            results[phase.name] = phase.func()
+        return results
+    
+    remaining = list(order)
+    running = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while remaining or running:
+            for phase in [p for p in remaining if all(dep in results for dep in p.depends_on)]:
+                remaining.remove(phase)
+                running[executor.submit(phase.func)] = phase
+            
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                phase = running.pop(future)
+                try:
+                    results[phase.name] = future.result()
+                except Exception:
+                    remaining.clear()
+                    wait(running)
+                    raise
+    return results
 
 
 def parallel_process(items: List[Any], process_func: Callable, max_workers: int = None, 
@@ -0,0 +1,131 @@
+import os
+import tempfile
+import textwrap
+import threading
+import time
+import unittest
+from unittest import mock
+
+from backend_analyzer.parsers.ast_parser import FileAnalyzer, ModelVisitor
+from backend_analyzer.utils import ASTSummaryCache, FileCacheManager, Phase, run_phases
+
+MODELS_SOURCE = textwrap.dedent("""
+    from django.db import models
+
+
+    class Course(models.Model):
+        title = models.CharField(max_length=255)
+""")
+
+
+# LRU file cache tests
+class FileCacheManagerTests(unittest.TestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = FileCacheManager(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+
+# On-disk summary cache tests
+class ASTSummaryCacheTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_dir = os.path.join(tmp.name, "cache")
+        self.source = os.path.join(tmp.name, "models.py")
+        with open(self.source, "w") as f:
+            f.write(MODELS_SOURCE)
+
+    def _analyze(self):
+        cache = ASTSummaryCache(self.cache_dir)
+        return FileAnalyzer(self.source, "courses", summary_cache=cache).analyze_models(), cache
+
+    def test_results_survive_across_runs(self):
+        models, cache = self._analyze()
+        self.assertEqual([m.name for m in models], ["Course"])
+        self.assertEqual(cache.hits, 0)
+
+        with mock.patch.object(ModelVisitor, "visit") as visit:
+            models, cache = self._analyze()
+        visit.assert_not_called()
+        self.assertEqual([m.name for m in models], ["Course"])
+        self.assertEqual(cache.hits, 1)
+
+    def test_edited_file_is_parsed_again(self):
+        self._analyze()
+        with open(self.source, "a") as f:
+            f.write("\n\nclass Lesson(models.Model):\n    pass\n")
+
+        models, cache = self._analyze()
+        self.assertEqual([m.name for m in models], ["Course", "Lesson"])
+        self.assertEqual(cache.hits, 0)
+
+    def test_entries_from_another_version_are_ignored(self):
+        self._analyze()
+        with mock.patch.object(ASTSummaryCache, "FORMAT_VERSION", ASTSummaryCache.FORMAT_VERSION + 1):
+            self.assertEqual(self._analyze()[1].hits, 0)
+
+    def test_clear_removes_entries(self):
+        models, cache = self._analyze()
+        cache.clear()
+        self.assertEqual(os.listdir(self.cache_dir), [])
+        self.assertEqual(self._analyze()[1].hits, 0)
+
+
+# Phase scheduling tests
+class RunPhasesTests(unittest.TestCase):
+    def test_dependent_phase_sees_its_dependencies_finished(self):
+        finished = []
+
+        def step(name, delay=0):
+            def run():
+                time.sleep(delay)
+                finished.append(name)
+                return name
+            return run
+
+        phases = [
+            Phase("models", step("models", 0.05)),
+            Phase("views", step("views")),
+            Phase("relationships", lambda: list(finished), depends_on=["models"]),
+        ]
+        for parallel in (True, False):
+            finished.clear()
+            results = run_phases(phases, parallel=parallel)
+            self.assertEqual(results["models"], "models")
+            self.assertIn("models", results["relationships"])
+
+    def test_independent_phases_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+        phases = [Phase("a", barrier.wait), Phase("b", barrier.wait)]
+        self.assertEqual(set(run_phases(phases, max_workers=2)), {"a", "b"})
+
+    def test_failure_stops_scheduling_and_is_raised(self):
+        after = mock.Mock()
+
+        def fail():
+            raise RuntimeError("boom")
+
+        phases = [Phase("models", fail), Phase("relationships", after, depends_on=["models"])]
+        with self.assertRaisesRegex(RuntimeError, "boom"):
+            run_phases(phases)
+        after.assert_not_called()
+
+    def test_unknown_dependencies_and_cycles_are_rejected(self):
+        with self.assertRaisesRegex(ValueError, "unknown"):
+            run_phases([Phase("a", lambda: None, depends_on=["missing"])])
+        with self.assertRaisesRegex(ValueError, "cycle"):
+            run_phases([
+                Phase("a", lambda: None, depends_on=["b"]),
+                Phase("b", lambda: None, depends_on=["a"]),
+            ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -26,6 +26,10 @@ OUTPUT_DIR = "./backend_docs"
 # Output format options: "markdown", "html", "json", or "all"
 OUTPUT_FORMAT = "all"
 
+# Incremental build: reuse extracted data and generated pages whose inputs are unchanged
+# since the last run (tracked in OUTPUT_DIR/.build_manifest.json)
+INCREMENTAL_BUILD = False
+
 # ========== AUTHENTICATION CONFIGURATION ==========
 # Credentials for testing authenticated endpoints
 AUTH_USERNAME = "test_user"
@@ -71,6 +75,26 @@ TEST_ERROR_SCENARIOS = True
 # Timeout for API requests in seconds
 REQUEST_TIMEOUT = 10
 
+# Per-endpoint timeout overrides in seconds, keyed by path prefix (longest prefix wins)
+RUNTIME_ENDPOINT_TIMEOUTS = {}
+
+# Number of endpoints probed concurrently (also the size of the keep-alive connection pool)
+RUNTIME_MAX_WORKERS = 8
+
+# Retries for connection errors and 502/503/504 responses, with exponential backoff
+RUNTIME_RETRIES = 2
+
+# Timed requests per endpoint used for latency percentiles
+RUNTIME_SAMPLES_PER_ENDPOINT = 3
+
+# Explicit values for URL parameters, e.g. {"pk": 1, "course_slug": "intro-to-python"}.
+# Parameters not listed here are filled from items returned by the matching list endpoint.
+RUNTIME_PATH_PARAMS = {}
+
+# Dotted path to a WSGI application (e.g. "educore.wsgi.application") to probe in-process
+# instead of over the network; BACKEND_URL then only supplies the Host header
+RUNTIME_WSGI_APPLICATION = ""
+
 # ========== DOCUMENTATION STYLE ==========
 # Theme for HTML output: "light", "dark", "auto"
 HTML_THEME = "auto"
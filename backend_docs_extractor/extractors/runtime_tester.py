@@ -10,16 +10,33 @@ Runtime API Tester for Django projects
 This module tests actual API endpoints in a running Django application,
 gathering response information, examples, and performance metrics.
 
+Endpoints are probed concurrently by a bounded worker pool sharing one
+keep-alive connection pool. Endpoints are probed in waves by the number of
+URL parameters they take, so list endpoints answer before the detail
+endpoints below them; the detail URLs are then filled with primary keys or
+slugs sampled from the list responses. Each endpoint is requested several
+times and its latency reported as percentiles.
+
+With RUNTIME_WSGI_APPLICATION set, requests are handed straight to the WSGI
+application in-process instead of going over the network.
+
 Author: nanthiniSanthanam
 Generated: 2025-05-04 05:13:56
 """
 
+import io
 import logging
 import json
+import re
+import sys
+import threading
 import time
 import warnings
-from typing import Dict, List, Any, Optional
-from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+from importlib import import_module
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urljoin, urlsplit, quote, unquote_to_bytes
 
 # Suppress insecure request warnings when testing
 warnings.filterwarnings('ignore', message='Unverified HTTPS request')
@@ -27,13 +44,125 @@ warnings.filterwarnings('ignore', message='Unverified HTTPS request')
 # For making HTTP requests
 try:
     import requests
+    from requests.adapters import BaseAdapter, HTTPAdapter
     from requests.exceptions import RequestException
+    from requests.structures import CaseInsensitiveDict
+    from requests.utils import get_encoding_from_headers
+    from urllib3.util.retry import Retry
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
+    BaseAdapter = object
 
 logger = logging.getLogger(__name__)
 
+# URL parameters as they appear in extracted paths: {pk}, <int:pk>, <slug>, :id
+PATH_PARAM_RE = re.compile(r'\{(\w*)\}|<(?:\w+:)?(\w+)>|(?<=/):(\w+)')
+
+# Format-suffix variants (".json") duplicate the plain endpoint
+FORMAT_SUFFIX_RE = re.compile(r'\\\.|drf_format_suffix|\{format\}')
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Linearly interpolated percentile of already sorted values"""
+    if len(values) == 1:
+        return values[0]
+    position = (len(values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def summarize_latencies(samples: List[float]) -> Dict[str, Any]:
+    """Min/mean/max and p50/p90/p99 of response times in seconds"""
+    if not samples:
+        return {'samples': 0}
+    ordered = sorted(samples)
+    return {
+        'samples': len(ordered),
+        'min': ordered[0],
+        'mean': sum(ordered) / len(ordered),
+        'p50': _percentile(ordered, 0.50),
+        'p90': _percentile(ordered, 0.90),
+        'p99': _percentile(ordered, 0.99),
+        'max': ordered[-1],
+    }
+
+
+class WSGIAdapter(BaseAdapter):
+    """Transport adapter that serves requests from a WSGI application in-process
+
+    Nothing goes over the network, so timeouts and TLS settings are ignored.
+    """
+
+    def __init__(self, app):
+        super().__init__()
+        self.app = app
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        parts = urlsplit(request.url)
+        body = request.body or b''
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+
+        environ = {
+            'REQUEST_METHOD': request.method,
+            'SCRIPT_NAME': '',
+            # WSGI carries the raw path bytes as a latin-1 string
+            'PATH_INFO': unquote_to_bytes(parts.path or '/').decode('iso-8859-1'),
+            'QUERY_STRING': parts.query,
+            'SERVER_NAME': parts.hostname or 'localhost',
+            'SERVER_PORT': str(parts.port or (443 if parts.scheme == 'https' else 80)),
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'REMOTE_ADDR': '127.0.0.1',
+            'CONTENT_LENGTH': str(len(body)),
+            'HTTP_HOST': parts.netloc,
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': parts.scheme or 'http',
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        for name, value in request.headers.items():
+            key = name.upper().replace('-', '_')
+            if key == 'CONTENT_TYPE':
+                environ['CONTENT_TYPE'] = value
+            elif key not in ('CONTENT_LENGTH', 'HOST'):
+                environ[f'HTTP_{key}'] = value
+
+        captured = {}
+
+        def start_response(status, headers, exc_info=None):
+            captured['status'] = status
+            captured['headers'] = headers
+
+        start_time = time.perf_counter()
+        result = self.app(environ, start_response)
+        try:
+            content = b''.join(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+        response = requests.Response()
+        status_code, _, reason = captured['status'].partition(' ')
+        response.status_code = int(status_code)
+        response.reason = reason
+        response.headers = CaseInsensitiveDict(captured['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = content
+        response.raw = io.BytesIO(content)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = timedelta(seconds=time.perf_counter() - start_time)
+        return response
+
+    def close(self):
+        pass
+
 
 class RuntimeTester:
     """Test API endpoints at runtime and gather response information"""
@@ -51,8 +180,9 @@ class RuntimeTester:
         self.auth_password = config.AUTH_PASSWORD
         self.auth_token = config.AUTH_TOKEN
 
-        # Request timeout
+        # Request timeout, with per-endpoint overrides by path prefix
         self.timeout = config.REQUEST_TIMEOUT
+        self.endpoint_timeouts = getattr(config, 'RUNTIME_ENDPOINT_TIMEOUTS', {})
 
         # Maximum items to fetch for list endpoints
         self.max_items = config.MAX_ITEMS_PER_ENDPOINT
@@ -60,9 +190,27 @@ class RuntimeTester:
         # Whether to test error scenarios
         self.test_errors = config.TEST_ERROR_SCENARIOS
 
+        # Concurrency, retries and latency sampling
+        self.max_workers = max(1, getattr(config, 'RUNTIME_MAX_WORKERS', 8))
+        self.retries = getattr(config, 'RUNTIME_RETRIES', 2)
+        self.samples_per_endpoint = max(1, getattr(config, 'RUNTIME_SAMPLES_PER_ENDPOINT', 3))
+
+        # Explicit URL parameter values
+        self.path_params = getattr(config, 'RUNTIME_PATH_PARAMS', {})
+
+        # In-process WSGI application (dotted path), if any
+        self.wsgi_application = getattr(config, 'RUNTIME_WSGI_APPLICATION', '')
+
         # Current authentication tokens
         self.current_tokens = {}
 
+        # Transport shared by the per-thread sessions, created on first use
+        self._adapter = None
+        self._local = threading.local()
+
+        # Items returned by each probed path template, used to fill URL parameters
+        self._samples = {}
+
     def extract(self, apis: Dict[str, Any], auth_info: Dict[str, Any]) -> Dict[str, Any]:
         """Test API endpoints and extract response information"""
         if not REQUESTS_AVAILABLE:
@@ -73,7 +221,7 @@ class RuntimeTester:
                 'endpoints_successful': 0,
             }
 
-        if not self.base_url:
+        if not self.base_url and not self.wsgi_application:
             logger.warning("No backend URL provided, skipping runtime API tests")
             return {
                 'error': 'No backend URL provided',
@@ -81,7 +229,11 @@ class RuntimeTester:
                 'endpoints_successful': 0,
             }
 
-        logger.info(f"Testing API endpoints at {self.base_url}")
+        if not self.base_url:
+            self.base_url = 'http://localhost'
+
+        transport = f"in-process WSGI ({self.wsgi_application})" if self.wsgi_application else self.base_url
+        logger.info(f"Testing API endpoints at {transport} with {self.max_workers} workers")
 
         # Extract authentication information to use in tests
         auth_headers = self._get_auth_headers(auth_info)
@@ -93,69 +245,213 @@ class RuntimeTester:
             'endpoints_successful': 0,
             'total_response_time': 0,
             'average_response_time': 0,
+            'latency': {},
+            'skipped': {},
             'auth_methods': {},
             'status_codes': {},
             'content_types': {},
+            'transport': 'wsgi' if self.wsgi_application else 'http',
+            'max_workers': self.max_workers,
         }
 
-        # Get the list of endpoints to test
-        endpoints = apis.get('endpoints', [])
+        # Group endpoints into waves by number of URL parameters, so collections
+        # are probed (and sampled) before the detail endpoints below them
+        waves = self._plan_waves(apis.get('endpoints', []), results['skipped'])
+        all_samples = []
+
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='runtime-tester') as pool:
+            for depth in sorted(waves):
+                futures = {}
+                for path, endpoint in waves[depth]:
+                    params = self._fill_path_params(path)
+                    if params is None:
+                        results['skipped'][path] = 'unresolved URL parameters'
+                        logger.debug(f"Skipping endpoint {path} (unresolved URL parameters)")
+                        continue
+                    future = pool.submit(self._test_endpoint, path, endpoint, auth_headers, params)
+                    futures[future] = path
+
+                for future in as_completed(futures):
+                    path = futures[future]
+                    try:
+                        endpoint_result = future.result()
+                    except Exception as e:
+                        logger.error(f"Error testing endpoint {path}: {str(e)}")
+                        continue
+
+                    if endpoint_result:
+                        self._record_result(results, path, endpoint_result)
+                        all_samples.extend(endpoint_result.get('latency_samples', []))
+        results['wall_time'] = time.perf_counter() - start_time
+
+        # Calculate average response time
+        if results['endpoints_successful'] > 0:
+            results['average_response_time'] = results['total_response_time'] / results['endpoints_successful']
+        results['latency'] = summarize_latencies(all_samples)
+
+        logger.info(
+            f"Tested {results['endpoints_tested']} endpoints, {results['endpoints_successful']} successful, "
+            f"{len(results['skipped'])} skipped in {results['wall_time']:.2f}s")
+        return results
+
+    def _plan_waves(self, endpoints: List[Dict[str, Any]], skipped: Dict[str, str]) -> Dict[int, List[Tuple[str, Dict]]]:
+        """Select testable GET endpoints, grouped by number of URL parameters"""
+        waves = {}
+        seen = set()
 
-        # Test each endpoint
         for endpoint in endpoints:
             path = endpoint.get('path', '')
-            if not path:
+            if not path or path in seen:
                 continue
+            seen.add(path)
 
             # Only test GET endpoints by default
             if 'get' not in endpoint.get('http_methods', []):
                 continue
 
-            # Skip endpoints that require parameters in the URL
-            if self._requires_url_params(path):
-                logger.debug(f"Skipping endpoint {path} (requires URL parameters)")
+            if FORMAT_SUFFIX_RE.search(path):
+                skipped[path] = 'format suffix variant'
                 continue
 
-            # Test the endpoint
-            try:
-                endpoint_result = self._test_endpoint(
-                    path, 
-                    endpoint, 
-                    auth_headers
-                )
+            depth = len(PATH_PARAM_RE.findall(path))
+            waves.setdefault(depth, []).append((path, endpoint))
 
-                if endpoint_result:
-                    results['endpoints'][path] = endpoint_result
-                    results['endpoints_tested'] += 1
+        return waves
 
-                    if endpoint_result.get('success', False):
-                        results['endpoints_successful'] += 1
+    def _record_result(self, results: Dict[str, Any], path: str, endpoint_result: Dict[str, Any]) -> None:
+        """Fold one endpoint result into the totals and keep its items for parameter filling"""
+        results['endpoints'][path] = endpoint_result
+        results['endpoints_tested'] += 1
 
-                        # Collect statistics
-                        results['total_response_time'] += endpoint_result.get('response_time', 0)
+        if not endpoint_result.get('success', False):
+            return
 
-                        # Count status codes
-                        status_code = endpoint_result.get('status_code')
-                        if status_code:
-                            results['status_codes'][status_code] = results['status_codes'].get(status_code, 0) + 1
+        results['endpoints_successful'] += 1
 
-                        # Count content types
-                        content_type = endpoint_result.get('content_type', '').split(';')[0]
-                        if content_type:
-                            results['content_types'][content_type] = results['content_types'].get(content_type, 0) + 1
-            except Exception as e:
-                logger.error(f"Error testing endpoint {path}: {str(e)}")
+        # Collect statistics
+        results['total_response_time'] += endpoint_result.get('response_time', 0)
 
-        # Calculate average response time
-        if results['endpoints_successful'] > 0:
-            results['average_response_time'] = results['total_response_time'] / results['endpoints_successful']
+        # Count status codes
+        status_code = endpoint_result.get('status_code')
+        if status_code:
+            results['status_codes'][status_code] = results['status_codes'].get(status_code, 0) + 1
 
-        logger.info(f"Tested {results['endpoints_tested']} endpoints, {results['endpoints_successful']} successful")
-        return results
+        # Count content types
+        content_type = endpoint_result.get('content_type', '').split(';')[0]
+        if content_type:
+            results['content_types'][content_type] = results['content_types'].get(content_type, 0) + 1
+
+        # Remember the items so parameters of deeper paths can be filled from them
+        response = endpoint_result.get('response')
+        if isinstance(response, dict) and isinstance(response.get('results'), list):
+            response = response['results']
+        if isinstance(response, list):
+            items = [item for item in response if isinstance(item, dict)]
+            if items:
+                self._samples[path] = {
+                    'params': endpoint_result.get('path_params', {}),
+                    'items': items,
+                }
+
+    def _fill_path_params(self, path: str) -> Optional[Dict[str, str]]:
+        """Choose values for the URL parameters of a path, or None if some cannot be filled
+
+        A parameter is taken from RUNTIME_PATH_PARAMS, else from the first item
+        listed by the path up to that parameter (``/api/courses/`` for
+        ``/api/courses/{slug}/``), which was probed in an earlier wave.
+        """
+        params = {}
 
-    def _test_endpoint(self, path: str, endpoint_info: Dict[str, Any], auth_headers: Dict[str, str]) -> Dict[str, Any]:
+        for match in PATH_PARAM_RE.finditer(path):
+            name = next((group for group in match.groups() if group is not None), '')
+
+            if name in self.path_params:
+                params[name] = str(self.path_params[name])
+                continue
+
+            sample = self._samples.get(path[:match.start()])
+            value = self._pick_param_value(name, sample['items']) if sample else None
+            if value is None:
+                return None
+
+            # The collection's own parameters must agree with ours
+            params.update(sample['params'])
+            params[name] = value
+
+        return params
+
+    def _pick_param_value(self, name: str, items: List[Dict[str, Any]]) -> Optional[str]:
+        """Value for a URL parameter from listed items: the same field, or its id/slug"""
+        candidates = [name] if name else []
+        if name in ('', 'pk', 'id') or name.endswith(('_id', '_pk')):
+            candidates += ['id', 'pk', 'uuid']
+        if 'slug' in name:
+            candidates.append('slug')
+        if '_' in name:
+            candidates.append(name.rsplit('_', 1)[1])
+
+        for item in items:
+            for field in candidates:
+                value = item.get(field)
+                if value is not None and not isinstance(value, (dict, list)):
+                    return str(value)
+        return None
+
+    def _build_url(self, path: str, params: Dict[str, str]) -> str:
+        """Substitute URL parameters into a path template"""
+        def replace(match):
+            name = next((group for group in match.groups() if group is not None), '')
+            return quote(params[name], safe='')
+
+        return urljoin(self.base_url, PATH_PARAM_RE.sub(replace, path))
+
+    def _timeout_for(self, path: str) -> float:
+        """Timeout of the longest configured prefix of the path, else REQUEST_TIMEOUT"""
+        matches = [prefix for prefix in self.endpoint_timeouts if path.startswith(prefix)]
+        if matches:
+            return self.endpoint_timeouts[max(matches, key=len)]
+        return self.timeout
+
+    def _get_adapter(self):
+        """Transport shared by all sessions: a keep-alive pool or the WSGI application"""
+        if self._adapter is None:
+            if self.wsgi_application:
+                module_path, _, attribute = self.wsgi_application.rpartition('.')
+                self._adapter = WSGIAdapter(getattr(import_module(module_path), attribute))
+            else:
+                retry = Retry(
+                    total=self.retries,
+                    backoff_factor=0.2,
+                    status_forcelist=(502, 503, 504),
+                    allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+                    raise_on_status=False,
+                )
+                self._adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=self.max_workers,
+                    max_retries=retry,
+                )
+        return self._adapter
+
+    def _session(self):
+        """Session for the calling thread, mounted on the shared transport"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.verify = False  # For testing against local/dev servers
+            adapter = self._get_adapter()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._local.session = session
+        return session
+
+    def _test_endpoint(self, path: str, endpoint_info: Dict[str, Any], auth_headers: Dict[str, str],
+                       params: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """Test a single API endpoint"""
-        url = urljoin(self.base_url, path)
+        params = params or {}
+        url = self._build_url(path, params)
+        timeout = self._timeout_for(path)
         logger.debug(f"Testing endpoint: {url}")
 
         # Check if authentication is required
@@ -170,29 +466,38 @@ class RuntimeTester:
         result = {
             'path': path,
             'url': url,
+            'path_params': params,
             'requires_auth': requires_auth,
             'method': 'GET',
             'success': False,
             'tested_at': time.strftime('%Y-%m-%d %H:%M:%S'),
         }
 
+        session = self._session()
+
         try:
-            # Make the request with timing
-            start_time = time.time()
-            response = requests.get(
-                url, 
-                headers=headers, 
-                timeout=self.timeout,
-                verify=False  # For testing against local/dev servers
-            )
-            end_time = time.time()
-            response_time = end_time - start_time
+            # Make the requests with timing; the first response is documented
+            response = None
+            latencies = []
+            for _ in range(self.samples_per_endpoint):
+                start_time = time.perf_counter()
+                sample = session.get(url, headers=headers, timeout=timeout)
+                latencies.append(time.perf_counter() - start_time)
+                if response is None:
+                    response = sample
+                # Failed endpoints are not worth sampling further
+                if sample.status_code >= 400:
+                    break
+
+            latency = summarize_latencies(latencies)
 
             # Get response details
             result.update({
                 'success': response.status_code < 400,
                 'status_code': response.status_code,
-                'response_time': response_time,
+                'response_time': latency['mean'],
+                'latency': latency,
+                'latency_samples': latencies,
                 'content_type': response.headers.get('Content-Type', ''),
                 'response_size': len(response.content),
             })
@@ -224,7 +529,7 @@ class RuntimeTester:
 
             # Test error scenarios if configured
             if self.test_errors and result['success']:
-                result['error_tests'] = self._test_error_scenarios(url, headers)
+                result['error_tests'] = self._test_error_scenarios(url, headers, timeout)
 
         except RequestException as e:
             result.update({
@@ -279,14 +584,16 @@ class RuntimeTester:
         if pagination:
             result['pagination'] = pagination
 
-    def _test_error_scenarios(self, url: str, headers: Dict[str, str]) -> Dict[str, Any]:
+    def _test_error_scenarios(self, url: str, headers: Dict[str, str], timeout: Optional[float] = None) -> Dict[str, Any]:
         """Test common error scenarios for an endpoint"""
         error_results = {}
+        session = self._session()
+        timeout = timeout or self.timeout
 
         # Test without authentication
         if headers:
             try:
-                response = requests.get(url, timeout=self.timeout, verify=False)
+                response = session.get(url, timeout=timeout)
                 error_results['no_auth'] = {
                     'status_code': response.status_code,
                     'success': response.status_code < 400,
@@ -296,12 +603,12 @@ class RuntimeTester:
 
         # Test with invalid parameters
         try:
-            invalid_param_url = f"{url}?invalid_param=test"
-            response = requests.get(
+            separator = '&' if '?' in url else '?'
+            invalid_param_url = f"{url}{separator}invalid_param=test"
+            response = session.get(
                 invalid_param_url, 
                 headers=headers, 
-                timeout=self.timeout, 
-                verify=False
+                timeout=timeout
             )
             error_results['invalid_param'] = {
                 'status_code': response.status_code,
@@ -359,7 +666,7 @@ class RuntimeTester:
             url = urljoin(self.base_url, endpoint)
 
             try:
-                response = requests.post(
+                response = self._session().post(
                     url,
                     json={
                         'username': self.auth_username,
@@ -404,7 +711,7 @@ class RuntimeTester:
             url = urljoin(self.base_url, endpoint)
 
             try:
-                response = requests.post(
+                response = self._session().post(
                     url,
                     json={
                         'username': self.auth_username,
@@ -433,4 +740,4 @@ class RuntimeTester:
     def _requires_url_params(self, path: str) -> bool:
         """Check if a URL path requires parameters"""
         # Check for parameter patterns in the URL
-        return '{' in path or '<' in path or ':' in path
\ No newline at end of file
+        return PATH_PARAM_RE.search(path) is not None
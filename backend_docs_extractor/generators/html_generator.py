@@ -41,6 +41,14 @@ Generated Assets:
 - resources/js/main.js: Core functionality
 - resources/js/prism.js: Syntax highlighting
 - resources/js/api-testing.js: API testing functionality
+- resources/js/search/: Sharded search index (see generators/search_index.py)
+
+Incremental Builds:
+When a BuildManifest is passed to generate(), each page is a node of the
+build graph keyed by the generator version, its settings and the hashes of
+the extracted artifacts it renders (see PAGES). Pages whose key is
+unchanged are not re-rendered, and their search entries come from the
+manifest; only index shards whose content changed are rewritten.
 
 Current Date and Time (UTC): 2025-05-04 17:01:45
 Author: nanthiniSanthanam
@@ -51,17 +59,33 @@ import logging
 import json
 import shutil
 import re
-import os
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+from generators.search_index import (
+    SEARCH_DIR, build_search_index, heading_entries, render_docs_js, render_shard_js,
+)
+from utils.build_manifest import BuildManifest, content_hash, file_hash
+
 logger = logging.getLogger(__name__)
 
 
 class HtmlGenerator:
     """Generate HTML documentation from extracted backend information"""
 
+    # Pages by documentation section: output file, generator method and the
+    # extracted artifacts the page is rendered from
+    PAGES = {
+        'index': ('index.html', '_generate_index', ['project_info', 'models', 'apis', 'serializers']),
+        'project_overview': ('project_overview.html', '_generate_project_overview', ['project_info']),
+        'models_and_database': ('models_and_database.html', '_generate_models_documentation', ['models']),
+        'api_endpoints': ('api_endpoints.html', '_generate_api_documentation', ['apis', 'runtime_tests']),
+        'authentication': ('authentication.html', '_generate_authentication_documentation', ['authentication']),
+        'frontend_integration': ('frontend_integration.html', '_generate_frontend_integration', ['authentication']),
+        'typescript_interfaces': ('typescript_interfaces.html', '_generate_typescript_overview', []),
+    }
+
     def __init__(self, config):
         """Initialize with configuration
 
@@ -92,44 +116,82 @@ class HtmlGenerator:
         # Search data for documentation search functionality
         self.search_data = []
 
-    def generate(self, data: Dict[str, Any], output_dir: Path) -> None:
+    def generate(self, data: Dict[str, Any], output_dir: Path, manifest: Optional[BuildManifest] = None) -> None:
         """Generate HTML documentation
 
         Args:
             data: Extracted data from backend analysis
             output_dir: Directory where HTML files will be generated
+            manifest: Build manifest for incremental generation; without one
+                every page is rendered
         """
         logger.info("Generating HTML documentation")
 
+        # Without a manifest nothing is fresh, and nothing is saved
+        manifest = manifest or BuildManifest(output_dir, enabled=False)
+        build_key = self._build_key()
+
         # Ensure output directory exists
         output_dir.mkdir(parents=True, exist_ok=True)
 
         # Create resources directory and copy assets
-        self._setup_resources(output_dir)
-
-        # Create index.html (main page)
-        self._generate_index(data, output_dir)
+        resources_dir = output_dir / "resources"
+        if manifest.is_fresh('html:resources', build_key, [resources_dir / "js" / "main.js"]):
+            manifest.reuse('html:resources')
+        else:
+            self._setup_resources(output_dir)
+            manifest.record('html:resources', build_key)
+
+        # Create index.html (main page), then the sections based on configuration
+        search_entries = []
+        sections = ['index'] + [s for s in self.documentation_sections if s in self.PAGES]
+        for section in sections:
+            filename, method_name, artifacts = self.PAGES[section]
+            node = f"html:{filename}"
+            key = manifest.key(build_key, {name: manifest.artifact_hash(name, data) for name in artifacts})
+
+            if manifest.is_fresh(node, key, [output_dir / filename]):
+                entries = manifest.reuse(node).get('search', [])
+                logger.debug(f"Reusing {filename} (inputs unchanged)")
+            else:
+                first_entry = len(self.search_data)
+                getattr(self, method_name)(data, output_dir)
+                entries = self.search_data[first_entry:]
+                entries = entries + self._page_search_entries(output_dir / filename, entries)
+                manifest.record(
+                    node, key,
+                    inputs=[f"artifact:{name}" for name in artifacts],
+                    search=entries,
+                )
 
-        # Generate sections based on configuration
-        for section in self.documentation_sections:
-            if section == 'project_overview':
-                self._generate_project_overview(data, output_dir)
-            elif section == 'models_and_database':
-                self._generate_models_documentation(data, output_dir)
-            elif section == 'api_endpoints':
-                self._generate_api_documentation(data, output_dir)
-            elif section == 'authentication':
-                self._generate_authentication_documentation(data, output_dir)
-            elif section == 'frontend_integration':
-                self._generate_frontend_integration(data, output_dir)
-            elif section == 'typescript_interfaces':
-                self._generate_typescript_overview(data, output_dir)
+            search_entries.extend(entries)
 
         # Generate search index
-        self._generate_search_data(output_dir)
+        self._generate_search_data(output_dir, search_entries, manifest)
 
         logger.info(f"HTML documentation generated in {output_dir}")
 
+    def _build_key(self) -> str:
+        """Hash of everything besides extracted data that shapes every page"""
+        return content_hash([
+            file_hash(__file__),
+            self.detail_level,
+            self.html_theme,
+            self.include_examples,
+            self.backend_url,
+            self.custom_templates_dir,
+            self.documentation_sections,
+        ])
+
+    def _page_search_entries(self, page_path: Path, page_entries: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Search entries for the headings of a generated page"""
+        section = page_entries[0]['section'] if page_entries else page_path.stem
+        with open(page_path, 'r') as f:
+            html = f.read()
+        # Only the main content, not the navigation repeated on every page
+        main = html.split('class="content-inner">', 1)[-1].split('<footer class="footer">', 1)[0]
+        return heading_entries(main, page_path.name, section)
+
     def _setup_resources(self, output_dir: Path) -> None:
         """Set up resources directory with CSS, JS and images
 
@@ -1034,8 +1096,10 @@ pre[class*="language-"] {
  * - Integration with API testing functionality
  *
  * Configuration Variables (set in the HTML):
- * - window.searchData: Array of searchable content objects with structure:
- *   {title: string, content: string, url: string, section: string}
+ * - window.docsSearchIndex: Prebuilt search index (resources/js/search/docs.js):
+ *   {base, docs: [[title, url, section]], shardKeys: [key], shards: {key: {term: [docId]}}}
+ * - window.searchData: Legacy array of {title, content, url, section} objects,
+ *   searched when no index is present
  * - window.backendUrl: Base URL for API testing (optional)
  *
  * Author: nanthiniSanthanam
@@ -1124,9 +1188,87 @@ function setActiveLink() {
     });
 }
 
+/**
+ * Loads the shard of the search index holding terms that start with `key`
+ * @param {string} key - Shard key (first character of the term)
+ * @returns {Promise} Resolved once the shard is available (or missing)
+ */
+function loadSearchShard(key) {
+    const index = window.docsSearchIndex;
+
+    if (index.shards[key] || !index.shardKeys.includes(key)) {
+        return Promise.resolve();
+    }
+
+    index.pending = index.pending || {};
+    if (!index.pending[key]) {
+        index.pending[key] = new Promise(resolve => {
+            const script = document.createElement('script');
+            script.src = index.base + 'shard-' + key + '.js';
+            script.onload = resolve;
+            script.onerror = resolve;
+            document.head.appendChild(script);
+        });
+    }
+    return index.pending[key];
+}
+
+/**
+ * Finds documents matching every word of a query in the prebuilt index
+ * (words match terms by prefix), best matches first
+ * @param {string} query - Lowercase query
+ * @returns {Promise<Array>} Matching {title, url, section} objects
+ */
+function searchIndex(query) {
+    const index = window.docsSearchIndex;
+    const words = query.split(/[^a-z0-9]+/).filter(word => word.length > 1);
+
+    if (words.length === 0) {
+        return Promise.resolve([]);
+    }
+
+    const shardKey = word => /[a-z0-9]/.test(word[0]) ? word[0] : '_';
+
+    return Promise.all(words.map(word => loadSearchShard(shardKey(word)))).then(() => {
+        let scores = null;
+
+        words.forEach(word => {
+            const shard = index.shards[shardKey(word)] || {};
+            const wordScores = new Map();
+
+            Object.keys(shard).forEach(term => {
+                if (term.startsWith(word)) {
+                    shard[term].forEach(docId => {
+                        wordScores.set(docId, (wordScores.get(docId) || 0) + (term === word ? 2 : 1));
+                    });
+                }
+            });
+
+            if (scores === null) {
+                scores = wordScores;
+            } else {
+                scores.forEach((score, docId) => {
+                    if (wordScores.has(docId)) {
+                        scores.set(docId, score + wordScores.get(docId));
+                    } else {
+                        scores.delete(docId);
+                    }
+                });
+            }
+        });
+
+        return Array.from(scores.entries())
+            .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+            .map(([docId]) => {
+                const [title, url, section] = index.docs[docId];
+                return {title, url, section};
+            });
+    });
+}
+
 /**
  * Initializes the search functionality
- * Searches through window.searchData to find matching content
+ * Searches window.docsSearchIndex, or window.searchData when no index is present
  */
 function initSearch() {
     const searchInput = document.getElementById('search-input');
@@ -1134,23 +1276,14 @@ function initSearch() {
 
     if (!searchInput || !searchResults) return;
 
-    // Search data (populated by the backend)
+    // Legacy search data (populated by the backend)
     const searchData = window.searchData || [];
 
-    searchInput.addEventListener('input', function() {
-        const query = this.value.toLowerCase().trim();
+    // Ignore answers to queries the user has already typed past
+    let latestQuery = 0;
 
-        if (query.length < 2) {
-            searchResults.innerHTML = '';
-            searchResults.style.display = 'none';
-            return;
-        }
-
-        // Filter results
-        const results = searchData.filter(item =>
-            item.title.toLowerCase().includes(query) ||
-            item.content.toLowerCase().includes(query)
-        ).slice(0, 10); // Limit to 10 results
+    function showResults(results) {
+        results = results.slice(0, 10); // Limit to 10 results
 
         // Display results
         if (results.length > 0) {
@@ -1173,6 +1306,32 @@ function initSearch() {
             searchResults.innerHTML = '<div class="search-result-item">No results found</div>';
             searchResults.style.display = 'block';
         }
+    }
+
+    searchInput.addEventListener('input', function() {
+        const query = this.value.toLowerCase().trim();
+        const queryId = ++latestQuery;
+
+        if (query.length < 2) {
+            searchResults.innerHTML = '';
+            searchResults.style.display = 'none';
+            return;
+        }
+
+        if (window.docsSearchIndex) {
+            searchIndex(query).then(results => {
+                if (queryId === latestQuery) {
+                    showResults(results);
+                }
+            });
+            return;
+        }
+
+        // Filter results
+        showResults(searchData.filter(item =>
+            item.title.toLowerCase().includes(query) ||
+            item.content.toLowerCase().includes(query)
+        ));
     });
 
     // Hide results when clicking outside
@@ -1250,7 +1409,7 @@ function initCollapsible() {
  */
 
 /* Core Prism functionality */
-var _self="undefined"!=typeof window?window:"undefined"!=typeof WorkerGlobalScope&&self instanceof WorkerGlobalScope?self:{},Prism=function(u){var c=/\\blang(?:uage)?-(\\w+)\\b/i,n=0,e={},M={util:{encode:function(n){return n instanceof W?new W(n.type,M.util.encode(n.content),n.alias):Array.isArray(n)?n.map(M.util.encode):n.replace(/&/g,"&amp;").replace(/</g,"&lt;").replace(/\\u00a0/g," ")}}};function W(e,n,t){this.type=e,this.content=n,this.alias=t}Prism.languages={markup:{comment:/<!--[\\s\\S]*?-->/,prolog:/<\\?[\\s\\S]+?\\?>/,doctype:{pattern:/<!DOCTYPE(?:[^>"'[\\]]|"[^"]*"|'[^']*')+(?:\\[(?:[^<"'\\]]|"[^"]*"|'[^']*'|<(?!!--)|<!--(?:[^-]|-(?!->))*-->)*\\]\\s*)?>/i,greedy:!0},cdata:/<![CDATA[[\\s\\S]*?]]>/i,tag:{pattern:/<\\/?(?!\\d)[^\\s>\\/=$<%]+(?:\\s(?:\\s*[^\\s>\\/=]+(?:\\s*=\\s*(?:"[^"]*"|'[^']*'|[^\\s'">=]+(?=[\\s>]))|(?=[\\s/>])))+)?\\s*\\/?>/,greedy:!0,inside:{tag:{pattern:/^<\\/?[^\\s>\\/]+/,inside:{punctuation:/^<\\/?/,namespace:/^[^\\s>\\/:]+:/}},"attr-value":{pattern:/=\\s*(?:"[^"]*"|'[^']*'|[^\\s'">=]+)/,inside:{punctuation:[{pattern:/^=/,alias:"attr-equals"},/"|'/]}},punctuation:/\\/?>/,"attr-name":{pattern:/[^\\s>\\/]+/,inside:{namespace:/^[^\\s>\\/:]+:/}}}},entity:/&#?[\\da-z]{1,8};/i},css:{comment:/\\/\\*[\\s\\S]*?\\*\\//,atrule:{pattern:/@[\\w-](?:[^;{\\s]|\\s+(?![\\s{]))*(?:;|(?=\\s*\\{))/,inside:{rule:/^@[\\w-]+/,"selector-function-argument":{pattern:/(\([^)]*\))/,lookbehind:!0,alias:"selector"},keyword:{pattern:/(^|[^\\w-])(?:and|not|only|or)(?![\\w-])/,lookbehind:!0}}},url:{pattern:RegExp("\\\\burl\\\\((?:[^\\\\\\\\\\\\)\"']|\\\\\\\\[\\\\s\\\\S])*\\\\)","i"),greedy:!0,inside:{function:/^url/i,punctuation:/^\\(|\\)$/,string:{pattern:RegExp("^[^\\\\s]$"),alias:"url"}}},selector:/[^{}\\s](?:[^{};"'\\s]|\\s+(?![\\s{])|"(?:\\\\.|[^\\\\\\r\\n"])*"|'(?:\\\\.|[^\\\\\\r\\n'])*')*/,property:/(?!\\s)[-_a-z\\xA0-\\uFFFF](?:(?!\\s)[-\\w\\xA0-\\uFFFF])*(?=\\s*:)/i,important:/!important\\b/i,function:/[-a-z0-9]+(?=\\()/i,punctuation:/[(){};:,]/},javascript:{comment:/\\/\\/.*|\\/\\*[\\s\\S]*?\\*\\//,string:{pattern:/(["'])(?:\\\\(?:\\r\\n|[\\s\\S])|(?!\\1)[^\\\\\\r\\n])*\\1/,greedy:!0},keyword:/\\b(?:as|async|await|break|case|catch|class|const|continue|debugger|default|delete|do|else|enum|export|extends|finally|for|from|function|get|if|implements|import|in|instanceof|interface|let|new|null|of|package|private|protected|public|return|set|static|super|switch|this|throw|try|typeof|undefined|var|void|while|with|yield)\\b/,"boolean":/\\b(?:false|true)\\b/,"function":/\\w+(?=\\()/,number:/\\b0x[\\da-f]+\\b|(?:\\b\\d+\\.?\\d*|\\B\\.\\d+)(?:e[+-]?\\d+)?/i,operator:/[<>]=?|[!=]=?=?|--?|\\+\\+?|&&?|\\|\\|?|[?*/~^%]/,punctuation:/[{}[\\];(),.:]/},python:{comment:{pattern:/(^|[^\\\\])#.*/,lookbehind:!0},"string-interpolation":{pattern:/(?:f|rf|fr)(?:(""" | ''')[\\s\\S]*?\\1|("|')(?:\\\\.|(?!\\2)[^\\\\\\r\\n])*\\2)/i,greedy:!0,inside:{interpolation:{pattern:/((?:^|[^{])(?:{{)*){(?!{)(?:[^{}]|{(?!{)(?:[^{}]|{(?!{)(?:[^{}])+})+})+}/,lookbehind:!0,inside:{"format-spec":{pattern:/(:)[^:(){}]+(?=}$)/,lookbehind:!0},"conversion-option":{pattern:/![sra](?=[:}]$)/,alias:"punctuation"},rest:null}},string:/[\\s\\S]+/}},"triple-quoted-string":{pattern:/(?:[rub]|rb|br)?"""|'''/i, greedy: !0, alias: "string"}, string: {pattern: / (?: [rub] | rb | br)?("|')(?:\\\\.|(?!\\1)[^\\\\\\r\\n])*\\1/i,greedy:!0},keyword:/\\b(?:and|as|assert|async|await|break|class|continue|def|del|elif|else|except|exec|finally|for|from|global|if|import|in|is|lambda|nonlocal|not|or|pass|print|raise|return|try|while|with|yield)\\b/,"function":/\\b[a-z_]\\w*(?=\\s*\\()/i},json:{property:{pattern:/"(?: \\\\.|[^\\\\"])*"(?=\\s*:)/,greedy:!0},string:{pattern:/"(?:\\\\.|[^\\\\"])*"/,greedy:!0},comment:/\\/\\/.*|\\/\\*[\\s\\S]*?(?:\\*\\/|$)/,number:/-?\\d+\\.?\\d*(?:e[+-]?\\d+)?/i,punctuation:/[{}[\\],]/,operator:/:/,"boolean":/\\b(?:true|false)\\b/,"null":{pattern:/\\bnull\\b/,alias:"keyword"}}};
+var _self="undefined"!=typeof window?window:"undefined"!=typeof WorkerGlobalScope&&self instanceof WorkerGlobalScope?self:{},Prism=function(u){var c=/\\blang(?:uage)?-(\\w+)\\b/i,n=0,e={},M={util:{encode:function(n){return n instanceof W?new W(n.type,M.util.encode(n.content),n.alias):Array.isArray(n)?n.map(M.util.encode):n.replace(/&/g,"&amp;").replace(/</g,"&lt;").replace(/\\u00a0/g," ")}}};function W(e,n,t){this.type=e,this.content=n,this.alias=t}Prism.languages={markup:{comment:/<!--[\\s\\S]*?-->/,prolog:/<\\?[\\s\\S]+?\\?>/,doctype:{pattern:/<!DOCTYPE(?:[^>"'[\\]]|"[^"]*"|'[^']*')+(?:\\[(?:[^<"'\\]]|"[^"]*"|'[^']*'|<(?!!--)|<!--(?:[^-]|-(?!->))*-->)*\\]\\s*)?>/i,greedy:!0},cdata:/<![CDATA[[\\s\\S]*?]]>/i,tag:{pattern:/<\\/?(?!\\d)[^\\s>\\/=$<%]+(?:\\s(?:\\s*[^\\s>\\/=]+(?:\\s*=\\s*(?:"[^"]*"|'[^']*'|[^\\s'">=]+(?=[\\s>]))|(?=[\\s/>])))+)?\\s*\\/?>/,greedy:!0,inside:{tag:{pattern:/^<\\/?[^\\s>\\/]+/,inside:{punctuation:/^<\\/?/,namespace:/^[^\\s>\\/:]+:/}},"attr-value":{pattern:/=\\s*(?:"[^"]*"|'[^']*'|[^\\s'">=]+)/,inside:{punctuation:[{pattern:/^=/,alias:"attr-equals"},/"|'/]}},punctuation:/\\/?>/,"attr-name":{pattern:/[^\\s>\\/]+/,inside:{namespace:/^[^\\s>\\/:]+:/}}}},entity:/&#?[\\da-z]{1,8};/i},css:{comment:/\\/\\*[\\s\\S]*?\\*\\//,atrule:{pattern:/@[\\w-](?:[^;{\\s]|\\s+(?![\\s{]))*(?:;|(?=\\s*\\{))/,inside:{rule:/^@[\\w-]+/,"selector-function-argument":{pattern:/(\([^)]*\))/,lookbehind:!0,alias:"selector"},keyword:{pattern:/(^|[^\\w-])(?:and|not|only|or)(?![\\w-])/,lookbehind:!0}}},url:{pattern:RegExp("\\\\burl\\\\((?:[^\\\\\\\\\\\\)\"']|\\\\\\\\[\\\\s\\\\S])*\\\\)","i"),greedy:!0,inside:{function:/^url/i,punctuation:/^\\(|\\)$/,string:{pattern:RegExp("^[^\\\\s]$"),alias:"url"}}},selector:/[^{}\\s](?:[^{};"'\\s]|\\s+(?![\\s{])|"(?:\\\\.|[^\\\\\\r\\n"])*"|'(?:\\\\.|[^\\\\\\r\\n'])*')*/,property:/(?!\\s)[-_a-z\\xA0-\\uFFFF](?:(?!\\s)[-\\w\\xA0-\\uFFFF])*(?=\\s*:)/i,important:/!important\\b/i,function:/[-a-z0-9]+(?=\\()/i,punctuation:/[(){};:,]/},javascript:{comment:/\\/\\/.*|\\/\\*[\\s\\S]*?\\*\\//,string:{pattern:/(["'])(?:\\\\(?:\\r\\n|[\\s\\S])|(?!\\1)[^\\\\\\r\\n])*\\1/,greedy:!0},keyword:/\\b(?:as|async|await|break|case|catch|class|const|continue|debugger|default|delete|do|else|enum|export|extends|finally|for|from|function|get|if|implements|import|in|instanceof|interface|let|new|null|of|package|private|protected|public|return|set|static|super|switch|this|throw|try|typeof|undefined|var|void|while|with|yield)\\b/,"boolean":/\\b(?:false|true)\\b/,"function":/\\w+(?=\\()/,number:/\\b0x[\\da-f]+\\b|(?:\\b\\d+\\.?\\d*|\\B\\.\\d+)(?:e[+-]?\\d+)?/i,operator:/[<>]=?|[!=]=?=?|--?|\\+\\+?|&&?|\\|\\|?|[?*/~^%]/,punctuation:/[{}[\\];(),.:]/},python:{comment:{pattern:/(^|[^\\\\])#.*/,lookbehind:!0},"string-interpolation":{pattern:/(?:f|rf|fr)(?:(\""" | ''')[\\s\\S]*?\\1|("|')(?:\\\\.|(?!\\2)[^\\\\\\r\\n])*\\2)/i,greedy:!0,inside:{interpolation:{pattern:/((?:^|[^{])(?:{{)*){(?!{)(?:[^{}]|{(?!{)(?:[^{}]|{(?!{)(?:[^{}])+})+})+}/,lookbehind:!0,inside:{"format-spec":{pattern:/(:)[^:(){}]+(?=}$)/,lookbehind:!0},"conversion-option":{pattern:/![sra](?=[:}]$)/,alias:"punctuation"},rest:null}},string:/[\\s\\S]+/}},"triple-quoted-string":{pattern:/(?:[rub]|rb|br)?\"""|'''/i, greedy: !0, alias: "string"}, string: {pattern: / (?: [rub] | rb | br)?("|')(?:\\\\.|(?!\\1)[^\\\\\\r\\n])*\\1/i,greedy:!0},keyword:/\\b(?:and|as|assert|async|await|break|class|continue|def|del|elif|else|except|exec|finally|for|from|global|if|import|in|is|lambda|nonlocal|not|or|pass|print|raise|return|try|while|with|yield)\\b/,"function":/\\b[a-z_]\\w*(?=\\s*\\()/i},json:{property:{pattern:/"(?: \\\\.|[^\\\\"])*"(?=\\s*:)/,greedy:!0},string:{pattern:/"(?:\\\\.|[^\\\\"])*"/,greedy:!0},comment:/\\/\\/.*|\\/\\*[\\s\\S]*?(?:\\*\\/|$)/,number:/-?\\d+\\.?\\d*(?:e[+-]?\\d+)?/i,punctuation:/[{}[\\],]/,operator:/:/,"boolean":/\\b(?:true|false)\\b/,"null":{pattern:/\\bnull\\b/,alias:"keyword"}}};
 
 // Initialize Prism for syntax highlighting
 document.addEventListener('DOMContentLoaded', function() {
@@ -1594,6 +1753,7 @@ function sendApiRequest(form, endpoint, method, responseElement) {
     
     <!-- Scripts -->
     <script src="resources/js/prism.js"></script>
+    <script src="resources/js/search/docs.js"></script>
     <script src="resources/js/main.js"></script>
     <script src="resources/js/api-testing.js"></script>
     
@@ -1606,49 +1766,41 @@ function sendApiRequest(form, endpoint, method, responseElement) {
         
         return html_template
 
-    def _generate_search_data(self, output_dir: Path) -> None:
-        """Generate search data file for documentation search
+    def _generate_search_data(self, output_dir: Path, entries: List[Dict[str, str]], manifest: BuildManifest) -> None:
+        """Write the sharded search index for documentation search
 
         Args:
             output_dir: Directory where HTML files are generated
+            entries: Search entries of every page
+            manifest: Build manifest; shards whose content is unchanged are not rewritten
         """
-        if not self.search_data:
-            return
-            
-        search_js = output_dir / "resources" / "js" / "search-data.js"
-        
-        # Convert search data to JSON
-        search_json = json.dumps(self.search_data, indent=2)
-        
-        search_js_content = f"""
-/**
- * Search data for documentation search
- * Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
- */
- 
-window.searchData = {search_json};
-"""
-        
-        # Write search data
-        with open(search_js, 'w') as f:
-            f.write(search_js_content)
-        
-        logger.info("Generated search data")
-        
-        # Add search data script to all HTML files
-        for html_file in output_dir.glob("*.html"):
-            with open(html_file, 'r') as f:
-                content = f.read()
-                
-            # Add search-data.js before closing body tag if not already present
-            if "search-data.js" not in content:
-                content = content.replace(
-                    "    <script>\n        // Initialize search data",
-                    '    <script src="resources/js/search-data.js"></script>\n    <script>\n        // Initialize search data'
-                )
-                
-                with open(html_file, 'w') as f:
-                    f.write(content)
+        search_dir = output_dir.joinpath(*SEARCH_DIR)
+        search_dir.mkdir(parents=True, exist_ok=True)
+
+        docs, shards = build_search_index(entries)
+
+        files = {'docs.js': render_docs_js(docs, list(shards))}
+        for key, terms in shards.items():
+            files[f'shard-{key}.js'] = render_shard_js(key, terms)
+
+        written = 0
+        for filename, content in files.items():
+            node = f"search:{filename}"
+            key = content_hash(content)
+            if manifest.is_fresh(node, key, [search_dir / filename]):
+                manifest.reuse(node)
+                continue
+            with open(search_dir / filename, 'w') as f:
+                f.write(content)
+            manifest.record(node, key, inputs=[f"html:{entry['url'].split('#')[0]}" for entry in entries])
+            written += 1
+
+        # Remove shards for terms that no longer exist
+        for stale in search_dir.glob('shard-*.js'):
+            if stale.name not in files:
+                stale.unlink()
+
+        logger.info(f"Generated search index: {len(docs)} entries in {len(shards)} shards ({written} files written)")
 
     def _add_to_search_data(self, title: str, content: str, url: str, section: str) -> None:
         """Add page content to search data
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Prebuilt, sharded search index for the HTML documentation
+
+The index is built once at generation time instead of filtering a full copy
+of the documentation text in the browser:
+
+- resources/js/search/docs.js: the document table (title, url, section) and
+  the list of shard keys
+- resources/js/search/shard-<key>.js: inverted index ``{term: [doc ids]}``
+  for the terms starting with <key> (a letter or digit, "_" for the rest)
+
+Pages load docs.js only; main.js loads the shards a query needs on demand
+through script tags, which also works for documentation opened via file://.
+
+Author: nanthiniSanthanam
+Version: 1.0.0
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Tuple
+
+# Location of the index relative to the HTML output directory
+SEARCH_DIR = ('resources', 'js', 'search')
+
+# Words too common to be worth indexing
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'it',
+    'of', 'on', 'or', 'the', 'this', 'to', 'with',
+}
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+_TAG_RE = re.compile(r'<.*?>', re.S)
+_HEADING_RE = re.compile(r'<h([23])(?:\s+id="([^"]*)")?[^>]*>(.*?)</h\1>', re.S)
+
+
+def strip_html(html: str) -> str:
+    """Plain text of an HTML fragment, whitespace collapsed"""
+    return re.sub(r'\s+', ' ', _TAG_RE.sub(' ', html)).strip()
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase index terms of a text"""
+    return [
+        token for token in _TOKEN_RE.findall(text.lower())
+        if len(token) > 1 and token not in STOP_WORDS
+    ]
+
+
+def shard_key(term: str) -> str:
+    """Shard holding a term: its first character if alphanumeric"""
+    first = term[:1]
+    return first if first.isalnum() else '_'
+
+
+def heading_entries(html: str, page_url: str, section: str) -> List[Dict[str, str]]:
+    """Search entries for the h2/h3 headings of a generated page
+
+    h2 headings with an id link to themselves; other headings link to the
+    closest anchored h2 above them.
+    """
+    entries = []
+    anchor = ''
+    for level, heading_id, heading_html in _HEADING_RE.findall(html):
+        if heading_id:
+            anchor = f'#{heading_id}'
+        title = strip_html(heading_html)
+        if not title or (level == '2' and not heading_id):
+            continue
+        entries.append({
+            'title': title,
+            'content': '',
+            'url': f'{page_url}{anchor}',
+            'section': section,
+        })
+    return entries
+
+
+def build_search_index(entries: List[Dict[str, Any]]) -> Tuple[List[List[str]], Dict[str, Dict[str, List[int]]]]:
+    """Build the document table and the term shards from search entries
+
+    Returns:
+        (docs, shards): ``[[title, url, section], ...]`` and
+        ``{shard key: {term: [doc ids]}}``
+    """
+    docs = []
+    shards = {}
+
+    for doc_id, entry in enumerate(entries):
+        docs.append([entry['title'], entry['url'], entry['section']])
+
+        terms = set(tokenize(f"{entry['title']} {entry.get('content', '')} {entry['section']}"))
+        for term in terms:
+            shards.setdefault(shard_key(term), {}).setdefault(term, []).append(doc_id)
+
+    return docs, shards
+
+
+def render_docs_js(docs: List[List[str]], shard_keys: List[str]) -> str:
+    """JavaScript defining the document table and the available shards"""
+    index = {
+        'base': '/'.join(SEARCH_DIR) + '/',
+        'docs': docs,
+        'shardKeys': sorted(shard_keys),
+        'shards': {},
+    }
+    return (
+        "/**\n * Search index: document table (shards are loaded on demand)\n */\n"
+        f"window.docsSearchIndex = {json.dumps(index, sort_keys=True)};\n"
+    )
+
+
+def render_shard_js(key: str, terms: Dict[str, List[int]]) -> str:
+    """JavaScript registering one shard of the inverted index"""
+    return (
+        f"window.docsSearchIndex && (window.docsSearchIndex.shards[{json.dumps(key)}] = "
+        f"{json.dumps(terms, sort_keys=True)});\n"
+    )
@@ -13,6 +13,7 @@ import os
 import sys
 import logging
 import argparse
+import inspect
 import time
 import json
 from datetime import datetime
@@ -35,6 +36,10 @@ from generators.typescript_generator import TypeScriptGenerator
 from generators.react_hooks_generator import ReactHooksGenerator
 
 # Import utilities
+from utils.build_manifest import (
+    ARTIFACT_DEPENDENCIES, COMMON_SOURCES, EXTRACTOR_CONFIG, EXTRACTOR_SOURCES,
+    BuildManifest, SourceTree, artifact_hash, file_hash,
+)
 from utils.django_setup import setup_django_environment
 from utils.logger import setup_logger
 
@@ -92,6 +97,13 @@ class BackendDocumentationGenerator:
             'frontend_integration': {}
         }
 
+        # Build graph state for incremental builds; the manifest is written on
+        # every run so that the next incremental run has something to compare to
+        self.incremental = getattr(self.config, 'INCREMENTAL_BUILD', False)
+        self.manifest = BuildManifest(self.output_dir, enabled=self.incremental)
+        self.sources = SourceTree(self.config.BACKEND_PROJECT_PATH)
+        self.previous_data = self._load_previous_data() if self.incremental else {}
+
     def run(self):
         """Run the complete documentation generation process"""
         self.logger.info("Starting backend documentation generation")
@@ -111,6 +123,11 @@ class BackendDocumentationGenerator:
         # Step 5: Create index and navigation
         self._create_index()
 
+        # Step 6: Record the build graph for the next incremental run
+        self.manifest.save()
+        if self.incremental:
+            self.logger.info(f"Incremental build: {self.manifest.summary()}")
+
         # Report completion
         elapsed_time = time.time() - self.start_time
         self.logger.info(
@@ -159,44 +176,25 @@ class BackendDocumentationGenerator:
         """Run all extractors to gather information"""
         self.logger.info("Running extractors")
 
-        # Models extraction
-        self.logger.info("Extracting model information")
-        try:
-            self.data['models'] = self.extractors['models'].extract()
-        except Exception as e:
-            self.logger.error(f"Error extracting models: {str(e)}")
-
-        # API endpoints extraction
-        self.logger.info("Extracting API endpoint information")
-        try:
-            self.data['apis'] = self.extractors['apis'].extract()
-        except Exception as e:
-            self.logger.error(f"Error extracting APIs: {str(e)}")
-
-        # Serializers extraction
-        self.logger.info("Extracting serializer information")
-        try:
-            self.data['serializers'] = self.extractors['serializers'].extract()
-        except Exception as e:
-            self.logger.error(f"Error extracting serializers: {str(e)}")
+        # Project information is always recomputed; it is cheap and feeds the index page
+        self.manifest.record(
+            'artifact:project_info', artifact_hash(self.data, 'project_info'),
+            hash=artifact_hash(self.data, 'project_info'),
+        )
 
-        # Authentication extraction
-        self.logger.info("Extracting authentication information")
-        try:
-            self.data['authentication'] = self.extractors['authentication'].extract()
-        except Exception as e:
-            self.logger.error(f"Error extracting authentication: {str(e)}")
+        self._run_extractor('models', "model information")
+        self._run_extractor('apis', "API endpoint information")
+        self._run_extractor('serializers', "serializer information")
+        self._run_extractor('authentication', "authentication information")
 
         # Runtime API testing
-        if self.config.BACKEND_URL:
-            self.logger.info("Running runtime API tests")
-            try:
-                self.data['runtime_tests'] = self.extractors['runtime'].extract(
-                    apis=self.data['apis'],
-                    auth_info=self.data['authentication']
-                )
-            except Exception as e:
-                self.logger.error(f"Error running API tests: {str(e)}")
+        if self.config.BACKEND_URL or getattr(self.config, 'RUNTIME_WSGI_APPLICATION', ''):
+            self._run_extractor(
+                'runtime_tests', "runtime API test results",
+                extractor='runtime',
+                apis=self.data['apis'],
+                auth_info=self.data['authentication'],
+            )
         else:
             self.logger.warning(
                 "Skipping runtime API tests (BACKEND_URL not configured)")
@@ -208,6 +206,74 @@ class BackendDocumentationGenerator:
 
         self.logger.info(f"Raw extracted data saved to {raw_data_path}")
 
+    def _load_previous_data(self):
+        """Extracted data of the previous run, reused for unchanged artifacts"""
+        raw_data_path = self.output_dir / "raw_extracted_data.json"
+        if not raw_data_path.exists():
+            return {}
+        try:
+            with open(raw_data_path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not read previous extracted data: {str(e)}")
+            return {}
+
+    def _config_values(self, names):
+        return {name: getattr(self.config, name, None) for name in names}
+
+    def _artifact_key(self, name, extractor):
+        """Key of an extracted artifact: its source files, upstream artifacts and settings"""
+        inputs = {
+            'extractor': file_hash(inspect.getsourcefile(type(extractor))),
+            'config': self._config_values(EXTRACTOR_CONFIG.get(name, [])),
+        }
+        if name in EXTRACTOR_SOURCES:
+            inputs['sources'] = self.sources.fingerprint(COMMON_SOURCES + EXTRACTOR_SOURCES[name])
+        for upstream in ARTIFACT_DEPENDENCIES.get(name, []):
+            inputs[upstream] = self.manifest.artifact_hash(upstream, self.data)
+        return self.manifest.key(inputs)
+
+    def _run_extractor(self, name, description, extractor=None, **kwargs):
+        """Run one extractor, or reuse its previous output if none of its inputs changed"""
+        extractor = self.extractors[extractor or name]
+        node = f"artifact:{name}"
+        key = self._artifact_key(name, extractor)
+
+        if self.manifest.is_fresh(node, key) and name in self.previous_data:
+            self.logger.info(f"Reusing {description} (inputs unchanged)")
+            self.data[name] = self.previous_data[name]
+            self.manifest.reuse(node)
+            return
+
+        self.logger.info(f"Extracting {description}")
+        try:
+            self.data[name] = extractor.extract(**kwargs)
+        except Exception as e:
+            # Not recorded, so the next run extracts again
+            self.logger.error(f"Error extracting {description}: {str(e)}")
+            return
+
+        inputs = [f"artifact:{upstream}" for upstream in ARTIFACT_DEPENDENCIES.get(name, [])]
+        self.manifest.record(node, key, inputs=inputs, hash=artifact_hash(self.data, name))
+
+    def _run_generator(self, name, artifacts, output_dir, generate):
+        """Run a whole-output generator unless its generator, settings and artifacts are unchanged"""
+        node = f"generator:{name}"
+        key = self.manifest.key(
+            file_hash(inspect.getsourcefile(type(self.generators[name]))),
+            {k: v for k, v in self._config_values(dir(self.config)).items()
+             if k.isupper() and k not in ('VERBOSITY', 'INCREMENTAL_BUILD')},
+            {artifact: self.manifest.artifact_hash(artifact, self.data) for artifact in artifacts},
+        )
+
+        if self.manifest.is_fresh(node, key, [output_dir]):
+            self.logger.info(f"Reusing {name} output (inputs unchanged)")
+            self.manifest.reuse(node)
+            return
+
+        generate()
+        self.manifest.record(node, key, inputs=[f"artifact:{artifact}" for artifact in artifacts])
+
     def _generate_documentation(self):
         """Generate documentation in specified formats"""
         self.logger.info("Generating documentation")
@@ -217,25 +283,31 @@ class BackendDocumentationGenerator:
             self.logger.info("Generating Markdown documentation")
             markdown_dir = self.output_dir / "markdown"
             markdown_dir.mkdir(exist_ok=True)
-            self.generators['markdown'].generate(self.data, markdown_dir)
+            self._run_generator(
+                'markdown', list(self.data), markdown_dir,
+                lambda: self.generators['markdown'].generate(self.data, markdown_dir)
+            )
 
-        # Generate HTML documentation
+        # Generate HTML documentation (incremental per page)
         if self.config.OUTPUT_FORMAT in ["html", "all"]:
             self.logger.info("Generating HTML documentation")
             html_dir = self.output_dir / "html"
             html_dir.mkdir(exist_ok=True)
-            self.generators['html'].generate(self.data, html_dir)
+            self.generators['html'].generate(self.data, html_dir, manifest=self.manifest)
 
         # Generate TypeScript interfaces
         if self.config.GENERATE_TYPESCRIPT:
             self.logger.info("Generating TypeScript interfaces")
             typescript_dir = self.output_dir / "typescript"
             typescript_dir.mkdir(exist_ok=True)
-            self.generators['typescript'].generate(
-                models=self.data['models'],
-                apis=self.data['apis'],
-                serializers=self.data['serializers'],
-                output_dir=typescript_dir
+            self._run_generator(
+                'typescript', ['models', 'apis', 'serializers'], typescript_dir,
+                lambda: self.generators['typescript'].generate(
+                    models=self.data['models'],
+                    apis=self.data['apis'],
+                    serializers=self.data['serializers'],
+                    output_dir=typescript_dir
+                )
             )
 
         # Generate React hooks
@@ -243,10 +315,13 @@ class BackendDocumentationGenerator:
             self.logger.info("Generating React hook examples")
             hooks_dir = self.output_dir / "react_hooks"
             hooks_dir.mkdir(exist_ok=True)
-            self.generators['react_hooks'].generate(
-                apis=self.data['apis'],
-                auth_info=self.data['authentication'],
-                output_dir=hooks_dir
+            self._run_generator(
+                'react_hooks', ['apis', 'authentication'], hooks_dir,
+                lambda: self.generators['react_hooks'].generate(
+                    apis=self.data['apis'],
+                    auth_info=self.data['authentication'],
+                    output_dir=hooks_dir
+                )
             )
 
     def _create_index(self):
@@ -355,6 +430,12 @@ def parse_arguments():
     parser.add_argument("--backend-url", dest="BACKEND_URL",
                         help="URL of running backend server for runtime tests")
 
+    parser.add_argument("--wsgi-app", dest="RUNTIME_WSGI_APPLICATION",
+                        help="Dotted path to a WSGI application to test in-process instead of over the network")
+
+    parser.add_argument("--workers", dest="RUNTIME_MAX_WORKERS", type=int,
+                        help="Number of endpoints tested concurrently during runtime tests")
+
     parser.add_argument("--output-dir", dest="OUTPUT_DIR",
                         help="Directory where documentation will be generated")
 
@@ -373,6 +454,12 @@ def parse_arguments():
     parser.add_argument("--token", dest="AUTH_TOKEN",
                         help="JWT token for testing authenticated endpoints")
 
+    parser.add_argument("--incremental", dest="INCREMENTAL_BUILD", action="store_true", default=None,
+                        help="Only re-extract and regenerate what changed since the last run")
+
+    parser.add_argument("--full", dest="INCREMENTAL_BUILD", action="store_false", default=None,
+                        help="Rebuild everything, ignoring the build manifest")
+
     parser.add_argument("--verbose", "-v", action="count", default=0, dest="VERBOSITY",
                         help="Increase verbosity (can be used multiple times)")
 
@@ -0,0 +1,247 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+# The extractor is run as a script from its own directory (see main.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+from generators.html_generator import HtmlGenerator  # noqa: E402
+from generators.search_index import (  # noqa: E402
+    SEARCH_DIR, build_search_index, render_docs_js, render_shard_js, shard_key, tokenize,
+)
+from utils.build_manifest import (  # noqa: E402
+    COMMON_SOURCES, EXTRACTOR_SOURCES, MANIFEST_NAME, BuildManifest, SourceTree, artifact_hash,
+)
+
+
+def make_config(**overrides):
+    values = {name: getattr(config, name) for name in dir(config) if name.isupper()}
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def make_data():
+    return {
+        'project_info': {'name': 'demo', 'apps': ['courses'], 'extraction_date': '2025-05-04'},
+        'models': {},
+        'apis': {},
+        'serializers': {},
+        'authentication': {},
+        'runtime_tests': {},
+        'frontend_integration': {},
+    }
+
+
+def entry(title, content='', url='page.html', section='Models'):
+    return {'title': title, 'content': content, 'url': url, 'section': section}
+
+
+def load_js(path, prefix):
+    """JSON payload of a generated search script"""
+    text = Path(path).read_text()
+    return json.loads(text.split(prefix, 1)[1].rsplit(')', 1)[0].rstrip(';\n'))
+
+
+class TempDirMixin:
+    def setUp(self):
+        super().setUp()
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+
+    def write(self, relative, text):
+        path = self.tmp / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        return path
+
+
+# Source tree tests
+class SourceTreeTests(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.write('project/settings.py', 'DEBUG = True\n')
+        self.write('courses/models.py', 'class Course: pass\n')
+        self.write('courses/views/api.py', 'def view(): pass\n')
+        self.write('courses/migrations/0001_initial.py', 'operations = []\n')
+        self.write('urls.py', 'urlpatterns = []\n')
+
+    def test_patterns_match_nested_and_root_files(self):
+        tree = SourceTree(self.tmp)
+        self.assertEqual(tree.match(['**/urls.py']), ['urls.py'])
+        self.assertEqual(tree.match(['**/views/*.py', '**/models.py']), ['courses/models.py', 'courses/views/api.py'])
+        self.assertNotIn('courses/migrations/0001_initial.py', tree.files())
+
+    def test_fingerprint_follows_file_contents(self):
+        patterns = COMMON_SOURCES + EXTRACTOR_SOURCES['models']
+        before = SourceTree(self.tmp).fingerprint(patterns)
+        self.assertEqual(sorted(before), ['courses/models.py', 'project/settings.py'])
+
+        self.write('courses/views/api.py', 'def view(): return 1\n')
+        self.assertEqual(SourceTree(self.tmp).fingerprint(patterns), before)
+
+        self.write('courses/models.py', 'class Course: title = None\n')
+        after = SourceTree(self.tmp).fingerprint(patterns)
+        self.assertNotEqual(after['courses/models.py'], before['courses/models.py'])
+        self.assertEqual(after['project/settings.py'], before['project/settings.py'])
+
+    def test_changed_file_only_changes_the_artifacts_reading_it(self):
+        def keys():
+            tree, manifest = SourceTree(self.tmp), BuildManifest(self.tmp, enabled=False)
+            return {
+                name: manifest.key(tree.fingerprint(COMMON_SOURCES + patterns))
+                for name, patterns in EXTRACTOR_SOURCES.items()
+            }
+
+        before = keys()
+        self.assertEqual(keys(), before)
+
+        self.write('courses/models.py', 'class Course: title = None\n')
+        after = keys()
+        self.assertEqual(sorted(name for name in before if after[name] != before[name]), ['models', 'serializers'])
+
+
+# Build manifest tests
+class BuildManifestTests(TempDirMixin, unittest.TestCase):
+    def test_unchanged_key_is_fresh_after_reload(self):
+        output = self.write('out/page.html', '<html></html>')
+        manifest = BuildManifest(self.tmp)
+        key = manifest.key({'sources': {'models.py': 'abc'}})
+        manifest.record('html:page.html', key, inputs=['artifact:models'], search=[entry('Course')])
+        manifest.save()
+
+        manifest = BuildManifest(self.tmp)
+        self.assertTrue(manifest.is_fresh('html:page.html', key, [output]))
+        self.assertFalse(manifest.is_fresh('html:page.html', manifest.key({'sources': {'models.py': 'def'}})))
+        self.assertEqual(manifest.reuse('html:page.html')['search'], [entry('Course')])
+        self.assertEqual(manifest.summary(), '0 rebuilt, 1 reused')
+
+    def test_missing_output_is_not_fresh(self):
+        manifest = BuildManifest(self.tmp)
+        manifest.record('html:page.html', 'k')
+        manifest.save()
+
+        self.assertFalse(BuildManifest(self.tmp).is_fresh('html:page.html', 'k', [self.tmp / 'page.html']))
+
+    def test_disabled_unreadable_or_outdated_manifests_start_empty(self):
+        manifest = BuildManifest(self.tmp)
+        manifest.record('artifact:models', 'k')
+        manifest.save()
+        self.assertFalse(BuildManifest(self.tmp, enabled=False).is_fresh('artifact:models', 'k'))
+
+        self.write(MANIFEST_NAME, json.dumps({'version': 0, 'nodes': {'artifact:models': {'key': 'k'}}}))
+        self.assertEqual(BuildManifest(self.tmp).previous, {})
+
+        self.write(MANIFEST_NAME, '{not json')
+        with self.assertLogs('utils.build_manifest', 'WARNING'):
+            self.assertEqual(BuildManifest(self.tmp).previous, {})
+
+    def test_artifact_hash_ignores_volatile_fields(self):
+        data = make_data()
+        before = artifact_hash(data, 'project_info')
+        data['project_info']['extraction_date'] = '2025-05-05'
+        self.assertEqual(artifact_hash(data, 'project_info'), before)
+        data['project_info']['apps'].append('users')
+        self.assertNotEqual(artifact_hash(data, 'project_info'), before)
+
+
+# Incremental HTML generation tests
+class IncrementalHtmlTests(TempDirMixin, unittest.TestCase):
+    def generate(self, data):
+        manifest = BuildManifest(self.tmp)
+        HtmlGenerator(make_config()).generate(data, self.tmp, manifest)
+        manifest.save()
+        return manifest
+
+    def test_unchanged_data_skips_regeneration(self):
+        data = make_data()
+        self.generate(data)
+        mtimes = {path: path.stat().st_mtime_ns for path in self.tmp.rglob('*') if path.is_file()}
+
+        manifest = self.generate(data)
+
+        self.assertEqual(manifest.rebuilt, [])
+        self.assertIn('html:index.html', manifest.reused)
+        changed = [
+            path for path, mtime in mtimes.items()
+            if path.name != MANIFEST_NAME and path.stat().st_mtime_ns != mtime
+        ]
+        self.assertEqual(changed, [])
+
+    def test_changed_artifact_rebuilds_only_its_pages(self):
+        data = make_data()
+        self.generate(data)
+        authentication_page = (self.tmp / 'authentication.html').read_text()
+
+        data['models'] = {'courses': {'Course': {'name': 'Course', 'fields': []}}}
+        manifest = self.generate(data)
+
+        pages = sorted(node for node in manifest.rebuilt if node.startswith('html:'))
+        self.assertEqual(pages, ['html:index.html', 'html:models_and_database.html'])
+        self.assertIn('html:authentication.html', manifest.reused)
+        self.assertEqual((self.tmp / 'authentication.html').read_text(), authentication_page)
+
+    def test_deleted_page_is_regenerated(self):
+        data = make_data()
+        self.generate(data)
+        (self.tmp / 'project_overview.html').unlink()
+
+        manifest = self.generate(data)
+
+        self.assertEqual([n for n in manifest.rebuilt if n.startswith('html:')], ['html:project_overview.html'])
+        self.assertTrue((self.tmp / 'project_overview.html').exists())
+
+
+# Search index tests
+class SearchIndexTests(TempDirMixin, unittest.TestCase):
+    def test_terms_are_found_in_their_shard(self):
+        docs, shards = build_search_index([
+            entry('Course model', 'Stores the course catalogue'),
+            entry('Enrollment', 'Links a user to a course', url='enrollment.html'),
+            entry('2FA settings', section='Authentication'),
+        ])
+
+        self.assertEqual(docs[1], ['Enrollment', 'enrollment.html', 'Models'])
+        self.assertEqual(shards[shard_key('course')]['course'], [0, 1])
+        self.assertEqual(shards['2']['2fa'], [2])
+        self.assertNotIn('the', shards.get('t', {}))
+        self.assertEqual(shard_key('_private'), '_')
+        self.assertEqual(tokenize('The API for a Course'), ['api', 'course'])
+
+    def test_rendered_scripts_list_and_register_shards(self):
+        docs, shards = build_search_index([entry('Course'), entry('Lesson')])
+        docs_path = self.write('docs.js', render_docs_js(docs, list(shards)))
+        shard_path = self.write('shard-c.js', render_shard_js('c', shards['c']))
+
+        index = load_js(docs_path, 'window.docsSearchIndex = ')
+        self.assertEqual(index['shardKeys'], ['c', 'l', 'm'])
+        self.assertEqual(index['base'], '/'.join(SEARCH_DIR) + '/')
+        self.assertEqual(load_js(shard_path, '.shards["c"] = '), {'course': [0]})
+
+    def test_only_changed_shards_are_rewritten(self):
+        generator = HtmlGenerator(make_config())
+        entries = [entry('Course', 'catalogue'), entry('Lesson', 'video')]
+        manifest = BuildManifest(self.tmp)
+        generator._generate_search_data(self.tmp, entries, manifest)
+        manifest.save()
+
+        entries[1] = entry('Lesson', 'quiz')
+        manifest = BuildManifest(self.tmp)
+        generator._generate_search_data(self.tmp, entries, manifest)
+
+        self.assertEqual(sorted(manifest.rebuilt), ['search:docs.js', 'search:shard-q.js'])
+        self.assertEqual(
+            sorted(manifest.reused), ['search:shard-c.js', 'search:shard-l.js', 'search:shard-m.js']
+        )
+        search_dir = self.tmp.joinpath(*SEARCH_DIR)
+        self.assertFalse((search_dir / 'shard-v.js').exists())
+        self.assertEqual(load_js(search_dir / 'shard-q.js', '.shards["q"] = '), {'quiz': [1]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import json
+import os
+import sys
+import threading
+import unittest
+from types import SimpleNamespace
+
+# The extractor is run as a script from its own directory (see main.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+from extractors.runtime_tester import REQUESTS_AVAILABLE, RuntimeTester, summarize_latencies  # noqa: E402
+
+COURSES = [{"id": 1, "slug": "intro"}, {"id": 2, "slug": "advanced"}]
+
+requests_seen = []
+requests_lock = threading.Lock()
+
+
+def app(environ, start_response):
+    """WSGI application serving a course list, course details and their lessons"""
+    path = environ["PATH_INFO"]
+    with requests_lock:
+        requests_seen.append(path)
+
+    parts = [part for part in path.split("/") if part]
+    body, status = None, "404 Not Found"
+    if parts == ["api", "courses"]:
+        body = {"count": len(COURSES), "next": None, "previous": None, "results": COURSES}
+    elif parts[:2] == ["api", "courses"] and len(parts) >= 3:
+        course = next((c for c in COURSES if c["slug"] == parts[2]), None)
+        if course and len(parts) == 3:
+            body = course
+        elif course and parts[3:] == ["lessons"]:
+            body = [{"id": 10, "course": course["id"]}]
+    if body is not None:
+        status = "200 OK"
+
+    start_response(status, [("Content-Type", "application/json")])
+    return [json.dumps(body or {"detail": "Not found."}).encode("utf-8")]
+
+
+def make_config(**overrides):
+    values = {name: getattr(config, name) for name in dir(config) if name.isupper()}
+    values.update(
+        BACKEND_URL="",
+        AUTH_USERNAME="",
+        AUTH_PASSWORD="",
+        TEST_ERROR_SCENARIOS=False,
+        RUNTIME_WSGI_APPLICATION=f"{__name__}.app",
+        RUNTIME_SAMPLES_PER_ENDPOINT=2,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def endpoint(path, methods=("get",)):
+    return {"path": path, "http_methods": list(methods)}
+
+
+# Runtime tester tests
+@unittest.skipUnless(REQUESTS_AVAILABLE, "requests is not installed")
+class RuntimeTesterTests(unittest.TestCase):
+    def setUp(self):
+        requests_seen.clear()
+
+    def test_detail_paths_are_filled_from_the_collection(self):
+        apis = {"endpoints": [
+            endpoint("/api/courses/{slug}/lessons/"),
+            endpoint("/api/courses/<slug:slug>/"),
+            endpoint("/api/courses/"),
+            endpoint("/api/courses/", ("get",)),
+            endpoint("/api/courses\\.(?P<format>[a-z0-9]+)/?$"),
+            endpoint("/api/enrollments/{pk}/"),
+            endpoint("/api/courses/create/", ("post",)),
+        ]}
+
+        results = RuntimeTester(make_config()).extract(apis, {})
+
+        self.assertEqual(results["transport"], "wsgi")
+        self.assertEqual(results["endpoints_tested"], 3)
+        self.assertEqual(results["endpoints_successful"], 3)
+        self.assertEqual(results["endpoints"]["/api/courses/<slug:slug>/"]["url"], "http://localhost/api/courses/intro/")
+        self.assertEqual(
+            results["endpoints"]["/api/courses/{slug}/lessons/"]["url"], "http://localhost/api/courses/intro/lessons/"
+        )
+        self.assertEqual(results["skipped"], {
+            "/api/courses\\.(?P<format>[a-z0-9]+)/?$": "format suffix variant",
+            "/api/enrollments/{pk}/": "unresolved URL parameters",
+        })
+        self.assertEqual(results["latency"]["samples"], 6)
+        self.assertEqual(requests_seen.count("/api/courses/"), 2)
+
+    def test_configured_params_take_precedence(self):
+        tester = RuntimeTester(make_config(RUNTIME_PATH_PARAMS={"slug": "advanced"}))
+        results = tester.extract({"endpoints": [endpoint("/api/courses/{slug}/")]}, {})
+        self.assertEqual(results["endpoints"]["/api/courses/{slug}/"]["response"], COURSES[1])
+
+    def test_failed_endpoints_are_sampled_once(self):
+        tester = RuntimeTester(make_config(RUNTIME_SAMPLES_PER_ENDPOINT=5))
+        results = tester.extract({"endpoints": [endpoint("/api/missing/")]}, {})
+
+        self.assertEqual(results["endpoints_successful"], 0)
+        self.assertEqual(results["endpoints"]["/api/missing/"]["status_code"], 404)
+        self.assertEqual(requests_seen, ["/api/missing/"])
+
+    def test_sessions_share_one_sized_connection_pool(self):
+        tester = RuntimeTester(make_config(
+            BACKEND_URL="http://localhost:8000", RUNTIME_WSGI_APPLICATION="", RUNTIME_MAX_WORKERS=4,
+        ))
+        sessions = []
+        threads = [threading.Thread(target=lambda: sessions.append(tester._session())) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertIsNot(sessions[0], sessions[1])
+        adapters = {id(session.get_adapter("http://localhost:8000/")) for session in sessions}
+        self.assertEqual(adapters, {id(tester._adapter)})
+        self.assertEqual(tester._adapter._pool_maxsize, 4)
+        self.assertEqual(tester._adapter.max_retries.status_forcelist, (502, 503, 504))
+
+    def test_longest_timeout_prefix_wins(self):
+        tester = RuntimeTester(make_config(
+            REQUEST_TIMEOUT=10, RUNTIME_ENDPOINT_TIMEOUTS={"/api/": 20, "/api/reports/": 60},
+        ))
+        self.assertEqual(tester._timeout_for("/api/reports/daily/"), 60)
+        self.assertEqual(tester._timeout_for("/api/courses/"), 20)
+        self.assertEqual(tester._timeout_for("/health/"), 10)
+
+
+class LatencySummaryTests(unittest.TestCase):
+    def test_percentiles_interpolate_between_samples(self):
+        summary = summarize_latencies([0.4, 0.1, 0.3, 0.2])
+        self.assertEqual((summary["min"], summary["max"]), (0.1, 0.4))
+        self.assertAlmostEqual(summary["mean"], 0.25)
+        self.assertAlmostEqual(summary["p50"], 0.25)
+        self.assertAlmostEqual(summary["p90"], 0.37)
+        self.assertEqual(summarize_latencies([]), {"samples": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
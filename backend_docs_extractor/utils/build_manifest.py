@@ -0,0 +1,228 @@
+# fmt: off
+# isort: skip_file
+
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Incremental build support for the documentation generator
+
+The build is a dependency graph with three layers:
+
+    source files (models.py, views.py, urls.py, ...)
+        -> extracted artifacts (models, apis, serializers, authentication, runtime_tests)
+            -> outputs (HTML pages, generator outputs, search index shards)
+
+Every node is recorded in a content-hash manifest in the output directory
+(.build_manifest.json) together with the key it was built from, i.e. the
+hash of all its inputs. On the next run a node whose key is unchanged, and
+whose output files still exist, is reused instead of rebuilt.
+
+Author: nanthiniSanthanam
+Generated: 2025-05-04 05:13:56
+"""
+
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = '.build_manifest.json'
+MANIFEST_VERSION = 1
+
+# Source files every extractor depends on, relative to the Django project root
+COMMON_SOURCES = ['**/settings.py', '**/settings/*.py']
+
+# Source files read by each extractor
+EXTRACTOR_SOURCES = {
+    'models': ['**/models.py', '**/models/*.py'],
+    'apis': [
+        '**/urls.py', '**/views.py', '**/views/*.py', '**/viewsets.py', '**/api.py',
+        '**/serializers.py', '**/serializers/*.py', '**/permissions.py',
+        '**/authentication.py', '**/filters.py', '**/pagination.py',
+    ],
+    'serializers': ['**/serializers.py', '**/serializers/*.py', '**/models.py', '**/models/*.py'],
+    'authentication': [
+        '**/authentication.py', '**/permissions.py', '**/backends.py', '**/urls.py',
+        '**/views.py', '**/views/*.py',
+    ],
+}
+
+# Artifacts derived from other artifacts instead of source files
+ARTIFACT_DEPENDENCIES = {
+    'runtime_tests': ['apis', 'authentication'],
+}
+
+# Configuration each extractor reads
+EXTRACTOR_CONFIG = {
+    'models': ['INCLUDED_APPS', 'EXCLUDED_APPS', 'DETAIL_LEVEL'],
+    'apis': ['INCLUDED_APPS', 'EXCLUDED_APPS', 'DETAIL_LEVEL'],
+    'serializers': ['INCLUDED_APPS', 'EXCLUDED_APPS', 'DETAIL_LEVEL'],
+    'authentication': ['INCLUDED_APPS', 'EXCLUDED_APPS', 'DETAIL_LEVEL'],
+    'runtime_tests': [
+        'BACKEND_URL', 'AUTH_USERNAME', 'AUTH_TOKEN', 'DETAIL_LEVEL', 'REQUEST_TIMEOUT',
+        'MAX_ITEMS_PER_ENDPOINT', 'TEST_ERROR_SCENARIOS', 'RUNTIME_PATH_PARAMS',
+        'RUNTIME_SAMPLES_PER_ENDPOINT', 'RUNTIME_WSGI_APPLICATION',
+    ],
+}
+
+# Fields left out of artifact hashes: the extraction date changes on every run,
+# and settings are already part of every generator's key
+VOLATILE_FIELDS = {
+    'project_info': ['extraction_date', 'config'],
+}
+
+# Directories never scanned for sources
+SKIP_DIRS = {'.git', '__pycache__', 'node_modules', 'migrations', 'venv', '.venv', 'env', 'static', 'media'}
+
+
+def content_hash(value: Any) -> str:
+    """SHA-256 of bytes, text, or any JSON-serializable value (keys sorted)"""
+    if isinstance(value, (bytes, bytearray)):
+        payload = bytes(value)
+    elif isinstance(value, str):
+        payload = value.encode('utf-8')
+    else:
+        payload = json.dumps(value, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+
+def file_hash(path) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def artifact_hash(data: Dict[str, Any], name: str) -> str:
+    """Content hash of an extracted artifact, ignoring volatile fields"""
+    value = data.get(name, {})
+    volatile = VOLATILE_FIELDS.get(name)
+    if volatile and isinstance(value, dict):
+        value = {k: v for k, v in value.items() if k not in volatile}
+    return content_hash(value)
+
+
+class SourceTree:
+    """Python sources of the Django project, walked once and hashed on demand"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._files = None
+        self._hashes = {}
+
+    def files(self) -> List[str]:
+        """All .py files below the root as POSIX paths relative to it"""
+        if self._files is None:
+            self._files = []
+            if self.root.is_dir():
+                for dirpath, dirnames, filenames in os.walk(self.root):
+                    dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.'))
+                    rel_dir = Path(dirpath).relative_to(self.root)
+                    for filename in sorted(filenames):
+                        if filename.endswith('.py'):
+                            self._files.append((rel_dir / filename).as_posix())
+        return self._files
+
+    def match(self, patterns: Iterable[str]) -> List[str]:
+        """Files matching any glob; a leading **/ also matches at the root"""
+        expanded = []
+        for pattern in patterns:
+            expanded.append(pattern)
+            if pattern.startswith('**/'):
+                expanded.append(pattern[3:])
+        return [path for path in self.files() if any(fnmatch.fnmatchcase(path, p) for p in expanded)]
+
+    def hash(self, path: str) -> str:
+        if path not in self._hashes:
+            self._hashes[path] = file_hash(self.root / path)
+        return self._hashes[path]
+
+    def fingerprint(self, patterns: Iterable[str]) -> Dict[str, str]:
+        """``{path: content hash}`` for every file matching the patterns"""
+        return {path: self.hash(path) for path in self.match(patterns)}
+
+
+class BuildManifest:
+    """Content-hash manifest of the build graph
+
+    Nodes are named ``<kind>:<name>`` (``artifact:models``,
+    ``html:api_endpoints.html``, ``search:shard:a``) and hold the key they
+    were built from, the nodes they were built from and any extra data the
+    builder wants back when the node is reused.
+    """
+
+    def __init__(self, output_dir, enabled: bool = True):
+        self.path = Path(output_dir) / MANIFEST_NAME
+        self.enabled = enabled
+        self.previous = self._load() if enabled else {}
+        self.nodes = {}
+        self.rebuilt = []
+        self.reused = []
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable build manifest {self.path}: {str(e)}")
+            return {}
+        if manifest.get('version') != MANIFEST_VERSION:
+            return {}
+        return manifest.get('nodes', {})
+
+    def key(self, *parts) -> str:
+        """Build key from any JSON-serializable inputs"""
+        return content_hash(list(parts))
+
+    def is_fresh(self, node: str, key: str, outputs: Iterable = ()) -> bool:
+        """True if the node was last built from the same key and its outputs exist"""
+        entry = self.previous.get(node)
+        return bool(
+            entry
+            and entry.get('key') == key
+            and all(Path(output).exists() for output in outputs)
+        )
+
+    def reuse(self, node: str) -> Dict[str, Any]:
+        """Carry the previous entry of a fresh node over to this build"""
+        self.nodes[node] = self.previous[node]
+        self.reused.append(node)
+        return self.nodes[node]
+
+    def record(self, node: str, key: str, inputs: Iterable[str] = (), **extra) -> Dict[str, Any]:
+        """Record a node rebuilt in this run"""
+        self.nodes[node] = {'key': key, 'inputs': sorted(inputs), **extra}
+        self.rebuilt.append(node)
+        return self.nodes[node]
+
+    def get(self, node: str) -> Optional[Dict[str, Any]]:
+        """Entry for a node from this build, else from the previous one"""
+        return self.nodes.get(node) or self.previous.get(node)
+
+    def artifact_hash(self, name: str, data: Dict[str, Any]) -> str:
+        """Recorded hash of an extracted artifact, computed if it was not recorded"""
+        entry = self.nodes.get(f'artifact:{name}')
+        if entry and 'hash' in entry:
+            return entry['hash']
+        return artifact_hash(data, name)
+
+    def save(self) -> None:
+        """Write the manifest atomically"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': MANIFEST_VERSION, 'nodes': self.nodes}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def summary(self) -> str:
+        return f"{len(self.rebuilt)} rebuilt, {len(self.reused)} reused"
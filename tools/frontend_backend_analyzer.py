@@ -12,6 +12,12 @@ to a Django/PostgreSQL backend. It generates a comprehensive report detailing:
 
 Usage: python frontend_backend_analyzer.py --frontend-dir <frontend_directory> --output <report_file.md>
        python frontend_backend_analyzer.py --frontend-dir <frontend_directory> --backend-dir <backend_directory> --output <report_file.md>
+       python frontend_backend_analyzer.py --frontend-dir <frontend_directory> --backend-dir <backend_directory> --cache --diff
+
+With --cache, per-file results are stored in the cache directory keyed by content
+hash and only changed files are analyzed again. --diff prints the API contract
+mismatches added or resolved since the last run and exits with status 1 when new
+ones appear, which makes the tool usable as a pre-commit hook.
 """
 
 import os
@@ -23,14 +29,14 @@ import logging
 import time
 import hashlib
 import multiprocessing
-import concurrent.futures
+import multiprocessing.connection
 from pathlib import Path
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, deque
 import ast
 from typing import Dict, List, Set, Tuple, Any, Optional, Union, DefaultDict
 import markdown
 import networkx as nx
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, asdict, replace
 import html
 from datetime import datetime
 import sys
@@ -92,6 +98,9 @@ REACT_HOOKS = [
 EXCLUDED_DIRS = ['node_modules', 'dist', 'build', '.git', '__pycache__', 'venv', '.venv']
 TEST_FILE_PATTERNS = ['.test.', '.spec.', 'test_', 'tests/']
 
+# Bump when per-file extraction changes so cached file results are discarded
+FILE_CACHE_VERSION = 1
+
 # ---- Data Classes for storing extracted information ----
 
 @dataclass
@@ -111,12 +120,21 @@ class APIEndpoint:
     
     def to_dict(self):
         """Convert to dict for JSON serialization"""
-        result = asdict(self)
+        # asdict() cannot rebuild a defaultdict before Python 3.12
+        result = asdict(replace(self, params=dict(self.params)))
         # Convert sets to lists for JSON serialization
         result['response_fields'] = list(self.response_fields)
         result['params'] = {k: list(v) for k, v in self.params.items()}
         return result
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'APIEndpoint':
+        """Rebuild an endpoint from to_dict() output"""
+        endpoint = cls(**{**data, 'params': defaultdict(set), 'response_fields': set(data['response_fields'])})
+        for name, values in data['params'].items():
+            endpoint.params[name].update(values)
+        return endpoint
+
 @dataclass
 class RelationshipInfo:
     """Represents a relationship between models"""
@@ -144,13 +162,28 @@ class DataModel:
     
     def to_dict(self):
         """Convert to dict for JSON serialization"""
-        result = asdict(self)
+        # asdict() cannot rebuild a defaultdict before Python 3.12
+        result = asdict(replace(self, fields=dict(self.fields)))
         # Convert sets to lists for JSON serialization
         result['api_endpoints'] = list(self.api_endpoints)
         result['required_fields'] = list(self.required_fields)
         result['fields'] = {k: list(v) for k, v in self.fields.items()}
         return result
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'DataModel':
+        """Rebuild a model from to_dict() output"""
+        model = cls(**{
+            **data,
+            'fields': defaultdict(set),
+            'relationships': {k: RelationshipInfo(**v) for k, v in data['relationships'].items()},
+            'api_endpoints': set(data['api_endpoints']),
+            'required_fields': set(data['required_fields']),
+        })
+        for name, types in data['fields'].items():
+            model.fields[name].update(types)
+        return model
+
 @dataclass
 class Component:
     """Represents a React component"""
@@ -169,7 +202,8 @@ class Component:
     
     def to_dict(self):
         """Convert to dict for JSON serialization"""
-        result = asdict(self)
+        # asdict() cannot rebuild a defaultdict before Python 3.12
+        result = asdict(replace(self, props=dict(self.props), state_vars=dict(self.state_vars)))
         # Convert sets to lists for JSON serialization
         result['api_calls'] = list(self.api_calls)
         result['libraries'] = list(self.libraries)
@@ -177,6 +211,22 @@ class Component:
         result['state_vars'] = {k: list(v) for k, v in self.state_vars.items()}
         return result
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Component':
+        """Rebuild a component from to_dict() output"""
+        component = cls(**{
+            **data,
+            'props': defaultdict(set),
+            'state_vars': defaultdict(set),
+            'api_calls': set(data['api_calls']),
+            'libraries': set(data['libraries']),
+        })
+        for name, types in data['props'].items():
+            component.props[name].update(types)
+        for name, types in data['state_vars'].items():
+            component.state_vars[name].update(types)
+        return component
+
 @dataclass
 class NamingIssue:
     """Represents a naming inconsistency or issue"""
@@ -212,11 +262,23 @@ class BackendComparison:
     field_mismatches: List[Dict] = field(default_factory=list)
     missing_endpoints: List[str] = field(default_factory=list)
     unexpected_endpoints: List[str] = field(default_factory=list)
+    missing_models: List[str] = field(default_factory=list)
     
     def to_dict(self):
         """Convert to dict for JSON serialization"""
         return asdict(self)
 
+    def contract_mismatches(self) -> Dict[str, List[str]]:
+        """Mismatches between the frontend's API contract and the backend, by kind"""
+        return {
+            'missing_endpoints': sorted(set(self.missing_endpoints)),
+            'unexpected_endpoints': sorted(set(self.unexpected_endpoints)),
+            'missing_models': sorted(set(self.missing_models)),
+            'field_mismatches': sorted({
+                f"{m['model']}.{m['field']} (backend {m['backend_model']})" for m in self.field_mismatches
+            }),
+        }
+
 # ---- Main Analyzer Class ----
 
 class FrontendBackendAnalyzer:
@@ -239,6 +301,7 @@ class FrontendBackendAnalyzer:
             'verbose': False,
             'use_ast': True,  # Enable AST-based parsing
             'ast_timeout': 5,  # Timeout for AST parsing in seconds
+            'file_timeout': 30,  # Timeout for analyzing one file with regex parsing
         }
         
         # Override with provided config
@@ -264,7 +327,11 @@ class FrontendBackendAnalyzer:
             'error_files': [],
             'ast_parse_errors': 0,
             'ast_parse_timeouts': 0,
+            'file_timeouts': 0,
+            'cache_hits': 0,
+            'cache_misses': 0,
         }
+        self._last_ast = None
         
         # Setup caching
         if self.config['cache_results']:
@@ -280,36 +347,27 @@ class FrontendBackendAnalyzer:
                 self.config['use_ast'] = False
 
     def _parse_with_ast(self, content: str) -> Optional[Dict]:
-        """Parse JavaScript/TypeScript content using AST"""
+        """Parse JavaScript/TypeScript content using AST
+        
+        Files are analyzed in worker processes that are killed when they exceed
+        the per-file timeout (see FileWorkerPool), so parsing is not interrupted
+        here. The last tree is kept since each extractor parses the same content.
+        """
         if not self.config['use_ast']:
             return None
             
-        try:
-            # Set timeout for AST parsing
-            import signal
-            
-            def timeout_handler(signum, frame):
-                raise TimeoutError("AST parsing timed out")
-                
-            signal.signal(signal.SIGALRM, timeout_handler)
-            signal.alarm(self.config['ast_timeout'])
+        if self._last_ast and self._last_ast[0] == content:
+            return self._last_ast[1]
             
-            try:
-                ast = self.ast_parser.parseScript(content, {'loc': True, 'range': True})
-                signal.alarm(0)  # Disable alarm
-                return ast
-            except TimeoutError:
-                self.stats['ast_parse_timeouts'] += 1
-                logger.warning("AST parsing timed out, falling back to regex")
-                return None
-            except Exception as e:
-                self.stats['ast_parse_errors'] += 1
-                logger.warning(f"AST parsing failed: {str(e)}, falling back to regex")
-                return None
-                
+        try:
+            tree = self.ast_parser.parseScript(content, {'loc': True, 'range': True})
         except Exception as e:
-            logger.error(f"Error setting up AST parsing: {str(e)}")
-            return None
+            self.stats['ast_parse_errors'] += 1
+            logger.warning(f"AST parsing failed: {str(e)}, falling back to regex")
+            tree = None
+            
+        self._last_ast = (content, tree)
+        return tree
 
     def extract_api_endpoints(self, content: str, file_path: str, component_name: Optional[str] = None):
         """Extract API endpoints from content using AST or regex"""
@@ -454,11 +512,8 @@ class FrontendBackendAnalyzer:
         self.stats['file_count'] = len(js_files)
         logger.info(f"Found {len(js_files)} JavaScript/TypeScript files to analyze")
         
-        # Process files (with parallel processing if enabled)
-        if self.config['parallel_processing'] and len(js_files) > 5:
-            self._parallel_process_files(js_files)
-        else:
-            self._sequential_process_files(js_files)
+        # Process files in worker processes, reusing cached results of unchanged files
+        self._process_files(js_files)
         
         # Build relationships between components and models
         self.build_relationships()
@@ -504,131 +559,107 @@ class FrontendBackendAnalyzer:
         self._save_to_cache(code_patterns, "code_patterns")
         self._save_to_cache(self.stats, "stats")
     
-    def _parallel_process_files(self, files: List[str]):
-        """Process files in parallel using a process pool"""
-        # Use ProcessPoolExecutor for CPU-bound operations to bypass GIL
-        with concurrent.futures.ProcessPoolExecutor(max_workers=self.config['max_workers']) as executor:
-            # Create serializable data for multiprocessing
-            file_configs = [
-                {
-                    'file_path': file_path,
-                    'frontend_dir': self.frontend_dir,
-                }
-                for file_path in files
-            ]
-            
-            # Map to a static method that can be pickled
-            future_to_file = {
-                executor.submit(self._process_file_static, file_config): 
-                file_config['file_path'] for file_config in file_configs
-            }
+    def _process_files(self, files: List[str]):
+        """Analyze files in worker processes and merge the results in file order
+        
+        With caching enabled, per-file results are stored keyed by content hash
+        and only files whose content changed since the last run are analyzed.
+        """
+        cached_files = self._load_file_cache('file_results')
+        file_entries = {}
+        results = {}
+        pending = []
+        
+        for file_path in files:
+            if not self.config['cache_results']:
+                pending.append(file_path)
+                continue
+                
+            rel_path = os.path.relpath(file_path, self.frontend_dir)
+            entry = cached_files.get(rel_path)
+            content_hash = self._cache_key(file_path)
+            if entry and entry['hash'] == content_hash:
+                results[file_path] = entry['result']
+                file_entries[rel_path] = entry
+                self.stats['cache_hits'] += 1
+            else:
+                file_entries[rel_path] = {'hash': content_hash}
+                pending.append(file_path)
+                self.stats['cache_misses'] += 1
+                
+        if self.config['cache_results']:
+            logger.info(f"Reusing cached results for {len(results)} unchanged files, analyzing {len(pending)}")
             
+        if pending:
+            workers = self.config['max_workers'] if self.config['parallel_processing'] and len(pending) > 5 else 1
+            pool = FileWorkerPool(self.frontend_dir, self.config, workers)
             completed = 0
-            total = len(files)
-            
-            for future in concurrent.futures.as_completed(future_to_file):
-                file_path = future_to_file[future]
-                try:
-                    result = future.result()
-                    if result:
-                        # Integrate results from worker process
-                        self._integrate_worker_results(result, file_path)
-                    self.stats['processed_files'].append(file_path)
-                except Exception as e:
-                    logger.error(f"Error processing {file_path}: {str(e)}")
+            total = len(pending)
+            
+            for file_path, status, payload in pool.run(pending):
+                if status == 'ok':
+                    results[file_path] = payload
+                    self.stats['ast_parse_errors'] += payload['ast_parse_errors']
+                    if self.config['cache_results']:
+                        file_entries[os.path.relpath(file_path, self.frontend_dir)]['result'] = payload
+                else:
+                    logger.error(f"Error processing {file_path}: {payload}")
                     self.stats['error_files'].append(file_path)
                     self.stats['error_count'] += 1
                 
                 completed += 1
                 if completed % 20 == 0 or completed == total:
                     logger.info(f"Progress: {completed}/{total} files ({completed/total*100:.1f}%)")
+                    
+            self.stats['ast_parse_timeouts'] += pool.ast_timeouts
+            self.stats['file_timeouts'] += pool.file_timeouts
+        
+        for file_path in files:
+            if file_path in results:
+                self._merge_file_result(results[file_path])
+                self.stats['processed_files'].append(file_path)
+                
+        if self.config['cache_results']:
+            # Files that failed keep no entry and are analyzed again next time
+            self._save_file_cache('file_results', {
+                rel_path: entry for rel_path, entry in file_entries.items() if 'result' in entry
+            })
     
-    @staticmethod
-    def _process_file_static(file_config):
-        """Static method for processing a file in a separate process"""
-        file_path = file_config['file_path']
-        frontend_dir = file_config['frontend_dir']
+    def analyze_file(self, file_path: str) -> Dict[str, Any]:
+        """Analyze a single file on its own and return its results in serializable form
+        
+        This is the unit of work of the file workers and of the file cache;
+        _merge_file_result() adds the result to the analysis.
+        """
+        stores = (self.api_endpoints, self.data_models, self.components)
+        self.api_endpoints, self.data_models, self.components = set(), {}, {}
+        ast_parse_errors = self.stats['ast_parse_errors']
         
         try:
-            rel_path = os.path.relpath(file_path, frontend_dir)
-            
-            # Basic component name extraction from filename
-            base_name = os.path.basename(file_path)
-            name, _ = os.path.splitext(base_name)
-            component_name = name[0].upper() + name[1:] if name else ""
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Return extracted data in a serializable format
+            self.process_file(file_path)
             return {
-                'file_path': file_path,
-                'rel_path': rel_path,
-                'component_name': component_name,
-                'content': content,
-            }
-        except Exception as e:
-            # Return the error to be handled in the main process
-            return {
-                'file_path': file_path,
-                'error': str(e)
+                'components': [component.to_dict() for component in self.components.values()],
+                'api_endpoints': [
+                    endpoint.to_dict()
+                    for endpoint in sorted(self.api_endpoints, key=lambda e: (e.method, e.url))
+                ],
+                'data_models': [model.to_dict() for model in self.data_models.values()],
+                'ast_parse_errors': self.stats['ast_parse_errors'] - ast_parse_errors,
             }
+        finally:
+            self.api_endpoints, self.data_models, self.components = stores
     
-    def _integrate_worker_results(self, result, file_path):
-        """Integrate results from worker processes"""
-        if 'error' in result:
-            # Error was already logged in _parallel_process_files
-            return
-            
-        # Extract file info
-        rel_path = result['rel_path']
-        component_name = result['component_name']
-        content = result['content']
-        
-        # Now process the file content in the main process
-        if component_name:
-            component = Component(
-                name=component_name,
-                file_path=rel_path
-            )
+    def _merge_file_result(self, result: Dict[str, Any]):
+        """Add the result of analyze_file() to the analysis"""
+        for data in result['components']:
+            component = Component.from_dict(data)
+            self.components[component.name] = component
             
-            # Extract imports and libraries
-            imports = self.extract_imports(content)
-            component.imports = imports
-            component.libraries = self.extract_libraries(imports)
+        for data in result['api_endpoints']:
+            self.api_endpoints.add(APIEndpoint.from_dict(data))
             
-            # Extract props and state
-            component.props = self.extract_props(content)
-            component.state_vars = self.extract_state(content)
-            
-            # Extract hooks
-            component.hooks = self.extract_hooks(content)
-            
-            # Estimate complexity
-            component.complexity = self.estimate_complexity(content)
-            
-            self.components[component_name] = component
-            
-        # Extract API endpoints
-        self.extract_api_endpoints(content, rel_path, component_name)
-        
-        # Extract data models/structures
-        self.extract_data_models(content, rel_path, component_name)
-    
-    def _sequential_process_files(self, files: List[str]):
-        """Process files sequentially"""
-        for i, file_path in enumerate(files):
-            try:
-                self.process_file(file_path)
-                self.stats['processed_files'].append(file_path)
-                
-                # Log progress every 10 files
-                if (i+1) % 10 == 0 or i+1 == len(files):
-                    logger.info(f"Progress: {i+1}/{len(files)} files ({(i+1)/len(files)*100:.1f}%)")
-            except Exception as e:
-                logger.error(f"Error processing {file_path}: {str(e)}")
-                self.stats['error_files'].append(file_path)
-                self.stats['error_count'] += 1
+        for data in result['data_models']:
+            self._merge_data_model(DataModel.from_dict(data))
     
     def find_js_files(self) -> List[str]:
         """Find all JavaScript and TypeScript files in the frontend directory"""
@@ -721,6 +752,103 @@ class FrontendBackendAnalyzer:
                 
         return libraries
     
+    def extract_imports(self, content: str) -> List[str]:
+        """Extract module paths from import statements and require() calls"""
+        imports = []
+        
+        for regex in IMPORT_REGEXES:
+            for match in regex.finditer(content):
+                if match.group(1) not in imports:
+                    imports.append(match.group(1))
+                    
+        return imports
+    
+    def extract_props(self, content: str) -> DefaultDict[str, Set[str]]:
+        """Extract component props from destructured parameters and propTypes"""
+        props = defaultdict(set)
+        
+        for match in PROPS_DESTRUCTURE_REGEX.finditer(content):
+            for item in match.group(1).split(','):
+                name, _, default = item.partition('=')
+                name = name.split(':')[0].strip()
+                if not re.fullmatch(r'[A-Za-z_$][\w$]*', name):
+                    continue  # ...rest and anything the regex cut apart
+                props[name]
+                js_type = infer_literal_type(default)
+                if js_type:
+                    props[name].add(js_type)
+                    
+        for match in PROPTYPES_REGEX.finditer(content):
+            for prop_match in PROPTYPE_ENTRY_REGEX.finditer(match.group(1)):
+                props[prop_match.group(1)].add(prop_match.group(2))
+                
+        return props
+    
+    def extract_state(self, content: str) -> DefaultDict[str, Set[str]]:
+        """Extract useState variables with the type of their initial value"""
+        state_vars = defaultdict(set)
+        
+        for match in STATE_REGEX.finditer(content):
+            state_vars[match.group(1)]
+            js_type = infer_literal_type(match.group(2))
+            if js_type:
+                state_vars[match.group(1)].add(js_type)
+                
+        return state_vars
+    
+    def extract_data_models(self, content: str, file_path: str, component_name: Optional[str] = None):
+        """Infer data models from TypeScript interfaces and object type aliases"""
+        source = JS_COMMENT_REGEX.sub('', content)
+        
+        for match in TYPE_DECLARATION_REGEX.finditer(source):
+            body = top_level_block(source, match.end() - 1)
+            if body is None:
+                continue
+                
+            model = DataModel(name=match.group('interface') or match.group('alias'), file_locations=[file_path])
+            
+            for base in re.findall(r'\b([A-Z]\w*)', match.group('extends') or ''):
+                model.relationships[base] = RelationshipInfo(related_model=base, relation_type="extends")
+                
+            for field_match in TYPE_FIELD_REGEX.finditer(body):
+                field_name, optional, ts_type = field_match.groups()
+                variants = [t.strip() for t in ts_type.split('|') if t.strip()]
+                nullable = bool(optional) or any(t in ('null', 'undefined') for t in variants)
+                variants = [t for t in variants if t not in ('null', 'undefined')] or ['any']
+                
+                model.fields[field_name].add(normalize_ts_type(' | '.join(variants)))
+                if not nullable:
+                    model.required_fields.add(field_name)
+                    
+                # References to other types become relationships
+                related = re.fullmatch(r'([A-Z]\w*)(\[\])?|Array<([A-Z]\w*)>', variants[0])
+                if len(variants) == 1 and related and variants[0] != 'Date':
+                    related_model = related.group(1) or related.group(3)
+                    model.relationships[related_model] = RelationshipInfo(
+                        related_model=related_model,
+                        relation_type="many_to_one" if related.group(1) and not related.group(2) else "one_to_many",
+                        field_name=field_name,
+                        nullable=nullable,
+                    )
+                    
+            self._merge_data_model(model)
+    
+    def _merge_data_model(self, model: DataModel):
+        """Add a model, merging it with a model of the same name found elsewhere"""
+        existing = self.data_models.get(model.name)
+        if existing is None:
+            self.data_models[model.name] = model
+            return
+            
+        for field_name, types in model.fields.items():
+            existing.fields[field_name].update(types)
+        existing.relationships.update(model.relationships)
+        existing.api_endpoints.update(model.api_endpoints)
+        existing.required_fields.update(model.required_fields)
+        for location in model.file_locations:
+            if location not in existing.file_locations:
+                existing.file_locations.append(location)
+    
     def estimate_complexity(self, content: str) -> int:
         """Estimate the complexity of a component based on various factors"""
         complexity = 0
@@ -886,9 +1014,14 @@ class FrontendBackendAnalyzer:
             
         logger.info(f"Comparing with backend implementation in {self.backend_dir}")
         
-        # Extract backend models and endpoints from Django files
+        # Extract backend models and endpoints from Django files, reusing
+        # cached results of files unchanged since the last run
+        self._backend_file_cache = self._load_file_cache('backend_file_results')
+        self._backend_file_entries = {}
         backend_models = self._extract_backend_models()
         backend_endpoints = self._extract_backend_endpoints()
+        if self.config['cache_results']:
+            self._save_file_cache('backend_file_results', self._backend_file_entries)
         
         # Compare models
         for model_name, model in self.data_models.items():
@@ -908,11 +1041,23 @@ class FrontendBackendAnalyzer:
                         'backend_name': variant,
                         'match_quality': self._calculate_model_match_quality(model, backend_models[variant])
                     }
+                    
+                    # Record frontend fields the backend model lacks under either naming convention
+                    backend_fields = backend_models[variant]['fields']
+                    for field_name in sorted(model.fields):
+                        if (field_name not in ('id', 'pk') and field_name not in backend_fields and
+                                self._to_snake_case(field_name) not in backend_fields):
+                            self.backend_comparison.field_mismatches.append({
+                                'model': model_name,
+                                'backend_model': variant,
+                                'field': field_name,
+                            })
                     found = True
                     break
                     
             if not found:
                 logger.warning(f"Frontend model {model_name} has no corresponding backend model")
+                self.backend_comparison.missing_models.append(model_name)
                 
         # Compare endpoints
         for endpoint in self.api_endpoints:
@@ -950,63 +1095,92 @@ class FrontendBackendAnalyzer:
                    f"{len(self.backend_comparison.missing_endpoints)} missing endpoints, " +
                    f"{len(self.backend_comparison.unexpected_endpoints)} unexpected endpoints")
     
+    def _backend_file_result(self, file_path: str, kind: str, extractor) -> Dict[str, Dict]:
+        """Result of a backend extractor for one file, reused while the file is unchanged"""
+        if not self.config['cache_results']:
+            return extractor(file_path)
+            
+        rel_path = os.path.relpath(file_path, self.backend_dir)
+        entry = self._backend_file_entries.get(rel_path)
+        if entry is None:
+            content_hash = self._cache_key(file_path)
+            entry = self._backend_file_cache.get(rel_path)
+            if not entry or entry['hash'] != content_hash:
+                entry = {'hash': content_hash, 'results': {}}
+            self._backend_file_entries[rel_path] = entry
+            
+        if kind in entry['results']:
+            self.stats['cache_hits'] += 1
+        else:
+            entry['results'][kind] = extractor(file_path)
+            self.stats['cache_misses'] += 1
+        return entry['results'][kind]
+    
     def _extract_backend_models(self) -> Dict[str, Dict]:
         """Extract model definitions from Django backend"""
         models = {}
         models_file_pattern = os.path.join(self.backend_dir, "**", "models.py")
         
-        for file_path in glob.glob(models_file_pattern, recursive=True):
+        for file_path in sorted(glob.glob(models_file_pattern, recursive=True)):
+            models.update(self._backend_file_result(file_path, 'models', self._extract_models_from_file))
+                
+        return models
+    
+    def _extract_models_from_file(self, file_path: str) -> Dict[str, Dict]:
+        """Extract model definitions from one Django models.py file"""
+        models = {}
+        
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+                
+            # Parse Python AST to extract model classes
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                # Parse Python AST to extract model classes
-                try:
-                    tree = ast.parse(content)
-                    for node in ast.walk(tree):
-                        if isinstance(node, ast.ClassDef):
-                            # Check if it's a Django model (inherits from models.Model)
-                            is_django_model = False
-                            for base in node.bases:
-                                # Check for direct inheritance: Model
-                                if isinstance(base, ast.Name) and base.id == 'Model':
-                                    is_django_model = True
-                                    break
-                                # Check for attribute inheritance: models.Model
-                                elif (isinstance(base, ast.Attribute) and 
-                                      isinstance(base.value, ast.Name) and
-                                      base.value.id == 'models' and 
-                                      base.attr == 'Model'):
-                                    is_django_model = True
-                                    break
-                                # Check for imported base: from .models import ModelBase
-                                elif isinstance(base, ast.Name) and base.id.endswith(('Model', 'ModelBase')):
-                                    is_django_model = True
-                                    break
+                tree = ast.parse(content)
+                for node in ast.walk(tree):
+                    if isinstance(node, ast.ClassDef):
+                        # Check if it's a Django model (inherits from models.Model)
+                        is_django_model = False
+                        for base in node.bases:
+                            # Check for direct inheritance: Model
+                            if isinstance(base, ast.Name) and base.id == 'Model':
+                                is_django_model = True
+                                break
+                            # Check for attribute inheritance: models.Model
+                            elif (isinstance(base, ast.Attribute) and 
+                                  isinstance(base.value, ast.Name) and
+                                  base.value.id == 'models' and 
+                                  base.attr == 'Model'):
+                                is_django_model = True
+                                break
+                            # Check for imported base: from .models import ModelBase
+                            elif isinstance(base, ast.Name) and base.id.endswith(('Model', 'ModelBase')):
+                                is_django_model = True
+                                break
+                        
+                        if is_django_model:
+                            model_name = node.name
+                            fields = {}
                             
-                            if is_django_model:
-                                model_name = node.name
-                                fields = {}
-                                
-                                for child in node.body:
-                                    if isinstance(child, ast.Assign):
-                                        for target in child.targets:
-                                            if isinstance(target, ast.Name):
-                                                field_name = target.id
-                                                # Skip Django Meta and other magic attrs
-                                                if not field_name.startswith('_'):
-                                                    fields[field_name] = self._extract_field_type(child.value)
-                                                    
-                                models[model_name] = {
-                                    'fields': fields,
-                                    'file_path': file_path
-                                }
-                except SyntaxError:
-                    logger.warning(f"Syntax error parsing {file_path}, skipping")
-                    
-            except Exception as e:
-                logger.error(f"Error processing backend model file {file_path}: {str(e)}")
+                            for child in node.body:
+                                if isinstance(child, ast.Assign):
+                                    for target in child.targets:
+                                        if isinstance(target, ast.Name):
+                                            field_name = target.id
+                                            # Skip Django Meta and other magic attrs
+                                            if not field_name.startswith('_'):
+                                                fields[field_name] = self._extract_field_type(child.value)
+                                                
+                            models[model_name] = {
+                                'fields': fields,
+                                'file_path': file_path
+                            }
+            except SyntaxError:
+                logger.warning(f"Syntax error parsing {file_path}, skipping")
                 
+        except Exception as e:
+            logger.error(f"Error processing backend model file {file_path}: {str(e)}")
+            
         return models
     
     def _extract_field_type(self, value_node) -> str:
@@ -1024,53 +1198,69 @@ class FrontendBackendAnalyzer:
         # Check for urls.py files
         urls_file_pattern = os.path.join(self.backend_dir, "**", "urls.py")
         
-        for file_path in glob.glob(urls_file_pattern, recursive=True):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                # Extract URL patterns using regex for common Django patterns
-                # path('api/users/', views.UserListView.as_view(), name='user-list'),
-                url_pattern = r"(?:path|url|re_path)\s*\(\s*['\"]([^'\"]*)['\"]"
-                for match in re.finditer(url_pattern, content):
-                    url = match.group(1)
-                    # Add to results
-                    endpoints[url] = {
-                        'file_path': file_path,
-                        'methods': self._extract_view_methods(content, url)
-                    }
-                    
-            except Exception as e:
-                logger.error(f"Error processing backend URL file {file_path}: {str(e)}")
+        for file_path in sorted(glob.glob(urls_file_pattern, recursive=True)):
+            endpoints.update(self._backend_file_result(file_path, 'urls', self._extract_url_endpoints))
                 
         # Check for DRF ViewSets and Routers
         viewsets_pattern = os.path.join(self.backend_dir, "**", "views*.py")
         
-        for file_path in glob.glob(viewsets_pattern, recursive=True):
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                # Look for ViewSet classes
-                viewset_pattern = r"class\s+(\w+)ViewSet\s*\("
-                for match in re.finditer(viewset_pattern, content):
-                    resource_name = match.group(1).lower()
-                    
-                    # Add standard REST endpoints
-                    endpoints[f"api/{resource_name}/"] = {
-                        'file_path': file_path,
-                        'methods': ['GET'],
-                        'viewset': True
-                    }
-                    
-                    endpoints[f"api/{resource_name}/{{id}}/"] = {
-                        'file_path': file_path,
-                        'methods': ['GET', 'PUT', 'PATCH', 'DELETE'],
-                        'viewset': True
-                    }
-                    
-            except Exception as e:
-                logger.error(f"Error processing backend views file {file_path}: {str(e)}")
+        for file_path in sorted(glob.glob(viewsets_pattern, recursive=True)):
+            endpoints.update(self._backend_file_result(file_path, 'viewsets', self._extract_viewset_endpoints))
+                
+        return endpoints
+    
+    def _extract_url_endpoints(self, file_path: str) -> Dict[str, Dict]:
+        """Extract URL patterns from one Django urls.py file"""
+        endpoints = {}
+        
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+                
+            # Extract URL patterns using regex for common Django patterns
+            # path('api/users/', views.UserListView.as_view(), name='user-list'),
+            url_pattern = r"(?:path|url|re_path)\s*\(\s*['\"]([^'\"]*)['\"]"
+            for match in re.finditer(url_pattern, content):
+                url = match.group(1)
+                # Add to results
+                endpoints[url] = {
+                    'file_path': file_path,
+                    'methods': self._extract_view_methods(content, url)
+                }
+                
+        except Exception as e:
+            logger.error(f"Error processing backend URL file {file_path}: {str(e)}")
+                
+        return endpoints
+    
+    def _extract_viewset_endpoints(self, file_path: str) -> Dict[str, Dict]:
+        """Extract the REST endpoints of DRF ViewSets in one views module"""
+        endpoints = {}
+        
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+                
+            # Look for ViewSet classes
+            viewset_pattern = r"class\s+(\w+)ViewSet\s*\("
+            for match in re.finditer(viewset_pattern, content):
+                resource_name = match.group(1).lower()
+                
+                # Add standard REST endpoints
+                endpoints[f"api/{resource_name}/"] = {
+                    'file_path': file_path,
+                    'methods': ['GET'],
+                    'viewset': True
+                }
+                
+                endpoints[f"api/{resource_name}/{{id}}/"] = {
+                    'file_path': file_path,
+                    'methods': ['GET', 'PUT', 'PATCH', 'DELETE'],
+                    'viewset': True
+                }
+                
+        except Exception as e:
+            logger.error(f"Error processing backend views file {file_path}: {str(e)}")
                 
         return endpoints
     
@@ -1108,8 +1298,9 @@ class FrontendBackendAnalyzer:
         # Strip leading/trailing slashes
         url = url.strip('/')
         
-        # Replace parameter placeholders with {param} format
+        # Replace parameter placeholders (:id, template literal ${id}) with {param} format
         url = re.sub(r':(\w+)', r'{\1}', url)
+        url = re.sub(r'\$\{([^}]+)\}', r'{\1}', url)
         
         # Add api/ prefix if not present
         if not url.startswith('api/') and not url.startswith('v1/') and not url.startswith('v2/'):
@@ -1122,12 +1313,13 @@ class FrontendBackendAnalyzer:
     
     def _endpoints_match(self, frontend_url: str, backend_url: str) -> bool:
         """Check if frontend and backend endpoints match"""
-        # Convert to pattern format (parameters become wildcards)
-        frontend_pattern = re.sub(r'{[^}]+}', r'[^/]+', frontend_url)
-        frontend_pattern = f"^{frontend_pattern}$"
+        # Convert to pattern format (parameters become wildcards, the rest is literal)
+        def url_pattern(url: str) -> str:
+            parts = re.split(r'{[^}]+}|<[^>]+>', url)
+            return "^" + "[^/]+".join(re.escape(part) for part in parts) + "$"
         
-        backend_pattern = re.sub(r'{[^}]+}', r'[^/]+', backend_url)
-        backend_pattern = f"^{backend_pattern}$"
+        frontend_pattern = url_pattern(frontend_url)
+        backend_pattern = url_pattern(backend_url)
         
         # Check if either pattern matches the other URL
         return (re.match(frontend_pattern, backend_url) is not None or
@@ -1271,10 +1463,10 @@ class FrontendBackendAnalyzer:
             camel_case_count = 0
             snake_case_count = 0
             
-            for field in model.fields:
-                if '_' in field:
+            for field_name in model.fields:
+                if '_' in field_name:
                     snake_case_count += 1
-                elif field and field[0].islower() and any(c.isupper() for c in field):
+                elif field_name and field_name[0].islower() and any(c.isupper() for c in field_name):
                     camel_case_count += 1
             
             if camel_case_count > 0 and snake_case_count > 0:
@@ -1399,7 +1591,7 @@ class FrontendBackendAnalyzer:
         report.append("\n### 1.3 URL Patterns")
         all_urls = [endpoint.url for endpoint in self.api_endpoints]
         if all_urls:
-            url_patterns = self.extract_url_patterns(all_urls)
+            url_patterns = extract_url_patterns(all_urls)
             report.append("\nBased on the API endpoints found, the following Django URL pattern structure is suggested:\n")
             report.append("```python")
             report.append("# urls.py")
@@ -1452,7 +1644,7 @@ class FrontendBackendAnalyzer:
                     
                 for field_name, types in sorted(model.fields.items()):
                     field_type = next(iter(types)) if types else "unknown"
-                    django_field = self.get_django_field_type(field_type, field_name)
+                    django_field = get_django_field_type(field_type, field_name)
                     report.append(f"    {field_name} = {django_field}")
                 
                 report.append("")
@@ -1680,52 +1872,6 @@ class FrontendBackendAnalyzer:
         
         return output_file
 
-    def extract_component_name(self, file_path: str) -> str:
-        """Extract React component name from file path or content using AST or regex"""
-        # First try from filename (common convention)
-        base_name = os.path.basename(file_path)
-        name, _ = os.path.splitext(base_name)
-        
-        # Guard against empty names
-        if not name:
-            return ""
-            
-        # PascalCase convention for components
-        if name[0].isupper():
-            return name
-            
-        # Try to read file to find component name
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            if self.config['use_ast']:
-                ast = self._parse_with_ast(content)
-                if ast:
-                    # Look for component definitions in AST
-                    for node in ast.body:
-                        if (node.type == 'FunctionDeclaration' and 
-                            node.id and node.id.name[0].isupper()):
-                            return node.id.name
-                        elif (node.type == 'VariableDeclaration' and 
-                              node.declarations and 
-                              node.declarations[0].id.name[0].isupper()):
-                            return node.declarations[0].id.name
-                        elif (node.type == 'ClassDeclaration' and 
-                              node.id and node.id.name[0].isupper()):
-                            return node.id.name
-            else:
-                # Fallback to regex-based extraction
-                for regex in COMPONENT_REGEXES:
-                    match = regex.search(content)
-                    if match and match.group(1)[0].isupper():
-                        return match.group(1)
-        except:
-            pass
-            
-        # Fallback: use filename with first letter capitalized
-        return name[0].upper() + name[1:] if name else ""
-
     def _print_component_tree(self, node: str, prefix: str, is_last: bool, report: List[str], visited: Set[str]):
         """Helper to print component tree structure"""
         if node in visited:
@@ -2067,8 +2213,8 @@ function showTab(tabId) {
                     content.append("<h5>Response Fields</h5>")
                     content.append("<ul>")
                     
-                    for field in sorted(endpoint.response_fields):
-                        content.append(f"<li>{field}</li>")
+                    for field_name in sorted(endpoint.response_fields):
+                        content.append(f"<li>{field_name}</li>")
                         
                     content.append("</ul>")
                 
@@ -2168,6 +2314,46 @@ function showTab(tabId) {
         else:
             content.append("<p>No matching endpoints found between frontend and backend.</p>")
 
+    # ---- Contract Diff ----
+
+    def diff_contract_mismatches(self, update_snapshot: bool = False) -> Dict[str, Any]:
+        """Compare the API contract mismatches with the snapshot of the last run
+        
+        Returns {'baseline': True} plus empty diffs when there is no snapshot yet,
+        otherwise 'added' and 'resolved' mismatches by kind. The snapshot is only
+        replaced when nothing was added (or update_snapshot is set), so a pre-commit
+        hook keeps failing until new mismatches are fixed or explicitly accepted.
+        """
+        if self.backend_comparison is None:
+            raise ValueError("Contract diff requires a backend directory")
+            
+        current = self.backend_comparison.contract_mismatches()
+        snapshot_path = self._get_cache_path('contract_snapshot')
+        previous = None
+        if os.path.exists(snapshot_path):
+            try:
+                with open(snapshot_path, 'r', encoding='utf-8') as f:
+                    previous = json.load(f)['mismatches']
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable contract snapshot {snapshot_path}: {str(e)}")
+                
+        diff = {'baseline': previous is None, 'added': {}, 'resolved': {}}
+        if previous is not None:
+            for kind in sorted(set(current) | set(previous)):
+                now, before = set(current.get(kind, [])), set(previous.get(kind, []))
+                if now - before:
+                    diff['added'][kind] = sorted(now - before)
+                if before - now:
+                    diff['resolved'][kind] = sorted(before - now)
+                    
+        if previous is None or not diff['added'] or update_snapshot:
+            self._write_cache_file('contract_snapshot', {
+                'generated': datetime.now().isoformat(),
+                'mismatches': current,
+            })
+            
+        return diff
+
     # ---- Caching Functions ----
 
     def _get_cache_path(self, name: str) -> str:
@@ -2224,6 +2410,54 @@ function showTab(tabId) {
             logger.warning(f"Error loading from cache: {str(e)}")
             return None
 
+    def _file_cache_settings(self) -> Dict[str, Any]:
+        """Settings the cached per-file results depend on"""
+        return {
+            'frontend_dir': self.frontend_dir,
+            'backend_dir': self.backend_dir,
+            'use_ast': self.config['use_ast'],
+        }
+
+    def _load_file_cache(self, name: str) -> Dict[str, Dict]:
+        """Per-file results of the last run keyed by relative path, {} if unusable"""
+        if not self.config['cache_results']:
+            return {}
+            
+        cache_path = self._get_cache_path(name)
+        if not os.path.exists(cache_path):
+            return {}
+            
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable file cache {cache_path}: {str(e)}")
+            return {}
+            
+        if cache.get('version') != FILE_CACHE_VERSION or cache.get('settings') != self._file_cache_settings():
+            return {}
+        return cache.get('files', {})
+
+    def _save_file_cache(self, name: str, files: Dict[str, Dict]) -> None:
+        """Save per-file results keyed by relative path"""
+        self._write_cache_file(name, {
+            'version': FILE_CACHE_VERSION,
+            'settings': self._file_cache_settings(),
+            'files': files,
+        })
+
+    def _write_cache_file(self, name: str, data: Any) -> None:
+        """Write a JSON file to the cache directory atomically"""
+        os.makedirs(self.config['cache_dir'], exist_ok=True)
+        cache_path = self._get_cache_path(name)
+        tmp_path = f"{cache_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.warning(f"Error saving to cache: {str(e)}")
+
     def _json_serializer(self, obj):
         """Custom JSON serializer for complex objects"""
         if isinstance(obj, (APIEndpoint, DataModel, ReactComponent, NamingIssue, CodePattern)):
@@ -2254,6 +2488,124 @@ function showTab(tabId) {
         """Escape HTML special characters to prevent XSS"""
         return html.escape(text)
 
+# ---- File Worker Processes ----
+
+class FileWorkerPool:
+    """Worker processes that analyze one file at a time under a deadline
+    
+    A worker that misses its deadline is terminated and replaced, so the
+    per-file timeout works on every platform and from any thread. With AST
+    parsing enabled a file first gets ast_timeout seconds and is retried with
+    regex parsing on timeout; a file that also exceeds file_timeout fails.
+    """
+    
+    def __init__(self, frontend_dir: str, config: Dict, workers: int):
+        self.frontend_dir = frontend_dir
+        self.config = config
+        self.size = max(1, workers)
+        self.ast_timeouts = 0
+        self.file_timeouts = 0
+        
+    def _start_worker(self) -> Dict[str, Any]:
+        parent_conn, child_conn = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_file_worker_loop,
+            args=(child_conn, self.frontend_dir, self.config),
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        return {'process': process, 'conn': parent_conn, 'task': None, 'deadline': 0.0}
+        
+    def _stop_worker(self, worker: Dict[str, Any], kill: bool = False):
+        if not kill:
+            try:
+                worker['conn'].send(None)
+            except (OSError, ValueError):
+                kill = True
+            else:
+                worker['process'].join(timeout=5)
+        if kill or worker['process'].is_alive():
+            worker['process'].terminate()
+            worker['process'].join()
+        worker['conn'].close()
+        
+    def run(self, files: List[str]):
+        """Analyze files, yielding (file_path, status, payload) as each one finishes
+        
+        status is 'ok' with the analyze_file() result as payload, or 'error'
+        with a message.
+        """
+        queue = deque((file_path, self.config['use_ast']) for file_path in files)
+        workers = [self._start_worker() for _ in range(min(self.size, len(queue)))]
+        
+        try:
+            while True:
+                for worker in workers:
+                    if worker['task'] is None and queue:
+                        task = queue.popleft()
+                        timeout = self.config['ast_timeout'] if task[1] else self.config['file_timeout']
+                        worker['conn'].send(task)
+                        worker['task'] = task
+                        worker['deadline'] = time.monotonic() + timeout
+                        
+                busy = [worker for worker in workers if worker['task'] is not None]
+                if not busy:
+                    break
+                    
+                wait_time = max(0.0, min(worker['deadline'] for worker in busy) - time.monotonic())
+                ready = multiprocessing.connection.wait([worker['conn'] for worker in busy], timeout=wait_time)
+                
+                for index, worker in enumerate(workers):
+                    task = worker['task']
+                    if task is None:
+                        continue
+                        
+                    if worker['conn'] in ready:
+                        try:
+                            status, payload = worker['conn'].recv()
+                            worker['task'] = None
+                        except (EOFError, OSError):
+                            status, payload = 'error', "worker process exited unexpectedly"
+                            self._stop_worker(worker, kill=True)
+                            workers[index] = self._start_worker()
+                        yield task[0], status, payload
+                    elif time.monotonic() >= worker['deadline']:
+                        self._stop_worker(worker, kill=True)
+                        workers[index] = self._start_worker()
+                        if task[1]:
+                            self.ast_timeouts += 1
+                            logger.warning(f"AST parsing of {task[0]} timed out, falling back to regex")
+                            queue.append((task[0], False))
+                        else:
+                            self.file_timeouts += 1
+                            yield task[0], 'error', f"timed out after {self.config['file_timeout']} seconds"
+        finally:
+            for worker in workers:
+                self._stop_worker(worker, kill=worker['task'] is not None)
+
+def _file_worker_loop(conn, frontend_dir: str, config: Dict):
+    """Body of a FileWorkerPool process: analyze the files received until None arrives"""
+    analyzer = FrontendBackendAnalyzer(frontend_dir, config={**config, 'cache_results': False})
+    ast_available = analyzer.config['use_ast']
+    
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+            
+        file_path, use_ast = task
+        analyzer.config['use_ast'] = use_ast and ast_available
+        try:
+            conn.send(('ok', analyzer.analyze_file(file_path)))
+        except Exception as e:
+            conn.send(('error', str(e)))
+            
+    conn.close()
+
 # ---- Pre-compiled regex patterns ----
 API_REGEXES = [re.compile(p) for p in [
     r'(?:axios|fetch)\s*\.\s*(?:get|post|put|delete|patch)\s*\(\s*[\'"`](.*?)[\'"`]',
@@ -2276,6 +2628,30 @@ COMPONENT_REGEXES = [
     re.compile(r'const\s+([A-Z]\w+)\s*='),
     re.compile(r'class\s+([A-Z]\w+)\s+extends'),
 ]
+IMPORT_REGEXES = [re.compile(p) for p in [
+    r'\bimport\s+(?:[\w$*{}\s,]+?\s+from\s+)?[\'"]([^\'"]+)[\'"]',
+    r'\bimport\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)',
+    r'\brequire\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)',
+]]
+PROPS_DESTRUCTURE_REGEX = re.compile(
+    r'(?:function\s+[A-Z]\w*\s*\(\s*'
+    r'|\b[A-Z]\w*\s*=\s*(?:React\.)?(?:(?:memo|forwardRef)\s*\(\s*)*(?:function\s*\w*\s*)?\(\s*)'
+    r'\{([^{}]*)\}'
+)
+PROPTYPES_REGEX = re.compile(r'\.propTypes\s*=\s*\{([^}]*)\}')
+PROPTYPE_ENTRY_REGEX = re.compile(r'(\w+)\s*:\s*PropTypes\.(\w+)')
+STATE_REGEX = re.compile(
+    r'const\s*\[\s*(\w+)\s*,\s*\w+\s*\]\s*=\s*(?:React\.)?useState\s*(?:<[^>(]*>)?\s*\(\s*([^)\n]*)'
+)
+TYPE_DECLARATION_REGEX = re.compile(
+    r'^[ \t]*(?:export\s+)?(?:default\s+)?(?:declare\s+)?'
+    r'(?:interface\s+(?P<interface>[A-Z]\w*)\s*(?:<[^>{]*>)?\s*(?:extends\s+(?P<extends>[^{]+?))?\s*'
+    r'|type\s+(?P<alias>[A-Z]\w*)\s*(?:<[^>=]*>)?\s*=\s*)\{',
+    re.M
+)
+TYPE_FIELD_REGEX = re.compile(r'(?:^|[;,\n])\s*(?:readonly\s+)?[\'"]?([A-Za-z_$][\w$]*)[\'"]?\s*(\?)?\s*:\s*([^;,\n]+)')
+STRING_LITERAL_UNION_REGEX = re.compile(r'(?:\'[^\']*\'|"[^"]*")(?:\s*\|\s*(?:\'[^\']*\'|"[^"]*"))*')
+JS_COMMENT_REGEX = re.compile(r'/\*.*?\*/|(?<!:)//[^\n]*', re.S)
 URL_PATTERN_REGEX = re.compile(r"(?:path|url|re_path)\s*\(\s*['\"]([^'\"]*)['\"]")
 VIEWSET_REGEX = re.compile(r"class\s+(\w+)ViewSet\s*\(")
 
@@ -2315,6 +2691,62 @@ def extract_url_patterns(urls: List[str]) -> List[str]:
             
     return patterns
 
+def infer_literal_type(value: str) -> str:
+    """Best-effort JavaScript type of a literal expression, '' if unknown"""
+    value = value.strip()
+    if not value:
+        return ''
+    if value[0] in '\'"`':
+        return 'string'
+    if re.match(r'-?\.?\d', value):
+        return 'number'
+    if value in ('true', 'false'):
+        return 'boolean'
+    if value in ('null', 'undefined'):
+        return 'null'
+    if value.startswith('['):
+        return 'array'
+    if value.startswith('{'):
+        return 'object'
+    return ''
+
+def normalize_ts_type(ts_type: str) -> str:
+    """Map a TypeScript type annotation to the basic types used in the report"""
+    ts_type = ts_type.strip()
+    if ts_type in ('string', 'number', 'boolean'):
+        return ts_type
+    if ts_type.endswith('[]') or ts_type.startswith(('Array<', 'ReadonlyArray<')):
+        return 'array'
+    if ts_type == 'Date':
+        return 'date'
+    if ts_type.startswith(('{', 'Record<')) or ts_type in ('object', 'any', 'unknown'):
+        return 'object'
+    if STRING_LITERAL_UNION_REGEX.fullmatch(ts_type):
+        return 'string'
+    return ts_type
+
+def top_level_block(content: str, open_index: int) -> Optional[str]:
+    """Text of the {...} block opening at open_index, with nested blocks reduced to {}
+    
+    Returns None if the block is never closed.
+    """
+    depth = 0
+    chars = []
+    
+    for char in content[open_index:]:
+        if char == '{':
+            depth += 1
+            if depth == 2:
+                chars.append('{}')
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return ''.join(chars)
+        elif depth == 1:
+            chars.append(char)
+            
+    return None
+
 def get_django_field_type(js_type: str, field_name: str) -> str:
     """Convert JavaScript/TypeScript type to Django field type"""
     # Common type mappings
@@ -2353,6 +2785,22 @@ def get_django_field_type(js_type: str, field_name: str) -> str:
     # Default to CharField if type not found
     return type_map.get(js_type.lower(), 'CharField(max_length=255)')
 
+def format_contract_diff(diff: Dict[str, Any]) -> List[str]:
+    """Printable lines for the result of diff_contract_mismatches()"""
+    if diff['baseline']:
+        return ["No previous contract snapshot; recorded the current mismatches as the baseline"]
+    if not diff['added'] and not diff['resolved']:
+        return ["No API contract changes since the last run"]
+        
+    lines = []
+    for title, marker, changes in (("New API contract mismatches since the last run:", '+', diff['added']),
+                                   ("Resolved since the last run:", '-', diff['resolved'])):
+        if changes:
+            lines.append(title)
+            for kind, items in changes.items():
+                lines.extend(f"  {marker} [{kind.replace('_', ' ')}] {item}" for item in items)
+    return lines
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(description='Frontend-Backend Analysis Tool')
@@ -2361,7 +2809,11 @@ def main():
     parser.add_argument('--output', '-o', default='frontend_backend_report.md', help='Output report file')
     parser.add_argument('--parallel', '-p', action='store_true', help='Enable parallel processing')
     parser.add_argument('--include-tests', '-t', action='store_true', help='Include test files in analysis')
-    parser.add_argument('--cache', '-c', action='store_true', help='Enable result caching')
+    parser.add_argument('--cache', '-c', action='store_true',
+                        help='Enable result caching; unchanged files are not analyzed again')
+    parser.add_argument('--cache-dir',
+                        default='.analyzer_cache',
+                        help='Directory for cached results and the contract snapshot')
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
     parser.add_argument('--log-level', '-l', 
                         choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
@@ -2378,6 +2830,17 @@ def main():
                         type=int,
                         default=5,
                         help='Timeout in seconds for AST parsing')
+    parser.add_argument('--file-timeout',
+                        type=int,
+                        default=30,
+                        help='Timeout in seconds for analyzing a file with regex parsing')
+    parser.add_argument('--diff',
+                        action='store_true',
+                        help='Report API contract mismatches added or resolved since the last run '
+                             '(requires --backend-dir); exits with status 1 only if new ones appear')
+    parser.add_argument('--update-snapshot',
+                        action='store_true',
+                        help='With --diff, accept the current mismatches as the new baseline')
     parser.add_argument('--max-workers',
                         type=int,
                         default=multiprocessing.cpu_count(),
@@ -2392,6 +2855,8 @@ def main():
                         help='File patterns to exclude from analysis')
     
     args = parser.parse_args()
+    if args.diff and not args.backend_dir:
+        parser.error('--diff requires --backend-dir')
     
     # Configure logging
     log_level = getattr(logging, args.log_level)
@@ -2412,10 +2877,12 @@ def main():
             'max_workers': args.max_workers,
             'include_tests': args.include_tests,
             'cache_results': args.cache,
+            'cache_dir': args.cache_dir,
             'verbose': args.verbose,
             'output_format': args.format,
             'use_ast': args.use_ast,
             'ast_timeout': args.ast_timeout,
+            'file_timeout': args.file_timeout,
             'excluded_dirs': args.exclude_dirs,
             'excluded_files': args.exclude_files,
         }
@@ -2456,8 +2923,20 @@ def main():
         print(f"- Issues found: {len(analyzer.naming_issues)}")
         print(f"- AST parse errors: {analyzer.stats['ast_parse_errors']}")
         print(f"- AST parse timeouts: {analyzer.stats['ast_parse_timeouts']}")
+        print(f"- File timeouts: {analyzer.stats['file_timeouts']}")
+        if args.cache:
+            print(f"- Cached file results reused: {analyzer.stats['cache_hits']}")
         print(f"- Total duration: {duration:.2f} seconds")
         
+        # Pre-commit mode: fail only on contract mismatches new since the last run
+        if args.diff:
+            diff = analyzer.diff_contract_mismatches(update_snapshot=args.update_snapshot)
+            print()
+            print("\n".join(format_contract_diff(diff)))
+            if diff['added'] and not args.update_snapshot:
+                sys.exit(1)
+            return
+        
         # Exit with error if issues found
         if analyzer.naming_issues:
             high_severity = sum(1 for i in analyzer.naming_issues if i.severity == 'high')
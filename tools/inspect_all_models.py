@@ -66,6 +66,9 @@ class InspectionConfig:
     exit_on_issues: bool = False
     issue_threshold: int = 10
     timing_enabled: bool = True
+    check_database: bool = True
+    sample_workers: int = 4
+    sample_size: int = 5
 
 @dataclass
 class TimingData:
@@ -92,6 +95,7 @@ class ProductionInspector:
             'views': {},
             'serializers': {},
             'urls': [],
+            'database': {},
             'consistency_issues': [],
             'security_issues': [],
             'performance_notes': [],
@@ -429,6 +433,87 @@ class ProductionInspector:
 
             return models_report, model_field_registry, model_metadata
 
+    def inspect_database(self, model_metadata: Dict[str, Dict]) -> List[str]:
+        """Compare models with a schema snapshot and sample every table"""
+        with self._time_phase("Database Inspection"):
+            if not self.config.check_database:
+                return ["Database inspection skipped (disabled)"]
+
+            try:
+                from educore.schema_snapshot import diff_models, sample_models, take_snapshot
+            except ImportError:
+                logger.warning("Schema snapshot engine not available, skipping database inspection")
+                return ["Database inspection skipped (educore.schema_snapshot not available)"]
+
+            database_report = []
+
+            apps_to_check = self.config.apps_to_inspect or []
+            models = [
+                model for model in self.apps.get_models()
+                if not apps_to_check or model._meta.app_config.name.split('.')[-1] in apps_to_check
+            ]
+
+            try:
+                snapshot = take_snapshot()
+            except Exception as e:
+                logger.error(f"Failed to read database schema: {e}")
+                self._add_issue(f"Database schema could not be read: {e}", "database")
+                return [f"    Error: {str(e)}"]
+
+            database_report.append(
+                f"Schema snapshot: {len(snapshot.tables)} tables from {snapshot.vendor} "
+                f"in {snapshot.queries} queries ({snapshot.duration:.2f}s)"
+            )
+
+            # Table presence and size per model
+            for model in models:
+                model_key = f"{model._meta.app_config.name.split('.')[-1]}.{model.__name__}"
+                table = model._meta.db_table
+                database_info = {
+                    'table': table,
+                    'table_exists': snapshot.has_table(table),
+                    'approx_rows': snapshot.approx_rows(table),
+                }
+                if model_key in model_metadata:
+                    model_metadata[model_key]['database'] = database_info
+
+            # Schema drift
+            issues = diff_models(snapshot, models)
+            database_report.append("\nSchema Diff:")
+            database_report.append("-" * 40)
+            if issues:
+                for issue in issues:
+                    icon = "❌" if issue.severity == "error" else "⚠️ "
+                    database_report.append(f"  {icon} {issue}")
+                    self._add_issue(str(issue), "database")
+            else:
+                database_report.append("  ✅ Schema matches all models")
+
+            # Sampling checks on a bounded pool
+            results = sample_models(
+                models, size=self.config.sample_size, max_workers=self.config.sample_workers
+            )
+            failed = [result for result in results if not result['ok']]
+            database_report.append("\nModel Sampling:")
+            database_report.append("-" * 40)
+            database_report.append(
+                f"  Loaded up to {self.config.sample_size} rows from {len(results) - len(failed)}/{len(results)} "
+                f"models with {self.config.sample_workers} workers"
+            )
+            for result in failed:
+                database_report.append(f"  ❌ {result['model']}: {result['error']}")
+                self._add_issue(f"{result['model']} could not be loaded: {result['error']}", "database")
+
+            self.inspection_data['database'] = {
+                'vendor': snapshot.vendor,
+                'tables': len(snapshot.tables),
+                'snapshot_queries': snapshot.queries,
+                'snapshot_duration': snapshot.duration,
+                'schema_issues': [issue.to_dict() for issue in issues],
+                'samples': results,
+            }
+            return database_report
+
     def inspect_views(self) -> Tuple[List[str], Dict, Dict]:
         """Enhanced view inspection with better detection"""
         with self._time_phase("View Inspection"):
@@ -1243,6 +1328,9 @@ class ProductionInspector:
             models_report, model_field_registry, model_metadata = self.inspect_models()
             self.add_to_report("MODELS", models_report)
 
+            database_report = self.inspect_database(model_metadata)
+            self.add_to_report("DATABASE", database_report)
+
             views_report, view_registry, view_metadata = self.inspect_views()
             self.add_to_report("VIEWS", views_report)
 
@@ -1422,6 +1510,8 @@ def main():
     parser.add_argument('--html', action='store_true', help='Export HTML report')
     parser.add_argument('--no-security', action='store_true', help='Skip security checks')
     parser.add_argument('--no-timing', action='store_true', help='Disable performance timing')
+    parser.add_argument('--no-database', action='store_true', help='Skip schema diff and sampling checks')
+    parser.add_argument('--sample-workers', type=int, help='Concurrent sampling checks (default: 4)')
     parser.add_argument('--exit-on-issues', action='store_true', help='Exit with error code if issues found')
     parser.add_argument('--issue-threshold', type=int, default=10, help='Issue threshold for exit code')
     parser.add_argument('--max-lines', type=int, default=1000, help='Max lines per report section')
@@ -1474,6 +1564,10 @@ def main():
         config.check_security = False
     if args.no_timing:
         config.timing_enabled = False
+    if args.no_database:
+        config.check_database = False
+    if args.sample_workers:
+        config.sample_workers = args.sample_workers
     if args.exit_on_issues:
         config.exit_on_issues = True
     if args.issue_threshold:
@@ -0,0 +1,199 @@
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# The analyzer is run as a script from the tools directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import frontend_backend_analyzer as analyzer  # noqa: E402
+from frontend_backend_analyzer import BackendComparison, FrontendBackendAnalyzer  # noqa: E402
+
+FRONTEND = {
+    'src/types/course.ts': """
+export interface Course {
+  id: number;
+  title: string;
+  createdAt: string;
+  subtitle?: string;
+}
+""",
+    'src/api/courses.ts': """
+import axios from 'axios';
+export const listCourses = () => axios.get('/api/courses/');
+export const getCourse = (id) => axios.get(`/api/courses/${id}/`);
+export const listBadges = () => axios.get('/api/badges/');
+""",
+}
+
+BACKEND = {
+    'courses/models.py': """
+from django.db import models
+
+class Course(models.Model):
+    title = models.CharField(max_length=100)
+    created_at = models.DateTimeField()
+""",
+    'courses/urls.py': """
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('api/courses/', views.CourseList.as_view()),
+    path('api/courses/<int:pk>/', views.CourseDetail.as_view()),
+    path('api/reports/', views.Reports.as_view()),
+]
+""",
+}
+
+EXPECTED_MISMATCHES = {
+    'missing_endpoints': ['GET /api/badges/'],
+    'unexpected_endpoints': ['api/reports/'],
+    'missing_models': [],
+    'field_mismatches': ['Course.subtitle (backend Course)'],
+}
+
+
+class AnalyzerFixtureMixin:
+    """Frontend and backend trees written to a temporary directory"""
+
+    def setUp(self):
+        super().setUp()
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+        for relative, text in FRONTEND.items():
+            self.write(f'frontend/{relative}', text)
+        for relative, text in BACKEND.items():
+            self.write(f'backend/{relative}', text)
+        logging.disable(logging.CRITICAL)
+        self.addCleanup(logging.disable, logging.NOTSET)
+
+    def write(self, relative, text):
+        path = self.tmp / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        return path
+
+    def analyze(self, **config):
+        result = FrontendBackendAnalyzer(str(self.tmp / 'frontend'), str(self.tmp / 'backend'), {
+            'parallel_processing': False,
+            'use_ast': False,
+            'cache_dir': str(self.tmp / 'cache'),
+            **config,
+        })
+        result.analyze()
+        return result
+
+
+# Contract mismatch tests
+class ContractMismatchTests(AnalyzerFixtureMixin, unittest.TestCase):
+    def test_fixture_mismatches(self):
+        result = self.analyze(cache_results=False)
+
+        self.assertEqual(result.backend_comparison.contract_mismatches(), EXPECTED_MISMATCHES)
+        self.assertIn('GET /api/courses/${id}/', result.backend_comparison.endpoint_matches)
+        self.assertEqual(result.backend_comparison.model_matches['Course']['backend_name'], 'Course')
+        self.assertFalse((self.tmp / 'cache').exists())
+
+    def test_mismatches_are_sorted_and_deduplicated(self):
+        comparison = BackendComparison(
+            missing_endpoints=['POST /api/b/', 'GET /api/a/', 'GET /api/a/'],
+            missing_models=['Badge'],
+            field_mismatches=[{'model': 'Course', 'field': 'slug', 'backend_model': 'Course'}] * 2,
+        )
+        self.assertEqual(comparison.contract_mismatches(), {
+            'missing_endpoints': ['GET /api/a/', 'POST /api/b/'],
+            'unexpected_endpoints': [],
+            'missing_models': ['Badge'],
+            'field_mismatches': ['Course.slug (backend Course)'],
+        })
+
+    def test_missing_model_and_viewset_endpoints(self):
+        self.write('frontend/src/types/badge.ts', 'export interface Badge {\n  name: string;\n}\n')
+        self.write('backend/badges/views.py', 'class BadgeViewSet(viewsets.ModelViewSet):\n    pass\n')
+
+        mismatches = self.analyze(cache_results=False).backend_comparison.contract_mismatches()
+
+        self.assertEqual(mismatches['missing_models'], ['Badge'])
+        # ViewSet routes are named after the class, not the router prefix
+        self.assertEqual(mismatches['missing_endpoints'], ['GET /api/badges/'])
+        self.assertEqual(mismatches['unexpected_endpoints'], ['api/badge/', 'api/badge/{id}/', 'api/reports/'])
+
+    def test_diff_reports_added_and_resolved_mismatches(self):
+        diff = self.analyze(cache_results=True).diff_contract_mismatches()
+        self.assertEqual(diff, {'baseline': True, 'added': {}, 'resolved': {}})
+
+        # A new call without a backend route, and the reports page now used
+        self.write('frontend/src/api/reports.ts', """
+import axios from 'axios';
+export const listReports = () => axios.get('/api/reports/');
+export const listTags = () => axios.post('/api/tags/');
+""")
+        diff = self.analyze(cache_results=True).diff_contract_mismatches()
+        self.assertEqual(diff['added'], {'missing_endpoints': ['POST /api/tags/']})
+        self.assertEqual(diff['resolved'], {'unexpected_endpoints': ['api/reports/']})
+        self.assertIn('  + [missing endpoints] POST /api/tags/', analyzer.format_contract_diff(diff))
+
+        # The snapshot is kept until the new mismatch is fixed or accepted
+        self.assertEqual(self.analyze(cache_results=True).diff_contract_mismatches()['added'], diff['added'])
+        self.analyze(cache_results=True).diff_contract_mismatches(update_snapshot=True)
+        diff = self.analyze(cache_results=True).diff_contract_mismatches()
+        self.assertEqual((diff['added'], diff['resolved']), ({}, {}))
+
+
+# Content-hash incremental analysis tests
+class IncrementalCacheTests(AnalyzerFixtureMixin, unittest.TestCase):
+    # Two frontend files, plus models.py and urls.py in the backend
+    FILES = 4
+
+    def test_unchanged_files_are_cache_hits(self):
+        first = self.analyze()
+        self.assertEqual((first.stats['cache_hits'], first.stats['cache_misses']), (0, self.FILES))
+
+        second = self.analyze()
+
+        self.assertEqual((second.stats['cache_hits'], second.stats['cache_misses']), (self.FILES, 0))
+        self.assertEqual(second.backend_comparison.contract_mismatches(), EXPECTED_MISMATCHES)
+        self.assertEqual(
+            sorted((e.method, e.url) for e in second.api_endpoints),
+            sorted((e.method, e.url) for e in first.api_endpoints),
+        )
+        self.assertEqual(second.data_models['Course'].required_fields, {'id', 'title', 'createdAt'})
+
+    def test_changed_files_are_analyzed_again(self):
+        self.analyze()
+        self.write('frontend/src/api/courses.ts', FRONTEND['src/api/courses.ts'].replace('badges', 'courses'))
+        self.write('backend/courses/models.py', BACKEND['courses/models.py'] + '    subtitle = models.CharField()\n')
+
+        result = self.analyze()
+
+        self.assertEqual((result.stats['cache_hits'], result.stats['cache_misses']), (self.FILES - 2, 2))
+        mismatches = result.backend_comparison.contract_mismatches()
+        self.assertEqual(mismatches['missing_endpoints'], [])
+        self.assertEqual(mismatches['field_mismatches'], [])
+
+    def test_touching_a_file_without_changing_it_is_a_hit(self):
+        self.analyze()
+        path = self.tmp / 'frontend' / 'src' / 'types' / 'course.ts'
+        os.utime(path, (0, 0))
+
+        self.assertEqual(self.analyze().stats['cache_misses'], 0)
+
+    def test_new_cache_version_or_unreadable_cache_starts_over(self):
+        self.analyze()
+        with mock.patch.object(analyzer, 'FILE_CACHE_VERSION', analyzer.FILE_CACHE_VERSION + 1):
+            self.assertEqual(self.analyze().stats['cache_hits'], 0)
+
+        self.analyze()
+        (self.tmp / 'cache' / 'file_results.json').write_text('{not json')
+        result = self.analyze()
+        self.assertEqual(result.stats['cache_misses'], 2)
+        self.assertEqual(result.backend_comparison.contract_mismatches(), EXPECTED_MISMATCHES)
+
+
+if __name__ == '__main__':
+    unittest.main()